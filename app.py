@@ -1,21 +1,23 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash, send_file
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash, send_file, Response
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import sqlite3
 import os
 from datetime import datetime
-import pandas as pd
-from io import BytesIO
 from dotenv import load_dotenv
+import time
+import click
 
 try:
     import psycopg2
-    from urllib.parse import urlparse
     PSYCOPG2_AVAILABLE = True
 except ImportError:
     PSYCOPG2_AVAILABLE = False
     print("⚠️ psycopg2 not available - PostgreSQL support disabled")
 
+# cloudinary_config and excel_export_enhanced import their heavy
+# dependencies (cloudinary, pandas, openpyxl, PIL, requests) on first use,
+# keeping worker boot fast - see benchmarks/import_time.py
 from cloudinary_config import (
     upload_image_to_cloudinary, 
     upload_excel_to_cloudinary,
@@ -25,9 +27,30 @@ from cloudinary_config import (
 )
 from excel_export_enhanced import (
     export_enhanced_excel_with_cloudinary,
-    create_simple_excel_with_formatting
+    create_simple_excel_with_formatting,
+    record_export
 )
-import requests
+from db_pool import get_pooled_connection
+from instrumentation import init_instrumentation, instrument_connection, get_endpoint_stats
+from app_cache import cached, invalidate, invalidate_all, cache_stats, use_shared_versions
+from branch_index import search_branches, find_branch_by_code, DEFAULT_LIMIT as BRANCH_SEARCH_LIMIT
+from profiling import init_profiling, get_profile, list_profiles, clear_profiles as clear_profile_store
+from submissions import (
+    SubmissionError, INTEGRITY_ERRORS, SUBMISSIONS, SUBMITTED_ENTRIES,
+    get_idempotency_key, parse_entries, parse_captured_at, store_images,
+    find_submission, claim_submission, complete_submission, save_branch, insert_entry
+)
+from static_assets import init_static_assets
+from taxonomy_bulk import (
+    TaxonomyImportError, IMPORTS, MAX_OPERATIONS, read_rows, parse_taxonomy, load_taxonomy, diff_taxonomy,
+    summarize, apply_changes, apply_operations, export_rows, write_csv, write_xlsx,
+    OperationError, MAX_CLONE_TARGETS, clone_pop_materials
+)
+from rename_propagation import record_renames, start_propagation, recent_jobs, unfinished_jobs
+from compression import init_compression
+from chunked_uploads import UploadError, create_session, get_status, write_chunk, finalize, open_upload, discard_upload
+from metrics import counter, render_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from migrations import run_migrations, migration_status
 
 # Load environment variables
 load_dotenv()
@@ -41,29 +64,48 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 DATABASE_URL = os.getenv('DATABASE_URL')
 IS_PRODUCTION = DATABASE_URL is not None
 
+# Request timing, DB time and query counts (Server-Timing header)
+init_instrumentation(app)
+
+# Admin-only on-demand profiling (?_profile=1 / ?_profile=sample)
+init_profiling(app)
+
+# Content-hashed static URLs with long cache lifetimes (?v=<hash>)
+init_static_assets(app)
+
+# gzip / brotli for text responses (registered last, so it runs first
+# among the after_request hooks and the others see the compressed body)
+init_compression(app)
+
+# Bearer token for scraping /metrics; without it only admins can read it
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+DB_CONNECTIONS = counter('db_connections_total', 'Database connections handed out by get_db_connection', ('db_type',))
+LOGINS = counter('logins_total', 'Login attempts by outcome', ('outcome',))
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-# Production database initialization will be done after function definitions
+# Schema setup is not done at import time: run `flask --app app migrate`
+# once per deploy (see migrations.py)
 
 def get_db_connection():
     """Get database connection based on environment"""
+    connect_started = time.perf_counter()
     if IS_PRODUCTION and DATABASE_URL and PSYCOPG2_AVAILABLE:
-        # Production: PostgreSQL
-        url = urlparse(DATABASE_URL)
-        conn = psycopg2.connect(
-            host=url.hostname,
-            port=url.port,
-            database=url.path[1:],
-            user=url.username,
-            password=url.password,
-            sslmode='require'
-        )
-        return conn, 'postgresql'
+        # Production: PostgreSQL (pooled per worker process, close() returns it)
+        conn = get_pooled_connection(DATABASE_URL)
+        DB_CONNECTIONS.inc(db_type='postgresql')
+        return instrument_connection(conn, connect_started, 'postgresql'), 'postgresql'
     else:
         # Development: SQLite
         conn = sqlite3.connect('database.db')
-        return conn, 'sqlite'
+        DB_CONNECTIONS.inc(db_type='sqlite')
+        return instrument_connection(conn, connect_started, 'sqlite'), 'sqlite'
+
+# Every gunicorn worker has its own cache; the versions that invalidate()
+# bumps are kept in the database so all of them drop stale values at once
+use_shared_versions(get_db_connection)
 
 def execute_query(query, params=None, fetch_one=False, fetch_all=False):
     """Execute query with proper database handling"""
@@ -103,174 +145,44 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False):
     finally:
         conn.close()
 
-def init_db():
-    """Initialize database with persistent data preservation"""
+def init_db(dry_run=False):
+    """Apply pending schema migrations and make sure the default data exists"""
     conn, db_type = get_db_connection()
-    c = conn.cursor()
-    
-    # Users table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS users (
-            id SERIAL PRIMARY KEY,
-            username VARCHAR(80) UNIQUE NOT NULL,
-            password_hash VARCHAR(255) NOT NULL,
-            employee_name VARCHAR(100) NOT NULL,
-            employee_code VARCHAR(50) UNIQUE NOT NULL,
-            is_admin BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            employee_name TEXT NOT NULL,
-            employee_code TEXT UNIQUE NOT NULL,
-            is_admin BOOLEAN DEFAULT FALSE,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )''')
-    
-    # Categories table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS categories (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(100) UNIQUE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )''')
-    
-    # Models table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS models (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            category_id INTEGER REFERENCES categories(id),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS models (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            category_id INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (category_id) REFERENCES categories (id)
-        )''')
-    
-    # Display types table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS display_types (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(100) NOT NULL,
-            category_id INTEGER REFERENCES categories(id),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS display_types (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            category_id INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (category_id) REFERENCES categories (id)
-        )''')
-    
-    # POP materials table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS pop_materials (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(200) NOT NULL,
-            model_id INTEGER REFERENCES models(id),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS pop_materials (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            model_id INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (model_id) REFERENCES models (id)
-        )''')
-    
-    # Data entries table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS data_entries (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER REFERENCES users(id),
-            employee_name VARCHAR(100) NOT NULL,
-            employee_code VARCHAR(50) NOT NULL,
-            branch_name VARCHAR(200) NOT NULL,
-            shop_code VARCHAR(50),
-            category VARCHAR(100) NOT NULL,
-            model VARCHAR(100) NOT NULL,
-            display_type VARCHAR(100) NOT NULL,
-            selected_materials TEXT,
-            missing_materials TEXT,
-            image_urls TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS data_entries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            employee_name TEXT NOT NULL,
-            employee_code TEXT NOT NULL,
-            branch_name TEXT NOT NULL,
-            shop_code TEXT,
-            category TEXT NOT NULL,
-            model TEXT NOT NULL,
-            display_type TEXT NOT NULL,
-            selected_materials TEXT,
-            missing_materials TEXT,
-            image_urls TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )''')
-    
-    # Branches table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS branches (
-            id SERIAL PRIMARY KEY,
-            name VARCHAR(200) NOT NULL,
-            code VARCHAR(50) UNIQUE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )''')
-    else:
-        c.execute('''CREATE TABLE IF NOT EXISTS branches (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            code TEXT UNIQUE NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )''')
-    
-    # User branches table
-    if db_type == 'postgresql':
-        c.execute('''CREATE TABLE IF NOT EXISTS user_branches (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-            branch_name VARCHAR(200) NOT NULL,
-            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(user_id, branch_name)
-        )''')
+
+    try:
+        applied = run_migrations(conn, db_type, dry_run=dry_run)
+        if dry_run:
+            print(f"ℹ️ {len(applied)} pending migration(s), nothing applied")
+            return
+
+        if applied:
+            print(f"✅ Applied migrations: {', '.join(str(v) for v in applied)}")
+        else:
+            print("✅ Database schema is up to date")
+
+        # Initialize default data
+        initialize_default_data(conn.cursor(), conn, db_type)
+    finally:
+        conn.close()
+
+def print_migration_status():
+    """Print applied and pending migrations"""
+    conn, db_type = get_db_connection()
+    try:
+        for version, description, applied in migration_status(conn, db_type):
+            print(f"{'✅' if applied else '⏳'} {version:04d} {description}")
+    finally:
+        conn.close()
+
+@app.cli.command('migrate')
+@click.option('--status', is_flag=True, help='List applied and pending migrations.')
+@click.option('--dry-run', is_flag=True, help='Show pending migrations without applying them.')
+def migrate_command(status, dry_run):
+    """Run database migrations (once per deploy, before workers start)"""
+    if status:
+        print_migration_status()
     else:
-        c.execute('''CREATE TABLE IF NOT EXISTS user_branches (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            branch_name TEXT NOT NULL,
-            created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-            UNIQUE(user_id, branch_name)
-        )''')
-    
-    conn.commit()
-    
-    # Initialize default data
-    initialize_default_data(c, conn, db_type)
-    
-    conn.close()
+        init_db(dry_run=dry_run)
 
 def initialize_default_data(cursor, conn, db_type):
     """Initialize default data"""
@@ -331,15 +243,18 @@ def login():
             session['company_code'] = user[4]  # employee_code
             session['is_admin'] = user[5]  # is_admin
             session.permanent = remember_me
+            LOGINS.inc(outcome='success')
             
             if user[5]:  # is_admin
                 return redirect(url_for('admin_dashboard'))
             else:
                 return redirect(url_for('data_entry'))
         else:
+            LOGINS.inc(outcome='invalid_credentials')
             flash('Invalid credentials')
             return redirect(url_for('index'))
     except Exception as e:
+        LOGINS.inc(outcome='error')
         print(f"Login error: {e}")
         flash('Login error occurred. Please try again.')
         return redirect(url_for('index'))
@@ -408,20 +323,49 @@ def admin_management():
     return render_template('admin_management.html')
 
 # Data loading routes
+# Taxonomy lists and the query parameter each one is filtered by
+TAXONOMY_FILTERS = {
+    'categories': None,
+    'models': 'category',
+    'display_types': 'category',
+    'pop_materials': 'model'
+}
+
+def taxonomy_cache_key(data_type):
+    """Cache key of a taxonomy request: the list type plus its filter value"""
+    filter_name = TAXONOMY_FILTERS[data_type]
+    return (data_type, request.args.get(filter_name, '') if filter_name else '')
+
 @app.route('/get_dynamic_data/<data_type>')
 def get_dynamic_data(data_type):
     """Get dynamic data from database for frontend"""
+    if data_type not in TAXONOMY_FILTERS:
+        return jsonify({'success': False, 'message': 'Invalid data type'}), 400
+
+    try:
+        category = request.args.get('category', '')
+        model = request.args.get('model', '')
+        data = cached('taxonomy', taxonomy_cache_key(data_type),
+                      lambda: load_dynamic_data(data_type, category, model))
+        return jsonify({'success': True, 'data': data})
+        
+    except Exception as e:
+        print(f"Error in get_dynamic_data: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+def load_dynamic_data(data_type, category='', model=''):
+    """Names of one taxonomy list for the data entry form"""
+    conn, db_type = get_db_connection()
     try:
-        conn, db_type = get_db_connection()
         c = conn.cursor()
         placeholder = '%s' if db_type == 'postgresql' else '?'
+        data = []
         
         if data_type == 'categories':
             c.execute('SELECT name FROM categories ORDER BY name')
             data = [row[0] for row in c.fetchall()]
         
         elif data_type == 'models':
-            category = request.args.get('category', '')
             if category:
                 # Get category ID first
                 c.execute(f'SELECT id FROM categories WHERE name = {placeholder}', (category,))
@@ -429,14 +373,11 @@ def get_dynamic_data(data_type):
                 if cat_result:
                     c.execute(f'SELECT name FROM models WHERE category_id = {placeholder} ORDER BY name', (cat_result[0],))
                     data = [row[0] for row in c.fetchall()]
-                else:
-                    data = []
             else:
                 c.execute('SELECT name FROM models ORDER BY name')
                 data = [row[0] for row in c.fetchall()]
         
         elif data_type == 'display_types':
-            category = request.args.get('category', '')
             if category:
                 # Get category ID first
                 c.execute(f'SELECT id FROM categories WHERE name = {placeholder}', (category,))
@@ -444,13 +385,8 @@ def get_dynamic_data(data_type):
                 if cat_result:
                     c.execute(f'SELECT name FROM display_types WHERE category_id = {placeholder} ORDER BY name', (cat_result[0],))
                     data = [row[0] for row in c.fetchall()]
-                else:
-                    data = []
-            else:
-                data = []
         
         elif data_type == 'pop_materials':
-            model = request.args.get('model', '')
             if model:
                 # Get model ID first
                 c.execute(f'SELECT id FROM models WHERE name = {placeholder}', (model,))
@@ -458,96 +394,442 @@ def get_dynamic_data(data_type):
                 if model_result:
                     c.execute(f'SELECT name FROM pop_materials WHERE model_id = {placeholder} ORDER BY name', (model_result[0],))
                     data = [row[0] for row in c.fetchall()]
-                else:
-                    data = []
-            else:
-                data = []
         
+        return data
+    finally:
         conn.close()
-        return jsonify({'success': True, 'data': data})
-        
+
+def load_branches():
+    """All branches as (id, name, code) rows for the branch search index"""
+    conn, db_type = get_db_connection()
+    try:
+        c = conn.cursor()
+        c.execute('SELECT id, name, code FROM branches')
+        return c.fetchall()
+    finally:
+        conn.close()
+
+@app.route('/get_branches')
+def get_branches():
+    """Branch autocomplete: ranked matches on branch name and shop code"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    search = request.args.get('search', '').strip()
+    limit = request.args.get('limit', BRANCH_SEARCH_LIMIT, type=int)
+    if not search:
+        return jsonify({'success': True, 'branches': []})
+
+    try:
+        return jsonify({'success': True, 'branches': search_branches(load_branches, search, limit)})
     except Exception as e:
-        print(f"Error in get_dynamic_data: {e}")
+        print(f"Error in get_branches: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/branches/sync')
+def branches_sync():
+    """
+    Compact branch list for the client-side cache (static/js/branch_cache.js)
+
+    ?since=<version> returns only the branches added or changed after that
+    version plus the shop codes that were deleted; without it (or when the
+    client is ahead of the server, e.g. after a database restore) the full
+    list is returned with full=true. Branches are [name, code] pairs.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    since = request.args.get('since', 0, type=int)
+
+    try:
+        conn, db_type = get_db_connection()
+        try:
+            c = conn.cursor()
+            placeholder = '%s' if db_type == 'postgresql' else '?'
+            c.execute("SELECT version FROM sync_versions WHERE name = 'branches'")
+            version = c.fetchone()[0]
+
+            if 0 < since <= version:
+                branches, deleted = [], []
+                if since < version:
+                    c.execute(f'SELECT name, code FROM branches WHERE version > {placeholder}', (since,))
+                    branches = [[name, code] for name, code in c.fetchall()]
+                    c.execute(f'SELECT code FROM branch_tombstones WHERE version > {placeholder}', (since,))
+                    deleted = [row[0] for row in c.fetchall()]
+                return jsonify({'success': True, 'version': version, 'full': False,
+                                'branches': branches, 'deleted': deleted})
+        finally:
+            conn.close()
+
+        # Same version, same list: build it once per version
+        branches = cached('branches', ('sync', version),
+                          lambda: [[name, code] for _, name, code in sorted(load_branches(), key=lambda row: row[1])])
+        return jsonify({'success': True, 'version': version, 'full': True, 'branches': branches, 'deleted': []})
+    except Exception as e:
+        print(f"Error in branches_sync: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/get_branch_by_code')
+def get_branch_by_code():
+    """Branch with exactly this shop code (case-insensitive)"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    code = request.args.get('code', '').strip()
+    if not code:
+        return jsonify({'success': False, 'message': 'Shop code is required'}), 400
+
+    try:
+        branch = find_branch_by_code(load_branches, code)
+        if branch is None:
+            return jsonify({'success': False, 'message': 'Branch not found'}), 404
+        return jsonify({'success': True, 'branch': branch})
+    except Exception as e:
+        print(f"Error in get_branch_by_code: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# Data entry submission
+def submission_response(entry_ids, replayed=False):
+    return jsonify({'success': True, 'message': f'{len(entry_ids)} entries saved successfully',
+                    'entry_ids': entry_ids, 'replayed': replayed})
+
+def replay_submission(existing, user_id):
+    """Response for a key that was already recorded, see submissions.py"""
+    owner, entry_ids = existing
+    if owner != user_id:
+        SUBMISSIONS.inc(outcome='conflict')
+        return jsonify({'success': False, 'message': 'Idempotency key already used'}), 409
+    if entry_ids is None:
+        # Another copy of this submission is being saved right now
+        SUBMISSIONS.inc(outcome='in_progress')
+        return jsonify({'success': False, 'message': 'Submission is already being processed'}), 409
+    SUBMISSIONS.inc(outcome='replayed')
+    return submission_response(entry_ids, replayed=True)
+
+@app.route('/submit_data', methods=['POST'])
+def submit_data():
+    """
+    Save the model entries of the data entry form
+
+    Requests with an Idempotency-Key header (sent by the offline outbox of
+    the data entry page) are saved at most once; a retry gets the original
+    result with replayed=true. The outbox names the user who filled the
+    form in (X-Outbox-User); submissions of another user than the session's
+    are held back on the device (held=true) instead of being filed under
+    the wrong name.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    user_id = session['user_id']
+    outbox_user = request.headers.get('X-Outbox-User')
+    if outbox_user and outbox_user != str(user_id):
+        SUBMISSIONS.inc(outcome='held')
+        return jsonify({'success': False, 'held': True,
+                        'message': 'This submission was saved on this device by another user'}), 403
+    try:
+        key = get_idempotency_key(request)
+        entries = parse_entries(request.form, request.files)
+        created_at = parse_captured_at(request.form.get('captured_at'))
+    except SubmissionError as e:
+        SUBMISSIONS.inc(outcome='invalid')
+        return jsonify({'success': False, 'message': str(e)}), e.status
+
+    try:
+        if key:
+            conn, db_type = get_db_connection()
+            try:
+                existing = find_submission(conn.cursor(), db_type, key)
+            finally:
+                conn.close()
+            if existing:
+                return replay_submission(existing, user_id)
+
+        # Slow work first, so no connection is held while uploading
+        for entry in entries:
+            uploaded = [open_upload(user_id, upload_id) for upload_id in entry['uploads']]
+            try:
+                entry['image_urls'] = store_images(entry['images'] + uploaded, app.config['UPLOAD_FOLDER'])
+            finally:
+                for upload in uploaded:
+                    upload.close()
+            model_materials = cached('taxonomy', ('pop_materials', entry['model']),
+                                     lambda: load_dynamic_data('pop_materials', model=entry['model']))
+            entry['missing_materials'] = [material for material in model_materials
+                                          if material not in entry['selected_materials']]
+    except (SubmissionError, UploadError) as e:
+        SUBMISSIONS.inc(outcome='error')
+        return jsonify({'success': False, 'message': str(e)}), e.status
+    except Exception as e:
+        SUBMISSIONS.inc(outcome='error')
+        print(f"Error in submit_data: {e}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+    conn, db_type = get_db_connection()
+    branches_changed = assignments_changed = False
+    try:
+        cursor = conn.cursor()
+        if key:
+            claim_submission(cursor, db_type, key, user_id, created_at)
+
+        entry_ids = []
+        for entry in entries:
+            branch_created, assignment_created = save_branch(cursor, db_type, user_id, entry['branch_name'],
+                                                             entry['shop_code'], created_at)
+            branches_changed |= branch_created
+            assignments_changed |= assignment_created
+            entry_ids.append(insert_entry(cursor, db_type, {
+                'user_id': user_id,
+                'employee_name': session.get('employee_name') or session.get('user_name'),
+                'employee_code': session.get('company_code') or '',
+                'branch_name': entry['branch_name'],
+                'shop_code': entry['shop_code'],
+                'category': entry['category'],
+                'model': entry['model'],
+                'display_type': entry['display_type'],
+                'selected_materials': ','.join(entry['selected_materials']),
+                'missing_materials': ','.join(entry['missing_materials']),
+                'image_urls': ','.join(entry['image_urls']),
+                'created_at': created_at
+            }))
+
+        if key:
+            complete_submission(cursor, db_type, key, entry_ids)
+        conn.commit()
+    except INTEGRITY_ERRORS:
+        # Lost the race for the key against another copy of this submission
+        conn.rollback()
+        existing = find_submission(conn.cursor(), db_type, key) if key else None
+        conn.close()
+        if existing:
+            return replay_submission(existing, user_id)
+        SUBMISSIONS.inc(outcome='error')
+        return jsonify({'success': False, 'message': 'Submission conflicts with existing data'}), 409
+    except Exception as e:
+        conn.rollback()
+        conn.close()
+        SUBMISSIONS.inc(outcome='error')
+        print(f"Error in submit_data: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
+    conn.close()
+
+    # The stored photos are in UPLOAD_FOLDER now; a retry gets the replay
+    for entry in entries:
+        for upload_id in entry['uploads']:
+            discard_upload(user_id, upload_id)
+
+    if branches_changed:
+        invalidate('branches')
+    if assignments_changed:
+        invalidate('user_branches')
+
+    SUBMISSIONS.inc(outcome='created')
+    SUBMITTED_ENTRIES.inc(len(entry_ids))
+    print(f"📝 {session.get('user_name')} submitted {len(entry_ids)} entries")
+    return submission_response(entry_ids)
+
+# Resumable chunked photo uploads, see chunked_uploads.py
+@app.route('/uploads', methods=['POST'])
+def create_upload():
+    """Start (or resume) an upload session for one photo"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    data = request.get_json(silent=True) or {}
+    try:
+        state = create_session(session['user_id'], data.get('upload_id'), data.get('filename'),
+                               data.get('size'), data.get('content_type'))
+        return jsonify({'success': True, **state})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), e.status
+
+@app.route('/uploads/<upload_id>')
+def upload_status(upload_id):
+    """Chunks the server already has, so the client can resume"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    try:
+        return jsonify({'success': True, **get_status(session['user_id'], upload_id)})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), e.status
+
+@app.route('/uploads/<upload_id>/chunks/<int:index>', methods=['PUT'])
+def upload_chunk(upload_id, index):
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    try:
+        state = write_chunk(session['user_id'], upload_id, index, request.stream,
+                            checksum=request.headers.get('X-Chunk-SHA256'))
+        return jsonify({'success': True, **state})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), e.status
+
+@app.route('/uploads/<upload_id>/finalize', methods=['POST'])
+def finalize_upload(upload_id):
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    try:
+        return jsonify({'success': True, **finalize(session['user_id'], upload_id)})
+    except UploadError as e:
+        return jsonify({'success': False, 'message': str(e)}), e.status
+
+@app.route('/sw.js')
+def service_worker():
+    """Service worker of the data entry page, served from the root so its scope covers the whole site"""
+    response = send_file(os.path.join(app.static_folder, 'sw.js'), mimetype='application/javascript')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 # Admin management routes
+# Admin tables: FROM clause and parent columns of each taxonomy list
+MANAGEMENT_TABLES = {
+    'categories': ('categories t', {}),
+    'models': ('models t JOIN categories c ON t.category_id = c.id',
+               {'category_id': 't.category_id', 'category': 'c.name'}),
+    'display_types': ('display_types t JOIN categories c ON t.category_id = c.id',
+                      {'category_id': 't.category_id', 'category': 'c.name'}),
+    'pop_materials': ('pop_materials t JOIN models m ON t.model_id = m.id JOIN categories c ON m.category_id = c.id',
+                      {'model_id': 't.model_id', 'model': 'm.name', 'category_id': 'm.category_id', 'category': 'c.name'})
+}
+
+# Sortable admin table columns; ties are broken by id so pages never overlap
+MANAGEMENT_SORTS = {'id': 't.id', 'name': 't.name', 'created_at': 't.created_at', 'category': 'c.name', 'model': 'm.name'}
+MANAGEMENT_PAGE_SIZE = 100
+MANAGEMENT_MAX_PAGE_SIZE = 500
+
+def management_query_options(data_type):
+    """Filter, search, sort and page options of a get_management_data request"""
+    columns = MANAGEMENT_TABLES[data_type][1]
+    sort = request.args.get('sort', 'name')
+    if sort not in MANAGEMENT_SORTS or (sort in ('category', 'model') and sort not in columns):
+        raise ValueError(f'Invalid sort column: {sort}')
+    order = request.args.get('order', 'asc').lower()
+    if order not in ('asc', 'desc'):
+        raise ValueError(f'Invalid sort order: {order}')
+
+    page = page_size = None
+    if 'page' in request.args or 'page_size' in request.args:
+        try:
+            page = int(request.args.get('page', 1))
+            page_size = int(request.args.get('page_size', MANAGEMENT_PAGE_SIZE))
+        except ValueError:
+            raise ValueError('page and page_size must be integers')
+        if page < 1 or page_size < 1:
+            raise ValueError('page and page_size must be positive')
+        page_size = min(page_size, MANAGEMENT_MAX_PAGE_SIZE)
+
+    return {
+        'category': request.args.get('category', '') if 'category' in columns else '',
+        'model': request.args.get('model', '') if 'model' in columns else '',
+        'search': request.args.get('search', '').strip(),
+        'sort': sort,
+        'order': order,
+        'page': page,
+        'page_size': page_size
+    }
+
 @app.route('/get_management_data/<data_type>')
 def get_management_data(data_type):
+    """
+    Rows of one taxonomy list for the admin tables
+
+    Optional query parameters: category / model filters, search (part of
+    the name), sort (id, name, created_at, category, model) and order
+    (asc, desc). With page / page_size only that page is returned, along
+    with the total number of matching rows.
+    """
     if 'user_id' not in session or not session.get('is_admin'):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 401
     
+    if data_type not in TAXONOMY_FILTERS:
+        return jsonify({'success': False, 'message': 'Invalid data type'}), 400
+    
     try:
-        conn, db_type = get_db_connection()
-        c = conn.cursor()
-        placeholder = '%s' if db_type == 'postgresql' else '?'
-        
-        if data_type == 'categories':
-            c.execute('SELECT id, name, created_at FROM categories ORDER BY name')
-            rows = c.fetchall()
-            data = [{'id': row[0], 'name': row[1], 'created_at': str(row[2]) if row[2] else 'N/A'} for row in rows]
-        
-        elif data_type == 'models':
-            category = request.args.get('category', '')
-            if category:
-                c.execute(f'SELECT id FROM categories WHERE name = {placeholder}', (category,))
-                cat_result = c.fetchone()
-                if cat_result:
-                    c.execute(f'SELECT m.id, m.name, c.name as category_name, m.created_at FROM models m JOIN categories c ON m.category_id = c.id WHERE m.category_id = {placeholder} ORDER BY m.name', (cat_result[0],))
-                    rows = c.fetchall()
-                    data = [{'id': row[0], 'name': row[1], 'category': row[2], 'created_at': str(row[3]) if row[3] else 'N/A'} for row in rows]
-                else:
-                    data = []
-            else:
-                c.execute('SELECT m.id, m.name, c.name as category_name, m.created_at FROM models m JOIN categories c ON m.category_id = c.id ORDER BY m.name')
-                rows = c.fetchall()
-                data = [{'id': row[0], 'name': row[1], 'category': row[2], 'created_at': str(row[3]) if row[3] else 'N/A'} for row in rows]
-        
-        elif data_type == 'display_types':
-            category = request.args.get('category', '')
-            if category:
-                c.execute(f'SELECT id FROM categories WHERE name = {placeholder}', (category,))
-                cat_result = c.fetchone()
-                if cat_result:
-                    c.execute(f'SELECT dt.id, dt.name, c.name as category_name, dt.created_at FROM display_types dt JOIN categories c ON dt.category_id = c.id WHERE dt.category_id = {placeholder} ORDER BY dt.name', (cat_result[0],))
-                    rows = c.fetchall()
-                    data = [{'id': row[0], 'name': row[1], 'category': row[2], 'created_at': str(row[3]) if row[3] else 'N/A'} for row in rows]
-                else:
-                    data = []
-            else:
-                c.execute('SELECT dt.id, dt.name, c.name as category_name, dt.created_at FROM display_types dt JOIN categories c ON dt.category_id = c.id ORDER BY dt.name')
-                rows = c.fetchall()
-                data = [{'id': row[0], 'name': row[1], 'category': row[2], 'created_at': str(row[3]) if row[3] else 'N/A'} for row in rows]
-        
-        elif data_type == 'pop_materials':
-            model = request.args.get('model', '')
-            if model:
-                c.execute(f'SELECT id FROM models WHERE name = {placeholder}', (model,))
-                model_result = c.fetchone()
-                if model_result:
-                    c.execute(f'SELECT pm.id, pm.name, m.name as model_name, pm.created_at FROM pop_materials pm JOIN models m ON pm.model_id = m.id WHERE pm.model_id = {placeholder} ORDER BY pm.name', (model_result[0],))
-                    rows = c.fetchall()
-                    data = [{'id': row[0], 'name': row[1], 'model': row[2], 'created_at': str(row[3]) if row[3] else 'N/A'} for row in rows]
-                else:
-                    data = []
-            else:
-                c.execute('SELECT pm.id, pm.name, m.name as model_name, pm.created_at FROM pop_materials pm JOIN models m ON pm.model_id = m.id ORDER BY pm.name')
-                rows = c.fetchall()
-                data = [{'id': row[0], 'name': row[1], 'model': row[2], 'created_at': str(row[3]) if row[3] else 'N/A'} for row in rows]
-        
-        conn.close()
-        return jsonify({'success': True, 'data': data})
+        options = management_query_options(data_type)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    try:
+        if options['search']:
+            # Typed searches are too varied to be worth caching
+            data, total = load_management_data(data_type, **options)
+        else:
+            key = ('management', data_type) + tuple(options[name] for name in sorted(options))
+            data, total = cached('taxonomy', key, lambda: load_management_data(data_type, **options))
+
+        result = {'success': True, 'data': data}
+        if options['page'] is not None:
+            result.update(total=total, page=options['page'], page_size=options['page_size'])
+        return jsonify(result)
         
     except Exception as e:
         print(f"Error in get_management_data: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+def load_management_data(data_type, category='', model='', search='', sort='name', order='asc',
+                         page=None, page_size=None):
+    """
+    Rows of one taxonomy list with ids and parents, and the number of
+    matching rows (None without paging)
+    """
+    from_clause, columns = MANAGEMENT_TABLES[data_type]
+    conn, db_type = get_db_connection()
+    try:
+        c = conn.cursor()
+        placeholder = '%s' if db_type == 'postgresql' else '?'
+
+        conditions, params = [], []
+        if category:
+            conditions.append(f'c.name = {placeholder}')
+            params.append(category)
+        if model:
+            conditions.append(f'm.name = {placeholder}')
+            params.append(model)
+        if search:
+            escaped = search.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append(f"LOWER(t.name) LIKE {placeholder} ESCAPE '\\'")
+            params.append(f'%{escaped}%')
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        total = None
+        if page is not None:
+            c.execute(f'SELECT COUNT(*) FROM {from_clause}{where}', params)
+            total = c.fetchone()[0]
+
+        direction = 'DESC' if order == 'desc' else 'ASC'
+        select = ', '.join(['t.id', 't.name', 't.created_at'] + list(columns.values()))
+        query = f'SELECT {select} FROM {from_clause}{where} ORDER BY {MANAGEMENT_SORTS[sort]} {direction}, t.id {direction}'
+        if page is not None:
+            query += f' LIMIT {placeholder} OFFSET {placeholder}'
+            params = params + [page_size, (page - 1) * page_size]
+        c.execute(query, params)
+
+        data = []
+        for row in c.fetchall():
+            item = {'id': row[0], 'name': row[1], 'created_at': str(row[2]) if row[2] else 'N/A'}
+            item.update(zip(columns, row[3:]))
+            data.append(item)
+        return data, total
+    finally:
+        conn.close()
+
 @app.route('/manage_data', methods=['POST'])
 def manage_data():
+    """
+    Add, edit or delete one taxonomy item ({action, type, id, name,
+    category_id / model_id}), or several at once with {operations: [...]}
+    """
     if 'user_id' not in session or not session.get('is_admin'):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 401
     
     try:
         data = request.get_json()
+        if isinstance(data, dict) and 'operations' in data:
+            return manage_data_batch(data)
+
         action = data.get('action')
         data_type = data.get('type')
         
@@ -596,6 +878,11 @@ def manage_data():
                     if not name or not category_id:
                         return jsonify({'success': False, 'message': 'Display type name and category are required'}), 400
                     
+                    cursor.execute(f'SELECT COUNT(*) FROM display_types WHERE name = {placeholder} AND category_id = {placeholder}', 
+                                 (name, category_id))
+                    if cursor.fetchone()[0] > 0:
+                        return jsonify({'success': False, 'message': 'Display type already exists in this category'}), 400
+                    
                     cursor.execute(f'INSERT INTO display_types (name, category_id, created_at) VALUES ({placeholder}, {placeholder}, {placeholder})',
                                  (name, category_id, current_time))
                     conn.commit()
@@ -608,6 +895,11 @@ def manage_data():
                     if not name or not model_id:
                         return jsonify({'success': False, 'message': 'Material name and model are required'}), 400
                     
+                    cursor.execute(f'SELECT COUNT(*) FROM pop_materials WHERE name = {placeholder} AND model_id = {placeholder}', 
+                                 (name, model_id))
+                    if cursor.fetchone()[0] > 0:
+                        return jsonify({'success': False, 'message': 'POP material already exists for this model'}), 400
+                    
                     cursor.execute(f'INSERT INTO pop_materials (name, model_id, created_at) VALUES ({placeholder}, {placeholder}, {placeholder})',
                                  (name, model_id, current_time))
                     conn.commit()
@@ -626,10 +918,13 @@ def manage_data():
                     if not name:
                         return jsonify({'success': False, 'message': 'Category name is required'}), 400
                     
+                    renames = record_renames(cursor, db_type, 'categories', [(item_id, name)], current_time)
                     cursor.execute(f'UPDATE categories SET name = {placeholder} WHERE id = {placeholder}',
                                  (name, item_id))
                     conn.commit()
-                    return jsonify({'success': True, 'message': 'Category updated successfully'})
+                    if renames:
+                        start_propagation(get_db_connection)
+                    return jsonify({'success': True, 'message': 'Category updated successfully', 'renames': renames})
                 
                 elif data_type == 'models':
                     name = data.get('name', '').strip()
@@ -638,6 +933,7 @@ def manage_data():
                     if not name:
                         return jsonify({'success': False, 'message': 'Model name is required'}), 400
                     
+                    renames = record_renames(cursor, db_type, 'models', [(item_id, name)], current_time)
                     if category_id:
                         cursor.execute(f'UPDATE models SET name = {placeholder}, category_id = {placeholder} WHERE id = {placeholder}',
                                      (name, category_id, item_id))
@@ -645,7 +941,9 @@ def manage_data():
                         cursor.execute(f'UPDATE models SET name = {placeholder} WHERE id = {placeholder}',
                                      (name, item_id))
                     conn.commit()
-                    return jsonify({'success': True, 'message': 'Model updated successfully'})
+                    if renames:
+                        start_propagation(get_db_connection)
+                    return jsonify({'success': True, 'message': 'Model updated successfully', 'renames': renames})
                 
                 elif data_type == 'display_types':
                     name = data.get('name', '').strip()
@@ -654,6 +952,7 @@ def manage_data():
                     if not name:
                         return jsonify({'success': False, 'message': 'Display type name is required'}), 400
                     
+                    renames = record_renames(cursor, db_type, 'display_types', [(item_id, name)], current_time)
                     if category_id:
                         cursor.execute(f'UPDATE display_types SET name = {placeholder}, category_id = {placeholder} WHERE id = {placeholder}',
                                      (name, category_id, item_id))
@@ -661,7 +960,9 @@ def manage_data():
                         cursor.execute(f'UPDATE display_types SET name = {placeholder} WHERE id = {placeholder}',
                                      (name, item_id))
                     conn.commit()
-                    return jsonify({'success': True, 'message': 'Display type updated successfully'})
+                    if renames:
+                        start_propagation(get_db_connection)
+                    return jsonify({'success': True, 'message': 'Display type updated successfully', 'renames': renames})
                 
                 elif data_type == 'pop_materials':
                     name = data.get('name', '').strip()
@@ -670,6 +971,7 @@ def manage_data():
                     if not name:
                         return jsonify({'success': False, 'message': 'Material name is required'}), 400
                     
+                    renames = record_renames(cursor, db_type, 'pop_materials', [(item_id, name)], current_time)
                     if model_id:
                         cursor.execute(f'UPDATE pop_materials SET name = {placeholder}, model_id = {placeholder} WHERE id = {placeholder}',
                                      (name, model_id, item_id))
@@ -677,7 +979,9 @@ def manage_data():
                         cursor.execute(f'UPDATE pop_materials SET name = {placeholder} WHERE id = {placeholder}',
                                      (name, item_id))
                     conn.commit()
-                    return jsonify({'success': True, 'message': 'POP material updated successfully'})
+                    if renames:
+                        start_propagation(get_db_connection)
+                    return jsonify({'success': True, 'message': 'POP material updated successfully', 'renames': renames})
                 
                 else:
                     return jsonify({'success': False, 'message': 'Invalid data type'}), 400
@@ -718,23 +1022,215 @@ def manage_data():
             else:
                 return jsonify({'success': False, 'message': 'Invalid action'}), 400
                 
+        except INTEGRITY_ERRORS as e:
+            # Unique indexes of migration 3, e.g. an edit to a name in use
+            conn.rollback()
+            print(f"Duplicate in manage_data: {e}")
+            return jsonify({'success': False, 'message': 'An item with this name already exists'}), 400
         except Exception as e:
             conn.rollback()
             print(f"Database error in manage_data: {e}")
             return jsonify({'success': False, 'message': f'Database error: {str(e)}'}), 500
         finally:
             conn.close()
+            # Cached taxonomy lists may be stale now
+            invalidate('taxonomy')
             
     except Exception as e:
         print(f"Error in manage_data: {e}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+def manage_data_batch(data):
+    """
+    Run the operations of one manage_data request in a single transaction
+    (see taxonomy_bulk.apply_operations); atomic=true applies all or none
+    """
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'message': 'operations must be a non-empty list'}), 400
+    if len(operations) > MAX_OPERATIONS:
+        return jsonify({'success': False, 'message': f'At most {MAX_OPERATIONS} operations per request'}), 400
+
+    conn, db_type = get_db_connection()
+    try:
+        results = apply_operations(conn.cursor(), db_type, operations, datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                   atomic=bool(data.get('atomic')))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Database error in manage_data batch: {e}")
+        return jsonify({'success': False, 'message': f'Database error: {str(e)}'}), 500
+    finally:
+        conn.close()
+        invalidate('taxonomy')
+
+    if any(result['success'] and operations[result['index']].get('action') == 'edit' for result in results):
+        start_propagation(get_db_connection)
+
+    applied = sum(1 for result in results if result['success'])
+    failed = len(results) - applied
+    return jsonify({
+        'success': failed == 0,
+        'message': f'{applied} of {len(results)} operations applied',
+        'applied': applied,
+        'failed': failed,
+        'results': results
+    }), 400 if failed and not applied else 200
+
+@app.route('/admin/renames')
+def rename_progress():
+    """
+    Progress of the jobs that carry taxonomy renames over to data_entries;
+    unfinished jobs (e.g. left over by a restart) are resumed
+    """
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    limit = min(max(request.args.get('limit', 20, type=int) or 20, 1), 200)
+    conn, db_type = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        unfinished = unfinished_jobs(cursor)
+        jobs = recent_jobs(cursor, db_type, limit)
+    finally:
+        conn.close()
+
+    if unfinished:
+        start_propagation(get_db_connection)
+    return jsonify({'success': True, 'unfinished': unfinished, 'jobs': jobs})
+
+@app.route('/clone_pop_materials', methods=['POST'])
+def clone_pop_materials_route():
+    """Copy the POP materials of source_model_id to every model of target_model_ids"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    data = request.get_json(silent=True) or {}
+    try:
+        source_model_id = int(data.get('source_model_id'))
+        target_model_ids = [int(model_id) for model_id in data.get('target_model_ids') or []]
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'source_model_id and target_model_ids must be model ids'}), 400
+    if len(target_model_ids) > MAX_CLONE_TARGETS:
+        return jsonify({'success': False, 'message': f'At most {MAX_CLONE_TARGETS} target models per request'}), 400
+
+    conn, db_type = get_db_connection()
+    try:
+        result = clone_pop_materials(conn.cursor(), db_type, source_model_id, target_model_ids,
+                                     datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        conn.commit()
+    except OperationError as e:
+        conn.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        conn.rollback()
+        print(f"Error in clone_pop_materials: {e}")
+        return jsonify({'success': False, 'message': f'Database error: {str(e)}'}), 500
+    finally:
+        conn.close()
+        invalidate('taxonomy')
+
+    return jsonify({
+        'success': True,
+        'message': f"Copied {result['added']} POP materials to {len(set(target_model_ids) - {source_model_id})} models",
+        **result
+    })
+
+@app.route('/import_taxonomy', methods=['POST'])
+def import_taxonomy():
+    """
+    Add the categories, models, display types and POP materials of an
+    uploaded .xlsx / .csv file (see taxonomy_bulk.py); with dry_run=1 only
+    report what would be added
+    """
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'success': False, 'message': 'No file uploaded'}), 400
+    dry_run = request.form.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+    try:
+        wanted = parse_taxonomy(read_rows(upload))
+    except TaxonomyImportError as e:
+        IMPORTS.inc(outcome='invalid')
+        return jsonify({'success': False, 'message': str(e), 'errors': e.errors}), 400
+
+    conn, db_type = get_db_connection()
+    applied = False
+    try:
+        cursor = conn.cursor()
+        changes = diff_taxonomy(wanted, load_taxonomy(cursor))
+        result = {'success': True, 'dry_run': dry_run, 'changes': summarize(changes)}
+        new_items = sum(len(change['new']) for change in changes.values())
+
+        if dry_run:
+            result['message'] = f'{new_items} new items to import'
+            IMPORTS.inc(outcome='dry_run')
+            return jsonify(result)
+
+        added = apply_changes(cursor, db_type, changes, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        conn.commit()
+        applied = True
+        IMPORTS.inc(outcome='applied')
+        result['added'] = added
+        result['message'] = f'Imported {sum(added.values())} new items'
+        return jsonify(result)
+    except Exception as e:
+        conn.rollback()
+        IMPORTS.inc(outcome='error')
+        print(f"Error in import_taxonomy: {e}")
+        return jsonify({'success': False, 'message': f'Database error: {str(e)}'}), 500
+    finally:
+        conn.close()
+        if applied:
+            invalidate('taxonomy')
+
+@app.route('/export_taxonomy')
+def export_taxonomy():
+    """The whole taxonomy as .xlsx (default) or ?format=csv, in the import layout"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return redirect(url_for('index'))
+
+    export_format = request.args.get('format', 'xlsx')
+    if export_format not in ('xlsx', 'csv'):
+        return jsonify({'success': False, 'message': 'Invalid format'}), 400
+
+    started = time.perf_counter()
+    rows = []
+    try:
+        conn, db_type = get_db_connection()
+        try:
+            rows = export_rows(conn.cursor())
+        finally:
+            conn.close()
+
+        if export_format == 'csv':
+            output, mimetype = write_csv(rows), 'text/csv'
+        else:
+            output, mimetype = write_xlsx(rows), 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        record_export('taxonomy', started, len(rows), True)
+
+        return send_file(
+            output,
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=f'taxonomy_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+        )
+    except Exception as e:
+        record_export('taxonomy', started, len(rows), False)
+        flash(f'Export error: {str(e)}')
+        return redirect(url_for('admin_management'))
+
 @app.route('/export_excel')
 def export_excel():
     """Export data to Excel with images"""
     if 'user_id' not in session or not session.get('is_admin'):
         return redirect(url_for('index'))
     
+    started = time.perf_counter()
+    data = []
     try:
         # Simple Excel export for now
         conn, db_type = get_db_connection()
@@ -758,6 +1254,7 @@ def export_excel():
             df.to_excel(writer, sheet_name='Data Entries', index=False)
         
         output.seek(0)
+        record_export('data_entries', started, len(data), True)
         
         return send_file(
             output,
@@ -766,6 +1263,7 @@ def export_excel():
             download_name=f'data_entries_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         )
     except Exception as e:
+        record_export('data_entries', started, len(data), False)
         flash(f'Export error: {str(e)}')
         return redirect(url_for('admin_dashboard'))
 
@@ -801,36 +1299,83 @@ def download_image(filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
-# Initialize production database after all functions are defined
-if IS_PRODUCTION:
-    try:
-        print("🔧 Initializing production database...")
-        conn, db_type = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Create tables if they don't exist
-        if db_type == 'postgresql':
-            cursor.execute('''CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                username VARCHAR(80) UNIQUE NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                employee_name VARCHAR(100) NOT NULL,
-                employee_code VARCHAR(50) UNIQUE NOT NULL,
-                is_admin BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
-            
-            cursor.execute('''CREATE TABLE IF NOT EXISTS categories (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(100) UNIQUE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
-        
-        conn.commit()
-        conn.close()
-        print("✅ Production database initialized")
-    except Exception as e:
-        print(f"⚠️ Database initialization warning: {e}")
+@app.route('/admin/request_stats')
+def request_stats():
+    """Per-endpoint latency, DB time and query count histograms of this worker"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    return jsonify({'success': True, 'pid': os.getpid(), 'data': get_endpoint_stats()})
+
+@app.route('/admin/cache', methods=['GET', 'POST'])
+def admin_cache():
+    """Cache hit/miss counts of this worker; POST drops every cached value (of all workers)"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    if request.method == 'POST':
+        invalidate_all()
+        return jsonify({'success': True, 'message': 'Cache cleared', 'data': cache_stats()})
+
+    return jsonify({'success': True, 'pid': os.getpid(), 'data': cache_stats()})
+
+@app.route('/admin/profiles')
+@app.route('/admin/profiles/<profile_id>')
+def admin_profiles(profile_id=None):
+    """Recent request profiles of all workers, or one of them"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return redirect(url_for('index'))
+
+    profile = None
+    if profile_id:
+        profile = get_profile(profile_id)
+        if profile is None:
+            flash('Profile not found - it may have been dropped for newer ones')
+            return redirect(url_for('admin_profiles'))
+
+    return render_template('admin_profiles.html', profiles=list_profiles(), profile=profile)
+
+@app.route('/admin/profiles/<profile_id>/download')
+def download_profile(profile_id):
+    """Raw profile: a .pstats file (cProfile) or collapsed stacks (sampling)"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+
+    profile = get_profile(profile_id)
+    if profile is None:
+        return jsonify({'success': False, 'message': 'Profile not found'}), 404
+
+    from io import BytesIO
+
+    if profile['mode'] == 'sample':
+        download_name, mimetype = f'profile_{profile_id}.collapsed.txt', 'text/plain'
+    else:
+        download_name, mimetype = f'profile_{profile_id}.pstats', 'application/octet-stream'
+    return send_file(BytesIO(profile['data']), mimetype=mimetype, as_attachment=True, download_name=download_name)
+
+@app.route('/admin/profiles/clear', methods=['POST'])
+def clear_profiles():
+    if 'user_id' not in session or not session.get('is_admin'):
+        return redirect(url_for('index'))
+
+    clear_profile_store()
+    flash('Profiles cleared')
+    return redirect(url_for('admin_profiles'))
+
+@app.route('/metrics')
+def metrics():
+    """
+    Prometheus text-format metrics of all gunicorn workers (see
+    metrics.py), for a scraper sending METRICS_TOKEN or a logged in admin;
+    hidden from everyone else
+    """
+    if not session.get('is_admin'):
+        if not METRICS_TOKEN:
+            return Response('Not Found\n', status=404, mimetype='text/plain')
+        if request.headers.get('Authorization') != f'Bearer {METRICS_TOKEN}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
 
 if __name__ == '__main__':
     init_db()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Keyed application cache with pluggable backends
+
+    from app_cache import cached, invalidate
+
+    data = cached('taxonomy', ('models', category), lambda: load_models(category))
+    ...
+    invalidate('taxonomy')        # after the admin changed categories/models
+
+Values are grouped in namespaces (NAMESPACE_TTLS). Every namespace carries
+a version number that is part of the stored key; invalidate() bumps the
+version, so all entries of the namespace become unreachable at once without
+scanning keys, and expire on their own.
+
+Backends (CACHE_BACKEND):
+
+    local   in-process LRU with per-entry TTL (default). Each gunicorn
+            worker has its own copy of the values; the namespace versions
+            are shared through the database (see below), so invalidate()
+            reaches every worker at once.
+    redis   shared between workers and instances, needs REDIS_URL and the
+            redis package. Falls back to local when either is missing.
+            Any client with get/set/incr (e.g. fakeredis, or a dict-backed
+            stand-in in tests) can be passed to RedisBackend directly.
+    none    caching disabled, every lookup calls the loader.
+
+Namespace versions of the local backend: a per-process version would only
+drop the values of the worker that ran the change, and the admin's next
+request could land on another worker and get data up to the TTL old. After
+use_shared_versions(connect) (app.py does this unless CACHE_SHARED_VERSIONS
+=0) the versions are rows of the sync_versions table ('cache:<namespace>'),
+bumped by invalidate(). Each worker keeps the versions it read and reads
+them all again with one query at most every CACHE_VERSION_REFRESH seconds,
+so a cache hit costs no database work and another worker's invalidation
+takes effect within that interval (the invalidating worker's own at once).
+The redis backend keeps its versions in redis already.
+
+Values must be JSON-serializable (lists, dicts, strings, numbers) so the
+backends are interchangeable. A failing backend never fails the request:
+the lookup counts as a miss and the loader's result is returned.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+from metrics import counter
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'local').lower()
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '2048'))
+CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', '300'))
+CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', 'rmcache')
+CACHE_SHARED_VERSIONS = os.getenv('CACHE_SHARED_VERSIONS', '1').lower() not in ('0', 'false', 'no')
+CACHE_VERSION_REFRESH = float(os.getenv('CACHE_VERSION_REFRESH', '2'))
+
+# TTL in seconds per namespace; unknown namespaces use CACHE_DEFAULT_TTL
+NAMESPACE_TTLS = {
+    'taxonomy': 600,        # categories, models, display types, POP materials
+    'branches': 600,        # branch list and lookups
+    'user_branches': 300,   # user -> branch assignments
+}
+
+CACHE_REQUESTS = counter('app_cache_requests_total', 'Cache lookups by namespace and result',
+                         ('namespace', 'result'))
+CACHE_INVALIDATIONS = counter('app_cache_invalidations_total', 'Namespace invalidations', ('namespace',))
+CACHE_ERRORS = counter('app_cache_backend_errors_total', 'Failed cache backend calls', ('backend',))
+
+_MISSING = object()
+
+class LocalBackend:
+    """Thread-safe LRU dict with a TTL per entry"""
+
+    name = 'local'
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Namespace versions live outside the LRU: evicting one would
+        # resurrect entries of an older version
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisBackend:
+    """Shared backend on a redis-py compatible client, values stored as JSON"""
+
+    name = 'redis'
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        raw = self.client.get(key)
+        if raw is None:
+            return _MISSING
+        return json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(key, json.dumps(value, default=str), ex=ttl or None)
+
+    def incr(self, key):
+        return self.client.incr(key)
+
+    def clear(self):
+        # Only the namespace versions are bumped by invalidate(); entries expire on their own
+        pass
+
+class NullBackend:
+    """No caching at all"""
+
+    name = 'none'
+
+    def get(self, key):
+        return _MISSING
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def incr(self, key):
+        return 0
+
+    def clear(self):
+        pass
+
+class DatabaseVersions:
+    """
+    Namespace versions in the sync_versions table, shared by all workers;
+    read back at most every `refresh` seconds
+    """
+
+    def __init__(self, connect, refresh=CACHE_VERSION_REFRESH):
+        # connect() returns (conn, db_type)
+        self.connect = connect
+        self.refresh = refresh
+        self._versions = {}
+        self._read_at = None
+        self._lock = threading.Lock()
+
+    def _name(self, namespace):
+        return f'cache:{namespace}'
+
+    def _read_all(self):
+        conn, _ = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, version FROM sync_versions WHERE name LIKE 'cache:%'")
+            rows = cursor.fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+        return {name[len('cache:'):]: int(version) for name, version in rows}
+
+    def get(self, namespace):
+        read_at = self._read_at
+        if read_at is None or time.monotonic() - read_at >= self.refresh:
+            with self._lock:
+                # Another thread may have read them while we waited
+                if self._read_at == read_at:
+                    versions = self._read_all()
+                    # Versions only grow: keep an invalidation of this
+                    # worker that committed after the read
+                    for name, version in self._versions.items():
+                        versions[name] = max(version, versions.get(name, 0))
+                    self._versions = versions
+                    self._read_at = time.monotonic()
+        return self._versions.get(namespace, 0)
+
+    def incr(self, namespace):
+        conn, db_type = self.connect()
+        try:
+            placeholder = '%s' if db_type == 'postgresql' else '?'
+            cursor = conn.cursor()
+            if db_type == 'postgresql':
+                cursor.execute(f'''INSERT INTO sync_versions (name, version) VALUES ({placeholder}, 1)
+                    ON CONFLICT (name) DO UPDATE SET version = sync_versions.version + 1 RETURNING version''',
+                               (self._name(namespace),))
+            else:
+                cursor.execute(f'INSERT OR IGNORE INTO sync_versions (name, version) VALUES ({placeholder}, 0)',
+                               (self._name(namespace),))
+                cursor.execute(f'UPDATE sync_versions SET version = version + 1 WHERE name = {placeholder}',
+                               (self._name(namespace),))
+                cursor.execute(f'SELECT version FROM sync_versions WHERE name = {placeholder}', (self._name(namespace),))
+            version = cursor.fetchone()[0]
+            conn.commit()
+        finally:
+            conn.close()
+        # This worker sees its own invalidation right away
+        with self._lock:
+            self._versions = {**self._versions, namespace: int(version)}
+        return version
+
+def _create_backend():
+    if CACHE_BACKEND == 'none':
+        return NullBackend()
+
+    if CACHE_BACKEND == 'redis':
+        redis_url = os.getenv('REDIS_URL')
+        if not redis_url:
+            print("⚠️ CACHE_BACKEND=redis but REDIS_URL is not set, using the in-process cache")
+            return LocalBackend()
+        try:
+            import redis
+        except ImportError:
+            print("⚠️ redis package not installed, using the in-process cache")
+            return LocalBackend()
+        return RedisBackend(redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5))
+
+    return LocalBackend()
+
+class AppCache:
+    """Namespaced get-or-load on top of a backend"""
+
+    def __init__(self, backend, prefix=CACHE_KEY_PREFIX, versions=None):
+        self.backend = backend
+        self.prefix = prefix
+        # Shared namespace versions (DatabaseVersions), else the backend's
+        self.versions = versions
+
+    def version(self, namespace):
+        """Current version of a namespace, bumped by every invalidate()"""
+        if self.versions is not None:
+            return self.versions.get(namespace)
+        version = self.backend.get(f'{self.prefix}:{namespace}:version')
+        return 0 if version is _MISSING else int(version)
+
+    def _key(self, namespace, key):
+        if not isinstance(key, str):
+            key = json.dumps(key, default=str, separators=(',', ':'))
+        return f'{self.prefix}:{namespace}:v{self.version(namespace)}:{key}'
+
+    def get_or_load(self, namespace, key, loader, ttl=None):
+        """
+        Return the cached value, or call loader() and cache its result
+
+        Args:
+            namespace: one of NAMESPACE_TTLS (others use CACHE_DEFAULT_TTL)
+            key: string, or a tuple/list of JSON-serializable parts
+            loader: zero-argument function computing the value
+            ttl: seconds, overrides the namespace TTL
+        """
+        backend_name = self.backend.name
+        try:
+            full_key = self._key(namespace, key)
+            value = self.backend.get(full_key)
+        except Exception as e:
+            print(f"⚠️ Cache get failed ({backend_name}): {e}")
+            CACHE_ERRORS.inc(backend=backend_name)
+            full_key, value = None, _MISSING
+
+        if value is not _MISSING:
+            CACHE_REQUESTS.inc(namespace=namespace, result='hit')
+            return value
+
+        CACHE_REQUESTS.inc(namespace=namespace, result='miss')
+        value = loader()
+
+        if full_key is not None:
+            try:
+                self.backend.set(full_key, value, ttl or NAMESPACE_TTLS.get(namespace, CACHE_DEFAULT_TTL))
+            except Exception as e:
+                print(f"⚠️ Cache set failed ({backend_name}): {e}")
+                CACHE_ERRORS.inc(backend=backend_name)
+        return value
+
+    def invalidate(self, *namespaces):
+        """Drop every entry of the given namespaces"""
+        for namespace in namespaces:
+            try:
+                if self.versions is not None:
+                    self.versions.incr(namespace)
+                else:
+                    self.backend.incr(f'{self.prefix}:{namespace}:version')
+            except Exception as e:
+                print(f"⚠️ Cache invalidation failed ({self.backend.name}): {e}")
+                CACHE_ERRORS.inc(backend=self.backend.name)
+            CACHE_INVALIDATIONS.inc(namespace=namespace)
+
+    def stats(self):
+        """Hit/miss counts of this worker per namespace"""
+        namespaces = {}
+        for labels, value in CACHE_REQUESTS.collect():
+            namespaces.setdefault(labels['namespace'], {'hit': 0, 'miss': 0})[labels['result']] = value
+        for counts in namespaces.values():
+            total = counts['hit'] + counts['miss']
+            counts['hit_ratio'] = round(counts['hit'] / total, 3) if total else None
+
+        result = {'backend': self.backend.name, 'shared_versions': self.versions is not None,
+                  'namespaces': namespaces}
+        if isinstance(self.backend, LocalBackend):
+            result['entries'] = len(self.backend)
+            result['max_entries'] = self.backend.max_entries
+        return result
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """The process-wide cache, created on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AppCache(_create_backend())
+    return _cache
+
+def set_backend(backend):
+    """Replace the backend (e.g. with a stand-in client in tests or scripts)"""
+    global _cache
+    with _cache_lock:
+        _cache = AppCache(backend)
+
+def use_shared_versions(connect):
+    """
+    Keep the namespace versions of the local backend in the database
+    (connect() returns (conn, db_type)), so invalidate() reaches every
+    worker; no-op for the other backends or with CACHE_SHARED_VERSIONS=0
+    """
+    cache = get_cache()
+    if CACHE_SHARED_VERSIONS and isinstance(cache.backend, LocalBackend):
+        cache.versions = DatabaseVersions(connect)
+
+def cached(namespace, key, loader, ttl=None):
+    return get_cache().get_or_load(namespace, key, loader, ttl)
+
+def invalidate(*namespaces):
+    get_cache().invalidate(*namespaces)
+
+def namespace_version(namespace):
+    """
+    Version of a namespace for state kept outside the cache (e.g. the branch
+    search index), or None when the backend is unreachable
+    """
+    cache = get_cache()
+    try:
+        return cache.version(namespace)
+    except Exception as e:
+        print(f"⚠️ Cache version lookup failed ({cache.backend.name}): {e}")
+        CACHE_ERRORS.inc(backend=cache.backend.name)
+        return None
+
+def invalidate_all():
+    invalidate(*NAMESPACE_TTLS)
+
+def cache_stats():
+    return get_cache().stats()
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the RM Team Checklist app
+
+Each module is a standalone script run from the repository root, e.g.
+
+    python -m benchmarks.import_time
+"""
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the benchmark scripts: percentiles, report metadata and
+running the app against a benchmark database
+"""
+
+import io
+import os
+import sys
+import json
+import re
+import math
+import platform
+import subprocess
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0-100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def summarize(values):
+    """min / median / p95 / p99 / max / mean of latencies, rounded"""
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'min': round(min(values), 3),
+        'median': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'p99': round(percentile(values, 99), 3),
+        'max': round(max(values), 3),
+        'mean': round(sum(values) / len(values), 3)
+    }
+
+def sample_jpeg(size=(1200, 900)):
+    """A JPEG like the shelf photos phones upload after client-side resizing"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (180, 40, 40)).save(buffer, format='JPEG', quality=80)
+    return buffer.getvalue()
+
+def git_revision():
+    """Current commit of the repository and whether the tree is dirty"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {'commit': commit, 'dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+def report_metadata(**extra):
+    """Metadata stored at the top of every JSON report"""
+    meta = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+    meta.update(git_revision())
+    meta.update(extra)
+    return meta
+
+def write_report(report, path):
+    """Write a JSON report to path ('-' for stdout)"""
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if path == '-':
+        print(text)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"📄 Report written to {path}")
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def import_app(workdir, database_url=None):
+    """
+    Import the Flask app so that it uses the benchmark database
+
+    app.py opens SQLite at ./database.db and reads DATABASE_URL at import
+    time, so the working directory and environment are set first.
+    """
+    if database_url:
+        os.environ['DATABASE_URL'] = database_url
+    else:
+        os.environ.pop('DATABASE_URL', None)
+
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    import app as app_module
+    return app_module
+
+def parse_server_timing(header):
+    """
+    Read the db duration and query count from the Server-Timing header
+
+    Returns:
+        dict: {'app_ms', 'db_ms', 'queries'} (missing values are None)
+    """
+    result = {'app_ms': None, 'db_ms': None, 'queries': None}
+    if not header:
+        return result
+
+    # Split on commas outside of quoted descriptions
+    for metric in re.findall(r'(?:[^,"]|"[^"]*")+', header):
+        parts = [part.strip() for part in metric.split(';')]
+        name = parts[0]
+        for part in parts[1:]:
+            if part.startswith('dur=') and name in ('app', 'db'):
+                result[f'{name}_ms'] = float(part[4:])
+            elif part.startswith('desc=') and name == 'db':
+                words = part[5:].strip('"').split()
+                if words and words[0].isdigit():
+                    result['queries'] = int(words[0])
+    return result
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Response compression benchmark
+
+Requests the heaviest pages and JSON endpoints once per encoding
+(identity, gzip, br) through the real routes and reports the bytes on the
+wire, the saving and the median latency per encoding, so the cost of
+compressing is visible next to what it saves:
+
+    python -m benchmarks.compression
+    python -m benchmarks.compression --entries 100000 --output compression.json
+
+Uses the dataset of benchmarks.suite (same --workdir and scale options).
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import statistics
+
+from benchmarks.common import report_metadata, write_report, import_app
+from benchmarks.datagen import ADMIN_CREDENTIALS
+from benchmarks.suite import prepare_database
+
+ENCODINGS = ('identity', 'gzip', 'br')
+DEFAULT_ITERATIONS = 10
+
+def build_cases(app_module):
+    """name, path, query string of the measured requests (all as admin)"""
+    conn, _ = app_module.get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT category, model FROM data_entries ORDER BY id DESC LIMIT 1')
+        category, model = cursor.fetchone()
+    finally:
+        conn.close()
+
+    return [
+        ('admin_dashboard', '/admin_dashboard', {}),
+        ('management_models', '/get_management_data/models', {}),
+        ('management_pop_materials', '/get_management_data/pop_materials', {}),
+        ('taxonomy_models', '/get_dynamic_data/models', {'category': category}),
+        ('taxonomy_pop_materials', '/get_dynamic_data/pop_materials', {'model': model}),
+        ('branch_sync_full', '/branches/sync', {}),
+        ('style_css', '/static/css/style.css', {}),
+    ]
+
+def measure(client, path, query, encoding, iterations):
+    sizes, timings = [], []
+    served = None
+    for index in range(iterations + 1):
+        started = time.perf_counter()
+        response = client.get(path, query_string=query, headers={'Accept-Encoding': encoding})
+        body = response.get_data()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if index == 0:
+            # Warmup (caches, first-request setup)
+            continue
+        sizes.append(len(body))
+        timings.append(elapsed_ms)
+        served = response.headers.get('Content-Encoding', 'identity')
+    return {
+        'bytes': int(statistics.median(sizes)),
+        'latency_ms_median': round(statistics.median(timings), 3),
+        'content_encoding': served
+    }
+
+def run(args):
+    scale = {'entries': args.entries, 'users': args.users, 'branches': args.branches, 'seed': args.seed}
+    workdir = os.path.abspath(args.workdir)
+    dataset = prepare_database(workdir, args.database_url, scale)
+
+    app_module = import_app(workdir, args.database_url)
+    app_module.app.config['TESTING'] = True
+    client = app_module.app.test_client()
+    client.post('/login', data=ADMIN_CREDENTIALS)
+
+    results = {}
+    print(f"{'case':26} {'identity':>10} {'gzip':>10} {'br':>10} {'saved':>7}  {'ms id/gz/br':>20}")
+    for name, path, query in build_cases(app_module):
+        result = {encoding: measure(client, path, query, encoding, args.iterations) for encoding in ENCODINGS}
+        original = result['identity']['bytes']
+        best = min(result[encoding]['bytes'] for encoding in ENCODINGS)
+        result['saved_pct'] = round(100 * (1 - best / original), 1) if original else 0.0
+        results[name] = result
+
+        latencies = '/'.join(f"{result[encoding]['latency_ms_median']:.1f}" for encoding in ENCODINGS)
+        print(f"{name:26} {original:>10,} {result['gzip']['bytes']:>10,} {result['br']['bytes']:>10,} "
+              f"{result['saved_pct']:>6}%  {latencies:>20}")
+
+    return {
+        'meta': report_metadata(suite='compression', dataset=dataset, iterations=args.iterations,
+                                db_type='postgresql' if args.database_url else 'sqlite'),
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure response compression savings per endpoint')
+    parser.add_argument('--entries', type=int, default=10000, help='data_entries rows (default: 10000)')
+    parser.add_argument('--users', type=int, default=50, help='field users (default: 50)')
+    parser.add_argument('--branches', type=int, default=500, help='branches (default: 500)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help=f'requests per case and encoding (default: {DEFAULT_ITERATIONS})')
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'rm_bench'),
+                        help='directory of the SQLite database and uploads')
+    parser.add_argument('--database-url', help='run against this PostgreSQL database instead of SQLite')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        write_report(report, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for benchmarks
+
+Fills a database with a realistic year of store visits: the taxonomy of
+populate_clean_data.py (categories, models, display types, POP materials),
+field users with their assigned branches, and data_entries with selected /
+missing materials and image URLs.
+
+    python -m benchmarks.datagen --database bench/database.db --entries 100000
+    python -m benchmarks.datagen --database postgresql://localhost/rm_bench --entries 5000000
+
+Generation is deterministic for a given --seed, streams rows in batches and
+works on SQLite and PostgreSQL. The schema is created with the migrations,
+so the database matches what `flask migrate` produces.
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from benchmarks.common import REPO_ROOT
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from migrations import run_migrations
+from populate_clean_data import MODELS_DATA, DISPLAY_TYPES_DATA, POP_MATERIALS_DATA
+
+DEFAULT_IMAGE_BASE_URL = 'https://res.cloudinary.com/benchmark/image/upload/v1'
+
+# Credentials of the generated accounts
+ADMIN_CREDENTIALS = {'name': 'admin', 'company_code': 'ADMIN001', 'password': 'admin123'}
+USER_PASSWORD = 'bench123'
+
+CITIES = [
+    'Cairo', 'Giza', 'Alexandria', 'Mansoura', 'Tanta', 'Zagazig', 'Ismailia', 'Suez',
+    'Port Said', 'Damietta', 'Asyut', 'Sohag', 'Minya', 'Beni Suef', 'Fayoum', 'Luxor',
+    'Aswan', 'Hurghada', 'Sharm El Sheikh', 'Banha'
+]
+STORE_CHAINS = [
+    'B.TECH', 'Raya Shop', '2B', 'Carrefour', 'Hyper One', 'Spinneys', 'Radio Shack',
+    'El Araby Showroom', 'Fresh Electric', 'Kheir Zaman'
+]
+DISTRICTS = [
+    'Downtown', 'Nasr City', 'Heliopolis', 'Maadi', 'Mall', 'Sporting', 'Smouha',
+    'El Haram', 'October', 'New Cairo', 'Sheikh Zayed', 'Corniche', 'El Gomhoria'
+]
+FIRST_NAMES = [
+    'Ahmed', 'Mohamed', 'Mahmoud', 'Omar', 'Youssef', 'Mostafa', 'Karim', 'Hassan',
+    'Ali', 'Khaled', 'Amr', 'Tarek', 'Sara', 'Mona', 'Nour', 'Yasmin', 'Aya', 'Salma',
+    'Mariam', 'Hana'
+]
+LAST_NAMES = [
+    'Hassan', 'Ibrahim', 'Abdelrahman', 'Saeed', 'Fathy', 'Mansour', 'Nabil', 'Kamal',
+    'Farouk', 'Salem', 'Gamal', 'Shawky', 'Adel', 'Samir'
+]
+
+def connect(database):
+    """
+    Open the benchmark database
+
+    Args:
+        database: SQLite file path or postgresql:// URL
+
+    Returns:
+        tuple: (connection, db_type)
+    """
+    if database.startswith(('postgres://', 'postgresql://')):
+        import psycopg2
+        return psycopg2.connect(database), 'postgresql'
+
+    directory = os.path.dirname(os.path.abspath(database))
+    os.makedirs(directory, exist_ok=True)
+    return sqlite3.connect(database), 'sqlite'
+
+def _insert_many(cursor, db_type, table, columns, rows, conflict_columns=None):
+    """Multi-row insert that skips rows violating a unique constraint"""
+    if not rows:
+        return
+
+    column_list = ', '.join(columns)
+    if db_type == 'postgresql':
+        from psycopg2.extras import execute_values
+        conflict = f' ON CONFLICT ({", ".join(conflict_columns)}) DO NOTHING' if conflict_columns else ''
+        execute_values(cursor, f'INSERT INTO {table} ({column_list}) VALUES %s{conflict}', rows, page_size=1000)
+    else:
+        verb = 'INSERT OR IGNORE' if conflict_columns else 'INSERT'
+        placeholders = ', '.join('?' for _ in columns)
+        cursor.executemany(f'{verb} INTO {table} ({column_list}) VALUES ({placeholders})', rows)
+
+def build_taxonomy():
+    """
+    The populate_clean_data taxonomy as nested dictionaries
+
+    Returns:
+        dict: category -> {'models': {model: [materials]}, 'display_types': [...]}
+    """
+    return {
+        category: {
+            'models': {model: POP_MATERIALS_DATA.get(model, []) for model in models},
+            'display_types': DISPLAY_TYPES_DATA.get(category, [])
+        }
+        for category, models in MODELS_DATA.items()
+    }
+
+def seed_taxonomy(cursor, db_type, created_at):
+    """
+    Insert the populate_clean_data taxonomy
+
+    Returns:
+        dict: the taxonomy, see build_taxonomy()
+    """
+    _insert_many(cursor, db_type, 'categories', ('name', 'created_at'),
+                 [(category, created_at) for category in MODELS_DATA], ('name',))
+    cursor.execute('SELECT name, id FROM categories')
+    category_ids = dict(cursor.fetchall())
+
+    _insert_many(cursor, db_type, 'models', ('name', 'category_id', 'created_at'),
+                 [(model, category_ids[category], created_at)
+                  for category, models in MODELS_DATA.items() for model in models],
+                 ('category_id', 'name'))
+    _insert_many(cursor, db_type, 'display_types', ('name', 'category_id', 'created_at'),
+                 [(display_type, category_ids[category], created_at)
+                  for category, display_types in DISPLAY_TYPES_DATA.items() for display_type in display_types],
+                 ('category_id', 'name'))
+
+    cursor.execute('SELECT c.name, m.name, m.id FROM models m JOIN categories c ON m.category_id = c.id')
+    model_ids = {(category, model): model_id for category, model, model_id in cursor.fetchall()}
+    _insert_many(cursor, db_type, 'pop_materials', ('name', 'model_id', 'created_at'),
+                 [(material, model_ids[(category, model)], created_at)
+                  for category, models in MODELS_DATA.items() for model in models
+                  for material in POP_MATERIALS_DATA.get(model, [])],
+                 ('model_id', 'name'))
+
+    return build_taxonomy()
+
+def seed_users(cursor, db_type, count, rng):
+    """
+    Insert the admin account and `count` field users
+
+    Returns:
+        list: (user_id, employee_name, employee_code) of the field users
+    """
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    # Hashing is slow on purpose: hash once and share it between the users
+    user_hash = generate_password_hash(USER_PASSWORD)
+
+    rows = [(ADMIN_CREDENTIALS['name'], generate_password_hash(ADMIN_CREDENTIALS['password']),
+             'System Administrator', ADMIN_CREDENTIALS['company_code'], True)]
+    for index in range(1, count + 1):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        rows.append((f'bench_user_{index:04d}', user_hash, name, f'EMP{index:05d}', False))
+
+    _insert_many(cursor, db_type, 'users',
+                 ('username', 'password_hash', 'employee_name', 'employee_code', 'is_admin'),
+                 rows, ('username',))
+
+    cursor.execute(f"SELECT id, employee_name, employee_code FROM users WHERE username LIKE {placeholder} ORDER BY id",
+                   ('bench_user_%',))
+    return cursor.fetchall()[:count]
+
+def seed_branches(cursor, db_type, count, rng, created_at):
+    """
+    Insert `count` branches
+
+    Returns:
+        list: (branch_name, shop_code)
+    """
+    branches = []
+    for index in range(1, count + 1):
+        name = f"{rng.choice(STORE_CHAINS)} {rng.choice(CITIES)} - {rng.choice(DISTRICTS)} {index}"
+        branches.append((name, f'BR{index:05d}'))
+
+    _insert_many(cursor, db_type, 'branches', ('name', 'code', 'created_at'),
+                 [(name, code, created_at) for name, code in branches], ('code',))
+    return branches
+
+def seed_user_branches(cursor, db_type, users, branches, rng, per_user=(5, 20)):
+    """
+    Assign every user a set of branches
+
+    Returns:
+        dict: user_id -> list of (branch_name, shop_code)
+    """
+    assignments = {}
+    rows = []
+    for user_id, _, _ in users:
+        assigned = rng.sample(branches, min(len(branches), rng.randint(*per_user)))
+        assignments[user_id] = assigned
+        rows.extend((user_id, name) for name, _ in assigned)
+
+    _insert_many(cursor, db_type, 'user_branches', ('user_id', 'branch_name'), rows, ('user_id', 'branch_name'))
+    return assignments
+
+def iter_entries(count, users, assignments, taxonomy, rng, days=365, max_images=3,
+                 image_base_url=DEFAULT_IMAGE_BASE_URL, end=None):
+    """
+    Yield data_entries rows in chronological order
+
+    Every entry is one model checked at one branch: the employee ticks a
+    random share of the model's POP materials, the rest are missing.
+    """
+    end = end or datetime.now()
+    start = end - timedelta(days=days)
+    step = (end - start) / max(count, 1)
+    categories = list(taxonomy)
+    # A few busy employees do most of the visits
+    weights = [1 / (rank + 1) ** 0.5 for rank in range(len(users))]
+
+    for index in range(count):
+        created_at = start + step * index + timedelta(seconds=rng.randint(0, 59))
+        user_id, employee_name, employee_code = rng.choices(users, weights=weights)[0]
+        branch_name, shop_code = rng.choice(assignments[user_id])
+
+        category = rng.choice(categories)
+        model = rng.choice(list(taxonomy[category]['models']))
+        display_type = rng.choice(taxonomy[category]['display_types'])
+
+        materials = taxonomy[category]['models'][model]
+        selected = [material for material in materials if rng.random() < 0.7]
+        missing = [material for material in materials if material not in selected]
+
+        image_count = rng.randint(0, max_images)
+        image_urls = ','.join(
+            f"{image_base_url}/employee_data_images/{created_at:%Y%m%d_%H%M%S}_{index}_{image}.jpg"
+            for image in range(image_count)
+        )
+
+        yield (
+            user_id, employee_name, employee_code, branch_name, shop_code,
+            category, model, display_type, ','.join(selected), ','.join(missing),
+            image_urls, created_at.strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+ENTRY_COLUMNS = (
+    'user_id', 'employee_name', 'employee_code', 'branch_name', 'shop_code',
+    'category', 'model', 'display_type', 'selected_materials', 'missing_materials',
+    'image_urls', 'created_at'
+)
+
+def generate_dataset(conn, db_type, entries=10000, users=50, branches=500, days=365, max_images=3,
+                     image_base_url=DEFAULT_IMAGE_BASE_URL, seed=42, batch_size=5000, verbose=True):
+    """
+    Create the schema and fill it with synthetic data
+
+    Returns:
+        dict: parameters and row counts of the generated dataset
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    run_migrations(conn, db_type)
+    cursor = conn.cursor()
+    if db_type == 'sqlite':
+        # Bulk load only: durability is not needed for a throwaway database
+        cursor.execute('PRAGMA synchronous = OFF')
+
+    created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    taxonomy = seed_taxonomy(cursor, db_type, created_at)
+    user_rows = seed_users(cursor, db_type, users, rng)
+    branch_rows = seed_branches(cursor, db_type, branches, rng, created_at)
+    assignments = seed_user_branches(cursor, db_type, user_rows, branch_rows, rng)
+    conn.commit()
+
+    batch = []
+    written = 0
+    for row in iter_entries(entries, user_rows, assignments, taxonomy, rng, days, max_images, image_base_url):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _insert_many(cursor, db_type, 'data_entries', ENTRY_COLUMNS, batch)
+            conn.commit()
+            written += len(batch)
+            batch = []
+            if verbose:
+                print(f"   ... {written:,}/{entries:,} entries", end='\r')
+
+    _insert_many(cursor, db_type, 'data_entries', ENTRY_COLUMNS, batch)
+    written += len(batch)
+    conn.commit()
+
+    # Fresh planner statistics, as a long-running database would have
+    cursor.execute('ANALYZE')
+    conn.commit()
+
+    elapsed = time.perf_counter() - started
+    if verbose:
+        if written > batch_size:
+            print()
+        print(f"✅ Generated {written:,} entries, {len(user_rows)} users, {len(branch_rows)} branches "
+              f"in {elapsed:.1f}s")
+
+    return {
+        'entries': written,
+        'users': len(user_rows),
+        'branches': len(branch_rows),
+        'days': days,
+        'max_images': max_images,
+        'image_base_url': image_base_url,
+        'seed': seed,
+        'generation_seconds': round(elapsed, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic benchmark database')
+    parser.add_argument('--database', default=os.path.join('bench', 'database.db'),
+                        help='SQLite file or postgresql:// URL (default: bench/database.db)')
+    parser.add_argument('--entries', type=int, default=10000, help='data_entries rows (default: 10000)')
+    parser.add_argument('--users', type=int, default=50, help='field users (default: 50)')
+    parser.add_argument('--branches', type=int, default=500, help='branches (default: 500)')
+    parser.add_argument('--days', type=int, default=365, help='days of history (default: 365)')
+    parser.add_argument('--max-images', type=int, default=3, help='maximum images per entry (default: 3)')
+    parser.add_argument('--image-base-url', default=DEFAULT_IMAGE_BASE_URL, help='base URL of the image links')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--batch-size', type=int, default=5000, help='rows per insert batch (default: 5000)')
+    args = parser.parse_args()
+
+    conn, db_type = connect(args.database)
+    try:
+        generate_dataset(conn, db_type, entries=args.entries, users=args.users, branches=args.branches,
+                         days=args.days, max_images=args.max_images, image_base_url=args.image_base_url,
+                         seed=args.seed, batch_size=args.batch_size)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
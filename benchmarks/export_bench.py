@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Excel export benchmark and regression gate
+
+Runs each export path over synthetic datasets of increasing size and
+reports rows/second, peak RSS and output size:
+
+    export_excel   the /export_excel route (query + DataFrame round-trip)
+    simple         create_simple_excel_with_formatting (pandas + styling)
+    enhanced       create_enhanced_excel_with_images (per-cell styling and
+                   embedded images, downloaded from a local image server
+                   that stands in for Cloudinary)
+
+    python -m benchmarks.export_bench
+    python -m benchmarks.export_bench --sizes 1000,10000,50000 --enhanced-sizes 100,500
+    python -m benchmarks.export_bench --output head.json --baseline base.json
+
+Every measurement runs in a fresh interpreter so peak RSS belongs to that
+export alone. The run fails (exit code 1) when a path is slower than its
+rows/second floor or above its memory ceiling (see DEFAULT_THRESHOLDS,
+override with --thresholds file.json), or - with --baseline - when it got
+more than --tolerance slower or bigger than the baseline report at the
+same size. The floor only applies from min_rows_for_rate rows on: below
+that, fixed costs (imports, workbook setup) dominate the rate.
+Run it from the repository root.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.common import REPO_ROOT, report_metadata, write_report, load_report, import_app, sample_jpeg
+
+PATHS = ('export_excel', 'simple', 'enhanced')
+
+# Floors and ceilings per export path; the memory ceiling is checked at
+# every size, the rows/second floor from min_rows_for_rate rows on
+DEFAULT_THRESHOLDS = {
+    'export_excel': {'min_rows_per_second': 500, 'min_rows_for_rate': 1000, 'max_peak_rss_mb': 1536},
+    'simple': {'min_rows_per_second': 500, 'min_rows_for_rate': 1000, 'max_peak_rss_mb': 1536},
+    'enhanced': {'min_rows_per_second': 5, 'min_rows_for_rate': 50, 'max_peak_rss_mb': 1536}
+}
+
+class ImageServer:
+    """
+    Local stand-in for the Cloudinary CDN
+
+    Answers every GET with the same JPEG after an optional delay, and with
+    404 for a share of the requests to exercise the failure path.
+    """
+
+    def __init__(self, latency_ms=0, failure_rate=0.0, seed=42):
+        image = sample_jpeg((1600, 1200))
+        rng = random.Random(seed)
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if latency_ms:
+                    time.sleep(latency_ms / 1000)
+                with lock:
+                    failed = rng.random() < failure_rate
+                if failed:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/jpeg')
+                self.send_header('Content-Length', str(len(image)))
+                self.end_headers()
+                self.wfile.write(image)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def synthetic_rows(size, image_base_url, max_images, seed):
+    """Rows in the column order the export functions expect"""
+    from benchmarks.datagen import build_taxonomy, iter_entries
+
+    rng = random.Random(seed)
+    users = [(index, f'Employee {index}', f'EMP{index:05d}') for index in range(1, 51)]
+    assignments = {user_id: [(f'Branch {user_id}-{number}', f'BR{user_id:03d}{number}') for number in range(10)]
+                   for user_id, _, _ in users}
+
+    rows = []
+    for index, entry in enumerate(iter_entries(size, users, assignments, build_taxonomy(), rng,
+                                               max_images=max_images, image_base_url=image_base_url), 1):
+        (_, employee_name, employee_code, branch_name, shop_code, _, model, display_type,
+         selected, missing, image_urls, created_at) = entry
+        rows.append((index, employee_name, employee_code, branch_name, shop_code, model, display_type,
+                     selected, missing, image_urls, created_at))
+    return rows
+
+def measure(path, size, workdir, image_base_url, max_images, seed):
+    """
+    Run one export in this process
+
+    Returns:
+        dict: seconds, rows_per_second, output_bytes, peak_rss_mb
+    """
+    if path == 'export_excel':
+        from benchmarks.datagen import ADMIN_CREDENTIALS
+        from benchmarks.suite import prepare_database
+
+        database_dir = os.path.join(workdir, f'export_{size}')
+        prepare_database(database_dir, None, {'entries': size, 'users': 50, 'branches': 500, 'seed': seed})
+        app_module = import_app(database_dir)
+        client = app_module.app.test_client()
+        client.post('/login', data=ADMIN_CREDENTIALS)
+
+        started = time.perf_counter()
+        response = client.get('/export_excel')
+        output_bytes = len(response.get_data())
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f"/export_excel answered {response.status_code}")
+    else:
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+        from excel_export_enhanced import create_simple_excel_with_formatting, create_enhanced_excel_with_images
+
+        export = create_simple_excel_with_formatting if path == 'simple' else create_enhanced_excel_with_images
+        rows = synthetic_rows(size, image_base_url, max_images, seed)
+        filename = f'export_bench_{path}_{size}_{os.getpid()}.xlsx'
+
+        started = time.perf_counter()
+        output_path = export(rows, filename)
+        elapsed = time.perf_counter() - started
+        if not output_path:
+            raise RuntimeError(f"{path} export failed")
+        output_bytes = os.path.getsize(output_path)
+        os.remove(output_path)
+
+    return {
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(size / elapsed, 1) if elapsed else None,
+        'output_bytes': output_bytes,
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+def measure_in_subprocess(path, size, workdir, image_base_url, max_images, seed):
+    command = [
+        sys.executable, '-m', 'benchmarks.export_bench', '--single', path, str(size),
+        '--workdir', workdir, '--image-base-url', image_base_url,
+        '--max-images', str(max_images), '--seed', str(seed)
+    ]
+    env = dict(os.environ)
+    env.pop('DATABASE_URL', None)
+    for name in ('CLOUDINARY_CLOUD_NAME', 'CLOUDINARY_API_KEY', 'CLOUDINARY_API_SECRET'):
+        # Exports must not be uploaded during the benchmark
+        env.pop(name, None)
+
+    result = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': (result.stderr or result.stdout).strip().splitlines()[-1:]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def check_thresholds(results, thresholds, baseline=None, tolerance=0.25):
+    """
+    Returns:
+        list: human readable threshold violations
+    """
+    failures = []
+    for path, sizes in results.items():
+        limits = thresholds.get(path, {})
+        for size, measurement in sizes.items():
+            label = f"{path} @ {size} rows"
+            if 'error' in measurement:
+                failures.append(f"{label}: failed ({measurement['error']})")
+                continue
+
+            rate = measurement.get('rows_per_second')
+            rss = measurement.get('peak_rss_mb')
+            rate_checked = int(size) >= limits.get('min_rows_for_rate', 0)
+            if rate is not None and rate_checked and rate < limits.get('min_rows_per_second', 0):
+                failures.append(f"{label}: {rate} rows/s below floor {limits['min_rows_per_second']}")
+            if rss is not None and 'max_peak_rss_mb' in limits and rss > limits['max_peak_rss_mb']:
+                failures.append(f"{label}: peak RSS {rss}MB above ceiling {limits['max_peak_rss_mb']}MB")
+
+            previous = (baseline or {}).get(path, {}).get(size)
+            if not previous or 'error' in previous:
+                continue
+            if rate and previous.get('rows_per_second') and rate < previous['rows_per_second'] * (1 - tolerance):
+                failures.append(f"{label}: {rate} rows/s vs {previous['rows_per_second']} in baseline")
+            if rss and previous.get('peak_rss_mb') and rss > previous['peak_rss_mb'] * (1 + tolerance):
+                failures.append(f"{label}: peak RSS {rss}MB vs {previous['peak_rss_mb']}MB in baseline")
+            if previous.get('output_bytes') and measurement['output_bytes'] > previous['output_bytes'] * (1 + tolerance):
+                failures.append(f"{label}: output {measurement['output_bytes']} bytes vs "
+                                f"{previous['output_bytes']} in baseline")
+    return failures
+
+def _sizes(text):
+    return [int(size) for size in text.split(',') if size.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Excel export paths')
+    parser.add_argument('--sizes', type=_sizes, default=_sizes('1000,5000,20000'),
+                        help='row counts for export_excel and simple (default: 1000,5000,20000)')
+    parser.add_argument('--enhanced-sizes', type=_sizes, default=_sizes('50,200'),
+                        help='row counts for the enhanced export with images (default: 50,200)')
+    parser.add_argument('--paths', nargs='*', choices=PATHS, default=list(PATHS), help='export paths to run')
+    parser.add_argument('--max-images', type=int, default=3, help='maximum images per entry (default: 3)')
+    parser.add_argument('--image-latency-ms', type=float, default=20,
+                        help='delay of the local image server per image (default: 20)')
+    parser.add_argument('--image-failure-rate', type=float, default=0.02,
+                        help='share of image requests answered with 404 (default: 0.02)')
+    parser.add_argument('--thresholds', help='JSON file overriding DEFAULT_THRESHOLDS')
+    parser.add_argument('--baseline', help='earlier report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative regression against the baseline (default: 0.25)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'rm_bench'),
+                        help='directory of the benchmark databases')
+    parser.add_argument('--output', default='-', help="report file (default: '-' for stdout)")
+    parser.add_argument('--single', nargs=2, metavar=('PATH', 'SIZE'), help=argparse.SUPPRESS)
+    parser.add_argument('--image-base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    workdir = os.path.abspath(args.workdir)
+
+    if args.single:
+        # Child process: one measurement, JSON on the last line of stdout
+        path, size = args.single
+        print(json.dumps(measure(path, int(size), workdir, args.image_base_url, args.max_images, args.seed)))
+        return
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if args.thresholds:
+        with open(args.thresholds, encoding='utf-8') as f:
+            thresholds.update(json.load(f))
+
+    results = {}
+    with ImageServer(args.image_latency_ms, args.image_failure_rate, args.seed) as image_server:
+        for path in args.paths:
+            results[path] = {}
+            for size in (args.enhanced_sizes if path == 'enhanced' else args.sizes):
+                print(f"📊 {path} @ {size:,} rows...", end=' ', flush=True)
+                measurement = measure_in_subprocess(path, size, workdir, image_server.url, args.max_images, args.seed)
+                results[path][str(size)] = measurement
+                if 'error' in measurement:
+                    print(f"❌ {measurement['error']}")
+                else:
+                    print(f"{measurement['rows_per_second']} rows/s, {measurement['seconds']}s, "
+                          f"peak RSS {measurement['peak_rss_mb']}MB, {measurement['output_bytes']:,} bytes")
+
+    baseline = load_report(args.baseline)['results'] if args.baseline else None
+    failures = check_thresholds(results, thresholds, baseline, args.tolerance)
+
+    write_report({
+        'meta': report_metadata(
+            suite='export',
+            max_images=args.max_images,
+            image_latency_ms=args.image_latency_ms,
+            image_failure_rate=args.image_failure_rate,
+            seed=args.seed
+        ),
+        'thresholds': thresholds,
+        'results': results,
+        'failures': failures
+    }, args.output)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Export performance within thresholds")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark
+
+Imports the app in fresh interpreters under `python -X importtime` and
+fails (exit code 1) when
+
+- a heavy dependency that only the export/upload routes need is imported
+  at boot (pandas, openpyxl, PIL, cloudinary, requests), or
+- the median import time of the app exceeds the budget.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 250 --runs 7 --json
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay lazy: only needed by exports and uploads
+LAZY_MODULES = ('pandas', 'openpyxl', 'PIL', 'cloudinary', 'requests')
+
+DEFAULT_BUDGET_MS = 400
+
+def measure_import(module='app'):
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Returns:
+        dict: {'total_us': cumulative import time of the module,
+               'modules': {name: (self_us, cumulative_us)}}
+    """
+    env = dict(os.environ)
+    env.pop('DATABASE_URL', None)
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    modules = {}
+    total_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.rstrip()
+        indent = len(name) - len(name.lstrip())
+        name = name.strip()
+        modules[name] = (int(self_us), int(cumulative_us))
+
+        if name == module and indent == 1:
+            total_us = int(cumulative_us)
+
+    return {'total_us': total_us, 'modules': modules}
+
+def run_benchmark(runs=5, budget_ms=DEFAULT_BUDGET_MS, module='app'):
+    """
+    Measure the import several times and check it against the guards
+
+    Returns:
+        dict: report with timings, heaviest modules and failures
+    """
+    # The first run compiles byte code, keep it out of the measurement
+    measure_import(module)
+
+    samples = [measure_import(module) for _ in range(runs)]
+    totals_ms = [sample['total_us'] / 1000 for sample in samples]
+    last = samples[-1]['modules']
+
+    top_level_lazy = sorted({
+        name.split('.')[0] for name in last
+        if name.split('.')[0] in LAZY_MODULES
+    })
+
+    heaviest = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:10]
+
+    report = {
+        'module': module,
+        'runs': runs,
+        'median_ms': round(statistics.median(totals_ms), 1),
+        'min_ms': round(min(totals_ms), 1),
+        'max_ms': round(max(totals_ms), 1),
+        'budget_ms': budget_ms,
+        'eager_heavy_modules': top_level_lazy,
+        'heaviest_modules_self_ms': {name: round(times[0] / 1000, 1) for name, times in heaviest},
+        'failures': []
+    }
+
+    if top_level_lazy:
+        report['failures'].append(f"Heavy modules imported at boot: {', '.join(top_level_lazy)}")
+    if report['median_ms'] > budget_ms:
+        report['failures'].append(f"Median import time {report['median_ms']}ms exceeds budget {budget_ms}ms")
+
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Guard the cold-start import time of the app')
+    parser.add_argument('--runs', type=int, default=5, help='number of measured imports (default: 5)')
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.getenv('IMPORT_TIME_BUDGET_MS', DEFAULT_BUDGET_MS)),
+                        help=f'maximum median import time in ms (default: {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--module', default='app', help='module to import (default: app)')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    report = run_benchmark(runs=args.runs, budget_ms=args.budget_ms, module=args.module)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"⏱️ import {report['module']}: median {report['median_ms']}ms "
+              f"(min {report['min_ms']}ms, max {report['max_ms']}ms, budget {report['budget_ms']}ms)")
+        print("Heaviest modules (self time):")
+        for name, self_ms in report['heaviest_modules_self_ms'].items():
+            print(f"  {self_ms:8.1f}ms  {name}")
+
+        if report['failures']:
+            for failure in report['failures']:
+                print(f"❌ {failure}")
+        else:
+            print("✅ Cold start within budget")
+
+    sys.exit(1 if report['failures'] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+HTTP load test against a locally started app
+
+Starts the app under gunicorn (the production config) or the werkzeug
+server on a benchmark database, then drives the real routes with a ramp of
+concurrent virtual users and reports latency percentiles per stage:
+
+    python -m benchmarks.load_test --stages 1,5,10,25,50 --stage-seconds 20
+    python -m benchmarks.load_test --database-url postgresql://localhost/rm_bench --workers 4
+    python -m benchmarks.load_test --url http://localhost:8000 --mix field=1   # running instance
+
+Scenarios (mixed with --mix, weights are relative):
+    field   log in, walk the category -> model -> display type -> POP
+            material cascade, submit the form with a photo
+    admin   open the dashboard, page through the management lists and,
+            now and then, export to Excel
+
+The report tells for every stage the throughput, error rate and p50/p95/p99
+per request, and the highest concurrency whose overall p95 stayed within
+--p95-budget-ms. Run it from the repository root.
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+
+from benchmarks.common import REPO_ROOT, summarize, report_metadata, write_report, sample_jpeg
+from benchmarks.datagen import ADMIN_CREDENTIALS, USER_PASSWORD
+from benchmarks.suite import prepare_database
+
+DEFAULT_MIX = 'field=9,admin=1'
+
+class Recorder:
+    """Thread-safe collection of (request name, latency, status) samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+        self.unavailable = set()
+
+    def add(self, name, elapsed_ms, status):
+        with self._lock:
+            self.samples.append((name, elapsed_ms, status))
+
+    def drain(self):
+        with self._lock:
+            samples, self.samples = self.samples, []
+        return samples
+
+class VirtualUser:
+    """One simulated user with its own cookie session"""
+
+    def __init__(self, base_url, index, recorder, rng, image, users):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.index = index
+        self.recorder = recorder
+        self.rng = rng
+        self.image = image
+        self.users = users
+        self.session = requests.Session()
+        self.logged_in_as = None
+
+    def request(self, name, method, path, **kwargs):
+        if name in self.recorder.unavailable:
+            return None
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=60,
+                                             allow_redirects=False, **kwargs)
+            status = response.status_code
+        except Exception:
+            response, status = None, 0
+        self.recorder.add(name, (time.perf_counter() - started) * 1000, status)
+
+        if status == 404 and name == 'submit_data':
+            # Route not deployed in this tree: stop calling it
+            self.recorder.unavailable.add(name)
+        return response
+
+    def login(self, role):
+        if self.logged_in_as == role:
+            return
+        self.session.cookies.clear()
+        if role == 'admin':
+            data = ADMIN_CREDENTIALS
+        else:
+            number = self.index % self.users + 1
+            data = {'name': f'bench_user_{number:04d}', 'company_code': f'EMP{number:05d}', 'password': USER_PASSWORD}
+        self.request('login', 'POST', '/login', data=data)
+        self.logged_in_as = role
+
+    def _json_list(self, response):
+        try:
+            return response.json().get('data') or []
+        except Exception:
+            return []
+
+    def field_scenario(self):
+        self.login('user')
+        categories = self._json_list(self.request('categories', 'GET', '/get_dynamic_data/categories'))
+        if not categories:
+            return
+        category = self.rng.choice(categories)
+
+        models = self._json_list(self.request('models', 'GET', '/get_dynamic_data/models', params={'category': category}))
+        display_types = self._json_list(self.request('display_types', 'GET', '/get_dynamic_data/display_types',
+                                                     params={'category': category}))
+        if not models or not display_types:
+            return
+        model = self.rng.choice(models)
+        materials = self._json_list(self.request('pop_materials', 'GET', '/get_dynamic_data/pop_materials',
+                                                 params={'model': model}))
+
+        data = {
+            'branch_0': f'Load Test Branch {self.index}',
+            'shop_code_0': f'LT{self.index:05d}',
+            'category_0': category,
+            'model_0': model,
+            'display_type_0': self.rng.choice(display_types),
+            'pop_materials_0': [material for material in materials if self.rng.random() < 0.7]
+        }
+        files = [('images_0', ('shelf.jpg', io.BytesIO(self.image), 'image/jpeg'))]
+        self.request('submit_data', 'POST', '/submit_data', data=data, files=files)
+
+    def admin_scenario(self):
+        self.login('admin')
+        self.request('admin_dashboard', 'GET', '/admin_dashboard')
+        for data_type in ('categories', 'models', 'pop_materials'):
+            self.request(f'management_{data_type}', 'GET', f'/get_management_data/{data_type}')
+        if self.rng.random() < 0.05:
+            self.request('export_excel', 'GET', '/export_excel')
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('field', 'admin'):
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r} (field, admin)")
+        mix[name] = float(weight or 1)
+    return mix
+
+def run_stage(base_url, concurrency, seconds, mix, recorder, image, users, think_time, seed):
+    """Run `concurrency` virtual users for `seconds` and return the samples"""
+    stop = threading.Event()
+    scenarios = list(mix)
+    weights = [mix[name] for name in scenarios]
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        user = VirtualUser(base_url, index, recorder, rng, image, users)
+        while not stop.is_set():
+            scenario = rng.choices(scenarios, weights=weights)[0]
+            getattr(user, f'{scenario}_scenario')()
+            if think_time:
+                stop.wait(rng.uniform(0, think_time))
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=120)
+    elapsed = time.perf_counter() - started
+
+    return recorder.drain(), elapsed
+
+def stage_report(samples, elapsed):
+    by_name = {}
+    for name, latency, status in samples:
+        by_name.setdefault(name, []).append((latency, status))
+
+    requests_report = {}
+    for name, values in sorted(by_name.items()):
+        errors = sum(1 for _, status in values if status == 0 or status >= 500)
+        requests_report[name] = {
+            'count': len(values),
+            'rps': round(len(values) / elapsed, 2),
+            'errors': errors,
+            'latency_ms': summarize([latency for latency, _ in values])
+        }
+
+    latencies = [latency for _, latency, _ in samples]
+    errors = sum(1 for _, _, status in samples if status == 0 or status >= 500)
+    return {
+        'duration_seconds': round(elapsed, 2),
+        'requests': len(samples),
+        'rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+        'error_rate': round(errors / len(samples), 4) if samples else 0,
+        'latency_ms': summarize(latencies),
+        'per_request': requests_report
+    }
+
+def start_server(workdir, database_url, port, server, workers, threads):
+    """Start the app in a subprocess and wait until it answers"""
+    import requests
+
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'WEB_CONCURRENCY': str(workers),
+        'GUNICORN_THREADS': str(threads),
+        'PYTHONPATH': REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    })
+    if database_url:
+        env['DATABASE_URL'] = database_url
+    else:
+        env.pop('DATABASE_URL', None)
+
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(REPO_ROOT, 'gunicorn_config.py'),
+                   '--access-logfile', os.devnull, 'app:app']
+    else:
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--with-threads']
+
+    log = open(os.path.join(workdir, 'server.log'), 'w')
+    process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with {process.returncode}, see {log.name}")
+        try:
+            requests.get(base_url + '/', timeout=2)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.25)
+
+    process.terminate()
+    raise RuntimeError(f"Server did not start within 60s, see {log.name}")
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the app over HTTP')
+    parser.add_argument('--stages', default='1,5,10,25',
+                        help='comma separated concurrency levels (default: 1,5,10,25)')
+    parser.add_argument('--stage-seconds', type=float, default=15, help='duration of each stage (default: 15)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'scenario weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help='maximum random pause between scenarios in seconds (default: 0)')
+    parser.add_argument('--p95-budget-ms', type=float, default=500, help='p95 latency budget (default: 500)')
+    parser.add_argument('--url', help='load test this running instance instead of starting one')
+    parser.add_argument('--server', choices=('gunicorn', 'werkzeug'), default='gunicorn',
+                        help='server used to start the app (default: gunicorn)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (default: 2)')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker (default: 4)')
+    parser.add_argument('--port', type=int, default=8765, help='port of the started app (default: 8765)')
+    parser.add_argument('--entries', type=int, default=10000, help='data_entries in the database (default: 10000)')
+    parser.add_argument('--users', type=int, default=50, help='field users in the database (default: 50)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'rm_bench'),
+                        help='directory of the SQLite database, uploads and server log')
+    parser.add_argument('--database-url', help='run the app on this PostgreSQL database instead of SQLite')
+    parser.add_argument('--output', default='-', help="report file (default: '-' for stdout)")
+    args = parser.parse_args()
+
+    stages = [int(stage) for stage in args.stages.split(',') if stage.strip()]
+    workdir = os.path.abspath(args.workdir)
+
+    dataset = None
+    process = None
+    base_url = args.url
+    if not base_url:
+        dataset = prepare_database(workdir, args.database_url,
+                                   {'entries': args.entries, 'users': args.users, 'branches': 500, 'seed': args.seed})
+        process, base_url = start_server(workdir, args.database_url, args.port, args.server, args.workers, args.threads)
+        print(f"🚀 App running at {base_url} ({args.server})")
+
+    image = sample_jpeg()
+    recorder = Recorder()
+    report_stages = []
+    max_within_budget = None
+    budget_exceeded = False
+
+    try:
+        for concurrency in stages:
+            print(f"👥 {concurrency} concurrent users for {args.stage_seconds:g}s...", end=' ', flush=True)
+            samples, elapsed = run_stage(base_url, concurrency, args.stage_seconds, args.mix, recorder,
+                                         image, args.users, args.think_time, args.seed)
+            stage = stage_report(samples, elapsed)
+            stage['concurrency'] = concurrency
+            report_stages.append(stage)
+
+            p95 = stage['latency_ms'].get('p95')
+            print(f"{stage['rps']} req/s, p95 {p95}ms, errors {stage['error_rate']:.1%}")
+            within_budget = p95 is not None and p95 <= args.p95_budget_ms and stage['error_rate'] < 0.01
+            if within_budget and not budget_exceeded:
+                max_within_budget = concurrency
+            elif not within_budget:
+                budget_exceeded = True
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    if recorder.unavailable:
+        print(f"ℹ️ Not available in this tree, skipped: {', '.join(sorted(recorder.unavailable))}")
+    print(f"📈 Highest concurrency within p95 {args.p95_budget_ms:g}ms: {max_within_budget or 'none'}")
+
+    write_report({
+        'meta': report_metadata(
+            suite='load_test',
+            db_type='postgresql' if args.database_url else 'sqlite',
+            server=None if args.url else args.server,
+            workers=None if args.url else args.workers,
+            threads=None if args.url else args.threads,
+            mix=args.mix,
+            think_time=args.think_time,
+            dataset=dataset
+        ),
+        'p95_budget_ms': args.p95_budget_ms,
+        'max_concurrency_within_budget': max_within_budget,
+        'skipped_requests': sorted(recorder.unavailable),
+        'stages': report_stages
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
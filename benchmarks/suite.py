@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the key request paths
+
+Generates (or reuses) a synthetic database with benchmarks.datagen, drives
+the real Flask routes through the test client and writes a JSON report
+that can be compared across commits:
+
+    python -m benchmarks.suite run --entries 100000 --output before.json
+    git checkout my-branch
+    python -m benchmarks.suite run --entries 100000 --output after.json
+    python -m benchmarks.suite compare before.json after.json
+
+Timed paths: login, the taxonomy cascade and branch autocomplete of the data entry page, the admin
+dashboard and management lists, the Excel export and a form submission.
+Every case reports wall-time percentiles plus the median database time and
+query count read from the Server-Timing header.
+
+Run it from the repository root. Without --database-url the app runs on a
+SQLite file in --workdir; make sure DATABASE_URL and the Cloudinary keys
+are not set (or in .env), otherwise the app talks to those services.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+from benchmarks.common import (
+    summarize, report_metadata, write_report, load_report, import_app, parse_server_timing, sample_jpeg
+)
+from benchmarks.datagen import ADMIN_CREDENTIALS, USER_PASSWORD, connect, generate_dataset
+
+DEFAULT_ITERATIONS = 20
+
+def prepare_database(workdir, database_url, scale, fresh=False):
+    """
+    Generate the benchmark dataset unless an identical one already exists
+
+    Returns:
+        dict: dataset parameters and row counts
+    """
+    os.makedirs(workdir, exist_ok=True)
+    marker = os.path.join(workdir, 'dataset.json')
+    database = database_url or os.path.join(workdir, 'database.db')
+
+    if not fresh and os.path.exists(marker):
+        with open(marker, encoding='utf-8') as f:
+            existing = json.load(f)
+        if all(existing.get(key) == value for key, value in scale.items()):
+            print(f"♻️ Reusing dataset in {workdir} ({existing['entries']:,} entries)")
+            return existing
+
+    if not database_url and os.path.exists(database):
+        os.remove(database)
+
+    print(f"🏗️ Generating {scale['entries']:,} entries...")
+    conn, db_type = connect(database)
+    try:
+        dataset = generate_dataset(conn, db_type, **scale)
+    finally:
+        conn.close()
+
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(dataset, f, indent=2)
+    return dataset
+
+def build_cases(app_module, iterations):
+    """
+    The benchmarked requests
+
+    Each case: name, role (admin / user / anonymous), method, path, a
+    function building the request kwargs, and the number of iterations.
+    """
+    conn, db_type = app_module.get_db_connection()
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT username, employee_code FROM users WHERE username LIKE 'bench_user_%' ORDER BY id LIMIT 1")
+        user = cursor.fetchone()
+        cursor.execute('SELECT category, model, branch_name, shop_code FROM data_entries ORDER BY id DESC LIMIT 1')
+        category, model, branch_name, shop_code = cursor.fetchone()
+        cursor.execute(f'SELECT display_type FROM data_entries WHERE category = {placeholder} LIMIT 1', (category,))
+        display_type = cursor.fetchone()[0]
+        cursor.execute(f'SELECT pm.name FROM pop_materials pm JOIN models m ON pm.model_id = m.id WHERE m.name = {placeholder}',
+                       (model,))
+        materials = [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+    image = sample_jpeg()
+    slow = max(1, iterations // 10)
+
+    def submission():
+        return {
+            'data': {
+                'branch_0': branch_name,
+                'shop_code_0': shop_code,
+                'category_0': category,
+                'model_0': model,
+                'display_type_0': display_type,
+                'pop_materials_0': materials[: len(materials) // 2 + 1],
+                'images_0': [(io.BytesIO(image), 'shelf.jpg')]
+            },
+            'content_type': 'multipart/form-data'
+        }
+
+    return [
+        ('login', 'anonymous', 'POST', '/login',
+         lambda: {'data': {'name': user[0], 'company_code': user[1], 'password': USER_PASSWORD}}, iterations),
+        ('taxonomy_categories', 'user', 'GET', '/get_dynamic_data/categories', dict, iterations),
+        ('taxonomy_models', 'user', 'GET', '/get_dynamic_data/models',
+         lambda: {'query_string': {'category': category}}, iterations),
+        ('taxonomy_display_types', 'user', 'GET', '/get_dynamic_data/display_types',
+         lambda: {'query_string': {'category': category}}, iterations),
+        ('taxonomy_pop_materials', 'user', 'GET', '/get_dynamic_data/pop_materials',
+         lambda: {'query_string': {'model': model}}, iterations),
+        ('branch_search', 'user', 'GET', '/get_branches',
+         lambda: {'query_string': {'search': branch_name[:4]}}, iterations),
+        ('branch_by_code', 'user', 'GET', '/get_branch_by_code',
+         lambda: {'query_string': {'code': shop_code}}, iterations),
+        ('branch_sync_full', 'user', 'GET', '/branches/sync', dict, iterations),
+        ('admin_dashboard', 'admin', 'GET', '/admin_dashboard', dict, iterations),
+        ('management_models', 'admin', 'GET', '/get_management_data/models', dict, iterations),
+        ('management_pop_materials', 'admin', 'GET', '/get_management_data/pop_materials', dict, iterations),
+        ('management_pop_materials_page', 'admin', 'GET', '/get_management_data/pop_materials',
+         lambda: {'query_string': {'page': 1, 'page_size': 100}}, iterations),
+        ('management_pop_materials_search', 'admin', 'GET', '/get_management_data/pop_materials',
+         lambda: {'query_string': {'search': materials[0][:4], 'page': 1, 'page_size': 100}}, iterations),
+        ('export_excel', 'admin', 'GET', '/export_excel', dict, slow),
+        ('submit_data', 'user', 'POST', '/submit_data', submission, slow),
+    ]
+
+def run_case(app_module, clients, case, warmup=1):
+    """Time one case and summarize its latencies"""
+    name, role, method, path, build_kwargs, iterations = case
+    timings, db_times, query_counts, sizes = [], [], [], []
+    errors = 0
+
+    for index in range(warmup + iterations):
+        client = app_module.app.test_client() if role == 'anonymous' else clients[role]
+        started = time.perf_counter()
+        response = client.open(path, method=method, **build_kwargs())
+        body = response.get_data()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if response.status_code == 404 and index == 0:
+            return {'skipped': f'{method} {path} is not available (404)'}
+
+        if index < warmup:
+            continue
+
+        if response.status_code >= 400:
+            errors += 1
+        timings.append(elapsed_ms)
+        sizes.append(len(body))
+
+        server_timing = parse_server_timing(response.headers.get('Server-Timing'))
+        if server_timing['db_ms'] is not None:
+            db_times.append(server_timing['db_ms'])
+        if server_timing['queries'] is not None:
+            query_counts.append(server_timing['queries'])
+
+    result = {'latency_ms': summarize(timings), 'errors': errors}
+    if db_times:
+        result['db_ms_median'] = round(statistics.median(db_times), 3)
+    if query_counts:
+        result['queries_median'] = statistics.median(query_counts)
+    if sizes:
+        result['response_bytes_median'] = statistics.median(sizes)
+    return result
+
+def run_suite(args):
+    scale = {
+        'entries': args.entries,
+        'users': args.users,
+        'branches': args.branches,
+        'seed': args.seed
+    }
+    workdir = os.path.abspath(args.workdir)
+    dataset = prepare_database(workdir, args.database_url, scale, fresh=args.fresh)
+
+    app_module = import_app(workdir, args.database_url)
+    app_module.app.config['TESTING'] = True
+
+    admin = app_module.app.test_client()
+    admin.post('/login', data=ADMIN_CREDENTIALS)
+    user = app_module.app.test_client()
+
+    cases = build_cases(app_module, args.iterations)
+    login_case = cases[0]
+    user.open(login_case[3], method='POST', **login_case[4]())
+    clients = {'admin': admin, 'user': user}
+
+    results = {}
+    for case in cases:
+        if args.only and case[0] not in args.only:
+            continue
+        print(f"⏱️ {case[0]}...", end=' ', flush=True)
+        results[case[0]] = run_case(app_module, clients, case)
+        latency = results[case[0]].get('latency_ms')
+        print(f"median {latency['median']}ms p95 {latency['p95']}ms" if latency else results[case[0]]['skipped'])
+
+    return {
+        'meta': report_metadata(
+            suite='request_paths',
+            db_type='postgresql' if args.database_url else 'sqlite',
+            dataset=dataset,
+            iterations=args.iterations
+        ),
+        'results': results
+    }
+
+def compare_reports(base, head, tolerance=0.2, min_delta_ms=2.0, metric='median'):
+    """
+    Compare two suite reports case by case
+
+    A case regresses when its latency grew by more than `tolerance`
+    (relative) and by more than `min_delta_ms` (absolute, to ignore noise
+    on sub-millisecond paths).
+
+    Returns:
+        tuple: (rows, regressions) where rows are
+               (case, base_ms, head_ms, ratio, status)
+    """
+    rows, regressions = [], []
+    for case in sorted(set(base['results']) | set(head['results'])):
+        before = base['results'].get(case, {}).get('latency_ms', {}).get(metric)
+        after = head['results'].get(case, {}).get('latency_ms', {}).get(metric)
+        if before is None or after is None:
+            rows.append((case, before, after, None, 'n/a'))
+            continue
+
+        ratio = after / before if before else float('inf')
+        status = 'ok'
+        if ratio > 1 + tolerance and after - before > min_delta_ms:
+            status = 'REGRESSION'
+            regressions.append(case)
+        elif ratio < 1 - tolerance and before - after > min_delta_ms:
+            status = 'faster'
+        rows.append((case, before, after, ratio, status))
+
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the key request paths')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run the suite and write a JSON report')
+    run_parser.add_argument('--entries', type=int, default=10000, help='data_entries rows (default: 10000)')
+    run_parser.add_argument('--users', type=int, default=50, help='field users (default: 50)')
+    run_parser.add_argument('--branches', type=int, default=500, help='branches (default: 500)')
+    run_parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    run_parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                            help=f'timed requests per case (default: {DEFAULT_ITERATIONS}, exports and submissions use a tenth)')
+    run_parser.add_argument('--only', nargs='*', help='run only these cases')
+    run_parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'rm_bench'),
+                            help='directory of the SQLite database and uploads')
+    run_parser.add_argument('--database-url', help='run against this PostgreSQL database instead of SQLite')
+    run_parser.add_argument('--fresh', action='store_true', help='regenerate the dataset even if it exists')
+    run_parser.add_argument('--output', default='-', help="report file (default: '-' for stdout)")
+
+    compare_parser = subparsers.add_parser('compare', help='compare two reports')
+    compare_parser.add_argument('base', help='report of the reference commit')
+    compare_parser.add_argument('head', help='report of the commit under test')
+    compare_parser.add_argument('--tolerance', type=float, default=0.2,
+                                help='allowed relative slowdown (default: 0.2 = 20%%)')
+    compare_parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                                help='ignore slowdowns smaller than this (default: 2ms)')
+    compare_parser.add_argument('--metric', default='median', choices=('median', 'p95', 'mean'),
+                                help='latency statistic to compare (default: median)')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        write_report(run_suite(args), args.output)
+        return
+
+    base, head = load_report(args.base), load_report(args.head)
+    rows, regressions = compare_reports(base, head, args.tolerance, args.min_delta_ms, args.metric)
+
+    print(f"{'case':28} {'base ms':>10} {'head ms':>10} {'ratio':>7}  status")
+    for case, before, after, ratio, status in rows:
+        before_text = f'{before:.2f}' if before is not None else '-'
+        after_text = f'{after:.2f}' if after is not None else '-'
+        ratio_text = f'{ratio:.2f}' if ratio is not None else '-'
+        print(f"{case:28} {before_text:>10} {after_text:>10} {ratio_text:>7}  {status}")
+
+    print(f"\nbase {(base['meta'].get('commit') or '?')[:10]}  head {(head['meta'].get('commit') or '?')[:10]}")
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ No regressions")
+
+if __name__ == "__main__":
+    main()
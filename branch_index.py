@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+In-memory search index for branch autocomplete
+
+    search_branches(load_branches, 'cairo fes', limit=10)
+    find_branch_by_code(load_branches, 'BR00042')
+
+The data entry form searches branches on every keystroke. Instead of a
+LIKE '%term%' scan of the branches table per request, each worker keeps an
+index of all branches:
+
+- a prefix trie over the shop code and every word of the branch name, so
+  "cai fes" finds "Cairo Festival City" (every query word must prefix a
+  word of the name, or the code)
+- a trigram index (like pg_trgm) over the distinct words of all names and
+  codes, for substrings and typos, used when the prefix search finds fewer
+  than `limit` branches. Every query word is scored against the closest
+  word of a branch and the branch gets the average, so a typo in one word
+  of a long name ("festivl") still matches where scoring against the
+  whole name would dilute it below the threshold
+
+Results are ranked: exact code, code prefix, name prefix, word prefix,
+then trigram similarity; ties go to the shorter name.
+
+The index is rebuilt lazily on the next search when the 'branches' cache
+namespace was invalidated (app_cache.invalidate('branches'), called by
+every route that changes branches) or when it is older than
+BRANCH_INDEX_MAX_AGE seconds, which bounds how stale other workers can be
+with the in-process cache backend.
+"""
+
+import os
+import re
+import time
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+
+from app_cache import namespace_version
+from metrics import counter, gauge, histogram
+
+BRANCH_INDEX_MAX_AGE = int(os.getenv('BRANCH_INDEX_MAX_AGE', '300'))
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Minimum trigram similarity for fuzzy matches (pg_trgm's default is 0.3)
+SIMILARITY_THRESHOLD = 0.3
+
+# Trigrams found in more words than this are only used to score
+# candidates, not to find them
+COMMON_TRIGRAM_SHARE = 0.05
+COMMON_TRIGRAM_MIN = 200
+
+BUILDS = counter('branch_index_builds_total', 'Rebuilds of the branch search index')
+INDEX_SIZE = gauge('branch_index_branches', 'Branches in the search index of this worker')
+SEARCH_SECONDS = histogram('branch_search_duration_seconds', 'Branch index lookup time',
+                           buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05))
+
+# Rank of each match kind, higher first
+RANK_CODE_EXACT = 5
+RANK_CODE_PREFIX = 4
+RANK_NAME_PREFIX = 3
+RANK_WORD_PREFIX = 2
+RANK_TRIGRAM = 1
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+def normalize(text):
+    """Lowercase, strip accents and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.casefold().split())
+
+def words(text):
+    return _WORD.findall(text)
+
+def trigrams(text):
+    """Trigrams of every word, padded like pg_trgm ('  w', ' wo', 'wor', 'ord', 'rd ')"""
+    result = set()
+    for word in words(text):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+class _TrieNode:
+    __slots__ = ('children', 'ids')
+
+    def __init__(self):
+        self.children = {}
+        self.ids = set()
+
+class BranchIndex:
+    """Prefix trie plus trigram index over (id, name, code) rows"""
+
+    def __init__(self, branches):
+        self.branches = {}
+        self.names = {}
+        self.codes = {}
+        self.by_code = {}
+        self.trie = _TrieNode()
+        # Distinct words of names and codes: their trigrams, the words per
+        # trigram and the branches per word
+        self.word_grams = {}
+        self.word_postings = {}
+        self.word_branches = {}
+
+        for branch_id, name, code in branches:
+            name = name or ''
+            code = code or ''
+            self.branches[branch_id] = {'name': name, 'code': code}
+            normalized_name, normalized_code = normalize(name), normalize(code)
+            self.names[branch_id] = normalized_name
+            self.codes[branch_id] = normalized_code
+            if normalized_code:
+                self.by_code[normalized_code] = branch_id
+
+            for token in set(words(normalized_name)) | {normalized_code}:
+                self._insert(token, branch_id)
+
+            for word in set(words(f'{normalized_name} {normalized_code}')):
+                if word not in self.word_grams:
+                    self.word_grams[word] = grams = trigrams(word)
+                    for gram in grams:
+                        self.word_postings.setdefault(gram, set()).add(word)
+                self.word_branches.setdefault(word, set()).add(branch_id)
+
+    def __len__(self):
+        return len(self.branches)
+
+    def _insert(self, token, branch_id):
+        node = self.trie
+        for char in token:
+            node = node.children.setdefault(char, _TrieNode())
+            node.ids.add(branch_id)
+
+    def _prefix_ids(self, prefix):
+        node = self.trie
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+    def get_by_code(self, code):
+        branch_id = self.by_code.get(normalize(code))
+        return dict(self.branches[branch_id]) if branch_id is not None else None
+
+    def search(self, term, limit=DEFAULT_LIMIT):
+        """
+        Ranked branches matching term
+
+        Returns:
+            list: {'name', 'code'} dicts, best match first
+        """
+        query = normalize(term)
+        query_words = words(query)
+        if not query_words:
+            return []
+
+        ranks = {}
+
+        # Every query word must prefix some word of the name (or the code)
+        candidates = None
+        for word in sorted(query_words, key=len, reverse=True):
+            matches = self._prefix_ids(word)
+            candidates = set(matches) if candidates is None else candidates & matches
+            if not candidates:
+                break
+
+        for branch_id in candidates or ():
+            code, name = self.codes[branch_id], self.names[branch_id]
+            if code == query:
+                ranks[branch_id] = (RANK_CODE_EXACT, 1.0)
+            elif code.startswith(query):
+                ranks[branch_id] = (RANK_CODE_PREFIX, 1.0)
+            elif name.startswith(query):
+                ranks[branch_id] = (RANK_NAME_PREFIX, 1.0)
+            else:
+                ranks[branch_id] = (RANK_WORD_PREFIX, 1.0)
+
+        exact_code = any(rank == RANK_CODE_EXACT for rank, _ in ranks.values())
+        if len(ranks) < limit and not exact_code:
+            for branch_id, similarity in self._similar(query):
+                ranks.setdefault(branch_id, (RANK_TRIGRAM, similarity))
+
+        best = heapq.nsmallest(limit, ranks, key=lambda branch_id: (-ranks[branch_id][0], -ranks[branch_id][1],
+                                                                    len(self.names[branch_id]), self.names[branch_id]))
+        return [dict(self.branches[branch_id]) for branch_id in best]
+
+    def _similar_words(self, query_word):
+        """{word: trigram similarity} of indexed words close to query_word or containing it"""
+        query_grams = trigrams(query_word)
+        if not query_grams:
+            return {}
+
+        # Count shared trigrams over the selective ones only, then check the
+        # common ones (e.g. the ' br' of every BRxxxxx code) per candidate
+        common_limit = max(COMMON_TRIGRAM_MIN, len(self.word_grams) * COMMON_TRIGRAM_SHARE)
+        postings = [self.word_postings[gram] for gram in query_grams if gram in self.word_postings]
+        selective = [candidates for candidates in postings if len(candidates) <= common_limit]
+        common = [candidates for candidates in postings if len(candidates) > common_limit]
+        if not selective:
+            selective, common = postings, []
+
+        shared = Counter()
+        for candidates in selective:
+            shared.update(candidates)
+        for word in shared:
+            shared[word] += sum(1 for candidates in common if word in candidates)
+
+        similar = {}
+        for word, count in shared.items():
+            similarity = count / (len(query_grams) + len(self.word_grams[word]) - count)
+            if similarity >= SIMILARITY_THRESHOLD or query_word in word:
+                similar[word] = similarity
+        return similar
+
+    def _similar(self, query):
+        """
+        (id, similarity) of branches whose words are close to the query
+        words: the similarity is the average over the query words of the
+        best match among the branch's words
+        """
+        query_words = words(query)
+        best = {}
+        for position, query_word in enumerate(query_words):
+            for word, similarity in self._similar_words(query_word).items():
+                for branch_id in self.word_branches[word]:
+                    scores = best.setdefault(branch_id, [0.0] * len(query_words))
+                    scores[position] = max(scores[position], similarity)
+
+        results = []
+        for branch_id, scores in best.items():
+            similarity = sum(scores) / len(scores)
+            # A query contained in a name ranks above the typo matches
+            contained = query in self.names[branch_id] or query in self.codes[branch_id]
+            if contained or similarity >= SIMILARITY_THRESHOLD:
+                results.append((branch_id, similarity + (1 if contained else 0)))
+        return results
+
+_index = None
+_index_version = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+def get_index(load_branches):
+    """
+    The branch index of this worker, rebuilt when stale
+
+    Args:
+        load_branches: function returning (id, name, code) rows of all branches
+    """
+    global _index, _index_version, _index_built_at
+
+    version = namespace_version('branches')
+    if _index is not None and _index_version == version and time.monotonic() - _index_built_at < BRANCH_INDEX_MAX_AGE:
+        return _index
+
+    with _index_lock:
+        # Another thread may have rebuilt it while we waited
+        if _index is not None and _index_version == version and time.monotonic() - _index_built_at < BRANCH_INDEX_MAX_AGE:
+            return _index
+
+        started = time.perf_counter()
+        index = BranchIndex(load_branches())
+        _index, _index_version, _index_built_at = index, version, time.monotonic()
+        BUILDS.inc()
+        INDEX_SIZE.set(len(index))
+        print(f"🔎 Branch index built: {len(index)} branches in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return index
+
+def reset_index():
+    """Drop the index of this worker; the next search rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+def search_branches(load_branches, term, limit=DEFAULT_LIMIT):
+    index = get_index(load_branches)
+    started = time.perf_counter()
+    results = index.search(term, max(1, min(limit, MAX_LIMIT)))
+    SEARCH_SECONDS.observe(time.perf_counter() - started)
+    return results
+
+def find_branch_by_code(load_branches, code):
+    return get_index(load_branches).get_by_code(code)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Static asset build: bundle, minify, fingerprint and precompress
+
+For every bundle of static_assets.BUNDLES this concatenates the source
+files, minifies the result (rjsmin / rcssmin), writes it to
+static/dist/<name>.<hash>.min.<ext> and next to it gzip (.gz) and brotli
+(.br) copies at maximum compression, then records the file names in
+static/dist/manifest.json. Templates pick the built files up through
+asset_tags(); files of older builds are removed.
+
+Run once per deploy after installing the requirements:
+
+    python build_assets.py
+    python build_assets.py --check     # only report sizes, write nothing
+
+Without rjsmin / rcssmin / brotli installed the bundles are still built,
+just without minification or the .br copies.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+
+from static_assets import BUNDLES, DIST_DIR, MANIFEST_FILE
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)(?!data:|https?:|/|#)([^\'")]+)\1\s*\)')
+
+def read_source(source):
+    with open(os.path.join(STATIC_DIR, source), encoding='utf-8') as f:
+        text = f.read()
+    if source.endswith('.css'):
+        # Relative url()s point next to the source, the bundle lives in dist/
+        source_dir = os.path.dirname(source)
+        text = _CSS_URL.sub(lambda m: f"url({m.group(1)}../{source_dir}/{m.group(2)}{m.group(1)})", text)
+    return text
+
+def minify(name, text):
+    if name.endswith('.css'):
+        return rcssmin.cssmin(text) if rcssmin else text
+    return rjsmin.jsmin(text) if rjsmin else text
+
+def build_bundle(name, sources):
+    """Minified bundle contents and its output file name"""
+    separator = '\n' if name.endswith('.css') else ';\n'
+    text = separator.join(read_source(source) for source in sources)
+    data = minify(name, text).encode('utf-8')
+    stem, ext = os.path.splitext(name)
+    return data, f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.min{ext}"
+
+def compressed_copies(data):
+    copies = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        copies['.br'] = brotli.compress(data, quality=11)
+    return copies
+
+def remove_stale(dist_dir, keep):
+    removed = 0
+    for filename in os.listdir(dist_dir):
+        if filename != MANIFEST_FILE and filename not in keep:
+            os.remove(os.path.join(dist_dir, filename))
+            removed += 1
+    return removed
+
+def build(check=False):
+    dist_dir = os.path.join(STATIC_DIR, DIST_DIR)
+    manifest = {'bundles': {}}
+    written = set()
+    totals = {'source': 0, 'minified': 0, 'gzip': 0, 'brotli': 0}
+
+    for name, sources in BUNDLES.items():
+        data, filename = build_bundle(name, sources)
+        copies = compressed_copies(data)
+        source_bytes = sum(os.path.getsize(os.path.join(STATIC_DIR, source)) for source in sources)
+
+        totals['source'] += source_bytes
+        totals['minified'] += len(data)
+        totals['gzip'] += len(copies['.gz'])
+        totals['brotli'] += len(copies.get('.br', copies['.gz']))
+        print(f"📦 {name:22} {source_bytes / 1024:7.1f} KB -> {len(data) / 1024:6.1f} KB min, "
+              f"{len(copies['.gz']) / 1024:5.1f} KB gz"
+              + (f", {len(copies['.br']) / 1024:5.1f} KB br" if '.br' in copies else ''))
+
+        manifest['bundles'][name] = filename
+        if check:
+            continue
+
+        os.makedirs(dist_dir, exist_ok=True)
+        for suffix, content in [('', data)] + list(copies.items()):
+            with open(os.path.join(dist_dir, filename + suffix), 'wb') as f:
+                f.write(content)
+            written.add(filename + suffix)
+
+    print(f"✅ {totals['source'] / 1024:.1f} KB of sources -> {totals['minified'] / 1024:.1f} KB minified, "
+          f"{totals['gzip'] / 1024:.1f} KB gzip, {totals['brotli'] / 1024:.1f} KB brotli")
+
+    bundled = {source for sources in BUNDLES.values() for source in sources}
+    unbundled = sorted(os.path.relpath(os.path.join(root, filename), STATIC_DIR).replace(os.sep, '/')
+                       for root, _, filenames in os.walk(os.path.join(STATIC_DIR, 'js'))
+                       for filename in filenames if filename.endswith('.js'))
+    unbundled = [source for source in unbundled if source not in bundled]
+    if unbundled:
+        print(f"ℹ️ Not in any bundle (not linked from the pages): {', '.join(unbundled)}")
+
+    if check:
+        return manifest
+
+    with open(os.path.join(dist_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    removed = remove_stale(dist_dir, written)
+    if removed:
+        print(f"🧹 Removed {removed} files of previous builds")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description='Bundle, minify, fingerprint and precompress static assets')
+    parser.add_argument('--check', action='store_true', help='report bundle sizes without writing files')
+    args = parser.parse_args()
+
+    missing = [package for package, module in (('rjsmin', rjsmin), ('rcssmin', rcssmin), ('brotli', brotli)) if module is None]
+    if missing:
+        print(f"⚠️ {', '.join(missing)} not installed: building without them", file=sys.stderr)
+
+    build(check=args.check)
+
+if __name__ == "__main__":
+    main()
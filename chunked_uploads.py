@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Resumable chunked photo uploads
+
+A photo set sent in one multipart request is lost completely when the
+connection drops halfway, and MAX_CONTENT_LENGTH caps the whole visit. The
+data entry page (static/js/chunked_upload.js) therefore uploads each photo
+separately in small chunks:
+
+    POST /uploads                              {upload_id, filename, size, content_type}
+    PUT  /uploads/<upload_id>/chunks/<index>   raw bytes (optional X-Chunk-SHA256)
+    POST /uploads/<upload_id>/finalize
+    GET  /uploads/<upload_id>                  which chunks the server has
+
+and then submits the form with the upload ids (uploads_N fields) instead of
+the files. The client chooses the upload id, so after a reload or a lost
+connection it asks for the status and only sends the missing chunks. Every
+step is idempotent: creating an existing session, re-sending a chunk or
+finalizing twice returns the current state.
+
+Chunks are staged on disk under UPLOAD_STAGING_DIR/<upload_id>/ (written to
+a temporary file and renamed into place, so a chunk is either complete or
+absent) and joined into one file on finalize. /submit_data then stores the
+file like a directly uploaded photo and, once the entries are committed,
+deletes the session (discard_upload). Sessions abandoned for longer than
+UPLOAD_SESSION_TTL (counted from their newest chunk or file) are removed by
+cleanup_expired(), which runs now and then when sessions are created, or
+with `python chunked_uploads.py`.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import shutil
+import hashlib
+
+from werkzeug.datastructures import FileStorage
+from werkzeug.utils import secure_filename
+
+from metrics import counter
+
+STAGING_DIR = os.getenv('UPLOAD_STAGING_DIR', 'upload_staging')
+CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', str(512 * 1024)))
+MAX_UPLOAD_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', str(25 * 1024 * 1024)))
+SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', str(24 * 3600)))
+CLEANUP_INTERVAL = 600
+
+ALLOWED_CONTENT_TYPES = {'image/jpeg', 'image/jpg', 'image/png', 'image/webp', 'image/avif', 'image/heic'}
+
+_UPLOAD_ID = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+_COPY_BUFFER = 64 * 1024
+
+CHUNKS = counter('upload_chunks_total', 'Chunks received by the resumable upload endpoints', ('outcome',))
+CHUNK_BYTES = counter('upload_chunk_bytes_total', 'Bytes received in upload chunks')
+UPLOADS = counter('uploads_total', 'Resumable upload sessions by event', ('event',))
+
+_last_cleanup = 0.0
+
+class UploadError(Exception):
+    """Invalid upload request, reported to the client with an HTTP status"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def _session_dir(upload_id):
+    if not upload_id or not _UPLOAD_ID.match(upload_id):
+        raise UploadError('Invalid upload id')
+    return os.path.join(STAGING_DIR, upload_id)
+
+def _read_meta(upload_id, user_id):
+    try:
+        with open(os.path.join(_session_dir(upload_id), 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise UploadError('Upload not found', 404)
+    # Other users' sessions do not exist as far as the caller is concerned
+    if meta['user_id'] != user_id:
+        raise UploadError('Upload not found', 404)
+    return meta
+
+def _total_chunks(meta):
+    return max(1, -(-meta['size'] // meta['chunk_size']))
+
+def _chunk_path(upload_id, index):
+    return os.path.join(_session_dir(upload_id), 'chunks', f'{index:06d}.part')
+
+def _file_path(upload_id):
+    return os.path.join(_session_dir(upload_id), 'file')
+
+def _state(upload_id, meta):
+    complete = os.path.exists(_file_path(upload_id))
+    received = []
+    if not complete:
+        chunks_dir = os.path.join(_session_dir(upload_id), 'chunks')
+        received = sorted(int(name.split('.')[0]) for name in os.listdir(chunks_dir) if name.endswith('.part'))
+    return {
+        'upload_id': upload_id,
+        'filename': meta['filename'],
+        'size': meta['size'],
+        'chunk_size': meta['chunk_size'],
+        'total_chunks': _total_chunks(meta),
+        'received': received,
+        'complete': complete
+    }
+
+def create_session(user_id, upload_id, filename, size, content_type):
+    """
+    Start an upload, or return the state of the existing session with this id
+
+    Returns:
+        dict: upload state (see get_status)
+    """
+    session_dir = _session_dir(upload_id)
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError('File size is required')
+    if size > MAX_UPLOAD_BYTES:
+        raise UploadError(f'File is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB', 413)
+    if (content_type or '').lower() not in ALLOWED_CONTENT_TYPES:
+        raise UploadError('Only image uploads are supported')
+
+    maybe_cleanup()
+
+    meta = {
+        'user_id': user_id,
+        'filename': secure_filename(filename or '') or 'image.jpg',
+        'size': size,
+        'content_type': content_type.lower(),
+        'chunk_size': CHUNK_SIZE,
+        'created_at': time.time()
+    }
+
+    # Build the session next to its final place and rename it in, so a
+    # concurrent request sees either no session or a complete one
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    pending_dir = os.path.join(STAGING_DIR, f'.{upload_id}.{uuid.uuid4().hex}')
+    os.makedirs(os.path.join(pending_dir, 'chunks'))
+    with open(os.path.join(pending_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    try:
+        os.rename(pending_dir, session_dir)
+        UPLOADS.inc(event='created')
+    except OSError:
+        shutil.rmtree(pending_dir, ignore_errors=True)
+        existing = _read_meta(upload_id, user_id)
+        if existing['size'] != size:
+            raise UploadError('Upload id already used for another file', 409)
+        meta = existing
+        UPLOADS.inc(event='resumed')
+
+    return _state(upload_id, meta)
+
+def get_status(user_id, upload_id):
+    """
+    Returns:
+        dict: upload_id, filename, size, chunk_size, total_chunks, received
+              (indexes of the stored chunks) and complete
+    """
+    return _state(upload_id, _read_meta(upload_id, user_id))
+
+def write_chunk(user_id, upload_id, index, stream, checksum=None):
+    """
+    Store chunk `index` read from stream; sending a chunk again replaces it
+
+    Args:
+        checksum: optional hex SHA-256 of the chunk, verified before storing
+    """
+    meta = _read_meta(upload_id, user_id)
+    if os.path.exists(_file_path(upload_id)):
+        CHUNKS.inc(outcome='duplicate')
+        return _state(upload_id, meta)
+
+    total = _total_chunks(meta)
+    if not 0 <= index < total:
+        CHUNKS.inc(outcome='rejected')
+        raise UploadError(f'Chunk index must be between 0 and {total - 1}')
+    expected = min(meta['chunk_size'], meta['size'] - index * meta['chunk_size'])
+
+    path = _chunk_path(upload_id, index)
+    temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    digest = hashlib.sha256()
+    received = 0
+    try:
+        with open(temp_path, 'wb') as f:
+            while True:
+                block = stream.read(min(_COPY_BUFFER, expected + 1 - received))
+                if not block:
+                    break
+                received += len(block)
+                if received > expected:
+                    break
+                digest.update(block)
+                f.write(block)
+
+        if received != expected:
+            raise UploadError(f'Chunk {index} must be {expected} bytes')
+        if checksum and checksum.lower() != digest.hexdigest():
+            raise UploadError(f'Chunk {index} checksum mismatch')
+        os.replace(temp_path, path)
+    except UploadError:
+        CHUNKS.inc(outcome='rejected')
+        raise
+    except FileNotFoundError:
+        # Finalized (chunks directory removed) while this chunk was arriving
+        CHUNKS.inc(outcome='duplicate')
+        return _state(upload_id, meta)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    CHUNKS.inc(outcome='stored')
+    CHUNK_BYTES.inc(received)
+    return _state(upload_id, meta)
+
+def finalize(user_id, upload_id):
+    """Join the chunks into the uploaded file; 409 while chunks are missing"""
+    meta = _read_meta(upload_id, user_id)
+    state = _state(upload_id, meta)
+    if state['complete']:
+        return state
+
+    missing = sorted(set(range(state['total_chunks'])) - set(state['received']))
+    if missing:
+        raise UploadError(f"Missing chunks: {', '.join(str(index) for index in missing[:20])}", 409)
+
+    file_path = _file_path(upload_id)
+    temp_path = f'{file_path}.{uuid.uuid4().hex}.tmp'
+    with open(temp_path, 'wb') as output:
+        for index in range(state['total_chunks']):
+            with open(_chunk_path(upload_id, index), 'rb') as chunk:
+                shutil.copyfileobj(chunk, output, _COPY_BUFFER)
+
+    if os.path.getsize(temp_path) != meta['size']:
+        os.remove(temp_path)
+        raise UploadError('Assembled file has the wrong size', 409)
+
+    os.replace(temp_path, file_path)
+    shutil.rmtree(os.path.join(_session_dir(upload_id), 'chunks'), ignore_errors=True)
+    UPLOADS.inc(event='finalized')
+    return _state(upload_id, meta)
+
+def open_upload(user_id, upload_id):
+    """
+    A finalized upload as a FileStorage, to be stored like a photo posted
+    with the form; the caller closes it
+    """
+    meta = _read_meta(upload_id, user_id)
+    try:
+        stream = open(_file_path(upload_id), 'rb')
+    except FileNotFoundError:
+        raise UploadError(f'Upload {upload_id} is not finalized', 409)
+    return FileStorage(stream=stream, filename=meta['filename'], content_type=meta['content_type'])
+
+def discard_upload(user_id, upload_id):
+    """Delete a session whose file was stored; unknown sessions are ignored"""
+    try:
+        _read_meta(upload_id, user_id)
+    except UploadError:
+        return
+    shutil.rmtree(_session_dir(upload_id), ignore_errors=True)
+    UPLOADS.inc(event='consumed')
+
+def _last_activity(path):
+    """
+    Newest mtime in a session: storing a chunk changes the chunks directory
+    and the chunk file, not the session directory itself
+    """
+    latest = os.path.getmtime(path)
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+            except OSError:
+                # Renamed or removed while walking
+                continue
+    return latest
+
+def cleanup_expired(max_age=SESSION_TTL, now=None):
+    """Remove upload sessions idle for more than max_age seconds; returns how many"""
+    now = now or time.time()
+    removed = 0
+    try:
+        names = os.listdir(STAGING_DIR)
+    except FileNotFoundError:
+        return 0
+
+    for name in names:
+        path = os.path.join(STAGING_DIR, name)
+        try:
+            if now - _last_activity(path) > max_age:
+                shutil.rmtree(path)
+                removed += 1
+        except OSError:
+            continue
+
+    if removed:
+        UPLOADS.inc(removed, event='expired')
+    return removed
+
+def maybe_cleanup():
+    """cleanup_expired() at most once per CLEANUP_INTERVAL in this process"""
+    global _last_cleanup
+    if time.monotonic() - _last_cleanup < CLEANUP_INTERVAL:
+        return
+    _last_cleanup = time.monotonic()
+    removed = cleanup_expired()
+    if removed:
+        print(f"🧹 Removed {removed} expired upload sessions")
+
+if __name__ == '__main__':
+    print(f"🧹 Removed {cleanup_expired()} expired upload sessions from {STAGING_DIR}")
@@ -1,15 +1,34 @@
 import os
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
+import time
 from datetime import datetime
 import tempfile
 from werkzeug.utils import secure_filename
-import pandas as pd
+from metrics import counter, histogram
+
+# cloudinary و pandas يتم استيرادها عند أول استخدام فقط لتسريع تشغيل التطبيق
+
+# مقاييس الرفع (تظهر في /metrics)
+CLOUDINARY_UPLOAD_SECONDS = histogram(
+    'cloudinary_upload_duration_seconds', 'Cloudinary upload latency',
+    ('resource_type', 'outcome')
+)
+CLOUDINARY_UPLOADED_BYTES = counter(
+    'cloudinary_uploaded_bytes_total', 'Bytes stored in Cloudinary by successful uploads',
+    ('resource_type',)
+)
+
+def _record_upload(resource_type, started, result=None):
+    """تسجيل زمن الرفع ونتيجته"""
+    outcome = 'success' if result is not None else 'error'
+    CLOUDINARY_UPLOAD_SECONDS.observe(time.perf_counter() - started, resource_type=resource_type, outcome=outcome)
+    if result is not None:
+        CLOUDINARY_UPLOADED_BYTES.inc(result.get('bytes', 0), resource_type=resource_type)
 
 # إعداد Cloudinary
 def configure_cloudinary():
     """Configure Cloudinary with environment variables"""
+    import cloudinary
+
     cloudinary.config(
         cloud_name=os.getenv('CLOUDINARY_CLOUD_NAME'),
         api_key=os.getenv('CLOUDINARY_API_KEY'),
@@ -28,7 +47,9 @@ def upload_image_to_cloudinary(file, folder="employee_data_images"):
     Returns:
         dict: معلومات الصورة المرفوعة أو None في حالة الخطأ
     """
+    started = time.perf_counter()
     try:
+        import cloudinary.uploader
         configure_cloudinary()
         
         # إنشاء اسم فريد للملف
@@ -50,6 +71,7 @@ def upload_image_to_cloudinary(file, folder="employee_data_images"):
                 {'quality': 'auto:good'}
             ]
         )
+        _record_upload('image', started, result)
         
         return {
             'success': True,
@@ -62,6 +84,7 @@ def upload_image_to_cloudinary(file, folder="employee_data_images"):
         }
         
     except Exception as e:
+        _record_upload('image', started)
         print(f"خطأ في رفع الصورة إلى Cloudinary: {e}")
         return {
             'success': False,
@@ -80,7 +103,9 @@ def upload_excel_to_cloudinary(file_path, filename, folder="employee_data_export
     Returns:
         dict: معلومات الملف المرفوع أو None في حالة الخطأ
     """
+    started = time.perf_counter()
     try:
+        import cloudinary.uploader
         configure_cloudinary()
         
         # إنشاء اسم فريد للملف
@@ -96,6 +121,7 @@ def upload_excel_to_cloudinary(file_path, filename, folder="employee_data_export
             use_filename=True,
             unique_filename=True
         )
+        _record_upload('raw', started, result)
         
         return {
             'success': True,
@@ -106,6 +132,7 @@ def upload_excel_to_cloudinary(file_path, filename, folder="employee_data_export
         }
         
     except Exception as e:
+        _record_upload('raw', started)
         print(f"خطأ في رفع ملف Excel إلى Cloudinary: {e}")
         return {
             'success': False,
@@ -124,6 +151,7 @@ def delete_file_from_cloudinary(public_id, resource_type="image"):
         bool: True إذا تم الحذف بنجاح
     """
     try:
+        import cloudinary.uploader
         configure_cloudinary()
         
         result = cloudinary.uploader.destroy(
@@ -137,29 +165,100 @@ def delete_file_from_cloudinary(public_id, resource_type="image"):
         print(f"خطأ في حذف الملف من Cloudinary: {e}")
         return False
 
+def delete_files_from_cloudinary(public_ids, resource_type="image", batch_size=100):
+    """
+    حذف مجموعة ملفات من Cloudinary على دفعات
+
+    Args:
+        public_ids: قائمة معرفات الملفات
+        resource_type: نوع الملفات (image أو raw)
+        batch_size: عدد الملفات في كل طلب (الحد الأقصى في Cloudinary هو 100)
+
+    Returns:
+        list: المعرفات التي تم حذفها بنجاح
+    """
+    deleted = []
+    public_ids = list(public_ids)
+    batch_size = max(1, min(batch_size, 100))
+
+    try:
+        import cloudinary.api
+        configure_cloudinary()
+    except Exception as e:
+        print(f"خطأ في إعداد Cloudinary: {e}")
+        return deleted
+
+    for start in range(0, len(public_ids), batch_size):
+        batch = public_ids[start:start + batch_size]
+        try:
+            result = cloudinary.api.delete_resources(
+                batch,
+                type="upload",
+                resource_type=resource_type
+            )
+            deleted.extend(
+                public_id for public_id, status in result.get('deleted', {}).items()
+                if status == 'deleted'
+            )
+        except Exception as e:
+            print(f"خطأ في حذف دفعة من الملفات من Cloudinary: {e}")
+
+    return deleted
+
+def iter_cloudinary_images(folder="employee_data_images", page_size=500):
+    """
+    المرور على جميع الصور في Cloudinary صفحة بصفحة باستخدام next_cursor
+
+    Args:
+        folder: مجلد البحث
+        page_size: عدد النتائج في كل صفحة (الحد الأقصى 500)
+
+    Yields:
+        dict: بيانات كل صورة كما يرجعها Cloudinary
+    """
+    import cloudinary.api
+    configure_cloudinary()
+
+    next_cursor = None
+    while True:
+        options = {
+            'type': "upload",
+            'prefix': folder,
+            'max_results': max(1, min(page_size, 500)),
+            'resource_type': "image"
+        }
+        if next_cursor:
+            options['next_cursor'] = next_cursor
+
+        result = cloudinary.api.resources(**options)
+
+        for resource in result.get('resources', []):
+            yield resource
+
+        next_cursor = result.get('next_cursor')
+        if not next_cursor:
+            break
+
 def get_cloudinary_images_list(folder="employee_data_images", max_results=100):
     """
     الحصول على قائمة الصور من Cloudinary
-    
+
     Args:
         folder: مجلد البحث
-        max_results: عدد النتائج الأقصى
-    
+        max_results: عدد النتائج الأقصى (None لجلب جميع الصور)
+
     Returns:
         list: قائمة الصور
     """
     try:
-        configure_cloudinary()
-        
-        result = cloudinary.api.resources(
-            type="upload",
-            prefix=folder,
-            max_results=max_results,
-            resource_type="image"
-        )
-        
-        return result.get('resources', [])
-        
+        images = []
+        for resource in iter_cloudinary_images(folder, page_size=max_results or 500):
+            images.append(resource)
+            if max_results and len(images) >= max_results:
+                break
+
+        return images
+
     except Exception as e:
         print(f"خطأ في الحصول على قائمة الصور: {e}")
         return []
@@ -176,6 +275,8 @@ def create_temp_excel_file(data, filename):
         str: مسار الملف المؤقت
     """
     try:
+        import pandas as pd
+
         # إنشاء ملف مؤقت
         temp_dir = tempfile.gettempdir()
         temp_path = os.path.join(temp_dir, filename)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Negotiated response compression (brotli / gzip)
+
+    init_compression(app)
+
+Text responses (HTML, JSON, CSS, JS, CSV, SVG) larger than
+COMPRESSION_MIN_SIZE are compressed with the best encoding the client
+accepts: brotli when the brotli package is installed, otherwise gzip.
+The admin dashboard HTML and the taxonomy JSON lists shrink 5-10x, which
+matters on the mobile links of the field staff.
+
+- Streamed responses are compressed chunk by chunk and flushed after every
+  chunk, so the client still receives data progressively.
+- Static files with a precompressed sibling (style.css.br / .gz, written
+  by build_assets.py at maximum compression) are served from that file
+  without compressing anything per request.
+- Other static files are compressed on the fly up to
+  COMPRESSION_MAX_STATIC_SIZE; photos and other binary files are never
+  touched.
+
+Bytes before and after compression are counted per encoding in
+/metrics; `python -m benchmarks.compression` measures the savings per
+endpoint. Set COMPRESSION_ENABLED=0 to switch compression off (e.g. when a
+reverse proxy already compresses).
+"""
+
+import os
+import zlib
+import mimetypes
+
+from flask import request, send_file
+from werkzeug.security import safe_join
+
+from metrics import counter
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', '1').lower() not in ('0', 'false', 'no')
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_MAX_STATIC_SIZE = 4 * 1024 * 1024
+
+# Per-request levels favour speed; build_assets.py uses the maximum levels
+GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'text/xml',
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'
+}
+
+# Preferred first when the client accepts several equally
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSED_RESPONSES = counter('http_compressed_responses_total', 'Responses compressed by encoding and source',
+                               ('encoding', 'source'))
+COMPRESSION_INPUT_BYTES = counter('http_compression_input_bytes_total', 'Response bytes before compression',
+                                  ('encoding',))
+COMPRESSION_OUTPUT_BYTES = counter('http_compression_output_bytes_total', 'Response bytes after compression',
+                                   ('encoding',))
+COMPRESSION_SKIPPED = counter('http_compression_skipped_total', 'Compressible responses sent uncompressed',
+                              ('reason',))
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+def negotiate(accept_encoding, available=None):
+    """
+    Best encoding of `available` the Accept-Encoding header allows, or None
+
+    Honours q-values (q=0 refuses an encoding) and '*'; ties go to the
+    order of `available`.
+    """
+    available = available or supported_encodings()
+    weights = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+def _stream_compressor(encoding):
+    """(compress_chunk, finish) functions of an incremental compressor"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+def _compress_stream(chunks, encoding):
+    compress_chunk, finish = _stream_compressor(encoding)
+    input_bytes = output_bytes = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if not chunk:
+            continue
+        input_bytes += len(chunk)
+        compressed = compress_chunk(chunk)
+        output_bytes += len(compressed)
+        if compressed:
+            yield compressed
+    tail = finish()
+    output_bytes += len(tail)
+    if tail:
+        yield tail
+    COMPRESSION_INPUT_BYTES.inc(input_bytes, encoding=encoding)
+    COMPRESSION_OUTPUT_BYTES.inc(output_bytes, encoding=encoding)
+
+def _add_vary(response):
+    vary = {value.strip().lower() for value in response.headers.get('Vary', '').split(',') if value.strip()}
+    if 'accept-encoding' not in vary:
+        response.headers.add('Vary', 'Accept-Encoding')
+
+def _mark_encoded(response, encoding):
+    response.headers['Content-Encoding'] = encoding
+    _add_vary(response)
+    # The representation changed: a strong ETag of the identity body no
+    # longer matches
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}', weak=True)
+
+def _precompressed_static(app):
+    """Serve static/<file>.br or .gz for static requests when available"""
+    if request.endpoint != 'static' or request.range is not None:
+        return None
+
+    filename = (request.view_args or {}).get('filename', '')
+    mimetype = mimetypes.guess_type(filename)[0]
+    if mimetype not in COMPRESSIBLE_TYPES:
+        return None
+
+    path = safe_join(app.static_folder, filename)
+    if path is None:
+        return None
+    existing = [encoding for encoding, suffix in PRECOMPRESSED_SUFFIXES.items() if os.path.isfile(path + suffix)]
+    encoding = negotiate(request.headers.get('Accept-Encoding'), existing) if existing else None
+    if encoding is None:
+        return None
+
+    response = send_file(path + PRECOMPRESSED_SUFFIXES[encoding], mimetype=mimetype)
+    _mark_encoded(response, encoding)
+    COMPRESSED_RESPONSES.inc(encoding=encoding, source='precompressed')
+    # Revalidate against the encoded ETag the client got before
+    return response.make_conditional(request.environ)
+
+def _compress_response(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if response.mimetype not in COMPRESSIBLE_TYPES or 'Content-Encoding' in response.headers:
+        return response
+
+    _add_vary(response)
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return response
+
+    encoding = negotiate(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        COMPRESSION_SKIPPED.inc(reason='not_accepted')
+        return response
+
+    buffered = False
+    if response.direct_passthrough:
+        # send_file: only static text files of reasonable size, read whole
+        # (compressing a file in one piece beats flushing per block)
+        if request.endpoint != 'static' or (response.content_length or 0) > COMPRESSION_MAX_STATIC_SIZE:
+            return response
+        response.direct_passthrough = False
+        buffered = True
+
+    if response.is_streamed and not buffered:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+        _mark_encoded(response, encoding)
+        COMPRESSED_RESPONSES.inc(encoding=encoding, source='stream')
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        COMPRESSION_SKIPPED.inc(reason='too_small')
+        return response
+
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        COMPRESSION_SKIPPED.inc(reason='not_smaller')
+        return response
+
+    response.set_data(compressed)
+    _mark_encoded(response, encoding)
+    COMPRESSED_RESPONSES.inc(encoding=encoding, source='dynamic')
+    COMPRESSION_INPUT_BYTES.inc(len(data), encoding=encoding)
+    COMPRESSION_OUTPUT_BYTES.inc(len(compressed), encoding=encoding)
+    if buffered:
+        # send_file compared If-None-Match with the identity ETag
+        response.make_conditional(request.environ)
+    return response
+
+def init_compression(app):
+    """Register the compression hooks; call after the other init_* hooks"""
+    if not COMPRESSION_ENABLED:
+        return
+
+    app.before_request(lambda: _precompressed_static(app))
+    app.after_request(_compress_response)
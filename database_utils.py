@@ -1,21 +1,25 @@
-import sqlite3
 from contextlib import contextmanager
+from datetime import datetime
 import logging
 
+from database_config import get_database_connection
+from rename_propagation import record_renames, start_propagation
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @contextmanager
 def get_db_cursor():
-    """Database connection context manager"""
+    """Database connection context manager, yields (cursor, db_type)"""
     conn = None
     try:
-        conn = sqlite3.connect('database.db')
-        # Enable foreign keys
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn, db_type = get_database_connection()
+        if db_type == 'sqlite':
+            # Enable foreign keys
+            conn.execute("PRAGMA foreign_keys = ON")
         cursor = conn.cursor()
-        yield cursor
+        yield cursor, db_type
         conn.commit()
     except Exception as e:
         logger.error(f"Database error: {str(e)}")
@@ -26,38 +30,35 @@ def get_db_cursor():
         if conn:
             conn.close()
 
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def _placeholder(db_type):
+    return '%s' if db_type == 'postgresql' else '?'
+
 def update_category(id, new_name):
-    """Update category with proper cascading updates"""
+    """Update category; its data entries follow through a rename propagation job"""
     try:
-        with get_db_cursor() as cursor:
-            # Start transaction
-            cursor.execute("BEGIN")
+        with get_db_cursor() as (cursor, db_type):
+            p = _placeholder(db_type)
+            
+            # Data entries store the name, record the rename for them
+            renames = record_renames(cursor, db_type, 'categories', [(id, new_name)], _now())
             
             # Update category
             cursor.execute(
-                "UPDATE categories SET name = ? WHERE id = ?",
+                f"UPDATE categories SET name = {p} WHERE id = {p}",
                 (new_name, id)
             )
             
             if cursor.rowcount == 0:
                 raise ValueError(f"Category with ID {id} not found")
-            
-            # Update related models
-            cursor.execute(
-                "UPDATE models SET category_name = ? WHERE category_id = ?",
-                (new_name, id)
-            )
-            logger.info(f"Updated {cursor.rowcount} model records")
-            
-            # Update related display types
-            cursor.execute(
-                "UPDATE display_types SET category_name = ? WHERE category_id = ?",
-                (new_name, id)
-            )
-            logger.info(f"Updated {cursor.rowcount} display type records")
-            
-            cursor.execute("COMMIT")
-            return True
+        
+        # Models and display types reference the category by id; only the
+        # data entries store its name
+        if renames:
+            start_propagation(get_database_connection)
+        return True
             
     except Exception as e:
         logger.error(f"Error updating category: {str(e)}")
@@ -66,27 +67,31 @@ def update_category(id, new_name):
 def update_model(id, name, category_id):
     """Update model with proper category relationship"""
     try:
-        with get_db_cursor() as cursor:
-            # Get category name
-            cursor.execute("SELECT name FROM categories WHERE id = ?", (category_id,))
+        with get_db_cursor() as (cursor, db_type):
+            p = _placeholder(db_type)
+            
+            # Check the category exists
+            cursor.execute(f"SELECT name FROM categories WHERE id = {p}", (category_id,))
             result = cursor.fetchone()
             if not result:
                 raise ValueError(f"Category with ID {category_id} not found")
             
-            category_name = result[0]
+            renames = record_renames(cursor, db_type, 'models', [(id, name)], _now())
             
             # Update model
             cursor.execute(
-                """UPDATE models 
-                   SET name = ?, category_id = ?, category_name = ? 
-                   WHERE id = ?""",
-                (name, category_id, category_name, id)
+                f"""UPDATE models 
+                   SET name = {p}, category_id = {p} 
+                   WHERE id = {p}""",
+                (name, category_id, id)
             )
             
             if cursor.rowcount == 0:
                 raise ValueError(f"Model with ID {id} not found")
-                
-            return True
+        
+        if renames:
+            start_propagation(get_database_connection)
+        return True
             
     except Exception as e:
         logger.error(f"Error updating model: {str(e)}")
@@ -95,27 +100,31 @@ def update_model(id, name, category_id):
 def update_display_type(id, name, category_id):
     """Update display type with proper category relationship"""
     try:
-        with get_db_cursor() as cursor:
-            # Get category name
-            cursor.execute("SELECT name FROM categories WHERE id = ?", (category_id,))
+        with get_db_cursor() as (cursor, db_type):
+            p = _placeholder(db_type)
+            
+            # Check the category exists
+            cursor.execute(f"SELECT name FROM categories WHERE id = {p}", (category_id,))
             result = cursor.fetchone()
             if not result:
                 raise ValueError(f"Category with ID {category_id} not found")
             
-            category_name = result[0]
+            renames = record_renames(cursor, db_type, 'display_types', [(id, name)], _now())
             
             # Update display type
             cursor.execute(
-                """UPDATE display_types 
-                   SET name = ?, category_id = ?, category_name = ? 
-                   WHERE id = ?""",
-                (name, category_id, category_name, id)
+                f"""UPDATE display_types 
+                   SET name = {p}, category_id = {p} 
+                   WHERE id = {p}""",
+                (name, category_id, id)
             )
             
             if cursor.rowcount == 0:
                 raise ValueError(f"Display type with ID {id} not found")
-                
-            return True
+        
+        if renames:
+            start_propagation(get_database_connection)
+        return True
             
     except Exception as e:
         logger.error(f"Error updating display type: {str(e)}")
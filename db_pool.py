@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL connection pool shared by the threads of one gunicorn worker
+
+get_db_connection used to open a fresh TLS connection for every request.
+The pool keeps a few connections per worker process and hands them out to
+request threads. Callers keep using conn.close(): on a pooled connection it
+returns the connection to the pool instead of closing the socket.
+
+The pool is created lazily on first use, so importing the app in the
+gunicorn master (preload_app) never opens a connection. gunicorn_config
+calls reset_pool() in post_fork so a worker never reuses a socket it
+inherited from its parent.
+"""
+
+import os
+import time
+import threading
+from urllib.parse import urlparse
+
+from metrics import counter, gauge, histogram
+
+try:
+    from psycopg2 import pool as pg_pool
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+POOL_MIN_CONNECTIONS = int(os.getenv('DB_POOL_MIN_CONNECTIONS', '1'))
+POOL_MAX_CONNECTIONS = int(os.getenv('DB_POOL_MAX_CONNECTIONS', os.getenv('GUNICORN_THREADS', '4')))
+POOL_CHECKOUT_TIMEOUT = float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '10'))
+
+POOL_IN_USE = gauge('db_pool_connections_in_use', 'Pooled database connections checked out by this worker')
+POOL_CHECKOUT_SECONDS = histogram('db_pool_checkout_wait_seconds', 'Time waited for a pooled connection',
+                                  buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10))
+POOL_TIMEOUTS = counter('db_pool_checkout_timeouts_total', 'Checkouts that gave up waiting for a connection')
+POOL_BROKEN = counter('db_pool_broken_connections_total', 'Pooled connections discarded because they were closed or broken')
+
+_pool = None
+_pool_pid = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+
+# Pools inherited over fork are kept referenced so their sockets are never
+# finalized (and closed) by the garbage collector in the child
+_inherited_pools = []
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection became free in time"""
+
+class PooledConnection:
+    """Connection proxy whose close() gives the connection back to the pool"""
+
+    def __init__(self, conn, owner, slots):
+        self._conn = conn
+        self._owner = owner
+        self._slots = slots
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+
+        broken = bool(self._conn.closed)
+        if not broken:
+            try:
+                # Never hand out a connection with an open transaction
+                self._conn.rollback()
+            except Exception:
+                broken = True
+
+        if broken:
+            POOL_BROKEN.inc()
+
+        try:
+            self._owner.putconn(self._conn, close=broken)
+        finally:
+            self._slots.release()
+            POOL_IN_USE.dec()
+
+    def __del__(self):
+        # Safety net for code paths that forget to close the connection
+        try:
+            self.close()
+        except Exception:
+            pass
+
+def _connect_kwargs(database_url):
+    url = urlparse(database_url)
+    return {
+        'host': url.hostname,
+        'port': url.port,
+        'database': url.path[1:],
+        'user': url.username,
+        'password': url.password,
+        'sslmode': os.getenv('DB_SSLMODE', 'require')
+    }
+
+def _get_pool(database_url):
+    global _pool, _pool_pid, _pool_slots
+
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool, _pool_slots
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = pg_pool.ThreadedConnectionPool(
+                POOL_MIN_CONNECTIONS,
+                POOL_MAX_CONNECTIONS,
+                **_connect_kwargs(database_url)
+            )
+            _pool_slots = threading.BoundedSemaphore(POOL_MAX_CONNECTIONS)
+            _pool_pid = pid
+
+    return _pool, _pool_slots
+
+def get_pooled_connection(database_url):
+    """
+    Check a connection out of this process' pool
+
+    Blocks up to DB_POOL_CHECKOUT_TIMEOUT seconds when every connection is
+    in use instead of failing immediately like ThreadedConnectionPool does.
+    """
+    if not PSYCOPG2_AVAILABLE:
+        raise RuntimeError("psycopg2 is required for PostgreSQL connection pooling")
+
+    owner, slots = _get_pool(database_url)
+    wait_started = time.perf_counter()
+    if not slots.acquire(timeout=POOL_CHECKOUT_TIMEOUT):
+        POOL_TIMEOUTS.inc()
+        raise PoolTimeout(f"No database connection free after {POOL_CHECKOUT_TIMEOUT}s")
+
+    try:
+        conn = owner.getconn()
+        if conn.closed:
+            POOL_BROKEN.inc()
+            owner.putconn(conn, close=True)
+            conn = owner.getconn()
+    except Exception:
+        slots.release()
+        raise
+
+    POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - wait_started)
+    POOL_IN_USE.inc()
+    return PooledConnection(conn, owner, slots)
+
+def close_pool():
+    """Close every pooled connection of the current process"""
+    global _pool, _pool_pid, _pool_slots
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
+        _pool_slots = None
+
+def reset_pool():
+    """
+    Forget a pool inherited from the parent process after fork
+
+    The inherited sockets are dropped without being closed: closing them
+    would send a terminate message on a socket the parent still owns.
+    """
+    global _pool, _pool_pid, _pool_slots
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid != os.getpid():
+            _inherited_pools.append(_pool)
+            POOL_IN_USE.set(0)
+        _pool = None
+        _pool_pid = None
+        _pool_slots = None
@@ -4,17 +4,64 @@ Enhanced Excel export with Cloudinary support and better formatting
 """
 
 import os
+import time
 import tempfile
-import requests
 from io import BytesIO
-from PIL import Image as PILImage
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as ExcelImage
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
 from datetime import datetime
 from cloudinary_config import upload_excel_to_cloudinary, cleanup_temp_file, is_cloudinary_configured
+from metrics import counter, histogram
+
+# requests و PIL و pandas و openpyxl يتم استيرادها داخل الدوال عند أول تصدير
+# حتى لا يدفع كل worker تكلفة تحميلها عند التشغيل
+
+# مقاييس التصدير (تظهر في /metrics)
+EXPORT_SECONDS = histogram(
+    'export_duration_seconds', 'Time to build an Excel export',
+    ('kind', 'outcome')
+)
+EXPORT_ROWS = counter('export_rows_total', 'Data entries written to Excel exports', ('kind',))
+IMAGE_DOWNLOAD_SECONDS = histogram(
+    'export_image_download_duration_seconds', 'Time to download and resize one export image',
+    ('outcome',)
+)
+IMAGE_DOWNLOAD_FAILURES = counter(
+    'export_image_download_failures_total', 'Export images that could not be loaded',
+    ('reason',)
+)
+
+def record_export(kind, started, rows, success):
+    """
+    تسجيل زمن التصدير وعدد الصفوف
+
+    Args:
+        kind: نوع التصدير (enhanced أو simple أو data_entries)
+        started: قيمة time.perf_counter() عند بداية التصدير
+        rows: عدد الإدخالات المصدرة
+        success: هل نجح التصدير
+    """
+    EXPORT_SECONDS.observe(time.perf_counter() - started, kind=kind, outcome='success' if success else 'error')
+    if success:
+        EXPORT_ROWS.inc(rows, kind=kind)
+
+def _image_failure_reason(error):
+    """تصنيف سبب فشل تحميل الصورة إلى مجموعة ثابتة من القيم"""
+    try:
+        import requests
+        from PIL import UnidentifiedImageError
+    except ImportError:
+        return 'other'
+
+    if isinstance(error, requests.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.ConnectionError):
+        return 'connection'
+    if isinstance(error, requests.HTTPError):
+        return 'http'
+    if isinstance(error, requests.RequestException):
+        return 'other'
+    if isinstance(error, (UnidentifiedImageError, OSError)):
+        return 'invalid_image'
+    return 'other'
 
 def download_image_from_cloudinary(image_url, max_size=(200, 200)):
     """
@@ -27,7 +74,11 @@ def download_image_from_cloudinary(image_url, max_size=(200, 200)):
     Returns:
         BytesIO: الصورة المحسنة أو None في حالة الخطأ
     """
+    started = time.perf_counter()
     try:
+        import requests
+        from PIL import Image as PILImage
+
         # تحميل الصورة
         response = requests.get(image_url, timeout=10)
         response.raise_for_status()
@@ -46,10 +97,13 @@ def download_image_from_cloudinary(image_url, max_size=(200, 200)):
         img_buffer = BytesIO()
         img.save(img_buffer, format='JPEG', quality=95, optimize=True)
         img_buffer.seek(0)
+        IMAGE_DOWNLOAD_SECONDS.observe(time.perf_counter() - started, outcome='success')
         
         return img_buffer
         
     except Exception as e:
+        IMAGE_DOWNLOAD_SECONDS.observe(time.perf_counter() - started, outcome='error')
+        IMAGE_DOWNLOAD_FAILURES.inc(reason=_image_failure_reason(e))
         print(f"خطأ في تحميل الصورة {image_url}: {e}")
         return None
 
@@ -64,7 +118,14 @@ def create_enhanced_excel_with_images(data_entries, filename):
     Returns:
         str: مسار الملف المؤقت أو None في حالة الخطأ
     """
+    started = time.perf_counter()
     try:
+        from PIL import Image as PILImage
+        from openpyxl import Workbook
+        from openpyxl.drawing.image import Image as ExcelImage
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        from openpyxl.utils import get_column_letter
+
         # إنشاء workbook جديد
         wb = Workbook()
         ws = wb.active
@@ -195,7 +256,10 @@ def create_enhanced_excel_with_images(data_entries, filename):
                                 img_buffer = BytesIO()
                                 img.save(img_buffer, format='JPEG', quality=95, optimize=True)
                                 img_buffer.seek(0)
+                            else:
+                                IMAGE_DOWNLOAD_FAILURES.inc(reason='missing_local_file')
                         except Exception as e:
+                            IMAGE_DOWNLOAD_FAILURES.inc(reason='invalid_image')
                             print(f"Error processing local image {image_url}: {e}")
                     
                     if img_buffer:
@@ -271,10 +335,12 @@ def create_enhanced_excel_with_images(data_entries, filename):
         temp_dir = tempfile.gettempdir()
         temp_path = os.path.join(temp_dir, filename)
         wb.save(temp_path)
+        record_export('enhanced', started, len(data_entries), True)
         
         return temp_path
         
     except Exception as e:
+        record_export('enhanced', started, len(data_entries), False)
         print(f"خطأ في إنشاء ملف Excel: {e}")
         return None
 
@@ -344,7 +410,11 @@ def create_simple_excel_with_formatting(data_entries, filename):
     Returns:
         str: مسار الملف المؤقت
     """
+    started = time.perf_counter()
     try:
+        import pandas as pd
+        from openpyxl.styles import Font, Alignment, PatternFill
+
         # تحويل البيانات إلى DataFrame
         df_data = []
         for entry in data_entries:
@@ -393,8 +463,10 @@ def create_simple_excel_with_formatting(data_entries, filename):
                 adjusted_width = min(max_length + 2, 50)
                 worksheet.column_dimensions[column_letter].width = adjusted_width
         
+        record_export('simple', started, len(data_entries), True)
         return temp_path
         
     except Exception as e:
+        record_export('simple', started, len(data_entries), False)
         print(f"خطأ في إنشاء ملف Excel البسيط: {e}")
         return None
\ No newline at end of file
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Production gunicorn configuration
+
+    gunicorn -c gunicorn_config.py app:app
+
+Workers are sized from the CPU cores available to the container and use
+threaded (gthread) workers, so a slow Excel export or Cloudinary upload
+only occupies one thread instead of blocking every other user. All values
+can be overridden with environment variables.
+
+The workers share their metrics through METRICS_DIR, so /metrics answers
+for all of them whichever worker serves the scrape (see metrics.py).
+"""
+
+import os
+import time
+import tempfile
+import multiprocessing
+
+def _available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+CORES = _available_cores()
+
+# Server socket
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Worker processes: (2 x cores) + 1, capped so pandas/openpyxl heavy workers
+# still fit in the instance memory
+workers = int(os.getenv('WEB_CONCURRENCY', min(2 * CORES + 1, int(os.getenv('GUNICORN_MAX_WORKERS', '4')))))
+
+# Threads per worker for the I/O bound routes (uploads, exports, database)
+# gevent can be selected with GUNICORN_WORKER_CLASS=gevent when installed
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '100'))
+
+# Load the app once in the master and fork it (copy-on-write, fast respawn)
+preload_app = True
+
+# Recycle workers now and then to bound memory growth from exports
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Time budget per route class in seconds
+ROUTE_TIMEOUTS = {
+    'default': int(os.getenv('TIMEOUT_DEFAULT', '30')),
+    'upload': int(os.getenv('TIMEOUT_UPLOAD', '120')),
+    'export': int(os.getenv('TIMEOUT_EXPORT', '300'))
+}
+
+ROUTE_CLASSES = (
+    ('/export_excel', 'export'),
+    ('/submit_data', 'upload'),
+    ('/uploads', 'upload'),
+)
+
+# The worker timeout has to cover the slowest route class; faster classes
+# are policed by post_request which logs requests that overran their budget
+timeout = max(ROUTE_TIMEOUTS.values())
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Per-worker metric snapshots, merged by /metrics
+METRICS_DIR = os.getenv('METRICS_DIR') or os.path.join(tempfile.gettempdir(), f"rm_metrics_{os.getenv('PORT', '8000')}")
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+def route_class(path):
+    """Return the timeout class of a request path"""
+    for prefix, name in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return name
+    return 'default'
+
+def when_ready(server):
+    # preload_app imported the app in the master: drop any database
+    # connection it opened before workers are forked
+    from db_pool import close_pool
+    from metrics import reset_directory
+    close_pool()
+    reset_directory(METRICS_DIR)
+    server.log.info(f"Ready: {workers} {worker_class} workers x {threads} threads on {CORES} cores")
+
+def post_fork(server, worker):
+    # Every worker builds its own connection pool on first use
+    from db_pool import reset_pool
+    from metrics import start_multiprocess
+    reset_pool()
+    start_multiprocess(METRICS_DIR)
+
+def worker_exit(server, worker):
+    # Last snapshot of this worker, folded into the archive by child_exit
+    from metrics import flush
+    flush()
+
+def child_exit(server, worker):
+    # Runs in the master once a worker is gone (recycled, crashed, killed)
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid, METRICS_DIR)
+
+def pre_request(worker, req):
+    req.start_time = time.monotonic()
+
+def post_request(worker, req, environ, resp):
+    start_time = getattr(req, 'start_time', None)
+    if start_time is None:
+        return
+
+    elapsed = time.monotonic() - start_time
+    budget = ROUTE_TIMEOUTS[route_class(req.path)]
+    if elapsed > budget:
+        worker.log.warning(f"Slow request: {req.method} {req.path} took {elapsed:.1f}s (budget {budget}s)")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Orphaned image garbage collector (mark and sweep)
+
+delete_entry only removes the data_entries row, so the photos it referenced
+stay in Cloudinary / static/uploads forever. This job:
+
+1. Mark:  streams data_entries.image_urls in batches and collects every
+          referenced Cloudinary public_id and local upload filename.
+2. Sweep: pages through all stored images (Cloudinary cursors and a
+          directory scan of static/uploads) and deletes the ones nobody
+          references, in batches.
+
+Images younger than --min-age-hours are never deleted so uploads of a
+submission that is still being saved are not swept away.
+
+Usage:
+    python image_gc.py                # dry run, only reports orphans
+    python image_gc.py --apply        # really delete orphans
+"""
+
+import os
+import re
+import argparse
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+from database_config import get_database_connection
+from cloudinary_config import (
+    iter_cloudinary_images,
+    delete_files_from_cloudinary,
+    is_cloudinary_configured
+)
+
+UPLOAD_FOLDER = 'static/uploads'
+CLOUDINARY_IMAGES_FOLDER = 'employee_data_images'
+IGNORED_LOCAL_FILES = {'.gitkeep'}
+
+_VERSION_SEGMENT = re.compile(r'^v\d+$')
+
+def split_image_urls(image_urls):
+    """Split a comma separated image_urls column value into clean references"""
+    if not image_urls:
+        return []
+    return [url.strip() for url in image_urls.split(',') if url.strip()]
+
+def cloudinary_public_id_from_url(url):
+    """
+    Extract the Cloudinary public_id from a delivery URL
+
+    https://res.cloudinary.com/<cloud>/image/upload/[<transformations>/]v123/<public_id>.<ext>
+
+    Returns:
+        str: the public_id or None if the URL is not a Cloudinary upload URL
+    """
+    path = urlparse(url).path
+    marker = '/upload/'
+    if marker not in path:
+        return None
+
+    segments = path.split(marker, 1)[1].split('/')
+
+    # Drop transformation segments and the version segment
+    for i, segment in enumerate(segments):
+        if _VERSION_SEGMENT.match(segment):
+            segments = segments[i + 1:]
+            break
+
+    public_id = '/'.join(segments)
+    if '.' in segments[-1]:
+        public_id = public_id.rsplit('.', 1)[0]
+
+    return public_id or None
+
+def mark_referenced_images(batch_size=1000):
+    """
+    Collect every image referenced by data_entries
+
+    Rows are streamed with fetchmany (a server side cursor on PostgreSQL) so
+    memory only grows with the number of distinct references, not the table.
+
+    Returns:
+        tuple: (set of Cloudinary public_ids, set of local upload filenames)
+    """
+    cloudinary_ids = set()
+    local_files = set()
+
+    conn, db_type = get_database_connection()
+    try:
+        if db_type == 'postgresql':
+            cursor = conn.cursor(name='image_gc_mark')
+            cursor.itersize = batch_size
+        else:
+            cursor = conn.cursor()
+
+        cursor.execute("SELECT image_urls FROM data_entries WHERE image_urls IS NOT NULL AND image_urls <> ''")
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+
+            for (image_urls,) in rows:
+                for reference in split_image_urls(image_urls):
+                    if reference.startswith('http'):
+                        public_id = cloudinary_public_id_from_url(reference)
+                        if public_id:
+                            cloudinary_ids.add(public_id)
+                    else:
+                        local_files.add(os.path.basename(reference))
+
+        cursor.close()
+    finally:
+        conn.close()
+
+    return cloudinary_ids, local_files
+
+def find_cloudinary_orphans(referenced_ids, min_age, folder=CLOUDINARY_IMAGES_FOLDER):
+    """
+    Page through all Cloudinary images and yield unreferenced public_ids
+
+    Args:
+        referenced_ids: set of public_ids still used by data_entries
+        min_age: timedelta, younger images are skipped
+        folder: Cloudinary folder prefix to scan
+    """
+    cutoff = datetime.now(timezone.utc) - min_age
+
+    for resource in iter_cloudinary_images(folder):
+        public_id = resource.get('public_id')
+        if not public_id or public_id in referenced_ids:
+            continue
+
+        created_at = resource.get('created_at')
+        if created_at:
+            created = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+            if created > cutoff:
+                continue
+
+        yield public_id
+
+def find_local_orphans(referenced_files, min_age, upload_folder=UPLOAD_FOLDER):
+    """
+    Scan the local upload folder and yield unreferenced file paths
+
+    Args:
+        referenced_files: set of filenames still used by data_entries
+        min_age: timedelta, younger files are skipped
+        upload_folder: directory holding local uploads
+    """
+    if not os.path.isdir(upload_folder):
+        return
+
+    cutoff = (datetime.now() - min_age).timestamp()
+
+    with os.scandir(upload_folder) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name in IGNORED_LOCAL_FILES:
+                continue
+            if entry.name in referenced_files:
+                continue
+            if entry.stat().st_mtime > cutoff:
+                continue
+            yield entry.path
+
+def _batched(iterable, batch_size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def run_image_gc(apply=False, min_age_hours=24, batch_size=100, upload_folder=UPLOAD_FOLDER):
+    """
+    Run one mark and sweep pass
+
+    Args:
+        apply: actually delete orphans (False = dry run)
+        min_age_hours: grace period before an unreferenced image is collected
+        batch_size: number of images deleted per Cloudinary API call
+        upload_folder: directory holding local uploads
+
+    Returns:
+        dict: statistics about the pass
+    """
+    min_age = timedelta(hours=min_age_hours)
+    stats = {
+        'referenced_cloudinary': 0,
+        'referenced_local': 0,
+        'orphaned_cloudinary': 0,
+        'orphaned_local': 0,
+        'deleted_cloudinary': 0,
+        'deleted_local': 0,
+        'freed_local_bytes': 0,
+        'dry_run': not apply
+    }
+
+    print("🔍 Marking referenced images...")
+    cloudinary_ids, local_files = mark_referenced_images()
+    stats['referenced_cloudinary'] = len(cloudinary_ids)
+    stats['referenced_local'] = len(local_files)
+    print(f"✅ {len(cloudinary_ids)} Cloudinary and {len(local_files)} local images referenced")
+
+    if is_cloudinary_configured():
+        print("☁️ Sweeping Cloudinary images...")
+        for batch in _batched(find_cloudinary_orphans(cloudinary_ids, min_age), batch_size):
+            stats['orphaned_cloudinary'] += len(batch)
+            if apply:
+                stats['deleted_cloudinary'] += len(delete_files_from_cloudinary(batch, batch_size=batch_size))
+    else:
+        print("ℹ️ Cloudinary not configured - skipping cloud sweep")
+
+    print("📁 Sweeping local uploads...")
+    for batch in _batched(find_local_orphans(local_files, min_age, upload_folder), batch_size):
+        stats['orphaned_local'] += len(batch)
+        if not apply:
+            continue
+        for path in batch:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                stats['deleted_local'] += 1
+                stats['freed_local_bytes'] += size
+            except OSError as e:
+                print(f"⚠️ Could not delete {path}: {e}")
+
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Delete images no data entry references anymore')
+    parser.add_argument('--apply', action='store_true', help='delete orphans (default is a dry run)')
+    parser.add_argument('--min-age-hours', type=float, default=24,
+                        help='skip images younger than this many hours (default: 24)')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='images deleted per batch (default: 100)')
+    args = parser.parse_args()
+
+    stats = run_image_gc(apply=args.apply, min_age_hours=args.min_age_hours, batch_size=args.batch_size)
+
+    mode = "Deleted" if args.apply else "Would delete"
+    print(f"🧹 {mode} {stats['orphaned_cloudinary']} Cloudinary and {stats['orphaned_local']} local orphaned images")
+    if args.apply:
+        print(f"✅ Removed {stats['deleted_cloudinary']} Cloudinary images, "
+              f"{stats['deleted_local']} local files ({stats['freed_local_bytes'] / 1024 / 1024:.2f} MB)")
+
+if __name__ == "__main__":
+    main()
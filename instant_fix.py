@@ -1,104 +0,0 @@
-#!/usr/bin/env python3
-"""
-Instant Fix - Run this immediately to fix all issues
-"""
-
-import os
-import sys
-
-def main():
-    """Instant fix for immediate deployment"""
-    print("⚡ Instant Fix - Immediate Solution")
-    
-    try:
-        # Check environment
-        if os.getenv('DATABASE_URL'):
-            print("🔧 Production environment detected")
-            from database_config import get_database_connection
-            conn, db_type = get_database_connection()
-        else:
-            print("🔧 Local environment detected")
-            import sqlite3
-            conn = sqlite3.connect('database.db')
-            db_type = 'sqlite'
-        
-        cursor = conn.cursor()
-        print(f"✅ Connected to {db_type} database")
-        
-        # 1. Create user_branches table (most critical)
-        print("🚨 Creating user_branches table...")
-        if db_type == 'postgresql':
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_branches (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER NOT NULL,
-                    branch_name VARCHAR(200) NOT NULL,
-                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, branch_name)
-                )
-            ''')
-        else:
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_branches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    branch_name TEXT NOT NULL,
-                    created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, branch_name)
-                )
-            ''')
-        print("✅ user_branches table created")
-        
-        # 2. Add some test data to user_branches to prevent empty results
-        print("🔧 Adding test user branch data...")
-        try:
-            # Get first user ID
-            cursor.execute("SELECT id FROM users LIMIT 1")
-            user_result = cursor.fetchone()
-            if user_result:
-                user_id = user_result[0]
-                if db_type == 'postgresql':
-                    cursor.execute('''
-                        INSERT INTO user_branches (user_id, branch_name) 
-                        VALUES (%s, %s) ON CONFLICT DO NOTHING
-                    ''', (user_id, 'Default Branch'))
-                else:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO user_branches (user_id, branch_name) 
-                        VALUES (?, ?)
-                    ''', (user_id, 'Default Branch'))
-                print("✅ Test branch data added")
-        except Exception as e:
-            print(f"⚠️ Branch data warning: {e}")
-        
-        # 3. Verify critical tables exist
-        print("📊 Verifying tables...")
-        critical_tables = ['users', 'categories', 'models', 'data_entries']
-        for table in critical_tables:
-            try:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                print(f"  ✅ {table}: {count} records")
-            except Exception as e:
-                print(f"  ❌ {table}: {e}")
-        
-        conn.commit()
-        conn.close()
-        
-        print("\n🎉 Instant fix completed!")
-        print("✅ user_branches table ready")
-        print("✅ Critical tables verified")
-        print("✅ Ready for immediate deployment")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-if __name__ == "__main__":
-    success = main()
-    if not success:
-        sys.exit(1)
\ No newline at end of file
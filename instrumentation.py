@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Per-request timing and query-count instrumentation
+
+    init_instrumentation(app)
+
+For every request this records the wall time, the time spent getting a
+database connection and inside the driver (execute / fetch / commit), the
+number of queries, the rows fetched and the bytes returned. The numbers are
+
+- sent back in a Server-Timing header, so they show up in the browser
+  devtools next to the request, and
+- aggregated in per-endpoint histograms of the metrics registry, scraped
+  from /metrics and summarized for admins as JSON at /admin/request_stats.
+
+get_db_connection wraps its connection with instrument_connection(); the
+wrapper only counts, it never changes what the driver returns. Every
+execute also goes through the slow query log (slow_query_log.py). Outside a
+request (flask CLI, scripts) connections are returned unwrapped.
+
+Set INSTRUMENTATION_ENABLED=0 to switch everything off.
+"""
+
+import os
+import time
+
+from flask import g, request, has_request_context
+
+from metrics import counter, histogram
+from slow_query_log import log_query
+
+INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+BYTES_BUCKETS = (1024, 10240, 102400, 1048576, 10485760, 104857600)
+
+_ENDPOINT_LABELS = ('method', 'endpoint')
+
+HTTP_REQUESTS = counter('http_requests_total', 'HTTP requests by route and status',
+                        ('method', 'endpoint', 'status'))
+HTTP_REQUEST_SECONDS = histogram('http_request_duration_seconds', 'Wall time per request',
+                                 _ENDPOINT_LABELS)
+HTTP_REQUEST_DB_SECONDS = histogram('http_request_db_seconds', 'Time spent connecting to and inside the database per request',
+                                    _ENDPOINT_LABELS)
+HTTP_REQUEST_QUERIES = histogram('http_request_queries', 'Database queries per request',
+                                 _ENDPOINT_LABELS, buckets=COUNT_BUCKETS)
+HTTP_REQUEST_ROWS = histogram('http_request_rows_fetched', 'Database rows fetched per request',
+                              _ENDPOINT_LABELS, buckets=ROWS_BUCKETS)
+HTTP_RESPONSE_BYTES = histogram('http_response_size_bytes', 'Response body size',
+                                _ENDPOINT_LABELS, buckets=BYTES_BUCKETS)
+
+# Histograms reported by get_endpoint_stats()
+_ENDPOINT_HISTOGRAMS = {
+    'duration_seconds': HTTP_REQUEST_SECONDS,
+    'db_seconds': HTTP_REQUEST_DB_SECONDS,
+    'queries': HTTP_REQUEST_QUERIES,
+    'rows': HTTP_REQUEST_ROWS,
+    'bytes': HTTP_RESPONSE_BYTES
+}
+
+class RequestStats:
+    """Counters of the current request, kept on flask.g"""
+
+    def __init__(self, endpoint=None):
+        self.start = time.perf_counter()
+        self.endpoint = endpoint
+        self.connect_time = 0.0
+        self.query_time = 0.0
+        self.queries = 0
+        self.rows = 0
+
+    @property
+    def db_time(self):
+        return self.connect_time + self.query_time
+
+def current_stats():
+    """Return the stats of the current request, or None outside a request"""
+    if not INSTRUMENTATION_ENABLED or not has_request_context():
+        return None
+    return g.get('_request_stats')
+
+class InstrumentedCursor:
+    """Cursor proxy counting queries, driver time and rows fetched"""
+
+    def __init__(self, cursor, stats, db_type):
+        self._cursor = cursor
+        self._stats = stats
+        self._db_type = db_type
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._stats.rows += 1
+            yield row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+        return False
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self._stats.query_time += time.perf_counter() - start
+
+    def execute(self, sql, params=None):
+        self._stats.queries += 1
+        start = time.perf_counter()
+        try:
+            if params is None:
+                self._cursor.execute(sql)
+            else:
+                self._cursor.execute(sql, params)
+        finally:
+            duration = time.perf_counter() - start
+            self._stats.query_time += duration
+
+        log_query(self._cursor.connection, self._db_type, sql, params, duration, self._stats.endpoint)
+        # sqlite3 returns the cursor itself to allow chaining
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._stats.queries += 1
+        start = time.perf_counter()
+        try:
+            self._cursor.executemany(sql, seq_of_params)
+        finally:
+            duration = time.perf_counter() - start
+            self._stats.query_time += duration
+
+        log_query(self._cursor.connection, self._db_type, sql, None, duration, self._stats.endpoint, explain=False)
+        return self
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._timed(self._cursor.fetchmany, *args, **kwargs)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._stats.rows += len(rows)
+        return rows
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors and commits are counted"""
+
+    def __init__(self, conn, stats, db_type):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_stats', stats)
+        object.__setattr__(self, '_db_type', db_type)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        # e.g. conn.isolation_level / conn.autocommit must reach the driver
+        setattr(self._conn, name, value)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._stats, self._db_type)
+
+    def execute(self, *args, **kwargs):
+        # sqlite3 shortcut: conn.execute() creates a cursor
+        return self.cursor().execute(*args, **kwargs)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return self._conn.commit()
+        finally:
+            self._stats.query_time += time.perf_counter() - start
+
+    def rollback(self):
+        start = time.perf_counter()
+        try:
+            return self._conn.rollback()
+        finally:
+            self._stats.query_time += time.perf_counter() - start
+
+def instrument_connection(conn, connect_started, db_type):
+    """
+    Wrap a freshly opened connection for the current request
+
+    Args:
+        conn: database connection (sqlite3, psycopg2 or pooled)
+        connect_started: time.perf_counter() taken before connecting
+        db_type: 'postgresql' or 'sqlite'
+
+    Returns:
+        the instrumented connection, or conn itself outside a request
+    """
+    stats = current_stats()
+    if stats is None:
+        return conn
+
+    stats.connect_time += time.perf_counter() - connect_started
+    return InstrumentedConnection(conn, stats, db_type)
+
+def _response_bytes(response):
+    if response.content_length is not None:
+        return response.content_length
+    if response.is_streamed or response.direct_passthrough:
+        # Unknown without consuming the stream
+        return None
+    return response.calculate_content_length()
+
+def _endpoint_labels():
+    endpoint = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+    return {'method': request.method, 'endpoint': endpoint}
+
+def _before_request():
+    labels = _endpoint_labels()
+    g._request_stats = RequestStats(f"{labels['method']} {labels['endpoint']}")
+
+def _after_request(response):
+    stats = g.pop('_request_stats', None)
+    if stats is None:
+        return response
+
+    total = time.perf_counter() - stats.start
+    response_bytes = _response_bytes(response)
+
+    response.headers.add(
+        'Server-Timing',
+        f'app;dur={total * 1000:.1f}, '
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows", '
+        f'connect;dur={stats.connect_time * 1000:.1f}'
+    )
+
+    labels = _endpoint_labels()
+    HTTP_REQUESTS.inc(status=response.status_code, **labels)
+    HTTP_REQUEST_SECONDS.observe(total, **labels)
+    HTTP_REQUEST_DB_SECONDS.observe(stats.db_time, **labels)
+    HTTP_REQUEST_QUERIES.observe(stats.queries, **labels)
+    HTTP_REQUEST_ROWS.observe(stats.rows, **labels)
+    if response_bytes is not None:
+        HTTP_RESPONSE_BYTES.observe(response_bytes, **labels)
+
+    return response
+
+def get_endpoint_stats():
+    """Per-endpoint summary of the request histograms of this worker process"""
+    endpoints = {}
+    for key, metric in _ENDPOINT_HISTOGRAMS.items():
+        for labels, state in metric.collect():
+            name = f"{labels['method']} {labels['endpoint']}"
+            endpoints.setdefault(name, {})[key] = {
+                'count': state['count'],
+                'sum': round(state['sum'], 6),
+                'avg': round(state['sum'] / state['count'], 6) if state['count'] else 0,
+                'buckets': state['buckets']
+            }
+    return dict(sorted(endpoints.items()))
+
+def init_instrumentation(app):
+    """Register the instrumentation hooks on the Flask app"""
+    if not INSTRUMENTATION_ENABLED:
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+In-process metrics registry with Prometheus text exposition
+
+    from metrics import counter, histogram, gauge
+
+    UPLOADS = counter('uploads_total', 'Uploads by outcome', ('outcome',))
+    UPLOADS.inc(outcome='success')
+
+    UPLOAD_SECONDS = histogram('upload_duration_seconds', 'Upload latency', ('outcome',))
+    UPLOAD_SECONDS.observe(0.42, outcome='success')
+
+render_metrics() returns every metric in the text format scraped from
+/metrics. Metrics are recorded in the memory of each process. All gunicorn
+workers sit behind one scrape target, so gunicorn_config.py switches on
+multiprocess mode (start_multiprocess) with a directory the workers share:
+
+- every worker writes a snapshot of its registry to worker_<pid>.json
+  every METRICS_FLUSH_INTERVAL seconds, on exit and before it answers a
+  scrape;
+- when a worker exits (max_requests recycling, crash, timeout), the
+  master folds its counters and histograms into archive.json
+  (mark_process_dead), so totals never go down and rate() and
+  histogram_quantile() stay correct;
+- a scrape sums counters and histograms over the archive and the live
+  workers; gauges are per worker and get a pid label (live workers only).
+
+Values of other workers are at most METRICS_FLUSH_INTERVAL seconds old.
+Without multiprocess mode (flask run, tests) the process's own registry is
+rendered.
+
+Label values must come from a small fixed set (route rules, outcomes,
+kinds) - never put user input, ids or URLs in a label.
+"""
+
+import os
+import json
+import math
+import uuid
+import atexit
+import threading
+from bisect import bisect_left
+
+# Default buckets for latencies in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+ARCHIVE_FILE = 'archive.json'
+# Exited workers remembered in the archive, see aggregate()
+ARCHIVED_PIDS_KEPT = 1000
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def collect(self):
+        """Snapshot of every label set as (labels dict, value) tuples"""
+        with self._lock:
+            return [(dict(zip(self.labelnames, key)), value) for key, value in sorted(self._values.items())]
+
+    def dump(self):
+        """JSON-friendly snapshot for multiprocess mode"""
+        with self._lock:
+            values = [[list(key), value] for key, value in sorted(self._values.items())]
+        return {'type': self.type_name, 'help': self.documentation, 'labelnames': list(self.labelnames),
+                'values': values}
+
+    def _format_labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}'
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self, items):
+        return [f'{self.name}{self._format_labels(key)} {_format_value(value)}' for key, value in items]
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self, items):
+        return [f'{self.name}{self._format_labels(key)} {_format_value(value)}' for key, value in items]
+
+class _HistogramState:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed buckets (plus +Inf)"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = _HistogramState(len(self.buckets) + 1)
+            state.counts[index] += 1
+            state.sum += value
+            state.count += 1
+
+    def collect(self):
+        """
+        Snapshot of every label set
+
+        Returns:
+            list: (labels dict, {'count', 'sum', 'buckets'}) tuples, where
+                  buckets maps each upper bound to its (non-cumulative) count
+        """
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        with self._lock:
+            return [
+                (dict(zip(self.labelnames, key)),
+                 {'count': state.count, 'sum': state.sum, 'buckets': dict(zip(bounds, state.counts))})
+                for key, state in sorted(self._values.items())
+            ]
+
+    def dump(self):
+        with self._lock:
+            values = [[list(key), {'counts': list(state.counts), 'sum': state.sum, 'count': state.count}]
+                      for key, state in sorted(self._values.items())]
+        return {'type': self.type_name, 'help': self.documentation, 'labelnames': list(self.labelnames),
+                'buckets': list(self.buckets), 'values': values}
+
+    def _render_samples(self, items):
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state.counts):
+                cumulative += count
+                le = '+Inf' if bound == math.inf else _format_value(bound)
+                lines.append(f'{self.name}_bucket{self._format_labels(key, [("le", le)])} {cumulative}')
+            lines.append(f'{self.name}_sum{self._format_labels(key)} {_format_value(state.sum)}')
+            lines.append(f'{self.name}_count{self._format_labels(key)} {state.count}')
+        return lines
+
+class MetricsRegistry:
+    """Named collection of metrics; registering a name twice returns the first one"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric_class, name, documentation, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def render(self):
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        """Reset every value (the metrics stay registered)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def dump(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.dump() for metric in metrics}
+
+REGISTRY = MetricsRegistry()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def counter(name, documentation, labelnames=()):
+    return REGISTRY.register(Counter, name, documentation, labelnames)
+
+def gauge(name, documentation, labelnames=()):
+    return REGISTRY.register(Gauge, name, documentation, labelnames)
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+def render_metrics():
+    """
+    Every registered metric in the Prometheus text format, summed over all
+    workers in multiprocess mode
+    """
+    directory = _multiprocess['directory']
+    if directory is None:
+        return REGISTRY.render()
+    flush()
+    return render_dump(aggregate(directory))
+
+# Multiprocess mode
+
+_multiprocess = {'directory': None, 'pid': None, 'written': None}
+_flush_lock = threading.Lock()
+
+def _worker_file(directory, pid):
+    return os.path.join(directory, f'worker_{pid}.json')
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_json(path, data):
+    temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def start_multiprocess(directory, interval=METRICS_FLUSH_INTERVAL):
+    """
+    Share this worker's metrics through `directory`; call in every worker
+    right after the fork (gunicorn post_fork). Values inherited from the
+    master are dropped so they are not counted once per worker.
+    """
+    os.makedirs(directory, exist_ok=True)
+    REGISTRY.clear()
+    _multiprocess.update(directory=directory, pid=os.getpid(), written=None)
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            flush()
+
+    threading.Thread(target=run, name='metrics-flush', daemon=True).start()
+    atexit.register(flush)
+
+def flush():
+    """Write this worker's snapshot when it changed since the last write"""
+    directory = _multiprocess['directory']
+    if directory is None or _multiprocess['pid'] != os.getpid():
+        return
+    with _flush_lock:
+        snapshot = REGISTRY.dump()
+        if snapshot == _multiprocess['written']:
+            return
+        try:
+            _write_json(_worker_file(directory, _multiprocess['pid']), snapshot)
+            _multiprocess['written'] = snapshot
+        except OSError as e:
+            print(f"⚠️ Could not write metrics snapshot: {e}")
+
+def reset_directory(directory):
+    """Remove the snapshots of a previous run (gunicorn when_ready)"""
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith('.json') or name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+def _merge(target, snapshot, pid=None):
+    """
+    Add a snapshot to target; gauges only come from live workers (pid) and
+    are kept apart with a pid label
+    """
+    for name, metric in snapshot.items():
+        if metric['type'] == 'gauge' and pid is None:
+            continue
+        merged = target.get(name)
+        if merged is None:
+            merged = target[name] = {key: value for key, value in metric.items() if key != 'values'}
+            merged['values'] = {}
+            if metric['type'] == 'gauge':
+                merged['labelnames'] = metric['labelnames'] + ['pid']
+        for key, value in metric['values']:
+            key = tuple(key) + ((str(pid),) if metric['type'] == 'gauge' else ())
+            current = merged['values'].get(key)
+            if current is None or metric['type'] == 'gauge':
+                merged['values'][key] = value
+            elif metric['type'] == 'histogram':
+                merged['values'][key] = {'counts': [a + b for a, b in zip(current['counts'], value['counts'])],
+                                         'sum': current['sum'] + value['sum'],
+                                         'count': current['count'] + value['count']}
+            else:
+                merged['values'][key] = current + value
+    return target
+
+def _snapshot(merged):
+    """Merged metrics back in the snapshot layout"""
+    return {name: {**metric, 'values': [[list(key), value] for key, value in sorted(metric['values'].items())]}
+            for name, metric in merged.items()}
+
+def mark_process_dead(pid, directory):
+    """
+    Fold the counters and histograms of an exited worker into the archive
+    and drop its snapshot (gunicorn child_exit, runs in the master)
+    """
+    path = _worker_file(directory, pid)
+    snapshot = _read_json(path)
+    if snapshot is None:
+        return
+    archive = _read_json(os.path.join(directory, ARCHIVE_FILE)) or {'metrics': {}, 'pids': []}
+    if pid not in archive['pids']:
+        merged = _merge(_merge({}, archive['metrics'], pid=None), snapshot, pid=None)
+        archive = {'metrics': _snapshot(merged), 'pids': (archive['pids'] + [pid])[-ARCHIVED_PIDS_KEPT:]}
+        _write_json(os.path.join(directory, ARCHIVE_FILE), archive)
+    # Only after the archive has it, so a scrape never misses its values
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def aggregate(directory):
+    """
+    Metrics of the archive and all live workers merged
+
+    The worker snapshots are read before the archive: a worker folded in
+    meanwhile is then listed in the archive's pids and skipped, so its
+    values are counted exactly once.
+    """
+    workers = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith('worker_') and name.endswith('.json'):
+            snapshot = _read_json(os.path.join(directory, name))
+            if snapshot is not None:
+                workers.append((int(name[len('worker_'):-len('.json')]), snapshot))
+
+    archive = _read_json(os.path.join(directory, ARCHIVE_FILE)) or {'metrics': {}, 'pids': []}
+    merged = _merge({}, archive['metrics'])
+    for pid, snapshot in workers:
+        if pid not in archive['pids']:
+            _merge(merged, snapshot, pid=pid)
+    return merged
+
+def render_dump(merged):
+    """Prometheus text of aggregate()'s result"""
+    registry = MetricsRegistry()
+    for name, metric in merged.items():
+        if metric['type'] == 'histogram':
+            rendered = registry.register(Histogram, name, metric['help'], metric['labelnames'], buckets=metric['buckets'])
+            for key, value in metric['values'].items():
+                state = _HistogramState(len(rendered.buckets) + 1)
+                state.counts, state.sum, state.count = list(value['counts']), value['sum'], value['count']
+                rendered._values[key] = state
+        else:
+            rendered = registry.register(Counter if metric['type'] == 'counter' else Gauge, name, metric['help'],
+                                         metric['labelnames'])
+            rendered._values.update(metric['values'])
+    return registry.render()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if value.is_integer():
+            return str(int(value)) if abs(value) < 1e15 else repr(value)
+        return repr(value)
+    return str(value)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Versioned database schema migrations
+
+Schema changes run once per deploy through an explicit step instead of at
+import time in every gunicorn worker, and replace the one-off fix_* /
+emergency_* scripts that each reconnected and re-introspected the whole
+database:
+
+    flask --app app migrate              # apply pending migrations
+    flask --app app migrate --status     # list applied / pending
+    flask --app app migrate --dry-run    # show what would run
+    python -m migrations                 # same, without the flask CLI
+
+Every migration is a module in this package named mNNNN_<slug>.py that
+defines DESCRIPTION and upgrade(cursor, db_type). Migrations are applied
+in version order, each inside its own transaction, and recorded in the
+schema_version table, so a deploy only runs the delta over one connection.
+upgrade() must be idempotent (IF NOT EXISTS, or guarded with the helpers
+below) because production databases may already carry some of these
+changes from the old fix scripts.
+"""
+
+import os
+import re
+import pkgutil
+import importlib
+
+SCHEMA_VERSION_TABLE = 'schema_version'
+
+# Arbitrary key for pg_advisory_lock so two deploys never migrate at once
+MIGRATION_LOCK_ID = 727401
+
+_MODULE_NAME = re.compile(r'^m(\d{4})_\w+$')
+
+def discover_migrations():
+    """
+    Find the migration modules of this package
+
+    Returns:
+        list: (version, description, upgrade) tuples ordered by version
+    """
+    migrations = []
+    package_dir = os.path.dirname(__file__)
+
+    for module_info in pkgutil.iter_modules([package_dir]):
+        match = _MODULE_NAME.match(module_info.name)
+        if not match:
+            continue
+
+        module = importlib.import_module(f'{__name__}.{module_info.name}')
+        migrations.append((int(match.group(1)), module.DESCRIPTION, module.upgrade))
+
+    migrations.sort(key=lambda migration: migration[0])
+
+    versions = [migration[0] for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+
+    return migrations
+
+# Introspection helpers for idempotent migrations
+
+def table_exists(cursor, db_type, table):
+    if db_type == 'postgresql':
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', (table,))
+        return cursor.fetchone()[0]
+
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone()[0] > 0
+
+def table_columns(cursor, db_type, table):
+    if db_type == 'postgresql':
+        cursor.execute(
+            'SELECT column_name FROM information_schema.columns WHERE table_name = %s ORDER BY ordinal_position',
+            (table,)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    cursor.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in cursor.fetchall()]
+
+# Engine
+
+def _ensure_version_table(cursor, db_type):
+    if db_type == 'postgresql':
+        cursor.execute(f'''CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute(f'''CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )''')
+
+def get_applied_versions(cursor):
+    """Return the set of applied schema versions"""
+    cursor.execute(f'SELECT version FROM {SCHEMA_VERSION_TABLE}')
+    return {row[0] for row in cursor.fetchall()}
+
+def _begin(cursor, db_type):
+    if db_type == 'sqlite':
+        cursor.execute('BEGIN')
+
+def _commit(conn, cursor, db_type):
+    if db_type == 'sqlite':
+        cursor.execute('COMMIT')
+    else:
+        conn.commit()
+
+def _rollback(conn, cursor, db_type):
+    if db_type == 'sqlite':
+        cursor.execute('ROLLBACK')
+    else:
+        conn.rollback()
+
+def migration_status(conn, db_type):
+    """
+    Compare the migrations on disk with the applied ones
+
+    Returns:
+        list: (version, description, applied) tuples ordered by version
+    """
+    cursor = conn.cursor()
+    _ensure_version_table(cursor, db_type)
+    conn.commit()
+    applied = get_applied_versions(cursor)
+
+    return [(version, description, version in applied)
+            for version, description, _ in discover_migrations()]
+
+def run_migrations(conn, db_type, dry_run=False):
+    """
+    Apply every pending migration, each one in its own transaction
+
+    Args:
+        conn: open database connection
+        db_type: 'postgresql' or 'sqlite'
+        dry_run: only report the pending migrations
+
+    Returns:
+        list: versions applied (or pending, for a dry run) by this run
+    """
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    migrations = discover_migrations()
+    cursor = conn.cursor()
+
+    if db_type == 'sqlite':
+        # Manage transactions explicitly so DDL is rolled back on failure
+        conn.isolation_level = None
+    else:
+        cursor.execute('SELECT pg_advisory_lock(%s)', (MIGRATION_LOCK_ID,))
+
+    try:
+        _begin(cursor, db_type)
+        _ensure_version_table(cursor, db_type)
+        applied = get_applied_versions(cursor)
+        _commit(conn, cursor, db_type)
+
+        pending = [migration for migration in migrations if migration[0] not in applied]
+        if dry_run:
+            for version, description, _ in pending:
+                print(f"⏳ Pending migration {version}: {description}")
+            return [version for version, _, _ in pending]
+
+        newly_applied = []
+        for version, description, upgrade in pending:
+            print(f"🔧 Applying migration {version}: {description}")
+            _begin(cursor, db_type)
+            try:
+                upgrade(cursor, db_type)
+                cursor.execute(
+                    f'INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES ({placeholder}, {placeholder})',
+                    (version, description)
+                )
+                _commit(conn, cursor, db_type)
+            except Exception as e:
+                _rollback(conn, cursor, db_type)
+                print(f"❌ Migration {version} failed and was rolled back: {e}")
+                raise
+
+            newly_applied.append(version)
+
+        return newly_applied
+    finally:
+        if db_type == 'postgresql':
+            cursor.execute('SELECT pg_advisory_unlock(%s)', (MIGRATION_LOCK_ID,))
+            conn.commit()
+        else:
+            conn.isolation_level = ''
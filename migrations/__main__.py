@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+python -m migrations [--status | --dry-run]
+"""
+
+import argparse
+
+from app import init_db, print_migration_status
+
+parser = argparse.ArgumentParser(description='Apply pending database migrations')
+group = parser.add_mutually_exclusive_group()
+group.add_argument('--status', action='store_true', help='list applied and pending migrations')
+group.add_argument('--dry-run', action='store_true', help='show pending migrations without applying them')
+args = parser.parse_args()
+
+if args.status:
+    print_migration_status()
+else:
+    init_db(dry_run=args.dry_run)
@@ -0,0 +1,163 @@
+"""
+Base schema: the tables of the original init_db
+"""
+
+DESCRIPTION = 'Base schema'
+
+def upgrade(cursor, db_type):
+    # Users table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR(80) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            employee_name VARCHAR(100) NOT NULL,
+            employee_code VARCHAR(50) UNIQUE NOT NULL,
+            is_admin BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            employee_name TEXT NOT NULL,
+            employee_code TEXT UNIQUE NOT NULL,
+            is_admin BOOLEAN DEFAULT FALSE,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )''')
+
+    # Categories table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS categories (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )''')
+
+    # Models table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS models (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            category_id INTEGER REFERENCES categories(id),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS models (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )''')
+
+    # Display types table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS display_types (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            category_id INTEGER REFERENCES categories(id),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS display_types (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )''')
+
+    # POP materials table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS pop_materials (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            model_id INTEGER REFERENCES models(id),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS pop_materials (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            model_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (model_id) REFERENCES models (id)
+        )''')
+
+    # Data entries table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS data_entries (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id),
+            employee_name VARCHAR(100) NOT NULL,
+            employee_code VARCHAR(50) NOT NULL,
+            branch_name VARCHAR(200) NOT NULL,
+            shop_code VARCHAR(50),
+            category VARCHAR(100) NOT NULL,
+            model VARCHAR(100) NOT NULL,
+            display_type VARCHAR(100) NOT NULL,
+            selected_materials TEXT,
+            missing_materials TEXT,
+            image_urls TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS data_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            employee_name TEXT NOT NULL,
+            employee_code TEXT NOT NULL,
+            branch_name TEXT NOT NULL,
+            shop_code TEXT,
+            category TEXT NOT NULL,
+            model TEXT NOT NULL,
+            display_type TEXT NOT NULL,
+            selected_materials TEXT,
+            missing_materials TEXT,
+            image_urls TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )''')
+
+    # Branches table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS branches (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            code VARCHAR(50) UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS branches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            code TEXT UNIQUE NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )''')
+
+    # User branches table
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS user_branches (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            branch_name VARCHAR(200) NOT NULL,
+            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(user_id, branch_name)
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS user_branches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            branch_name TEXT NOT NULL,
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            UNIQUE(user_id, branch_name)
+        )''')
@@ -0,0 +1,50 @@
+"""
+Rename the legacy taxonomy columns to the current schema
+
+Older databases still use categories.category_name, models.model_name /
+category_name and display_types.display_type_name / category_name with a
+created_date column. Replaces the column fixes of emergency_database_reset.py,
+complete_database_fix.py and fix_admin_management_schema.py.
+"""
+
+from migrations import table_columns
+
+DESCRIPTION = 'Rename legacy taxonomy columns'
+
+def _rename_created_date(cursor, db_type, table, columns):
+    if 'created_date' in columns and 'created_at' not in columns:
+        cursor.execute(f'ALTER TABLE {table} RENAME COLUMN created_date TO created_at')
+
+def _migrate_named_table(cursor, db_type, table, legacy_name_column):
+    columns = table_columns(cursor, db_type, table)
+    if legacy_name_column not in columns:
+        _rename_created_date(cursor, db_type, table, columns)
+        return
+
+    if 'name' not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN name VARCHAR(100)')
+        cursor.execute(f'UPDATE {table} SET name = {legacy_name_column}')
+
+    if 'category_id' not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN category_id INTEGER')
+
+    if 'category_name' in columns:
+        cursor.execute(f'''
+            UPDATE {table} SET category_id = (
+                SELECT c.id FROM categories c WHERE c.name = {table}.category_name
+            )
+            WHERE category_id IS NULL
+        ''')
+        cursor.execute(f'ALTER TABLE {table} DROP COLUMN category_name')
+
+    cursor.execute(f'ALTER TABLE {table} DROP COLUMN {legacy_name_column}')
+    _rename_created_date(cursor, db_type, table, columns)
+
+def upgrade(cursor, db_type):
+    columns = table_columns(cursor, db_type, 'categories')
+    if 'category_name' in columns and 'name' not in columns:
+        cursor.execute('ALTER TABLE categories RENAME COLUMN category_name TO name')
+    _rename_created_date(cursor, db_type, 'categories', columns)
+
+    _migrate_named_table(cursor, db_type, 'models', 'model_name')
+    _migrate_named_table(cursor, db_type, 'display_types', 'display_type_name')
@@ -0,0 +1,82 @@
+"""
+Remove duplicate taxonomy rows and enforce uniqueness
+
+Duplicates are merged into the row with the lowest id (children are
+re-pointed first so no POP material or model is orphaned), then unique
+indexes stop new duplicates. Every removed row and re-pointed child count
+is printed, so the deploy log records what was merged. Replaces
+clean_duplicate_data.py and the duplicate cleanup of
+fix_render_database_final.py.
+"""
+
+DESCRIPTION = 'Deduplicate taxonomy and add unique indexes'
+
+# Columns that identify a row, per table
+KEYS = {
+    'categories': 'name',
+    'models': 'name, category_id',
+    'display_types': 'name, category_id',
+    'pop_materials': 'name, model_id',
+}
+
+def delete_duplicates(cursor, table):
+    """Print and delete the rows of table that duplicate a lower id"""
+    keys = KEYS[table]
+    duplicates = f'SELECT id FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {keys})'
+    cursor.execute(f'SELECT id, {keys} FROM {table} WHERE id IN ({duplicates}) ORDER BY id')
+    rows = cursor.fetchall()
+    if not rows:
+        return
+    print(f"🧹 Removing {len(rows)} duplicate {table} rows (id, {keys}):")
+    for row in rows:
+        print(f"   {table} {tuple(row)}")
+    cursor.execute(f'DELETE FROM {table} WHERE id IN ({duplicates})')
+
+def report_repointed(cursor, child, parent):
+    if cursor.rowcount > 0:
+        print(f"🔗 Re-pointed {cursor.rowcount} {child} rows to the surviving {parent}")
+
+def upgrade(cursor, db_type):
+    # NULL-safe comparison for models without a category
+    same = 'IS NOT DISTINCT FROM' if db_type == 'postgresql' else 'IS'
+
+    # Categories: re-point children to the surviving category, then delete
+    for child in ('models', 'display_types'):
+        cursor.execute(f'''
+            UPDATE {child} SET category_id = (
+                SELECT MIN(keep.id) FROM categories keep
+                WHERE keep.name = (SELECT c.name FROM categories c WHERE c.id = {child}.category_id)
+            )
+            WHERE category_id IN (
+                SELECT id FROM categories WHERE id NOT IN (
+                    SELECT MIN(id) FROM categories GROUP BY name
+                )
+            )
+        ''')
+        report_repointed(cursor, child, 'categories')
+    delete_duplicates(cursor, 'categories')
+
+    # Models: re-point POP materials to the surviving model, then delete
+    cursor.execute(f'''
+        UPDATE pop_materials SET model_id = (
+            SELECT MIN(keep.id) FROM models keep, models m
+            WHERE m.id = pop_materials.model_id
+              AND keep.name = m.name
+              AND keep.category_id {same} m.category_id
+        )
+        WHERE model_id IN (
+            SELECT id FROM models WHERE id NOT IN (
+                SELECT MIN(id) FROM models GROUP BY name, category_id
+            )
+        )
+    ''')
+    report_repointed(cursor, 'pop_materials', 'models')
+    delete_duplicates(cursor, 'models')
+
+    delete_duplicates(cursor, 'display_types')
+    delete_duplicates(cursor, 'pop_materials')
+
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_categories_name ON categories (name)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_models_category_name ON models (category_id, name)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_display_types_category_name ON display_types (category_id, name)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS uq_pop_materials_model_name ON pop_materials (model_id, name)')
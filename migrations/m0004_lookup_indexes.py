@@ -0,0 +1,21 @@
+"""
+Indexes for the hot lookup paths
+
+Replaces the index creation of complete_database_fix.py,
+emergency_database_reset.py and render_database_fix.py. Foreign key
+lookups on models, display_types and pop_materials are already served by
+the leading column of the unique indexes of migration 3.
+"""
+
+DESCRIPTION = 'Lookup indexes'
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_user_branches_branch_name ON user_branches (branch_name)',
+    'CREATE INDEX IF NOT EXISTS idx_data_entries_branch_name ON data_entries (branch_name)',
+    'CREATE INDEX IF NOT EXISTS idx_data_entries_employee_name ON data_entries (employee_name)',
+    'CREATE INDEX IF NOT EXISTS idx_data_entries_created_at ON data_entries (created_at)',
+]
+
+def upgrade(cursor, db_type):
+    for statement in INDEXES:
+        cursor.execute(statement)
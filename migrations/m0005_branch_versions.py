@@ -0,0 +1,118 @@
+"""
+Version stamps for branch delta sync
+
+Every insert or update of a branch stamps it with the next value of a
+single counter (sync_versions row 'branches'), and every delete or code
+change leaves a tombstone, so /branches/sync can answer "what changed since
+version N" with an indexed range scan. The stamps are set by triggers, so
+branches written by scripts or bulk loads are versioned too.
+
+The counter is a row rather than a sequence: writers serialize on its row
+lock, so versions become visible in commit order and a client can never
+skip a change that committed late with a lower version.
+"""
+
+from migrations import table_columns
+
+DESCRIPTION = 'Branch version stamps and tombstones'
+
+SQLITE_TRIGGERS = [
+    '''CREATE TRIGGER IF NOT EXISTS branches_version_insert AFTER INSERT ON branches
+       BEGIN
+           UPDATE sync_versions SET version = version + 1 WHERE name = 'branches';
+           UPDATE branches SET version = (SELECT version FROM sync_versions WHERE name = 'branches')
+               WHERE id = NEW.id;
+           DELETE FROM branch_tombstones WHERE code = NEW.code;
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS branches_version_update AFTER UPDATE OF name, code ON branches
+       BEGIN
+           UPDATE sync_versions SET version = version + 1 WHERE name = 'branches';
+           UPDATE branches SET version = (SELECT version FROM sync_versions WHERE name = 'branches')
+               WHERE id = NEW.id;
+           INSERT OR REPLACE INTO branch_tombstones (code, version)
+               SELECT OLD.code, version FROM sync_versions WHERE name = 'branches' AND OLD.code <> NEW.code;
+           DELETE FROM branch_tombstones WHERE code = NEW.code;
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS branches_version_delete AFTER DELETE ON branches
+       BEGIN
+           UPDATE sync_versions SET version = version + 1 WHERE name = 'branches';
+           INSERT OR REPLACE INTO branch_tombstones (code, version)
+               SELECT OLD.code, version FROM sync_versions WHERE name = 'branches';
+       END''',
+]
+
+POSTGRES_FUNCTIONS = [
+    '''CREATE OR REPLACE FUNCTION branches_stamp_version() RETURNS trigger AS $$
+       BEGIN
+           IF TG_OP = 'UPDATE' THEN
+               IF NEW.name IS NOT DISTINCT FROM OLD.name AND NEW.code IS NOT DISTINCT FROM OLD.code THEN
+                   RETURN NEW;
+               END IF;
+           END IF;
+           UPDATE sync_versions SET version = version + 1 WHERE name = 'branches' RETURNING version INTO NEW.version;
+           IF TG_OP = 'UPDATE' THEN
+               IF NEW.code <> OLD.code THEN
+                   INSERT INTO branch_tombstones (code, version) VALUES (OLD.code, NEW.version)
+                       ON CONFLICT (code) DO UPDATE SET version = EXCLUDED.version;
+               END IF;
+           END IF;
+           DELETE FROM branch_tombstones WHERE code = NEW.code;
+           RETURN NEW;
+       END
+       $$ LANGUAGE plpgsql''',
+    '''CREATE OR REPLACE FUNCTION branches_tombstone() RETURNS trigger AS $$
+       DECLARE
+           new_version BIGINT;
+       BEGIN
+           UPDATE sync_versions SET version = version + 1 WHERE name = 'branches' RETURNING version INTO new_version;
+           INSERT INTO branch_tombstones (code, version) VALUES (OLD.code, new_version)
+               ON CONFLICT (code) DO UPDATE SET version = EXCLUDED.version;
+           RETURN OLD;
+       END
+       $$ LANGUAGE plpgsql''',
+]
+
+POSTGRES_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS branches_version_stamp ON branches',
+    '''CREATE TRIGGER branches_version_stamp BEFORE INSERT OR UPDATE ON branches
+       FOR EACH ROW EXECUTE FUNCTION branches_stamp_version()''',
+    'DROP TRIGGER IF EXISTS branches_version_delete ON branches',
+    '''CREATE TRIGGER branches_version_delete AFTER DELETE ON branches
+       FOR EACH ROW EXECUTE FUNCTION branches_tombstone()''',
+]
+
+def upgrade(cursor, db_type):
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS sync_versions (
+            name VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS branch_tombstones (
+            code VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL
+        )''')
+        cursor.execute("INSERT INTO sync_versions (name, version) VALUES ('branches', 1) ON CONFLICT (name) DO NOTHING")
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS sync_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS branch_tombstones (
+            code TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )''')
+        cursor.execute("INSERT OR IGNORE INTO sync_versions (name, version) VALUES ('branches', 1)")
+
+    if 'version' not in table_columns(cursor, db_type, 'branches'):
+        # Existing branches all belong to version 1
+        cursor.execute('ALTER TABLE branches ADD COLUMN version BIGINT NOT NULL DEFAULT 1')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_branches_version ON branches (version)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_branch_tombstones_version ON branch_tombstones (version)')
+
+    if db_type == 'postgresql':
+        for statement in POSTGRES_FUNCTIONS + POSTGRES_TRIGGERS:
+            cursor.execute(statement)
+    else:
+        for statement in SQLITE_TRIGGERS:
+            cursor.execute(statement)
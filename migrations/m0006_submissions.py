@@ -0,0 +1,30 @@
+"""
+Idempotency keys of data entry submissions
+
+The offline outbox of the data entry page replays a submission until it
+gets an answer, so the same form can reach /submit_data several times.
+Each submission carries a client generated key; the first request stores
+it here together with the ids of the entries it created, later requests
+with the same key get that result back instead of inserting again.
+"""
+
+DESCRIPTION = 'Submission idempotency keys'
+
+def upgrade(cursor, db_type):
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS submissions (
+            idempotency_key VARCHAR(64) PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            entry_ids TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS submissions (
+            idempotency_key TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            entry_ids TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )''')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_submissions_created_at ON submissions (created_at)')
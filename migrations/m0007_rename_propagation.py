@@ -0,0 +1,59 @@
+"""
+Rename propagation jobs
+
+data_entries stores the category, model, display type and POP material
+names as text. Renaming a taxonomy item records a job here (old and new
+name, plus the category / model names that scope it); rename_propagation.py
+then rewrites the matching entries in batches and reports its progress in
+rows_updated / total_rows. The (category, model) and (category,
+display_type) indexes serve the batch lookups of those jobs.
+"""
+
+DESCRIPTION = 'Rename propagation jobs'
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_taxonomy_renames_status ON taxonomy_renames (status, id)',
+    'CREATE INDEX IF NOT EXISTS idx_data_entries_category_model ON data_entries (category, model)',
+    'CREATE INDEX IF NOT EXISTS idx_data_entries_category_display_type ON data_entries (category, display_type)',
+]
+
+def upgrade(cursor, db_type):
+    if db_type == 'postgresql':
+        cursor.execute('''CREATE TABLE IF NOT EXISTS taxonomy_renames (
+            id SERIAL PRIMARY KEY,
+            data_type VARCHAR(20) NOT NULL,
+            item_id INTEGER NOT NULL,
+            category VARCHAR(100),
+            model VARCHAR(100),
+            old_name VARCHAR(200) NOT NULL,
+            new_name VARCHAR(200) NOT NULL,
+            status VARCHAR(10) NOT NULL DEFAULT 'pending',
+            rows_updated INTEGER NOT NULL DEFAULT 0,
+            total_rows INTEGER,
+            error TEXT,
+            worker VARCHAR(100),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )''')
+    else:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS taxonomy_renames (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data_type TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            category TEXT,
+            model TEXT,
+            old_name TEXT NOT NULL,
+            new_name TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            rows_updated INTEGER NOT NULL DEFAULT 0,
+            total_rows INTEGER,
+            error TEXT,
+            worker TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT,
+            finished_at TEXT
+        )''')
+
+    for statement in INDEXES:
+        cursor.execute(statement)
@@ -0,0 +1,46 @@
+"""
+Stamp branch versions after the write on PostgreSQL
+
+The BEFORE INSERT trigger of migration 5 also fired for the inserts that
+ON CONFLICT (code) DO NOTHING skips, which submissions.save_branch runs on
+every submission: each one bumped the shared counter and held its row lock
+until commit, so submissions ran one at a time and clients got delta syncs
+without changes. AFTER row triggers only fire for rows really written.
+Like the SQLite triggers, the update trigger is limited to name and code,
+so the trigger's own version update does not fire it again.
+"""
+
+DESCRIPTION = 'Branch version stamps in AFTER triggers'
+
+POSTGRES_STATEMENTS = [
+    '''CREATE OR REPLACE FUNCTION branches_stamp_version() RETURNS trigger AS $$
+       DECLARE
+           new_version BIGINT;
+       BEGIN
+           IF TG_OP = 'UPDATE' THEN
+               IF NEW.name IS NOT DISTINCT FROM OLD.name AND NEW.code IS NOT DISTINCT FROM OLD.code THEN
+                   RETURN NULL;
+               END IF;
+           END IF;
+           UPDATE sync_versions SET version = version + 1 WHERE name = 'branches' RETURNING version INTO new_version;
+           UPDATE branches SET version = new_version WHERE id = NEW.id;
+           IF TG_OP = 'UPDATE' THEN
+               IF NEW.code <> OLD.code THEN
+                   INSERT INTO branch_tombstones (code, version) VALUES (OLD.code, new_version)
+                       ON CONFLICT (code) DO UPDATE SET version = EXCLUDED.version;
+               END IF;
+           END IF;
+           DELETE FROM branch_tombstones WHERE code = NEW.code;
+           RETURN NULL;
+       END
+       $$ LANGUAGE plpgsql''',
+    'DROP TRIGGER IF EXISTS branches_version_stamp ON branches',
+    '''CREATE TRIGGER branches_version_stamp AFTER INSERT OR UPDATE OF name, code ON branches
+       FOR EACH ROW EXECUTE FUNCTION branches_stamp_version()''',
+]
+
+def upgrade(cursor, db_type):
+    # The SQLite triggers of migration 5 already run after the write
+    if db_type == 'postgresql':
+        for statement in POSTGRES_STATEMENTS:
+            cursor.execute(statement)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-request profiler for admins
+
+    init_profiling(app)
+
+An admin adds ?_profile=1 (or the header X-Profile: 1) to any request to
+run it under cProfile; ?_profile=sample runs it under a sampling profiler
+instead, which records whole call stacks every PROFILE_SAMPLE_INTERVAL_MS
+and costs much less than tracing every call:
+
+    cprofile   pstats file (snakeviz, python -m pstats) + text summary
+    sample     collapsed stacks ("a;b;c 42" lines, ready for flamegraph.pl
+               or speedscope) + text summary
+
+The response comes back unchanged with an X-Profile-Id header; the profile
+is written to PROFILE_DIR, which every gunicorn worker shares, so the
+follow-up requests for it can land on any worker. The directory is bounded
+(at most PROFILE_STORE_SIZE profiles and PROFILE_STORE_MAX_BYTES bytes, the
+oldest are dropped first) and browsable at /admin/profiles.
+
+Requests of non-admins ignore the flag. Set PROFILING_ENABLED=0 to switch
+the hook off completely.
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import marshal
+import threading
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request, session
+
+from metrics import counter
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '1').lower() not in ('0', 'false', 'no')
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_STORE_SIZE = int(os.getenv('PROFILE_STORE_SIZE', '20'))
+PROFILE_STORE_MAX_BYTES = int(os.getenv('PROFILE_STORE_MAX_BYTES', str(20 * 1024 * 1024)))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'X-Profile'
+MODES = ('cprofile', 'sample')
+
+# Lines of the text summary
+SUMMARY_LIMIT = 60
+
+PROFILES = counter('profiles_captured_total', 'Requests profiled on demand', ('mode',))
+
+class SamplingProfiler:
+    """
+    Records the call stack of one thread at a fixed interval
+
+    Runs a daemon thread reading sys._current_frames(), so the profiled
+    code is not slowed down by per-call tracing.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Stacks in the collapsed format of flamegraph.pl, root frame first"""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def summary(self, limit=SUMMARY_LIMIT):
+        """Functions by share of samples on top of the stack (self) and anywhere on it (total)"""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+
+        if not self.samples:
+            return 'No samples recorded - the request finished within one sampling interval.\n'
+
+        lines = [f'{self.samples} samples every {self.interval * 1000:g}ms', '',
+                 f"{'self %':>7} {'total %':>8}  function"]
+        for frame, count in total.most_common(limit):
+            lines.append(f'{own[frame] * 100 / self.samples:7.1f} {count * 100 / self.samples:8.1f}  {frame}')
+        return '\n'.join(lines) + '\n'
+
+_PROFILE_ID = re.compile(r'^[0-9a-f]{12}$')
+
+class ProfileStore:
+    """
+    Recent profiles of all workers in a directory, bounded by count and
+    total size
+
+    Each profile is <id>.data (the raw profile) plus <id>.json (metadata
+    and summary). Both are written to temporary files and renamed into
+    place, the .json last, so a listed profile is always complete.
+    """
+
+    def __init__(self, directory, max_entries, max_bytes):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, profile_id, extension):
+        return os.path.join(self.directory, f'{profile_id}.{extension}')
+
+    def _write(self, path, content):
+        temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def _read_meta(self, profile_id):
+        try:
+            with open(self._path(profile_id, 'json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Dropped by another worker meanwhile
+            return None
+
+    def _all_meta(self):
+        """Metadata with summary of the stored profiles, oldest first"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        profiles = [self._read_meta(name[:-5]) for name in names if name.endswith('.json')]
+        return sorted((profile for profile in profiles if profile), key=lambda profile: profile['stored_at'])
+
+    def _remove(self, profile_id):
+        for extension in ('json', 'data'):
+            try:
+                os.remove(self._path(profile_id, extension))
+            except FileNotFoundError:
+                pass
+
+    def add(self, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {key: value for key, value in profile.items() if key != 'data'}
+        meta['stored_at'] = time.time()
+        self._write(self._path(profile['id'], 'data'), profile['data'])
+        self._write(self._path(profile['id'], 'json'), json.dumps(meta).encode('utf-8'))
+
+        profiles = self._all_meta()
+        total = sum(stored['size'] for stored in profiles)
+        while profiles and (len(profiles) > self.max_entries or total > self.max_bytes):
+            dropped = profiles.pop(0)
+            total -= dropped['size']
+            self._remove(dropped['id'])
+
+    def get(self, profile_id):
+        if not _PROFILE_ID.match(profile_id or ''):
+            return None
+        profile = self._read_meta(profile_id)
+        if profile is None:
+            return None
+        try:
+            with open(self._path(profile_id, 'data'), 'rb') as f:
+                profile['data'] = f.read()
+        except FileNotFoundError:
+            return None
+        return profile
+
+    def list(self):
+        """Profile metadata, newest first"""
+        return [{key: value for key, value in profile.items() if key != 'summary'}
+                for profile in reversed(self._all_meta())]
+
+    def clear(self):
+        for profile in self._all_meta():
+            self._remove(profile['id'])
+
+_store = ProfileStore(PROFILE_DIR, PROFILE_STORE_SIZE, PROFILE_STORE_MAX_BYTES)
+
+def get_profile(profile_id):
+    """A stored profile with its data, or None when unknown or already evicted"""
+    return _store.get(profile_id)
+
+def list_profiles():
+    return _store.list()
+
+def clear_profiles():
+    _store.clear()
+
+def _requested_mode():
+    value = request.args.get(PROFILE_PARAM) or request.headers.get(PROFILE_HEADER)
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return None
+    value = value.lower()
+    return value if value in MODES else 'cprofile'
+
+def _pstats_summary(profiler, limit=SUMMARY_LIMIT):
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(limit)
+    return output.getvalue()
+
+def _before_request():
+    mode = _requested_mode()
+    if mode is None or not session.get('is_admin'):
+        return
+
+    if mode == 'sample':
+        profiler = SamplingProfiler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000)
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger) is already active on this thread
+            print(f"⚠️ Profiling skipped: {e}")
+            return
+
+    g._profile = (mode, profiler, time.perf_counter(), datetime.now())
+
+def _after_request(response):
+    state = g.pop('_profile', None)
+    if state is None:
+        return response
+
+    mode, profiler, started, started_at = state
+    duration = time.perf_counter() - started
+
+    if mode == 'sample':
+        profiler.stop()
+        data = profiler.collapsed().encode('utf-8')
+        summary = profiler.summary()
+    else:
+        profiler.disable()
+        profiler.create_stats()
+        data = marshal.dumps(profiler.stats)
+        summary = _pstats_summary(profiler)
+
+    profile_id = uuid.uuid4().hex[:12]
+    _store.add({
+        'id': profile_id,
+        'mode': mode,
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'endpoint': request.url_rule.rule if request.url_rule is not None else None,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 1),
+        'created_at': started_at.isoformat(timespec='seconds'),
+        'pid': os.getpid(),
+        'size': len(data) + len(summary),
+        'data': data,
+        'summary': summary
+    })
+    PROFILES.inc(mode=mode)
+
+    response.headers['X-Profile-Id'] = profile_id
+    return response
+
+def init_profiling(app):
+    """Register the profiler hooks on the Flask app"""
+    if not PROFILING_ENABLED:
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Propagation of taxonomy renames to data_entries
+
+data_entries keeps the category, model, display type and POP material
+names of every submission as text, so renaming a taxonomy item leaves the
+historic entries (and every export built from them) on the old name.
+Renames are therefore recorded as jobs in taxonomy_renames, in the same
+transaction as the rename itself, and applied afterwards:
+
+- every job is one indexed UPDATE repeated over batches of BATCH_SIZE rows
+  (WHERE id IN (SELECT id ... LIMIT n)), committed per batch together with
+  the job's rows_updated, so progress is visible and locks stay short;
+- jobs run strictly in the order they were recorded, since the names that
+  scope a job (the category of a model, the model of a POP material) are
+  the ones that were current when it was recorded;
+- a job is claimed with a compare-and-set on its status, so several
+  gunicorn workers never run the same job; a job whose worker stopped
+  heartbeating for STALE_AFTER seconds is taken over and resumed.
+
+The app starts a background thread after every rename (start_propagation)
+and /admin/renames reports the progress. Leftover jobs (e.g. after a
+restart) are resumed by the next rename, by the progress endpoint, or by
+hand:
+
+    python rename_propagation.py            # run pending jobs
+    python rename_propagation.py --status   # list recent jobs
+"""
+
+import os
+import uuid
+import argparse
+import threading
+from datetime import datetime, timedelta
+
+from metrics import counter
+
+BATCH_SIZE = int(os.getenv('RENAME_BATCH_SIZE', '1000'))
+STALE_AFTER = 300
+
+TYPES = ('categories', 'models', 'display_types', 'pop_materials')
+
+# Current name and scope (category, model names) of the renamed items
+SCOPE_QUERIES = {
+    'categories': 'SELECT c.id, c.name, NULL, NULL FROM categories c WHERE c.id IN ({values})',
+    'models': ('SELECT m.id, m.name, c.name, NULL FROM models m '
+               'LEFT JOIN categories c ON c.id = m.category_id WHERE m.id IN ({values})'),
+    'display_types': ('SELECT d.id, d.name, c.name, NULL FROM display_types d '
+                      'LEFT JOIN categories c ON c.id = d.category_id WHERE d.id IN ({values})'),
+    'pop_materials': ('SELECT p.id, p.name, c.name, m.name FROM pop_materials p '
+                      'LEFT JOIN models m ON m.id = p.model_id '
+                      'LEFT JOIN categories c ON c.id = m.category_id WHERE p.id IN ({values})')
+}
+
+# Materials are stored as comma separated lists
+MATERIAL_COLUMNS = ('selected_materials', 'missing_materials')
+
+JOB_COLUMNS = ('id', 'data_type', 'item_id', 'category', 'model', 'old_name', 'new_name', 'status',
+               'rows_updated', 'total_rows', 'error', 'created_at', 'updated_at', 'finished_at')
+
+RENAMES_RECORDED = counter('taxonomy_renames_recorded_total', 'Rename propagation jobs recorded by type', ('type',))
+RENAME_JOBS = counter('taxonomy_rename_jobs_total', 'Finished rename propagation jobs by outcome', ('outcome',))
+RENAMED_ENTRIES = counter('taxonomy_renamed_entries_total', 'data_entries rows rewritten by rename jobs', ('type',))
+
+class LostClaim(Exception):
+    """Another worker took the job over"""
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def _placeholder(db_type):
+    return '%s' if db_type == 'postgresql' else '?'
+
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def record_renames(cursor, db_type, data_type, renames, created_at):
+    """
+    Record propagation jobs for items about to be renamed
+
+    Call before the UPDATE of the taxonomy table, in the same transaction:
+    the old names are read from the table. Items whose name does not change
+    are skipped, and so are POP material names with a comma, which cannot
+    be told apart inside the stored material lists. The caller commits and
+    then calls start_propagation().
+
+    Args:
+        renames: (item id, new name) pairs
+
+    Returns:
+        int: jobs recorded
+    """
+    new_names = {int(item_id): name for item_id, name in renames}
+    if data_type not in SCOPE_QUERIES or not new_names:
+        return 0
+
+    placeholder = _placeholder(db_type)
+    ids = sorted(new_names)
+    cursor.execute(SCOPE_QUERIES[data_type].format(values=', '.join([placeholder] * len(ids))), ids)
+
+    jobs = []
+    for item_id, old_name, category, model in cursor.fetchall():
+        new_name = new_names[item_id]
+        if old_name == new_name:
+            continue
+        if data_type == 'pop_materials' and (',' in old_name or ',' in new_name):
+            continue
+        jobs.append((data_type, item_id, category, model, old_name, new_name, created_at))
+
+    if jobs:
+        cursor.executemany(f'''INSERT INTO taxonomy_renames
+            (data_type, item_id, category, model, old_name, new_name, created_at)
+            VALUES ({', '.join([placeholder] * 7)})''', jobs)
+        RENAMES_RECORDED.inc(len(jobs), type=data_type)
+    return len(jobs)
+
+def job_statement(job, placeholder):
+    """
+    SET and WHERE clauses (with their parameters) that rewrite the
+    data_entries rows of one job; rewritten rows no longer match WHERE
+    """
+    data_type, old_name, new_name = job['data_type'], job['old_name'], job['new_name']
+    if data_type == 'categories':
+        return f'category = {placeholder}', [new_name], f'category = {placeholder}', [old_name]
+
+    if data_type in ('models', 'display_types'):
+        column = 'model' if data_type == 'models' else 'display_type'
+        return (f'{column} = {placeholder}', [new_name],
+                f'category = {placeholder} AND {column} = {placeholder}', [job['category'], old_name])
+
+    # ',a,b,' with ',old,' replaced, without the added commas
+    assignments, set_params, matches, match_params = [], [], [], []
+    for column in MATERIAL_COLUMNS:
+        replaced = f"REPLACE(',' || {column} || ',', {placeholder}, {placeholder})"
+        assignments.append(f'{column} = SUBSTR({replaced}, 2, LENGTH({replaced}) - 2)')
+        set_params += [f',{old_name},', f',{new_name},'] * 2
+        matches.append(f"',' || {column} || ',' LIKE {placeholder} ESCAPE '\\'")
+        match_params.append(f'%,{_like_escape(old_name)},%')
+    return (', '.join(assignments), set_params,
+            f"category = {placeholder} AND model = {placeholder} AND ({' OR '.join(matches)})",
+            [job['category'], job['model']] + match_params)
+
+def claim_next(conn, db_type, worker):
+    """
+    Claim the oldest unfinished job
+
+    Returns:
+        dict: the job, or None when there is none or the oldest one is
+              being run by another worker (which continues with the rest)
+    """
+    placeholder = _placeholder(db_type)
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM taxonomy_renames WHERE status IN ('pending', 'running') ORDER BY id LIMIT 1")
+    row = cursor.fetchone()
+    if row is None:
+        conn.commit()
+        return None
+
+    now = datetime.now()
+    stale = (now - timedelta(seconds=STALE_AFTER)).strftime('%Y-%m-%d %H:%M:%S')
+    cursor.execute(f'''UPDATE taxonomy_renames SET status = 'running', worker = {placeholder}, updated_at = {placeholder}
+        WHERE id = {placeholder} AND (status = 'pending' OR (status = 'running' AND updated_at < {placeholder}))''',
+                   (worker, now.strftime('%Y-%m-%d %H:%M:%S'), row[0], stale))
+    if cursor.rowcount != 1:
+        conn.commit()
+        return None
+
+    cursor.execute(f'SELECT {", ".join(JOB_COLUMNS)} FROM taxonomy_renames WHERE id = {placeholder}', (row[0],))
+    job = dict(zip(JOB_COLUMNS, cursor.fetchone()))
+    conn.commit()
+    return job
+
+def _heartbeat(cursor, placeholder, job, worker, **fields):
+    assignments = ''.join(f', {column} = {placeholder}' for column in fields)
+    cursor.execute(f'UPDATE taxonomy_renames SET updated_at = {placeholder}{assignments} '
+                   f'WHERE id = {placeholder} AND worker = {placeholder}',
+                   [_now()] + list(fields.values()) + [job['id'], worker])
+    if cursor.rowcount != 1:
+        raise LostClaim(f"Job {job['id']} was taken over by another worker")
+
+def run_job(conn, db_type, job, worker, batch_size=BATCH_SIZE):
+    """
+    Rewrite the entries of one claimed job batch by batch; a resumed job
+    continues where it stopped since rewritten rows no longer match
+
+    Returns:
+        int: rows rewritten by this run
+    """
+    placeholder = _placeholder(db_type)
+    set_sql, set_params, where_sql, where_params = job_statement(job, placeholder)
+    cursor = conn.cursor()
+
+    cursor.execute(f'SELECT COUNT(*) FROM data_entries WHERE {where_sql}', where_params)
+    remaining = cursor.fetchone()[0]
+    rows_updated = job['rows_updated'] or 0
+    _heartbeat(cursor, placeholder, job, worker, total_rows=rows_updated + remaining)
+    conn.commit()
+
+    updated_now = 0
+    while True:
+        cursor.execute(f'UPDATE data_entries SET {set_sql} WHERE id IN '
+                       f'(SELECT id FROM data_entries WHERE {where_sql} LIMIT {placeholder})',
+                       set_params + where_params + [batch_size])
+        updated = max(cursor.rowcount, 0)
+        rows_updated += updated
+        updated_now += updated
+        done = updated < batch_size
+        if done:
+            _heartbeat(cursor, placeholder, job, worker, rows_updated=rows_updated, status='done', finished_at=_now())
+        else:
+            _heartbeat(cursor, placeholder, job, worker, rows_updated=rows_updated)
+        conn.commit()
+        if done:
+            break
+
+    RENAMED_ENTRIES.inc(updated_now, type=job['data_type'])
+    return updated_now
+
+def run_pending(connect, batch_size=BATCH_SIZE, worker=None):
+    """
+    Run unfinished jobs in order until none is left (or another worker is
+    on the oldest one); connect() returns (conn, db_type)
+
+    Returns:
+        list: {'id', 'status', 'rows'} of the jobs run
+    """
+    worker = worker or f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+    conn, db_type = connect()
+    placeholder = _placeholder(db_type)
+    finished = []
+    try:
+        while True:
+            job = claim_next(conn, db_type, worker)
+            if job is None:
+                break
+
+            try:
+                rows = run_job(conn, db_type, job, worker, batch_size)
+            except LostClaim as e:
+                conn.rollback()
+                print(f"⚠️ {e}")
+                break
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ Rename job {job['id']} ({job['old_name']} -> {job['new_name']}) failed: {e}")
+                cursor = conn.cursor()
+                cursor.execute(f'''UPDATE taxonomy_renames SET status = 'failed', error = {placeholder},
+                    updated_at = {placeholder}, finished_at = {placeholder} WHERE id = {placeholder} AND worker = {placeholder}''',
+                               (str(e)[:500], _now(), _now(), job['id'], worker))
+                conn.commit()
+                RENAME_JOBS.inc(outcome='failed')
+                finished.append({'id': job['id'], 'status': 'failed', 'rows': 0})
+                continue
+
+            print(f"✅ Renamed {job['old_name']} -> {job['new_name']} in {rows} data entries")
+            RENAME_JOBS.inc(outcome='done')
+            finished.append({'id': job['id'], 'status': 'done', 'rows': rows})
+    finally:
+        conn.close()
+    return finished
+
+_state = {'thread': None, 'wake': False}
+_state_lock = threading.Lock()
+
+def start_propagation(connect):
+    """
+    Run pending jobs in a background thread of this process; a thread that
+    is already running picks the new jobs up before it stops
+    """
+    with _state_lock:
+        _state['wake'] = True
+        if _state['thread'] is not None:
+            return
+        thread = threading.Thread(target=_propagation_loop, args=(connect,), name='rename-propagation', daemon=True)
+        _state['thread'] = thread
+    thread.start()
+
+def _propagation_loop(connect):
+    while True:
+        with _state_lock:
+            if not _state['wake']:
+                _state['thread'] = None
+                return
+            _state['wake'] = False
+        try:
+            run_pending(connect)
+        except Exception as e:
+            print(f"❌ Rename propagation stopped: {e}")
+
+def recent_jobs(cursor, db_type, limit=20):
+    """Newest jobs first, as dicts with JSON friendly values"""
+    cursor.execute(f'SELECT {", ".join(JOB_COLUMNS)} FROM taxonomy_renames ORDER BY id DESC LIMIT {_placeholder(db_type)}',
+                   (limit,))
+    jobs = []
+    for row in cursor.fetchall():
+        job = dict(zip(JOB_COLUMNS, row))
+        for column in ('created_at', 'updated_at', 'finished_at'):
+            if job[column] is not None:
+                job[column] = str(job[column])
+        jobs.append(job)
+    return jobs
+
+def unfinished_jobs(cursor):
+    cursor.execute("SELECT COUNT(*) FROM taxonomy_renames WHERE status IN ('pending', 'running')")
+    return cursor.fetchone()[0]
+
+def main():
+    from database_config import get_database_connection
+
+    parser = argparse.ArgumentParser(description='Apply recorded taxonomy renames to data_entries')
+    parser.add_argument('--status', action='store_true', help='list recent jobs instead of running them')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'rows rewritten per batch (default: {BATCH_SIZE})')
+    args = parser.parse_args()
+
+    if args.status:
+        conn, db_type = get_database_connection()
+        try:
+            for job in recent_jobs(conn.cursor(), db_type):
+                total = job['total_rows'] if job['total_rows'] is not None else '?'
+                print(f"{job['id']:6} {job['status']:8} {job['data_type']:14} {job['old_name']} -> {job['new_name']} "
+                      f"({job['rows_updated']}/{total})" + (f" {job['error']}" if job['error'] else ''))
+        finally:
+            conn.close()
+        return
+
+    finished = run_pending(get_database_connection, batch_size=args.batch_size)
+    print(f"🔁 {len(finished)} rename jobs run, {sum(job['rows'] for job in finished)} data entries updated")
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +0,0 @@
-#!/usr/bin/env python3
-"""
-Simple Complete Fix - One script to fix everything
-"""
-
-import os
-import sys
-
-def fix_everything():
-    """Fix all issues in one go"""
-    print("🔧 Simple Complete Fix - Fixing Everything...")
-    
-    try:
-        # Connect to database
-        if os.getenv('DATABASE_URL'):
-            from database_config import get_database_connection
-            conn, db_type = get_database_connection()
-            print("✅ Connected to production PostgreSQL")
-        else:
-            import sqlite3
-            conn = sqlite3.connect('database.db')
-            db_type = 'sqlite'
-            print("✅ Connected to local SQLite")
-        
-        cursor = conn.cursor()
-        
-        # 1. Create user_branches table
-        print("🔧 Creating user_branches table...")
-        if db_type == 'postgresql':
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_branches (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER NOT NULL,
-                    branch_name VARCHAR(200) NOT NULL,
-                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, branch_name)
-                )
-            ''')
-        else:
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_branches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    branch_name TEXT NOT NULL,
-                    created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, branch_name)
-                )
-            ''')
-        print("✅ user_branches table ready")
-        
-        # 2. Verify and count all tables
-        print("📊 Checking all tables...")
-        tables_to_check = ['users', 'categories', 'models', 'display_types', 'data_entries', 'user_branches']
-        
-        for table in tables_to_check:
-            try:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                print(f"  ✅ {table}: {count} records")
-            except Exception as e:
-                print(f"  ⚠️ {table}: {e}")
-        
-        # 3. Check for old schema tables
-        print("🔧 Checking for old schema tables...")
-        old_tables = ['pop_materials_db']
-        for table in old_tables:
-            try:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                print(f"  ℹ️ {table} (old schema): {count} records")
-            except:
-                print(f"  ℹ️ {table}: not found (normal)")
-        
-        # 4. Add some test data to prevent empty results
-        print("🔧 Adding test data...")
-        try:
-            # Get first user
-            cursor.execute("SELECT id FROM users LIMIT 1")
-            user_result = cursor.fetchone()
-            if user_result:
-                user_id = user_result[0]
-                # Add test branch
-                if db_type == 'postgresql':
-                    cursor.execute('''
-                        INSERT INTO user_branches (user_id, branch_name) 
-                        VALUES (%s, %s) ON CONFLICT DO NOTHING
-                    ''', (user_id, 'Main Branch'))
-                else:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO user_branches (user_id, branch_name) 
-                        VALUES (?, ?)
-                    ''', (user_id, 'Main Branch'))
-                print("✅ Test branch data added")
-        except Exception as e:
-            print(f"⚠️ Test data warning: {e}")
-        
-        conn.commit()
-        conn.close()
-        
-        print("\n🎉 Simple Complete Fix Done!")
-        print("✅ All critical tables verified")
-        print("✅ user_branches table created")
-        print("✅ Test data added")
-        print("✅ Ready for use!")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-if __name__ == "__main__":
-    success = fix_everything()
-    if not success:
-        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Slow query log with captured query plans
+
+The instrumented cursors of instrumentation.py call log_query() after every
+execute. Queries slower than SLOW_QUERY_LOG_MS are written as one JSON
+object per line to a rotating log file:
+
+    {"ts": "...", "pid": 123, "endpoint": "GET /export_excel", "db_type": "postgresql",
+     "duration_ms": 812.4, "sql": "SELECT * FROM data_entries WHERE branch_name = ?",
+     "params": ["str"], "plan": ...}
+
+The SQL is normalized (literals replaced by ?, whitespace collapsed) and
+only the shape of the parameters is kept, never their values, so the log
+holds no passwords or personal data.
+
+Queries slower than SLOW_QUERY_EXPLAIN_MS also get their plan captured:
+EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL - only for SELECT, since ANALYZE
+runs the statement again - and EXPLAIN QUERY PLAN on SQLite. The same
+normalized query is explained at most once per SLOW_QUERY_EXPLAIN_INTERVAL
+seconds per worker, so a slow hot path does not double the database load.
+
+Environment:
+    SLOW_QUERY_LOG_ENABLED          1 (set to 0 to disable)
+    SLOW_QUERY_LOG_MS               200
+    SLOW_QUERY_EXPLAIN_MS           1000
+    SLOW_QUERY_EXPLAIN_INTERVAL     300
+    SLOW_QUERY_LOG_FILE             logs/slow_queries.log ('-' for stderr)
+    SLOW_QUERY_LOG_MAX_BYTES        10485760
+    SLOW_QUERY_LOG_BACKUPS          5
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from metrics import counter
+
+SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', '1').lower() not in ('0', 'false', 'no')
+SLOW_QUERY_LOG_MS = float(os.getenv('SLOW_QUERY_LOG_MS', '200'))
+SLOW_QUERY_EXPLAIN_MS = float(os.getenv('SLOW_QUERY_EXPLAIN_MS', '1000'))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL', '300'))
+SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE', os.path.join('logs', 'slow_queries.log'))
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv('SLOW_QUERY_LOG_BACKUPS', '5'))
+
+SLOW_QUERIES = counter('db_slow_queries_total', 'Queries slower than SLOW_QUERY_LOG_MS', ('db_type',))
+
+_logger = None
+_logger_lock = threading.Lock()
+
+_last_explained = {}
+_explain_lock = threading.Lock()
+
+# Normalization patterns, applied in order
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|%\(\w+\)s|\?|(?<!:):[A-Za-z_]\w*')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_VALUES_LIST = re.compile(r'(VALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+_WRITE_STATEMENT = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE)
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape so identical queries group together
+
+    >>> normalize_sql("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s)")
+    'SELECT * FROM t WHERE a = ? AND b IN (...)'
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    sql = _VALUES_LIST.sub(r'\1, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+def params_shape(params):
+    """Type names of the parameters, without their values"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {str(key): type(value).__name__ for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        shape = [type(value).__name__ for value in params[:20]]
+        if len(params) > 20:
+            shape.append(f'... {len(params) - 20} more')
+        return shape
+    return type(params).__name__
+
+def _get_logger():
+    global _logger
+
+    if _logger is not None:
+        return _logger
+
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger('slow_query')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+            if SLOW_QUERY_LOG_FILE == '-':
+                handler = logging.StreamHandler(sys.stderr)
+            else:
+                log_dir = os.path.dirname(SLOW_QUERY_LOG_FILE)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                handler = RotatingFileHandler(
+                    SLOW_QUERY_LOG_FILE,
+                    maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=SLOW_QUERY_LOG_BACKUPS,
+                    encoding='utf-8'
+                )
+
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            _logger = logger
+
+    return _logger
+
+def _should_explain(normalized):
+    now = time.monotonic()
+    with _explain_lock:
+        last = _last_explained.get(normalized)
+        if last is not None and now - last < SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        _last_explained[normalized] = now
+        return True
+
+def _is_select(sql):
+    words = sql.lstrip(' \t\n(').split(None, 1)
+    if not words or words[0].upper() not in ('SELECT', 'WITH'):
+        return False
+    # WITH ... INSERT/UPDATE/DELETE would be executed again by ANALYZE
+    return not _WRITE_STATEMENT.search(sql)
+
+def capture_plan(conn, db_type, sql, params):
+    """
+    Run EXPLAIN for a statement on the connection that ran it
+
+    Returns:
+        the plan (PostgreSQL JSON plan or list of SQLite plan rows), or None
+        when the statement is not explainable
+    """
+    cursor = conn.cursor()
+    try:
+        if db_type == 'postgresql':
+            if not _is_select(sql):
+                return None
+
+            # A failing EXPLAIN must not abort the caller's transaction
+            cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            except Exception:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                raise
+
+            return plan
+
+        # EXPLAIN QUERY PLAN never executes the statement
+        if params:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        else:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [list(row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+def log_query(conn, db_type, sql, params, duration, endpoint=None, explain=True):
+    """
+    Record a query if it was slow
+
+    Args:
+        conn: raw driver connection that ran the query (used for EXPLAIN)
+        db_type: 'postgresql' or 'sqlite'
+        sql: statement as sent to the driver
+        params: its parameters
+        duration: execution time in seconds
+        endpoint: route that ran the query, if any
+        explain: allow capturing the plan (False for executemany)
+    """
+    duration_ms = duration * 1000
+    if not SLOW_QUERY_LOG_ENABLED or duration_ms < SLOW_QUERY_LOG_MS or not isinstance(sql, str):
+        return
+
+    SLOW_QUERIES.inc(db_type=db_type)
+    normalized = normalize_sql(sql)
+
+    record = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'pid': os.getpid(),
+        'endpoint': endpoint,
+        'db_type': db_type,
+        'duration_ms': round(duration_ms, 1),
+        'sql': normalized,
+        'params': params_shape(params)
+    }
+
+    if explain and duration_ms >= SLOW_QUERY_EXPLAIN_MS and _should_explain(normalized):
+        try:
+            record['plan'] = capture_plan(conn, db_type, sql, params)
+        except Exception as e:
+            record['plan_error'] = str(e)
+
+    try:
+        _get_logger().info(json.dumps(record, default=str, ensure_ascii=False))
+    except Exception as e:
+        print(f"⚠️ Could not write slow query log: {e}")
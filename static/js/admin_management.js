@@ -1,12 +1,34 @@
 // Admin Management JavaScript
+//
+// The tables are virtualized: /get_management_data is read one page at a
+// time (PAGE_SIZE rows, fetched as they scroll into view) and only the rows
+// in the visible window plus OVERSCAN rows are in the DOM, kept in place by
+// two spacer rows of the height of the rows above and below. Thousands of
+// POP materials therefore cost a few dozen table rows. Sorting and name
+// search run on the server.
+
+const PAGE_SIZE = 100;
+const ROW_HEIGHT = 48;      // px, fixed by .virtual-table rows in style.css
+const OVERSCAN = 10;
+const SEARCH_DELAY = 300;   // ms
+const RENAME_POLL_INTERVAL = 2000;  // ms
+
+const DATA_TYPES = ['categories', 'models', 'display_types', 'pop_materials'];
+const CATEGORY_FILTERS = {
+    models: 'models-category-filter',
+    display_types: 'display-types-category-filter',
+    pop_materials: 'pop-materials-category-filter'
+};
 
 let currentDataType = 'categories';
 let deleteItemId = null;
 let deleteItemType = null;
-let currentContext = {
-    category: '',
-    model: ''
-};
+let categoriesByName = {};
+let popFilterModels = {};   // model name -> id of the POP materials model filter
+let renamePolling = false;
+
+// Per table: query, loaded rows (sparse, by index) and pages in flight
+const grids = {};
 
 // Initialize management interface
 document.addEventListener('DOMContentLoaded', function() {
@@ -17,20 +39,29 @@ function initializeManagement() {
     // Setup tab switching
     setupTabs();
     
-    // Load initial data only for categories (lightweight)
+    DATA_TYPES.forEach(dataType => {
+        grids[dataType] = {
+            category: '', model: '', search: '', sort: 'name', order: 'asc',
+            rows: [], total: null, pending: new Set(), generation: 0, scheduled: false
+        };
+        setupGrid(dataType);
+    });
+    
     loadData('categories');
     loadCategories();
     
     // Setup form submission
     document.getElementById('dataForm').addEventListener('submit', handleFormSubmit);
+    setupCategoryModelListener();
     
     // Setup category filters
     setupCategoryFilters();
     
-    // Show initial empty state for other tabs
-    showEmptyState('models');
-    showEmptyState('display_types');
-    showEmptyState('pop_materials');
+    setupTaxonomyImport();
+    document.getElementById('clone-target-search').addEventListener('input', filterCloneTargets);
+    
+    // Renames still being carried over to the data entries
+    watchRenames();
 }
 
 function setupTabs() {
@@ -52,49 +83,88 @@ function setupTabs() {
             // Update current data type
             currentDataType = tabName;
             
-            // Only load data for categories automatically, others need filter selection
-            if (tabName === 'categories') {
-                loadData(tabName);
+            // Load a table the first time its tab is opened
+            if (grids[tabName].total === null && grids[tabName].pending.size === 0) {
+                loadData(tabName, grids[tabName].category, grids[tabName].model);
             } else {
-                showEmptyState(tabName);
+                renderGrid(tabName);
             }
+            updateContextIndicator();
         });
     });
 }
 
-function setupCategoryFilters() {
-    const filters = ['models-category-filter', 'display-types-category-filter', 'pop-materials-category-filter'];
+function setupGrid(dataType) {
+    const container = document.getElementById(`${dataType}-scroll`);
+    const table = document.getElementById(`${dataType}-table`);
+    const search = document.getElementById(`${dataType}-search`);
+    
+    if (container) {
+        container.addEventListener('scroll', () => scheduleRender(dataType));
+    }
+    
+    if (table) {
+        table.querySelectorAll('th[data-sort]').forEach(header => {
+            header.addEventListener('click', () => {
+                const grid = grids[dataType];
+                if (grid.sort === header.dataset.sort) {
+                    grid.order = grid.order === 'asc' ? 'desc' : 'asc';
+                } else {
+                    grid.sort = header.dataset.sort;
+                    grid.order = 'asc';
+                }
+                updateSortIndicators(dataType);
+                resetGrid(dataType);
+            });
+        });
+        
+        // Row buttons (rows are re-rendered on scroll, so delegate)
+        table.querySelector('tbody').addEventListener('click', event => {
+            const button = event.target.closest('button[data-action]');
+            if (!button) return;
+            const id = parseInt(button.dataset.id, 10);
+            if (button.dataset.action === 'edit') {
+                editItem(dataType, id);
+            } else {
+                deleteItem(dataType, id);
+            }
+        });
+        updateSortIndicators(dataType);
+    }
     
-    filters.forEach(filterId => {
+    if (search) {
+        let timer = null;
+        search.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => {
+                grids[dataType].search = search.value.trim();
+                resetGrid(dataType);
+            }, SEARCH_DELAY);
+        });
+    }
+}
+
+function updateSortIndicators(dataType) {
+    const grid = grids[dataType];
+    document.querySelectorAll(`#${dataType}-table th[data-sort]`).forEach(header => {
+        header.classList.remove('sorted-asc', 'sorted-desc');
+        if (header.dataset.sort === grid.sort) {
+            header.classList.add(`sorted-${grid.order}`);
+        }
+    });
+}
+
+function setupCategoryFilters() {
+    Object.entries(CATEGORY_FILTERS).forEach(([dataType, filterId]) => {
         const filter = document.getElementById(filterId);
         if (filter) {
             filter.addEventListener('change', function() {
-                const dataType = filterId.split('-')[0] === 'models' ? 'models' : 
-                               filterId.split('-')[0] === 'display' ? 'display_types' : 'pop_materials';
-                
-                if (this.value === '') {
-                    // If no filter selected, show empty state
-                    showEmptyState(dataType);
-                    if (dataType === 'pop_materials') {
-                        currentContext.category = '';
-                        currentContext.model = '';
-                        updateModelFilter(''); // Clear model filter
-                    } else {
-                        currentContext.category = '';
-                    }
-                    updateContextIndicator();
-                } else {
-                    // Load data when filter is selected
-                    if (dataType === 'pop_materials') {
-                        updateModelFilter(this.value);
-                        currentContext.category = this.value;
-                        currentContext.model = ''; // Reset model when category changes
-                        loadData(dataType, this.value, '');
-                    } else {
-                        currentContext.category = this.value;
-                        loadData(dataType, this.value);
-                    }
+                if (dataType === 'pop_materials') {
+                    // Reset model when category changes
+                    grids.pop_materials.model = '';
+                    updateModelFilter(this.value);
                 }
+                loadData(dataType, this.value, '');
             });
         }
     });
@@ -104,16 +174,7 @@ function setupCategoryFilters() {
     if (modelFilter) {
         modelFilter.addEventListener('change', function() {
             const categoryFilter = document.getElementById('pop-materials-category-filter');
-            currentContext.model = this.value;
-            
-            if (categoryFilter.value === '') {
-                // If no category selected, show empty state
-                showEmptyState('pop_materials');
-                updateContextIndicator();
-            } else {
-                // Load data with both category and model filters
-                loadData('pop_materials', categoryFilter.value, this.value);
-            }
+            loadData('pop_materials', categoryFilter.value, this.value);
         });
     }
 }
@@ -123,6 +184,10 @@ function loadCategories() {
         .then(response => response.json())
         .then(data => {
             if (data.success) {
+                categoriesByName = {};
+                data.data.forEach(category => {
+                    categoriesByName[category.name] = category.id;
+                });
                 updateCategoryFilters(data.data);
                 updateCategorySelect(data.data);
             }
@@ -131,11 +196,10 @@ function loadCategories() {
 }
 
 function updateCategoryFilters(categories) {
-    const filters = ['models-category-filter', 'display-types-category-filter', 'pop-materials-category-filter'];
-    
-    filters.forEach(filterId => {
+    Object.values(CATEGORY_FILTERS).forEach(filterId => {
         const filter = document.getElementById(filterId);
         if (filter) {
+            const selected = filter.value;
             filter.innerHTML = '<option value="">All Categories</option>';
             categories.forEach(category => {
                 const option = document.createElement('option');
@@ -143,6 +207,7 @@ function updateCategoryFilters(categories) {
                 option.textContent = category.name;
                 filter.appendChild(option);
             });
+            filter.value = categoriesByName[selected] ? selected : '';
         }
     });
 }
@@ -153,55 +218,296 @@ function updateCategorySelect(categories) {
         select.innerHTML = '<option value="">Select Category</option>';
         categories.forEach(category => {
             const option = document.createElement('option');
-            option.value = category.name;
+            option.value = category.id;
             option.textContent = category.name;
             select.appendChild(option);
         });
     }
 }
 
+// Show a table from its first row with new filters
 function loadData(dataType, categoryFilter = '', modelFilter = '') {
-    let url = `/get_management_data/${dataType}`;
-    const params = new URLSearchParams();
-    
-    if (categoryFilter) {
-        params.append('category', categoryFilter);
-        currentContext.category = categoryFilter;
+    const grid = grids[dataType];
+    grid.category = categoryFilter;
+    grid.model = modelFilter;
+    if (dataType === 'pop_materials') {
+        // Copying needs one source model
+        document.getElementById('clone-materials-btn').disabled = !modelFilter;
     }
-    if (modelFilter) {
-        params.append('model', modelFilter);
-        currentContext.model = modelFilter;
+    if (dataType === currentDataType || dataType === 'pop_materials') {
+        updateContextIndicator();
     }
+    resetGrid(dataType);
+}
+
+// Drop the loaded rows and fetch again, from the top or at the same place
+function resetGrid(dataType, keepScroll = false) {
+    const grid = grids[dataType];
+    grid.generation++;
+    grid.rows = [];
+    grid.total = null;
+    grid.pending.clear();
     
-    if (params.toString()) {
-        url += `?${params.toString()}`;
+    const container = document.getElementById(`${dataType}-scroll`);
+    if (container && !keepScroll) {
+        container.scrollTop = 0;
     }
     
-    // Show loading state
-    showLoadingState(dataType);
+    if (!keepScroll) {
+        showLoadingState(dataType);
+    }
+    const first = container ? Math.floor(container.scrollTop / ROW_HEIGHT) : 0;
+    fetchPage(dataType, Math.floor(first / PAGE_SIZE) + 1);
+}
+
+function fetchPage(dataType, page) {
+    const grid = grids[dataType];
+    if (grid.pending.has(page)) return;
+    grid.pending.add(page);
+    
+    const generation = grid.generation;
+    const params = new URLSearchParams({ page: page, page_size: PAGE_SIZE, sort: grid.sort, order: grid.order });
+    if (grid.category) params.append('category', grid.category);
+    if (grid.model) params.append('model', grid.model);
+    if (grid.search) params.append('search', grid.search);
     
-    fetch(url)
+    fetch(`/get_management_data/${dataType}?${params.toString()}`)
         .then(response => response.json())
         .then(data => {
+            // A newer query replaced this one while it was loading
+            if (generation !== grid.generation) return;
+            grid.pending.delete(page);
             if (data.success) {
-                updateTable(dataType, data.data);
-                updateContextIndicator();
+                grid.total = data.total;
+                data.data.forEach((item, index) => {
+                    grid.rows[(page - 1) * PAGE_SIZE + index] = item;
+                });
+                updateGridCount(dataType);
+                renderGrid(dataType);
             } else {
                 showMessage('Error loading data: ' + data.message, 'error');
             }
         })
         .catch(error => {
+            if (generation !== grid.generation) return;
+            grid.pending.delete(page);
             console.error('Error loading data:', error);
             showMessage('Error loading data', 'error');
         });
 }
 
+function scheduleRender(dataType) {
+    const grid = grids[dataType];
+    if (grid.scheduled) return;
+    grid.scheduled = true;
+    requestAnimationFrame(() => {
+        grid.scheduled = false;
+        renderGrid(dataType);
+    });
+}
+
+// Render the rows in view and fetch the pages they need
+function renderGrid(dataType) {
+    const grid = grids[dataType];
+    const container = document.getElementById(`${dataType}-scroll`);
+    const tableBody = document.querySelector(`#${dataType}-table tbody`);
+    if (!tableBody || grid.total === null) return;
+    
+    if (grid.total === 0) {
+        showEmptyState(dataType);
+        return;
+    }
+    
+    const viewport = container ? container.clientHeight : ROW_HEIGHT * 20;
+    const scrollTop = container ? container.scrollTop : 0;
+    const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+    const last = Math.min(grid.total, Math.ceil((scrollTop + viewport) / ROW_HEIGHT) + OVERSCAN);
+    const colSpan = getColumnCount(dataType);
+    
+    let html = spacerRow(first * ROW_HEIGHT, colSpan);
+    for (let index = first; index < last; index++) {
+        const item = grid.rows[index];
+        if (item) {
+            html += renderRow(dataType, item);
+        } else {
+            html += `<tr class="grid-row"><td colspan="${colSpan}" class="table-loading">Loading...</td></tr>`;
+            fetchPage(dataType, Math.floor(index / PAGE_SIZE) + 1);
+        }
+    }
+    html += spacerRow((grid.total - last) * ROW_HEIGHT, colSpan);
+    tableBody.innerHTML = html;
+}
+
+function spacerRow(height, colSpan) {
+    return height > 0 ? `<tr class="virtual-spacer"><td colspan="${colSpan}" style="height: ${height}px"></td></tr>` : '';
+}
+
+function renderRow(dataType, item) {
+    const cells = [item.id, escapeHtml(item.name)];
+    if (dataType === 'pop_materials') {
+        cells.push(escapeHtml(item.model || 'N/A'));
+    }
+    if (dataType !== 'categories') {
+        cells.push(escapeHtml(item.category || 'N/A'));
+    }
+    cells.push(formatDate(item.created_at || item.created_date));
+    
+    return `<tr class="grid-row" data-id="${item.id}">${cells.map(cell => `<td title="${cell}">${cell}</td>`).join('')}
+        <td>
+            <button class="btn btn-sm btn-secondary" data-action="edit" data-id="${item.id}">Edit</button>
+            <button class="btn btn-sm btn-danger" data-action="delete" data-id="${item.id}">Delete</button>
+        </td></tr>`;
+}
+
+function updateGridCount(dataType) {
+    const count = document.getElementById(`${dataType}-count`);
+    if (count) {
+        const total = grids[dataType].total;
+        count.textContent = total === null ? '' : `${total} ${total === 1 ? 'item' : 'items'}`;
+    }
+}
+
+function findRow(dataType, id) {
+    return grids[dataType].rows.find(item => item && item.id === id);
+}
+
+function escapeHtml(value) {
+    return String(value).replace(/[&<>"']/g, char => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[char]);
+}
+
+// Bulk import: preview the diff of a spreadsheet (dry run), then apply it
+function setupTaxonomyImport() {
+    const fileInput = document.getElementById('taxonomy-file');
+    const previewButton = document.getElementById('taxonomy-preview');
+    const importButton = document.getElementById('taxonomy-import');
+    if (!fileInput || !previewButton || !importButton) return;
+    
+    fileInput.addEventListener('change', () => {
+        importButton.disabled = true;
+        document.getElementById('taxonomy-import-result').innerHTML = '';
+    });
+    previewButton.addEventListener('click', () => submitTaxonomyImport(true));
+    importButton.addEventListener('click', () => submitTaxonomyImport(false));
+}
+
+function submitTaxonomyImport(dryRun) {
+    const fileInput = document.getElementById('taxonomy-file');
+    const importButton = document.getElementById('taxonomy-import');
+    if (!fileInput.files.length) {
+        showMessage('Choose an .xlsx or .csv file first', 'error');
+        return;
+    }
+    
+    const formData = new FormData();
+    formData.append('file', fileInput.files[0]);
+    formData.append('dry_run', dryRun ? '1' : '0');
+    importButton.disabled = true;
+    
+    fetch('/import_taxonomy', { method: 'POST', body: formData })
+        .then(response => response.json())
+        .then(result => {
+            renderImportResult(result);
+            if (!result.success) {
+                showMessage('Error: ' + result.message, 'error');
+                return;
+            }
+            if (dryRun) {
+                importButton.disabled = !Object.values(result.changes).some(change => change.new > 0);
+                return;
+            }
+            showMessage(result.message, 'success');
+            fileInput.value = '';
+            loadCategories();
+            DATA_TYPES.filter(dataType => grids[dataType].total !== null)
+                .forEach(dataType => resetGrid(dataType, true));
+        })
+        .catch(error => {
+            console.error('Error importing taxonomy:', error);
+            showMessage('Error importing file', 'error');
+        });
+}
+
+function renderImportResult(result) {
+    const container = document.getElementById('taxonomy-import-result');
+    if (!result.success) {
+        const errors = (result.errors || []).map(error => `<li>Row ${error.row}: ${escapeHtml(error.message)}</li>`);
+        container.innerHTML = `<div class="bulk-errors">${escapeHtml(result.message)}<ul>${errors.join('')}</ul></div>`;
+        return;
+    }
+    
+    const rows = DATA_TYPES.map(dataType => {
+        const change = result.changes[dataType];
+        const added = result.added ? result.added[dataType] : change.new;
+        const preview = change.preview.map(escapeHtml).join(', ') + (change.new > change.preview.length ? ', ...' : '');
+        return `<tr><td>${getDataTypeLabel(dataType)}</td><td>${added} new</td><td>${change.existing} existing</td>
+            <td>${change.not_in_file} not in file</td><td>${preview}</td></tr>`;
+    });
+    container.innerHTML = `<p>${escapeHtml(result.message)}${result.dry_run ? ' (preview, nothing saved yet)' : ''}</p>
+        <table>${rows.join('')}</table>`;
+}
+
+// Renamed items: the data entries that use the old name are rewritten in
+// the background, /admin/renames reports how far that got
+function watchRenames() {
+    if (renamePolling) return;
+    renamePolling = true;
+    pollRenames(false);
+}
+
+function pollRenames(wasRunning) {
+    fetch('/admin/renames?limit=10')
+    .then(response => response.json())
+    .then(result => {
+        if (!result.success) {
+            renamePolling = false;
+            return;
+        }
+        renderRenameProgress(result, wasRunning);
+        if (result.unfinished > 0) {
+            setTimeout(() => pollRenames(true), RENAME_POLL_INTERVAL);
+        } else {
+            renamePolling = false;
+        }
+    })
+    .catch(error => {
+        console.error('Error loading rename progress:', error);
+        renamePolling = false;
+    });
+}
+
+function renderRenameProgress(result, wasRunning) {
+    const container = document.getElementById('rename-progress');
+    const active = result.jobs.filter(job => job.status === 'pending' || job.status === 'running');
+    const failed = result.jobs.filter(job => job.status === 'failed');
+    const lines = active.map(job => {
+        const total = job.total_rows === null ? '?' : job.total_rows;
+        return `<li>${getDataTypeLabel(job.data_type)} ${escapeHtml(job.old_name)} → ${escapeHtml(job.new_name)}: ` +
+            (job.status === 'running' ? `${job.rows_updated} / ${total} entries` : 'waiting') + '</li>';
+    });
+    
+    if (lines.length) {
+        container.innerHTML = `<p>⏳ Updating data entries of renamed items...</p><ul>${lines.join('')}</ul>`;
+    } else if (wasRunning) {
+        container.innerHTML = failed.length
+            ? `<p class="bulk-errors">❌ ${failed.map(job => `${escapeHtml(job.old_name)} → ${escapeHtml(job.new_name)}: ${escapeHtml(job.error || 'failed')}`).join('; ')}</p>`
+            : '<p>✅ Data entries updated with the new names</p>';
+        setTimeout(() => {
+            if (!renamePolling) container.innerHTML = '';
+        }, 6000);
+    } else {
+        container.innerHTML = '';
+    }
+}
+
 function updateModelFilter(selectedCategory) {
     const modelFilter = document.getElementById('pop-materials-model-filter');
     if (!modelFilter) return;
     
     // Clear current options
     modelFilter.innerHTML = '<option value="">All Models</option>';
+    popFilterModels = {};
     
     if (selectedCategory) {
         // Fetch models for the selected category
@@ -209,12 +515,19 @@ function updateModelFilter(selectedCategory) {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
+                    popFilterModels = {};
                     data.data.forEach(model => {
+                        popFilterModels[model.name] = model.id;
                         const option = document.createElement('option');
                         option.value = model.name;
                         option.textContent = model.name;
                         modelFilter.appendChild(option);
                     });
+                    // Keep the selection unless the model is gone
+                    modelFilter.value = grids.pop_materials.model;
+                    if (modelFilter.value !== grids.pop_materials.model) {
+                        loadData('pop_materials', selectedCategory, '');
+                    }
                 }
             })
             .catch(error => {
@@ -223,54 +536,6 @@ function updateModelFilter(selectedCategory) {
     }
 }
 
-function updateTable(dataType, data) {
-    const tableBody = document.querySelector(`#${dataType}-table tbody`);
-    if (!tableBody) return;
-    
-    tableBody.innerHTML = '';
-    
-    data.forEach(item => {
-        const row = document.createElement('tr');
-        
-        if (dataType === 'categories') {
-            row.innerHTML = `
-                <td>${item.id}</td>
-                <td>${item.name}</td>
-                <td>${formatDate(item.created_at || item.created_date)}</td>
-                <td>
-                    <button class="btn btn-sm btn-secondary" onclick="editItem('${dataType}', ${item.id}, '${item.name}')">Edit</button>
-                    <button class="btn btn-sm btn-danger" onclick="deleteItem('${dataType}', ${item.id})">Delete</button>
-                </td>
-            `;
-        } else if (dataType === 'pop_materials') {
-            row.innerHTML = `
-                <td>${item.id}</td>
-                <td>${item.name}</td>
-                <td>${item.model || 'N/A'}</td>
-                <td>${item.category || 'N/A'}</td>
-                <td>${formatDate(item.created_at || item.created_date)}</td>
-                <td>
-                    <button class="btn btn-sm btn-secondary" onclick="editItem('${dataType}', ${item.id}, '${item.name}', '${item.category || ''}', '${item.model || ''}')">Edit</button>
-                    <button class="btn btn-sm btn-danger" onclick="deleteItem('${dataType}', ${item.id})">Delete</button>
-                </td>
-            `;
-        } else {
-            row.innerHTML = `
-                <td>${item.id}</td>
-                <td>${item.name}</td>
-                <td>${item.category || 'N/A'}</td>
-                <td>${formatDate(item.created_at || item.created_date)}</td>
-                <td>
-                    <button class="btn btn-sm btn-secondary" onclick="editItem('${dataType}', ${item.id}, '${item.name}', '${item.category || ''}')">Edit</button>
-                    <button class="btn btn-sm btn-danger" onclick="deleteItem('${dataType}', ${item.id})">Delete</button>
-                </td>
-            `;
-        }
-        
-        tableBody.appendChild(row);
-    });
-}
-
 function formatDate(dateString) {
     if (!dateString || dateString === 'N/A' || dateString === 'null' || dateString === 'undefined') {
         return 'N/A';
@@ -292,96 +557,61 @@ function showAddModal(dataType) {
     document.getElementById('data-type').value = dataType;
     document.getElementById('item-id').value = '';
     document.getElementById('item-name').value = '';
+    document.getElementById('item-names').value = '';
     document.getElementById('item-category').value = '';
     
-    // Show/hide fields based on data type
-    const categoryGroup = document.getElementById('category-group');
-    const modelGroup = document.getElementById('model-group');
+    showModalFields(dataType);
+    document.getElementById('bulk-names-group').style.display = 'block';
     
-    if (dataType === 'categories') {
-        categoryGroup.style.display = 'none';
-        modelGroup.style.display = 'none';
-        document.getElementById('item-category').required = false;
-        document.getElementById('item-model').required = false;
-    } else if (dataType === 'pop_materials') {
-        categoryGroup.style.display = 'block';
-        modelGroup.style.display = 'block';
-        document.getElementById('item-category').required = true;
-        document.getElementById('item-model').required = true;
-        
-        // Auto-fill category and model if we're in a filtered context
-        if (currentContext.category) {
-            document.getElementById('item-category').value = currentContext.category;
-            
-            // Load models for the current category
-            loadModelsForCategory(currentContext.category, currentContext.model);
-            
-            // If we have a specific model context, select it
-            if (currentContext.model) {
-                setTimeout(() => {
-                    document.getElementById('item-model').value = currentContext.model;
-                }, 200);
-            }
-        }
-        
-        // Setup category change listener for model loading
-        setupCategoryModelListener();
-    } else {
-        categoryGroup.style.display = 'block';
-        modelGroup.style.display = 'none';
-        document.getElementById('item-category').required = true;
-        document.getElementById('item-model').required = false;
-        
-        // Auto-fill category if we're in a filtered context
-        if (currentContext.category) {
-            document.getElementById('item-category').value = currentContext.category;
-        }
+    // Auto-fill category (and model) if we're in a filtered context
+    const context = dataType === 'categories' ? {} : grids[dataType];
+    const categoryId = categoriesByName[context.category] || '';
+    if (categoryId) {
+        document.getElementById('item-category').value = categoryId;
+    }
+    if (dataType === 'pop_materials') {
+        loadModelsForCategory(categoryId, '', context.model);
     }
     
     document.getElementById('dataModal').style.display = 'block';
     focusNameField();
 }
 
-function editItem(dataType, id, name, category = '', model = '') {
+function editItem(dataType, id) {
+    const item = findRow(dataType, id);
+    if (!item) return;
+    
     document.getElementById('modal-title').textContent = `Edit ${getDataTypeLabel(dataType)}`;
     document.getElementById('data-type').value = dataType;
     document.getElementById('item-id').value = id;
-    document.getElementById('item-name').value = name;
-    document.getElementById('item-category').value = category;
+    document.getElementById('item-name').value = item.name;
+    document.getElementById('item-category').value = item.category_id || '';
     
-    // Show/hide fields based on data type
-    const categoryGroup = document.getElementById('category-group');
-    const modelGroup = document.getElementById('model-group');
+    showModalFields(dataType);
+    document.getElementById('bulk-names-group').style.display = 'none';
     
-    if (dataType === 'categories') {
-        categoryGroup.style.display = 'none';
-        modelGroup.style.display = 'none';
-        document.getElementById('item-category').required = false;
-        document.getElementById('item-model').required = false;
-    } else if (dataType === 'pop_materials') {
-        categoryGroup.style.display = 'block';
-        modelGroup.style.display = 'block';
-        document.getElementById('item-category').required = true;
-        document.getElementById('item-model').required = true;
-        
-        // Load models for the selected category and set the model
-        if (category) {
-            loadModelsForCategory(category, model);
-        }
-        
-        // Setup category change listener for model loading
-        setupCategoryModelListener();
-    } else {
-        categoryGroup.style.display = 'block';
-        modelGroup.style.display = 'none';
-        document.getElementById('item-category').required = true;
-        document.getElementById('item-model').required = false;
+    // Load models for the selected category and set the model
+    if (dataType === 'pop_materials') {
+        loadModelsForCategory(item.category_id, item.model_id);
     }
     
     document.getElementById('dataModal').style.display = 'block';
     focusNameField();
 }
 
+// Show/hide fields based on data type
+function showModalFields(dataType) {
+    const categoryGroup = document.getElementById('category-group');
+    const modelGroup = document.getElementById('model-group');
+    const hasCategory = dataType !== 'categories';
+    const hasModel = dataType === 'pop_materials';
+    
+    categoryGroup.style.display = hasCategory ? 'block' : 'none';
+    modelGroup.style.display = hasModel ? 'block' : 'none';
+    document.getElementById('item-category').required = hasCategory;
+    document.getElementById('item-model').required = hasModel;
+}
+
 function deleteItem(dataType, id) {
     deleteItemId = id;
     deleteItemType = dataType;
@@ -396,6 +626,7 @@ function confirmDelete() {
         type: deleteItemType,
         id: deleteItemId
     };
+    const dataType = deleteItemType;
     
     fetch('/manage_data', {
         method: 'POST',
@@ -410,19 +641,12 @@ function confirmDelete() {
             showMessage(data.message, 'success');
             
             // Reload data with current filters preserved
-            reloadCurrentData(deleteItemType);
+            reloadCurrentData(dataType);
             
             // Refresh filters and related data after deletion
-            if (deleteItemType === 'categories') {
-                loadCategories();
+            if (dataType === 'categories') {
                 refreshAllFilters();
-                // Clear context if deleted category was selected
-                if (currentContext.category) {
-                    currentContext.category = '';
-                    currentContext.model = '';
-                    updateContextIndicator();
-                }
-            } else if (deleteItemType === 'models') {
+            } else if (dataType === 'models') {
                 refreshModelFilters();
             }
         } else {
@@ -441,11 +665,14 @@ function confirmDelete() {
 function handleFormSubmit(e) {
     e.preventDefault();
     
-    const formData = new FormData(e.target);
-    const itemId = formData.get('item-id') || document.getElementById('item-id').value;
-    const dataType = formData.get('data-type') || document.getElementById('data-type').value;
-    const itemName = formData.get('item-name') || document.getElementById('item-name').value;
-    const itemCategory = formData.get('item-category') || document.getElementById('item-category').value;
+    const itemId = document.getElementById('item-id').value;
+    const dataType = document.getElementById('data-type').value;
+    const itemName = document.getElementById('item-name').value.trim();
+    
+    if (!itemName) {
+        showMessage('Name is required', 'error');
+        return;
+    }
     
     const data = {
         action: itemId ? 'edit' : 'add',
@@ -454,38 +681,52 @@ function handleFormSubmit(e) {
     };
     
     if (itemId) {
-        data.id = itemId;
+        data.id = parseInt(itemId, 10);
     }
     
-    if (dataType !== 'categories') {
-        data.category_id = itemCategory;
-        
-        if (dataType === 'pop_materials') {
-            const itemModel = document.getElementById('item-model').value;
-            data.model_id = itemModel;
-        }
+    // manage_data expects the ids of the parent category / model
+    if (dataType === 'models' || dataType === 'display_types') {
+        data.category_id = parseInt(document.getElementById('item-category').value, 10);
+    } else if (dataType === 'pop_materials') {
+        data.model_id = parseInt(document.getElementById('item-model').value, 10);
     }
     
+    // Several names: one request, saved in one transaction
+    const moreNames = itemId ? [] : document.getElementById('item-names').value
+        .split('\n').map(name => name.trim()).filter(name => name);
+    const payload = moreNames.length ? {
+        operations: [itemName].concat(moreNames).map(name => Object.assign({}, data, { name: name }))
+    } : data;
+    
     fetch('/manage_data', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
-        body: JSON.stringify(data)
+        body: JSON.stringify(payload)
     })
     .then(response => response.json())
-    .then(data => {
-        if (data.success) {
-            showMessage(data.message, 'success');
+    .then(result => {
+        if (result.success || result.applied > 0) {
+            if (result.success) {
+                showMessage(result.message, 'success');
+            } else {
+                const failures = result.results.filter(item => !item.success)
+                    .map(item => `${escapeHtml(payload.operations[item.index].name)}: ${escapeHtml(item.message)}`);
+                showMessage(`${result.message} (${failures.join('; ')})`, 'error');
+            }
+            
+            if (result.renames > 0) {
+                watchRenames();
+            }
             
             // Close modal first for better UX
             closeModal();
             
             // Reload data to show changes with current filters
-            reloadCurrentData(currentDataType);
+            reloadCurrentData(dataType);
             
             // Highlight the saved item (if it's an edit)
-            const itemId = document.getElementById('item-id').value;
             if (itemId) {
                 setTimeout(() => {
                     highlightSavedItem(itemId);
@@ -493,22 +734,15 @@ function handleFormSubmit(e) {
             }
             
             // Refresh filters and related data after changes
-            if (currentDataType === 'categories') {
-                loadCategories();
-                // Refresh all dependent data
+            if (dataType === 'categories') {
                 refreshAllFilters();
-            } else if (currentDataType === 'models') {
+            } else if (dataType === 'models') {
                 // Refresh model filters in POP materials
                 refreshModelFilters();
             }
-            
-            // Keep focus on the same tab for quick editing
-            const activeTab = document.querySelector('.tab-btn.active');
-            if (activeTab) {
-                activeTab.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
-            }
         } else {
-            showMessage('Error: ' + data.message, 'error');
+            const failures = (result.results || []).map(item => escapeHtml(item.message));
+            showMessage('Error: ' + (failures.length ? failures.join('; ') : result.message), 'error');
         }
     })
     .catch(error => {
@@ -539,60 +773,44 @@ function getDataTypeLabel(dataType) {
 
 function setupCategoryModelListener() {
     const categorySelect = document.getElementById('item-category');
-    const modelSelect = document.getElementById('item-model');
     
-    if (categorySelect && modelSelect) {
+    if (categorySelect) {
         categorySelect.addEventListener('change', function() {
-            loadModelsForCategory(this.value);
+            if (document.getElementById('data-type').value === 'pop_materials') {
+                loadModelsForCategory(this.value);
+            }
         });
     }
 }
 
-function loadModelsForCategory(category, selectedModel = '') {
+// Fill the model select of the form with the models of a category (by id)
+function loadModelsForCategory(categoryId, selectedModelId = '', selectedModelName = '') {
     const modelSelect = document.getElementById('item-model');
     if (!modelSelect) return;
     
-    // Clear current options completely
-    modelSelect.innerHTML = '';
+    modelSelect.innerHTML = '<option value="">Select Model</option>';
     
-    // Add default option
-    const defaultOption = document.createElement('option');
-    defaultOption.value = '';
-    defaultOption.textContent = 'Select Model';
-    modelSelect.appendChild(defaultOption);
+    const category = Object.keys(categoriesByName).find(name => String(categoriesByName[name]) === String(categoryId));
+    if (!category) return;
     
-    if (category) {
-        fetch(`/get_management_data/models?category=${encodeURIComponent(category)}`)
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    // Remove duplicates by using a Set
-                    const uniqueModels = [];
-                    const seenModels = new Set();
-                    
-                    data.data.forEach(model => {
-                        if (!seenModels.has(model.name)) {
-                            seenModels.add(model.name);
-                            uniqueModels.push(model);
-                        }
-                    });
-                    
-                    // Add unique models to select
-                    uniqueModels.forEach(model => {
-                        const option = document.createElement('option');
-                        option.value = model.name;
-                        option.textContent = model.name;
-                        if (model.name === selectedModel) {
-                            option.selected = true;
-                        }
-                        modelSelect.appendChild(option);
-                    });
-                }
-            })
-            .catch(error => {
-                console.error('Error loading models:', error);
-            });
-    }
+    fetch(`/get_management_data/models?category=${encodeURIComponent(category)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                data.data.forEach(model => {
+                    const option = document.createElement('option');
+                    option.value = model.id;
+                    option.textContent = model.name;
+                    if (String(model.id) === String(selectedModelId) || model.name === selectedModelName) {
+                        option.selected = true;
+                    }
+                    modelSelect.appendChild(option);
+                });
+            }
+        })
+        .catch(error => {
+            console.error('Error loading models:', error);
+        });
 }
 
 function showMessage(message, type) {
@@ -635,6 +853,84 @@ function showMessage(message, type) {
     }, hideDelay);
 }
 
+// Copy the POP materials of the selected model to other models
+function showCloneModal() {
+    const grid = grids.pop_materials;
+    const sourceId = popFilterModels[grid.model];
+    if (!sourceId) return;
+    
+    document.getElementById('clone-source').textContent = `${grid.category} - ${grid.model}`;
+    document.getElementById('clone-target-search').value = '';
+    const targets = document.getElementById('clone-targets');
+    targets.innerHTML = '<p class="table-loading">Loading models...</p>';
+    document.getElementById('cloneModal').style.display = 'block';
+    
+    fetch('/get_management_data/models?sort=category')
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                targets.innerHTML = `<p>${escapeHtml(data.message)}</p>`;
+                return;
+            }
+            targets.innerHTML = data.data.filter(model => model.id !== sourceId).map(model => `
+                <label class="clone-target">
+                    <input type="checkbox" value="${model.id}">${escapeHtml(model.category)} / ${escapeHtml(model.name)}
+                </label>`).join('');
+        })
+        .catch(error => {
+            console.error('Error loading models:', error);
+            targets.innerHTML = '<p>Error loading models</p>';
+        });
+}
+
+function filterCloneTargets() {
+    const term = document.getElementById('clone-target-search').value.trim().toLowerCase();
+    document.querySelectorAll('#clone-targets .clone-target').forEach(label => {
+        label.style.display = label.textContent.toLowerCase().includes(term) ? 'block' : 'none';
+    });
+}
+
+function confirmClone() {
+    const sourceId = popFilterModels[grids.pop_materials.model];
+    const targetIds = Array.from(document.querySelectorAll('#clone-targets input:checked'))
+        .map(input => parseInt(input.value, 10));
+    if (!sourceId || !targetIds.length) {
+        showMessage('Select at least one model to copy to', 'error');
+        return;
+    }
+    
+    const button = document.getElementById('clone-confirm');
+    button.disabled = true;
+    fetch('/clone_pop_materials', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ source_model_id: sourceId, target_model_ids: targetIds })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            showMessage(result.message, 'success');
+            closeCloneModal();
+            reloadCurrentData('pop_materials');
+        } else {
+            showMessage('Error: ' + result.message, 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Error copying POP materials:', error);
+        showMessage('Error copying POP materials', 'error');
+    })
+    .finally(() => {
+        button.disabled = false;
+    });
+}
+
+function closeCloneModal() {
+    document.getElementById('cloneModal').style.display = 'none';
+}
+
 // Close modals when clicking outside
 window.addEventListener('click', function(e) {
     const dataModal = document.getElementById('dataModal');
@@ -647,6 +943,10 @@ window.addEventListener('click', function(e) {
     if (e.target === deleteModal) {
         closeDeleteModal();
     }
+    
+    if (e.target === document.getElementById('cloneModal')) {
+        closeCloneModal();
+    }
 });
 
 // Keyboard shortcuts for better UX
@@ -662,6 +962,7 @@ document.addEventListener('keydown', function(e) {
         if (deleteModal && deleteModal.style.display === 'block') {
             closeDeleteModal();
         }
+        closeCloneModal();
     }
     
     // Ctrl+S to save form (prevent default browser save)
@@ -696,19 +997,15 @@ function focusNameField() {
 
 // Highlight saved item for visual feedback
 function highlightSavedItem(itemId) {
-    const tableRows = document.querySelectorAll(`#${currentDataType}-table tbody tr`);
-    tableRows.forEach(row => {
-        const firstCell = row.querySelector('td');
-        if (firstCell && firstCell.textContent.trim() === itemId.toString()) {
-            row.classList.add('just-saved');
-            row.scrollIntoView({ behavior: 'smooth', block: 'center' });
-            
-            // Remove highlight after animation
-            setTimeout(() => {
-                row.classList.remove('just-saved');
-            }, 2000);
-        }
-    });
+    const row = document.querySelector(`#${currentDataType}-table tbody tr[data-id="${itemId}"]`);
+    if (row) {
+        row.classList.add('just-saved');
+        
+        // Remove highlight after animation
+        setTimeout(() => {
+            row.classList.remove('just-saved');
+        }, 2000);
+    }
 }
 
 // Show loading state
@@ -716,18 +1013,14 @@ function showLoadingState(dataType) {
     const tableBody = document.querySelector(`#${dataType}-table tbody`);
     if (!tableBody) return;
     
-    tableBody.innerHTML = '';
-    
-    const row = document.createElement('tr');
-    const colSpan = getColumnCount(dataType);
-    
-    row.innerHTML = `
-        <td colspan="${colSpan}" class="table-loading">
-            Loading ${getDataTypeLabel(dataType).toLowerCase()}...
-        </td>
+    tableBody.innerHTML = `
+        <tr>
+            <td colspan="${getColumnCount(dataType)}" class="table-loading">
+                Loading ${getDataTypeLabel(dataType).toLowerCase()}...
+            </td>
+        </tr>
     `;
-    
-    tableBody.appendChild(row);
+    updateGridCount(dataType);
 }
 
 // Show empty state with instruction message
@@ -735,25 +1028,18 @@ function showEmptyState(dataType) {
     const tableBody = document.querySelector(`#${dataType}-table tbody`);
     if (!tableBody) return;
     
-    // Clear current content
-    tableBody.innerHTML = '';
-    
-    // Create instruction row
-    const row = document.createElement('tr');
-    const colSpan = getColumnCount(dataType);
-    
-    row.innerHTML = `
-        <td colspan="${colSpan}" class="empty-state">
-            <div class="empty-state-content">
-                <span class="empty-state-icon">🔍</span>
-                <p class="empty-state-message">
-                    ${getEmptyStateMessage(dataType)}
-                </p>
-            </div>
-        </td>
+    tableBody.innerHTML = `
+        <tr>
+            <td colspan="${getColumnCount(dataType)}" class="empty-state">
+                <div class="empty-state-content">
+                    <span class="empty-state-icon">🔍</span>
+                    <p class="empty-state-message">
+                        ${getEmptyStateMessage(dataType)}
+                    </p>
+                </div>
+            </td>
+        </tr>
     `;
-    
-    tableBody.appendChild(row);
 }
 
 function getColumnCount(dataType) {
@@ -767,93 +1053,40 @@ function getColumnCount(dataType) {
 }
 
 function getEmptyStateMessage(dataType) {
-    switch(dataType) {
-        case 'models':
-            return 'Select a category from the filter above to view models';
-        case 'display_types':
-            return 'Select a category from the filter above to view display types';
-        case 'pop_materials':
-            return 'Select a category (and optionally a model) from the filters above to view POP materials';
-        default:
-            return 'Use the filters above to view data';
+    const grid = grids[dataType];
+    const label = getDataTypeLabel(dataType).toLowerCase();
+    if (grid.search) {
+        return `No ${label} matches "${escapeHtml(grid.search)}"`;
+    }
+    if (grid.category || grid.model) {
+        return `No ${label} in the selected filter yet`;
     }
+    return `No ${label} yet, add one with the button above`;
 }
 
 // Reload data with current filters preserved
 function reloadCurrentData(dataType) {
-    if (dataType === 'categories') {
-        // Categories don't need filters
-        loadData(dataType);
-    } else if (dataType === 'pop_materials') {
-        // For POP materials, use both category and model filters
-        const categoryFilter = document.getElementById('pop-materials-category-filter');
-        const modelFilter = document.getElementById('pop-materials-model-filter');
-        
-        if (categoryFilter && categoryFilter.value) {
-            loadData(dataType, categoryFilter.value, modelFilter ? modelFilter.value : '');
-        } else {
-            // No filter selected, show empty state
-            showEmptyState(dataType);
-        }
-    } else {
-        // For models and display_types, use category filter
-        const filterElement = document.getElementById(`${dataType.replace('_', '-')}-category-filter`);
-        
-        if (filterElement && filterElement.value) {
-            loadData(dataType, filterElement.value);
-        } else {
-            // No filter selected, show empty state
-            showEmptyState(dataType);
-        }
-    }
+    resetGrid(dataType, true);
 }
 
 // Refresh all filters after category changes
 function refreshAllFilters() {
-    // Reload categories in all filter dropdowns
+    // Reload categories in all filter dropdowns (the selection is kept)
     loadCategories();
     
-    // Clear and reload model filters
-    const modelFilter = document.getElementById('pop-materials-model-filter');
-    if (modelFilter) {
-        modelFilter.innerHTML = '<option value="">All Models</option>';
-    }
-    
-    // If we're currently viewing filtered data, reload it
-    if (currentContext.category) {
-        setTimeout(() => {
-            const categoryFilter = document.getElementById('pop-materials-category-filter');
-            if (categoryFilter) {
-                categoryFilter.value = currentContext.category;
-                updateModelFilter(currentContext.category);
-            }
-        }, 200);
-    }
+    // Parent names shown in the other tables may have changed
+    DATA_TYPES.filter(dataType => dataType !== 'categories' && grids[dataType].total !== null)
+        .forEach(dataType => resetGrid(dataType, true));
 }
 
 // Refresh model filters after model changes
 function refreshModelFilters() {
-    // If we're in POP materials and have a category selected, refresh models
-    if (currentDataType === 'pop_materials' && currentContext.category) {
-        updateModelFilter(currentContext.category);
-        
-        // If we had a specific model selected, try to maintain it
-        if (currentContext.model) {
-            setTimeout(() => {
-                const modelFilter = document.getElementById('pop-materials-model-filter');
-                if (modelFilter) {
-                    // Check if the model still exists
-                    const modelOption = Array.from(modelFilter.options).find(option => option.value === currentContext.model);
-                    if (modelOption) {
-                        modelFilter.value = currentContext.model;
-                    } else {
-                        // Model was deleted or renamed, clear the context
-                        currentContext.model = '';
-                        updateContextIndicator();
-                    }
-                }
-            }, 300);
-        }
+    const categoryFilter = document.getElementById('pop-materials-category-filter');
+    if (categoryFilter && categoryFilter.value) {
+        updateModelFilter(categoryFilter.value);
+    }
+    if (grids.pop_materials.total !== null) {
+        resetGrid('pop_materials', true);
     }
 }
 
@@ -864,13 +1097,14 @@ function updateContextIndicator() {
     
     if (!indicator || !contextDisplay) return;
     
-    if (currentDataType === 'pop_materials' && (currentContext.category || currentContext.model)) {
+    const context = grids.pop_materials;
+    if (currentDataType === 'pop_materials' && (context.category || context.model)) {
         let contextText = '';
         
-        if (currentContext.model && currentContext.category) {
-            contextText = `${currentContext.category} - ${currentContext.model}`;
-        } else if (currentContext.category) {
-            contextText = `${currentContext.category} (All Models)`;
+        if (context.model && context.category) {
+            contextText = `${context.category} - ${context.model}`;
+        } else if (context.category) {
+            contextText = `${context.category} (All Models)`;
         }
         
         if (contextText) {
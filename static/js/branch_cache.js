@@ -0,0 +1,200 @@
+// Client-side branch cache for offline autocomplete
+//
+// Downloads the compact branch list from /branches/sync once, keeps it in
+// IndexedDB and in memory, and afterwards only asks for the changes since
+// the stored version. Autocomplete (data_entry.js) searches the local copy,
+// so suggestions appear instantly and keep working without a connection.
+// Without IndexedDB (private mode, old browsers) the list lives in memory
+// for the lifetime of the page.
+
+const BranchCache = (function () {
+    const DB_NAME = 'rm-branch-cache';
+    const DB_VERSION = 1;
+    const SYNC_INTERVAL = 5 * 60 * 1000;
+
+    let branches = new Map();   // code -> {name, code, search}
+    let version = 0;
+    let ready = false;
+    let syncing = null;
+    let dbPromise = null;
+
+    function normalize(text) {
+        return (text || '')
+            .normalize('NFKD')
+            .replace(/[\u0300-\u036f]/g, '')
+            .toLowerCase()
+            .replace(/\s+/g, ' ')
+            .trim();
+    }
+
+    function entry(name, code) {
+        return { name: name, code: code, search: normalize(name), searchCode: normalize(code) };
+    }
+
+    function openDb() {
+        if (dbPromise) return dbPromise;
+
+        dbPromise = new Promise((resolve) => {
+            if (!window.indexedDB) {
+                resolve(null);
+                return;
+            }
+            const request = indexedDB.open(DB_NAME, DB_VERSION);
+            request.onupgradeneeded = () => {
+                const db = request.result;
+                if (!db.objectStoreNames.contains('branches')) {
+                    db.createObjectStore('branches', { keyPath: 'code' });
+                }
+                if (!db.objectStoreNames.contains('meta')) {
+                    db.createObjectStore('meta');
+                }
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => {
+                console.warn('Branch cache: IndexedDB unavailable, keeping branches in memory only');
+                resolve(null);
+            };
+        });
+        return dbPromise;
+    }
+
+    function loadFromDb(db) {
+        return new Promise((resolve) => {
+            const tx = db.transaction(['branches', 'meta'], 'readonly');
+            const rows = tx.objectStore('branches').getAll();
+            const storedVersion = tx.objectStore('meta').get('version');
+            tx.oncomplete = () => {
+                branches = new Map(rows.result.map(row => [row.code, entry(row.name, row.code)]));
+                version = storedVersion.result || 0;
+                resolve();
+            };
+            tx.onerror = () => resolve();
+        });
+    }
+
+    function saveToDb(db, data) {
+        return new Promise((resolve) => {
+            const tx = db.transaction(['branches', 'meta'], 'readwrite');
+            const store = tx.objectStore('branches');
+            if (data.full) {
+                store.clear();
+            }
+            data.deleted.forEach(code => store.delete(code));
+            data.branches.forEach(([name, code]) => store.put({ name: name, code: code }));
+            tx.objectStore('meta').put(data.version, 'version');
+            tx.oncomplete = resolve;
+            tx.onerror = () => {
+                console.warn('Branch cache: could not store branches', tx.error);
+                resolve();
+            };
+        });
+    }
+
+    function apply(data) {
+        if (data.full) {
+            branches = new Map();
+        }
+        data.deleted.forEach(code => branches.delete(code));
+        data.branches.forEach(([name, code]) => branches.set(code, entry(name, code)));
+        version = data.version;
+    }
+
+    function sync() {
+        if (syncing) return syncing;
+        if (!navigator.onLine && ready) return Promise.resolve(false);
+
+        syncing = fetch(`/branches/sync?since=${version}`, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) return false;
+                if (!data.full && data.branches.length === 0 && data.deleted.length === 0) {
+                    return false;
+                }
+                apply(data);
+                return openDb().then(db => (db ? saveToDb(db, data) : null)).then(() => true);
+            })
+            .catch(error => {
+                // Offline or server unreachable: keep using the stored copy
+                console.warn('Branch cache: sync failed', error);
+                return false;
+            })
+            .finally(() => {
+                syncing = null;
+            });
+        return syncing;
+    }
+
+    function init() {
+        const loaded = openDb().then(db => (db ? loadFromDb(db) : null));
+        return loaded
+            .then(() => {
+                if (branches.size > 0) {
+                    // Usable right away; refresh in the background
+                    ready = true;
+                    sync();
+                    return;
+                }
+                return sync().then(() => {
+                    ready = branches.size > 0;
+                });
+            })
+            .then(() => {
+                setInterval(sync, SYNC_INTERVAL);
+                window.addEventListener('online', sync);
+            });
+    }
+
+    // Same ranking as the server index: exact code, code prefix, name
+    // prefix, word prefix, then substring
+    function rank(branch, query, queryWords) {
+        if (branch.searchCode === query) return 5;
+        if (branch.searchCode.startsWith(query)) return 4;
+        if (branch.search.startsWith(query)) return 3;
+
+        const nameWords = branch.search.split(' ').concat([branch.searchCode]);
+        if (queryWords.every(word => nameWords.some(nameWord => nameWord.startsWith(word)))) return 2;
+        if (branch.search.includes(query) || branch.searchCode.includes(query)) return 1;
+        return 0;
+    }
+
+    function search(term, limit = 10) {
+        const query = normalize(term);
+        if (!query) return [];
+        const queryWords = query.split(' ');
+
+        const matches = [];
+        branches.forEach(branch => {
+            const score = rank(branch, query, queryWords);
+            if (score > 0) matches.push([score, branch]);
+        });
+
+        matches.sort((a, b) => b[0] - a[0]
+            || a[1].search.length - b[1].search.length
+            || a[1].search.localeCompare(b[1].search));
+        return matches.slice(0, limit).map(([, branch]) => ({ name: branch.name, code: branch.code }));
+    }
+
+    function findByCode(code) {
+        const query = normalize(code);
+        for (const branch of branches.values()) {
+            if (branch.searchCode === query) {
+                return { name: branch.name, code: branch.code };
+            }
+        }
+        return null;
+    }
+
+    return {
+        init: init,
+        sync: sync,
+        search: search,
+        findByCode: findByCode,
+        isReady: () => ready,
+        version: () => version,
+        size: () => branches.size
+    };
+})();
+
+document.addEventListener('DOMContentLoaded', function () {
+    BranchCache.init();
+});
@@ -0,0 +1,100 @@
+// Resumable chunked photo uploads (server side: chunked_uploads.py)
+//
+// ChunkedUpload.upload(blob, filename, uploadId) sends one photo in chunks
+// and resolves once the server assembled it. The caller picks a stable
+// uploadId (the outbox uses "<submission key>-<photo number>"), so calling
+// upload() again after a failure, a reload or inside the service worker
+// asks the server which chunks it already has and only sends the rest.
+//
+// Loaded by the page and by the service worker (importScripts).
+
+const ChunkedUpload = (function () {
+    const MAX_ATTEMPTS = 4;
+    const RETRY_DELAY = 1000;
+
+    // Thrown for failed requests; retry tells whether trying later may help
+    class UploadFailure extends Error {
+        constructor(message, status) {
+            super(message);
+            this.status = status;
+            this.retry = !status || status >= 500 || [401, 403, 408, 409, 429].includes(status);
+        }
+    }
+
+    function call(method, url, body, headers) {
+        return fetch(url, { method: method, body: body, headers: headers || {}, credentials: 'same-origin' })
+            .catch(error => {
+                throw new UploadFailure(error.message, 0);
+            })
+            .then(response => response.json()
+                .catch(() => ({}))
+                .then(data => {
+                    if (!response.ok || !data.success) {
+                        throw new UploadFailure(data.message || `HTTP ${response.status}`, response.status);
+                    }
+                    return data;
+                }));
+    }
+
+    function wait(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    // Retry a request with exponential backoff while the failure is transient
+    function withRetry(fn, attempt = 1) {
+        return fn().catch(error => {
+            if (!error.retry || attempt >= MAX_ATTEMPTS) throw error;
+            return wait(RETRY_DELAY * 2 ** (attempt - 1)).then(() => withRetry(fn, attempt + 1));
+        });
+    }
+
+    function sha256(blob) {
+        if (!self.crypto || !crypto.subtle) return Promise.resolve(null);
+        return blob.arrayBuffer()
+            .then(buffer => crypto.subtle.digest('SHA-256', buffer))
+            .then(digest => Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join(''))
+            .catch(() => null);
+    }
+
+    function sendChunk(uploadId, index, chunk) {
+        return sha256(chunk).then(checksum => withRetry(() => call(
+            'PUT', `/uploads/${encodeURIComponent(uploadId)}/chunks/${index}`, chunk,
+            checksum ? { 'X-Chunk-SHA256': checksum } : {}
+        )));
+    }
+
+    // onProgress(sentBytes, totalBytes) is called after every chunk
+    function upload(blob, filename, uploadId, onProgress) {
+        const session = JSON.stringify({
+            upload_id: uploadId,
+            filename: filename,
+            size: blob.size,
+            content_type: blob.type || 'image/jpeg'
+        });
+
+        return withRetry(() => call('POST', '/uploads', session, { 'Content-Type': 'application/json' }))
+            .then(state => {
+                if (state.complete) return state;
+
+                const received = new Set(state.received);
+                let sent = received.size * state.chunk_size;
+                let chain = Promise.resolve();
+                for (let index = 0; index < state.total_chunks; index++) {
+                    if (received.has(index)) continue;
+                    const chunk = blob.slice(index * state.chunk_size, (index + 1) * state.chunk_size);
+                    chain = chain
+                        .then(() => sendChunk(uploadId, index, chunk))
+                        .then(() => {
+                            sent += chunk.size;
+                            if (onProgress) onProgress(Math.min(sent, blob.size), blob.size);
+                        });
+                }
+                return chain.then(() => withRetry(() => call('POST', `/uploads/${encodeURIComponent(uploadId)}/finalize`)));
+            });
+    }
+
+    return {
+        upload: upload,
+        UploadFailure: UploadFailure
+    };
+})();
@@ -239,6 +239,9 @@ function initializeDataEntry() {
     // Load categories first
     loadCategories();
 
+    // Send submissions saved while offline
+    initializeOutbox();
+
     // Set up event listeners for the first model entry
     setupModelEntry(0);
 
@@ -470,24 +473,34 @@ function setupBranchAutocomplete(index) {
     let currentSuggestions = [];
     let selectedIndex = -1;
 
-    // Handle branch input changes
+    // Handle branch input changes (debounced: one request once typing pauses)
+    const debouncedFetchBranches = debounce(fetchBranches, BRANCH_SEARCH_DELAY);
     branchInput.addEventListener('input', function () {
         const searchTerm = this.value.trim();
+        selectedIndex = -1;
 
-        if (searchTerm.length >= 1) {
+        if (searchTerm.length >= 1 && localBranchesReady()) {
+            // Local search is instant, no need to wait for a pause
+            debouncedFetchBranches.cancel();
             fetchBranches(searchTerm, index);
+        } else if (searchTerm.length >= 1) {
+            debouncedFetchBranches(searchTerm, index);
         } else {
+            debouncedFetchBranches.cancel();
             hideSuggestions(index);
         }
     });
 
     // Handle shop code input changes
+    const debouncedFetchBranchByCode = debounce(fetchBranchByCode, BRANCH_SEARCH_DELAY);
     shopCodeInput.addEventListener('input', function () {
         const shopCode = this.value.trim();
 
         if (shopCode.length >= 2) {
             // Search for branch by shop code
-            fetchBranchByCode(shopCode, index);
+            debouncedFetchBranchByCode(shopCode, index);
+        } else {
+            debouncedFetchBranchByCode.cancel();
         }
     });
 
@@ -541,11 +554,66 @@ function setupBranchAutocomplete(index) {
     }
 }
 
-function fetchBranches(searchTerm, index) {
-    fetch(`/get_branches?search=${encodeURIComponent(searchTerm)}`)
+// Branch lookups: wait for a pause in typing, remember recent answers
+const BRANCH_SEARCH_DELAY = 150;
+const BRANCH_CACHE_TTL = 60 * 1000;
+const BRANCH_CACHE_SIZE = 100;
+const branchSearchCache = new Map();
+const branchSearchRequests = {};
+
+function debounce(fn, delay) {
+    let timer = null;
+    const debounced = function (...args) {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn.apply(this, args), delay);
+    };
+    debounced.cancel = () => clearTimeout(timer);
+    return debounced;
+}
+
+function cachedBranchLookup(url) {
+    const cached = branchSearchCache.get(url);
+    if (cached && Date.now() - cached.time < BRANCH_CACHE_TTL) {
+        return Promise.resolve(cached.data);
+    }
+
+    return fetch(url)
         .then(response => response.json())
         .then(data => {
-            if (data.success) {
+            if (data.success || data.message === 'Branch not found') {
+                branchSearchCache.delete(url);
+                branchSearchCache.set(url, { data: data, time: Date.now() });
+                if (branchSearchCache.size > BRANCH_CACHE_SIZE) {
+                    // Map keeps insertion order: drop the oldest entry
+                    branchSearchCache.delete(branchSearchCache.keys().next().value);
+                }
+            }
+            return data;
+        });
+}
+
+function localBranchesReady() {
+    return typeof BranchCache !== 'undefined' && BranchCache.isReady();
+}
+
+function fetchBranches(searchTerm, index) {
+    // Answers can arrive out of order: only show the one for the latest term
+    const requestId = (branchSearchRequests[index] || 0) + 1;
+    branchSearchRequests[index] = requestId;
+
+    // Search the synced copy first (branch_cache.js); ask the server only
+    // when it knows nothing and we are online
+    if (localBranchesReady()) {
+        const localResults = BranchCache.search(searchTerm);
+        if (localResults.length > 0 || !navigator.onLine) {
+            showSuggestions(localResults, index);
+            return;
+        }
+    }
+
+    cachedBranchLookup(`/get_branches?search=${encodeURIComponent(searchTerm.toLowerCase())}`)
+        .then(data => {
+            if (data.success && branchSearchRequests[index] === requestId) {
                 showSuggestions(data.branches, index);
             }
         })
@@ -596,8 +664,16 @@ function selectBranch(branchName, shopCode, index) {
 }
 
 function fetchBranchByCode(shopCode, index) {
-    fetch(`/get_branch_by_code?code=${encodeURIComponent(shopCode)}`)
-        .then(response => response.json())
+    const localBranch = localBranchesReady() ? BranchCache.findByCode(shopCode) : null;
+    if (localBranch) {
+        const branchInput = document.getElementById(`branch_${index}`);
+        if (branchInput) {
+            branchInput.value = localBranch.name;
+        }
+        return;
+    }
+
+    cachedBranchLookup(`/get_branch_by_code?code=${encodeURIComponent(shopCode.toLowerCase())}`)
         .then(data => {
             if (data.success) {
                 const branchInput = document.getElementById(`branch_${index}`);
@@ -845,6 +921,58 @@ function removeModelEntry(index) {
     }
 }
 
+// Photos are scaled down before they go to the outbox: a phone picture is
+// several MB, too much to keep offline or to upload on a weak connection
+const RESIZE_MAX_DIMENSION = 1600;
+const RESIZE_QUALITY = 0.8;
+const RESIZE_MIN_BYTES = 500 * 1024;
+
+function resizeImage(file) {
+    if (!window.createImageBitmap || file.size < RESIZE_MIN_BYTES) {
+        return Promise.resolve(file);
+    }
+
+    return createImageBitmap(file)
+        .then(bitmap => {
+            const scale = Math.min(1, RESIZE_MAX_DIMENSION / Math.max(bitmap.width, bitmap.height));
+            const canvas = document.createElement('canvas');
+            canvas.width = Math.round(bitmap.width * scale);
+            canvas.height = Math.round(bitmap.height * scale);
+            canvas.getContext('2d').drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+            bitmap.close();
+            return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', RESIZE_QUALITY));
+        })
+        .then(blob => {
+            if (!blob || blob.size >= file.size) return file;
+            const name = file.name.replace(/\.[^.]+$/, '') + '.jpg';
+            return new File([blob], name, { type: 'image/jpeg', lastModified: file.lastModified });
+        })
+        .catch(error => {
+            console.warn('Could not resize image, sending the original', error);
+            return file;
+        });
+}
+
+function prepareSubmission(form) {
+    const formData = new FormData(form);
+    const prepared = new FormData();
+    const pending = [];
+
+    formData.forEach((value, name) => {
+        if (value instanceof File) {
+            // Empty file inputs still send a nameless part
+            if (value.name) pending.push(resizeImage(value).then(file => [name, file]));
+        } else {
+            prepared.append(name, value);
+        }
+    });
+
+    return Promise.all(pending).then(files => {
+        files.forEach(([name, file]) => prepared.append(name, file, file.name));
+        return prepared;
+    });
+}
+
 function handleFormSubmission(e) {
     e.preventDefault();
 
@@ -863,27 +991,34 @@ function handleFormSubmission(e) {
         return;
     }
 
-    // Create FormData object
-    const formData = new FormData(form);
-
-    // Submit form
-    fetch(form.action, {
-        method: 'POST',
-        body: formData
-    })
-        .then(response => {
-            if (response.ok) {
-                return response.json();
-            }
-            throw new Error('Network response was not ok');
+    // Keep the submission on the device before sending it, so nothing is
+    // lost when the connection drops
+    let record = null;
+    prepareSubmission(form)
+        .then(formData => Outbox.add(formData, currentUserId()))
+        .then(stored => {
+            record = stored;
+            return Outbox.send(record.id, (sent, total) => {
+                submitBtn.textContent = `Uploading photos ${Math.round(100 * sent / total)}%...`;
+            });
         })
-        .then(data => {
-            if (data.success) {
+        .then(result => {
+            if (result.status === 'sent') {
                 showSuccessMessage('Data saved successfully!');
                 form.reset();
                 resetFormState();
+            } else if (result.status === 'held') {
+                // Another user logged in meanwhile; kept for the user who filled it in
+                showErrorMessage(result.message);
+            } else if (result.status === 'rejected') {
+                // The form is still on screen to be corrected
+                Outbox.remove(record.id);
+                showErrorMessage(result.message || 'Failed to save data. Please try again.');
             } else {
-                throw new Error(data.message || 'Failed to save data');
+                showSuccessMessage('No connection: the data is saved on this device and will be sent automatically.');
+                form.reset();
+                resetFormState();
+                requestOutboxSync();
             }
         })
         .catch(error => {
@@ -893,7 +1028,65 @@ function handleFormSubmission(e) {
         .finally(() => {
             submitBtn.textContent = originalText;
             submitBtn.disabled = false;
+            updateOutboxStatus();
+        });
+}
+
+// The outbox outlives the session: only this user's submissions are shown
+// and replayed here
+function currentUserId() {
+    const container = document.querySelector('.data-entry-container');
+    return container ? container.dataset.userId : null;
+}
+
+function updateOutboxStatus() {
+    const status = document.getElementById('outboxStatus');
+    if (!status) return;
+
+    Outbox.counts(currentUserId()).then(({ pending, failed }) => {
+        const parts = [];
+        if (pending > 0) parts.push(`${pending} submission${pending === 1 ? '' : 's'} waiting to be sent`);
+        if (failed > 0) parts.push(`${failed} rejected by the server`);
+        status.textContent = parts.join(', ');
+        status.style.display = parts.length ? 'block' : 'none';
+    });
+}
+
+function replayOutbox() {
+    return Outbox.replay(currentUserId()).then(summary => {
+        if (summary.sent > 0) {
+            showSuccessMessage(`${summary.sent} saved submission${summary.sent === 1 ? ' was' : 's were'} sent.`);
+        }
+        updateOutboxStatus();
+    });
+}
+
+// Let the service worker send the outbox once the device is back online,
+// even if this page is closed by then
+function requestOutboxSync() {
+    if (!('serviceWorker' in navigator)) return;
+
+    navigator.serviceWorker.ready
+        .then(registration => (registration.sync ? registration.sync.register(Outbox.SYNC_TAG) : null))
+        .catch(error => console.warn('Background sync unavailable', error));
+}
+
+function initializeOutbox() {
+    // The service worker itself is registered by main.js
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.addEventListener('message', event => {
+            if (event.data && event.data.type === 'outbox-replayed') {
+                updateOutboxStatus();
+            }
         });
+    }
+
+    window.addEventListener('online', replayOutbox);
+    if (navigator.onLine) {
+        replayOutbox();
+    } else {
+        updateOutboxStatus();
+    }
 }
 
 function validateForm(form) {
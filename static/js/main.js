@@ -15,9 +15,19 @@ function displayCurrentDate() {
     }
 }
 
+// Service worker: caches static files and taxonomy, delivers the offline
+// outbox (static/sw.js)
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+    navigator.serviceWorker.register('/sw.js').catch(error => {
+        console.warn('Service worker registration failed', error);
+    });
+}
+
 // Initialize common functionality
 document.addEventListener('DOMContentLoaded', function() {
     displayCurrentDate();
+    registerServiceWorker();
     
     // Auto-hide flash messages after 5 seconds
     const flashMessages = document.querySelectorAll('.alert');
@@ -0,0 +1,266 @@
+// Offline outbox for data entry submissions
+//
+// Every submission of the data entry form is stored in IndexedDB first
+// (form fields plus the resized photos as Blobs) under a random
+// idempotency key, then sent to /submit_data with an Idempotency-Key
+// header. A submission that could not be delivered (no signal, server
+// down, session expired) stays in the outbox and is replayed later by the
+// page (on load and when the browser goes back online) or by the service
+// worker (background sync, static/sw.js). The server saves each key at most
+// once, so a replay of a submission that did arrive never duplicates it.
+//
+// Each record keeps the id of the user who filled it in. The outbox
+// survives logging out, so on a shared device the page only replays the
+// records of the user logged in now; the service worker does not know the
+// session and sends X-Outbox-User instead, which /submit_data answers with
+// 403 and held=true for another user's record. Held records wait for their
+// user to log in again.
+//
+// Loaded by the page and by the service worker (importScripts), so only
+// APIs available in both are used here.
+
+const Outbox = (function () {
+    const DB_NAME = 'rm-outbox';
+    const DB_VERSION = 1;
+    const STORE = 'submissions';
+    const SUBMIT_URL = '/submit_data';
+    const SYNC_TAG = 'submission-outbox';
+
+    // Answers that mean "try again later"; any other 4xx will never succeed
+    const RETRY_STATUSES = [401, 403, 408, 409, 425, 429];
+
+    let dbPromise = null;
+    let replaying = null;
+    const memory = new Map();   // used when IndexedDB is unavailable
+
+    function openDb() {
+        if (dbPromise) return dbPromise;
+
+        dbPromise = new Promise((resolve) => {
+            if (!self.indexedDB) {
+                resolve(null);
+                return;
+            }
+            const request = indexedDB.open(DB_NAME, DB_VERSION);
+            request.onupgradeneeded = () => {
+                request.result.createObjectStore(STORE, { keyPath: 'id' });
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => {
+                console.warn('Outbox: IndexedDB unavailable, submissions are only kept while the page is open');
+                resolve(null);
+            };
+        });
+        return dbPromise;
+    }
+
+    function withStore(mode, fn) {
+        return openDb().then(db => {
+            if (!db) {
+                const result = fn(null);
+                return result && 'result' in result ? result.result : result;
+            }
+            return new Promise((resolve, reject) => {
+                const tx = db.transaction(STORE, mode);
+                const result = fn(tx.objectStore(STORE));
+                tx.oncomplete = () => resolve(result && 'result' in result ? result.result : result);
+                tx.onerror = () => reject(tx.error);
+            });
+        });
+    }
+
+    function newKey() {
+        if (self.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        const bytes = new Uint8Array(16);
+        crypto.getRandomValues(bytes);
+        return Array.from(bytes, byte => byte.toString(16).padStart(2, '0')).join('');
+    }
+
+    function put(record) {
+        return withStore('readwrite', store => {
+            if (!store) {
+                memory.set(record.id, record);
+                return null;
+            }
+            return store.put(record);
+        });
+    }
+
+    function get(id) {
+        return withStore('readonly', store => (store ? store.get(id) : { result: memory.get(id) }));
+    }
+
+    function remove(id) {
+        return withStore('readwrite', store => {
+            if (!store) {
+                memory.delete(id);
+                return null;
+            }
+            return store.delete(id);
+        });
+    }
+
+    function all() {
+        return withStore('readonly', store => (store ? store.getAll() : { result: Array.from(memory.values()) }))
+            .then(records => (records || []).sort((a, b) => a.createdAt - b.createdAt));
+    }
+
+    function ownedBy(record, userId) {
+        return userId == null || record.userId === String(userId);
+    }
+
+    // Store a submission of user userId; resolves to its record
+    function add(formData, userId) {
+        const record = {
+            id: newKey(),
+            userId: String(userId),
+            createdAt: Date.now(),
+            capturedAt: new Date().toISOString(),
+            fields: [],
+            files: [],
+            attempts: 0,
+            failed: false,
+            lastError: null
+        };
+        formData.forEach((value, name) => {
+            if (value instanceof Blob) {
+                record.files.push([name, value, value.name || 'image.jpg']);
+            } else {
+                record.fields.push([name, value]);
+            }
+        });
+        return put(record).then(() => record);
+    }
+
+    // Photos go through the resumable chunked upload (chunked_upload.js)
+    // when it is loaded; the form then carries uploads_N ids instead of the
+    // images_N files. Upload ids derive from the submission key, so a replay
+    // resumes the uploads of the previous attempt.
+    function uploadFiles(record, onProgress) {
+        if (typeof ChunkedUpload === 'undefined' || record.files.length === 0) {
+            return Promise.resolve(null);
+        }
+
+        const totalBytes = record.files.reduce((sum, [, blob]) => sum + blob.size, 0);
+        let doneBytes = 0;
+        const uploads = [];
+        return record.files.reduce((chain, [name, blob, filename], index) => chain.then(() => {
+            const uploadId = `${record.id}-${index}`;
+            return ChunkedUpload.upload(blob, filename, uploadId, sent => {
+                if (onProgress) onProgress(doneBytes + sent, totalBytes);
+            }).then(() => {
+                doneBytes += blob.size;
+                uploads.push([name.replace(/^images_/, 'uploads_'), uploadId]);
+            });
+        }), Promise.resolve()).then(() => uploads);
+    }
+
+    function toFormData(record, uploads) {
+        const formData = new FormData();
+        record.fields.forEach(([name, value]) => formData.append(name, value));
+        if (uploads) {
+            uploads.forEach(([name, uploadId]) => formData.append(name, uploadId));
+        } else {
+            record.files.forEach(([name, blob, filename]) => formData.append(name, blob, filename));
+        }
+        formData.append('captured_at', record.capturedAt);
+        return formData;
+    }
+
+    // POST one stored submission. Resolves to {status, message}, status
+    // being 'sent', 'rejected' (the server refused it for good), 'held'
+    // (it belongs to another user than the session's) or 'retry'.
+    // onProgress(sentBytes, totalBytes) reports photo upload progress
+    function send(id, onProgress) {
+        return get(id).then(record => {
+            if (!record) return { status: 'sent', message: null };
+
+            return uploadFiles(record, onProgress)
+                .then(uploads => fetch(SUBMIT_URL, {
+                    method: 'POST',
+                    body: toFormData(record, uploads),
+                    headers: { 'Idempotency-Key': record.id, 'X-Outbox-User': record.userId },
+                    credentials: 'same-origin'
+                }))
+                .then(response => response.json()
+                    .catch(() => ({}))
+                    .then(data => {
+                        if (response.ok && data.success) {
+                            return remove(id).then(() => ({ status: 'sent', message: data.message }));
+                        }
+                        if (data.held) {
+                            return { status: 'held', message: data.message };
+                        }
+                        const status = response.status >= 500 || RETRY_STATUSES.includes(response.status) ? 'retry' : 'rejected';
+                        return { status: status, message: data.message || `HTTP ${response.status}` };
+                    }))
+                .catch(error => ({ status: error.retry === false ? 'rejected' : 'retry', message: error.message }))
+                .then(result => {
+                    if (result.status === 'sent' || result.status === 'held') return result;
+                    record.attempts += 1;
+                    record.lastError = result.message;
+                    record.failed = result.status === 'rejected';
+                    return put(record).then(() => result);
+                });
+        });
+    }
+
+    // Send every pending submission of user userId (of every user when
+    // userId is not given, the server holds back the others), oldest first.
+    // Resolves to the counts {sent, pending, failed, held}
+    function replay(userId) {
+        if (replaying) return replaying;
+
+        replaying = all()
+            .then(records => {
+                const summary = { sent: 0, pending: 0, failed: 0, held: 0 };
+                let offline = false;
+                return records.reduce((chain, record) => chain.then(() => {
+                    if (!ownedBy(record, userId)) {
+                        summary.held += 1;
+                        return null;
+                    }
+                    if (record.failed) {
+                        summary.failed += 1;
+                        return null;
+                    }
+                    if (offline) {
+                        summary.pending += 1;
+                        return null;
+                    }
+                    return send(record.id).then(result => {
+                        summary[{ sent: 'sent', rejected: 'failed', held: 'held' }[result.status] || 'pending'] += 1;
+                        // Do not hammer the network once a send failed
+                        offline = result.status === 'retry';
+                    });
+                }), Promise.resolve()).then(() => summary);
+            })
+            .finally(() => {
+                replaying = null;
+            });
+        return replaying;
+    }
+
+    // Counts of the records of user userId
+    function counts(userId) {
+        return all().then(records => {
+            const own = records.filter(record => ownedBy(record, userId));
+            return {
+                pending: own.filter(record => !record.failed).length,
+                failed: own.filter(record => record.failed).length
+            };
+        });
+    }
+
+    return {
+        SYNC_TAG: SYNC_TAG,
+        add: add,
+        send: send,
+        remove: remove,
+        replay: replay,
+        counts: counts,
+        all: all
+    };
+})();
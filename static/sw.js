@@ -0,0 +1,153 @@
+// Service worker of RM Team Check list
+//
+// - Static files: fingerprinted URLs (/static/...?v=<hash> and the built
+//   bundles /static/dist/<name>.<hash>.min.js, see static_assets.py) never
+//   change, so they are served cache-first; other static files go to the
+//   network and fall back to the cache offline.
+// - Taxonomy for the data entry form (/get_dynamic_data/...): answered from
+//   the cache right away and refreshed in the background
+//   (stale-while-revalidate), so the form renders instantly and works
+//   offline. The admin lists (/get_management_data/...) are network-first:
+//   an admin must see their own edits.
+// - The data entry page itself is network-first with a cached copy for
+//   visits without signal. Logging out drops cached pages and data.
+// - Data entry submissions left in the offline outbox (static/js/outbox.js)
+//   are delivered through background sync, even after the page was closed.
+//   The outbox is kept on logout: /submit_data holds back the records of
+//   users other than the one logged in (see outbox.js).
+//
+// Served as /sw.js (see app.py) so its scope covers the whole site.
+
+importScripts('/static/js/chunked_upload.js', '/static/js/outbox.js');
+
+const STATIC_CACHE = 'rm-static-v1';
+const DATA_CACHE = 'rm-data-v1';
+const PAGE_CACHE = 'rm-pages-v1';
+const CURRENT_CACHES = [STATIC_CACHE, DATA_CACHE, PAGE_CACHE];
+
+const OFFLINE_PAGES = ['/data_entry'];
+
+self.addEventListener('install', () => {
+    self.skipWaiting();
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys()
+        .then(names => Promise.all(names
+            .filter(name => !CURRENT_CACHES.includes(name))
+            .map(name => caches.delete(name))))
+        .then(() => self.clients.claim()));
+});
+
+function cacheable(response) {
+    return response && response.ok && !response.redirected && response.type === 'basic';
+}
+
+// Path of a fingerprinted file without its version
+function unversionedPath(url) {
+    return new URL(url).pathname.replace(/\.[0-9a-f]{12}\.min\./, '.min.');
+}
+
+function isFingerprinted(url) {
+    return url.searchParams.has('v') || url.pathname.startsWith('/static/dist/');
+}
+
+// Only the newest version of a fingerprinted file is worth keeping
+function dropOtherVersions(cache, request) {
+    const path = unversionedPath(request.url);
+    return cache.keys().then(keys => Promise.all(keys
+        .filter(key => key.url !== request.url && unversionedPath(key.url) === path)
+        .map(key => cache.delete(key))));
+}
+
+function cacheFirst(request) {
+    return caches.open(STATIC_CACHE).then(cache => cache.match(request).then(cached => {
+        if (cached) return cached;
+        return fetch(request).then(response => {
+            if (cacheable(response)) {
+                cache.put(request, response.clone()).then(() => dropOtherVersions(cache, request));
+            }
+            return response;
+        });
+    }));
+}
+
+function networkFirst(request, cacheName) {
+    return caches.open(cacheName).then(cache => fetch(request)
+        .then(response => {
+            if (cacheable(response)) {
+                cache.put(request, response.clone());
+            }
+            return response;
+        })
+        .catch(error => cache.match(request).then(cached => {
+            if (cached) return cached;
+            throw error;
+        })));
+}
+
+function staleWhileRevalidate(event, cacheName) {
+    const request = event.request;
+    return caches.open(cacheName).then(cache => cache.match(request).then(cached => {
+        const refresh = fetch(request).then(response => {
+            if (cacheable(response)) {
+                cache.put(request, response.clone());
+            }
+            return response;
+        });
+        if (cached) {
+            // Answer now, update the cache for the next visit
+            event.waitUntil(refresh.catch(() => null));
+            return cached;
+        }
+        return refresh;
+    }));
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (url.pathname === '/logout') {
+        event.waitUntil(Promise.all([caches.delete(PAGE_CACHE), caches.delete(DATA_CACHE)]));
+        return;
+    }
+
+    if (url.pathname.startsWith('/static/uploads/')) return;
+
+    if (url.pathname.startsWith('/static/')) {
+        event.respondWith(isFingerprinted(url) ? cacheFirst(request) : networkFirst(request, STATIC_CACHE));
+    } else if (url.pathname.startsWith('/get_dynamic_data/')) {
+        event.respondWith(staleWhileRevalidate(event, DATA_CACHE));
+    } else if (url.pathname.startsWith('/get_management_data/')) {
+        event.respondWith(networkFirst(request, DATA_CACHE));
+    } else if (request.mode === 'navigate' && OFFLINE_PAGES.includes(url.pathname)) {
+        event.respondWith(networkFirst(request, PAGE_CACHE));
+    }
+});
+
+function notifyClients(summary) {
+    return self.clients.matchAll({ type: 'window' }).then(clients => {
+        clients.forEach(client => client.postMessage({ type: 'outbox-replayed', summary: summary }));
+    });
+}
+
+self.addEventListener('sync', event => {
+    if (event.tag !== Outbox.SYNC_TAG) return;
+
+    event.waitUntil(Outbox.replay().then(summary => notifyClients(summary).then(() => {
+        if (summary.pending > 0) {
+            // Rejecting makes the browser retry the sync later with backoff
+            throw new Error(`${summary.pending} submissions still pending`);
+        }
+    })));
+});
+
+self.addEventListener('message', event => {
+    if (event.data && event.data.type === 'outbox-replay') {
+        event.waitUntil(Outbox.replay().then(notifyClients));
+    }
+});
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted static asset URLs and page bundles
+
+    init_static_assets(app)
+
+    {{ asset_tags('data_entry.js') }}     in templates
+
+url_for('static', filename='css/style.css') yields
+/static/css/style.css?v=<content hash>. A changed file gets a new URL, so
+versioned responses are sent with a one year immutable Cache-Control and
+the service worker (static/sw.js) serves them cache-first without asking
+the server again. Unversioned requests keep the default revalidation.
+
+Templates include their CSS and JS through the bundles of BUNDLES.
+build_assets.py concatenates and minifies each bundle into
+static/dist/<name>.<hash>.min.<ext> (plus .gz/.br copies) and lists them in
+static/dist/manifest.json; asset_tags() then emits one tag per bundle.
+Without a build (development) it emits a tag per source file instead, so
+editing a source file never requires a rebuild locally.
+
+Hashes are computed once per file and recomputed when its modification
+time changes. User photos under uploads/ are not fingerprinted: they never
+change, and hashing them would slow down the pages that list hundreds.
+Files under dist/ already carry their hash in the name.
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+from flask import request, url_for
+from markupsafe import Markup, escape
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+UNVERSIONED_PREFIXES = ('uploads/', 'dist/')
+
+DIST_DIR = 'dist'
+MANIFEST_FILE = 'manifest.json'
+
+# Page bundles: output name -> source files under static/, in load order.
+# A bundle is named after the page that includes it, not after its sources:
+# admin_management.js is the script of admin_management.html, which
+# packaged js/super_simple_admin.js until the virtualized tables replaced it
+# with js/admin_management.js. Scripts outside every bundle are not linked
+# from any page and do not belong under static/ (build_assets.py lists them).
+BUNDLES = {
+    'base.css': ['css/style.css'],
+    'base.js': ['js/main.js'],
+    'data_entry.js': ['js/branch_cache.js', 'js/chunked_upload.js', 'js/outbox.js', 'js/data_entry.js'],
+    'admin_management.js': ['js/admin_management.js'],
+    'user_management.js': ['js/user_management.js'],
+}
+
+_manifest = {'mtime': None, 'bundles': {}}
+
+_versions = {}   # filename -> (mtime_ns, size, hash)
+_versions_lock = threading.Lock()
+
+def file_version(static_folder, filename):
+    """Short content hash of a static file, or None when it does not exist"""
+    path = os.path.join(static_folder, filename)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    cached = _versions.get(filename)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+    version = digest.hexdigest()[:12]
+    with _versions_lock:
+        _versions[filename] = (stat.st_mtime_ns, stat.st_size, version)
+    return version
+
+def load_manifest(static_folder):
+    """Bundle name -> built file under dist/, reloaded when the manifest changes"""
+    path = os.path.join(static_folder, DIST_DIR, MANIFEST_FILE)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+
+    if _manifest['mtime'] != mtime:
+        with open(path, encoding='utf-8') as f:
+            bundles = json.load(f).get('bundles', {})
+        with _versions_lock:
+            _manifest['mtime'], _manifest['bundles'] = mtime, bundles
+    return _manifest['bundles']
+
+def asset_urls(static_folder, bundle):
+    """URLs to include for a bundle: the built file, or its versioned sources"""
+    built = load_manifest(static_folder).get(bundle)
+    if built:
+        return [url_for('static', filename=f'{DIST_DIR}/{built}')]
+    return [url_for('static', filename=source) for source in BUNDLES[bundle]]
+
+def asset_tags(static_folder, bundle):
+    """<link>/<script> tags of a bundle"""
+    if bundle.endswith('.css'):
+        tag = '<link rel="stylesheet" href="{}">'
+    else:
+        tag = '<script src="{}"></script>'
+    return Markup('\n'.join(tag.format(escape(url)) for url in asset_urls(static_folder, bundle)))
+
+def init_static_assets(app):
+    """
+    Add ?v=<hash> to static URLs, long cache headers to versioned responses
+    and the asset_urls() / asset_tags() template helpers
+    """
+    app.jinja_env.globals['asset_urls'] = lambda bundle: asset_urls(app.static_folder, bundle)
+    app.jinja_env.globals['asset_tags'] = lambda bundle: asset_tags(app.static_folder, bundle)
+
+    @app.url_defaults
+    def _add_static_version(endpoint, values):
+        if endpoint != 'static' or 'v' in values:
+            return
+        filename = values.get('filename', '')
+        if not filename or filename.startswith(UNVERSIONED_PREFIXES):
+            return
+        version = file_version(app.static_folder, filename)
+        if version:
+            values['v'] = version
+
+    @app.after_request
+    def _static_cache_headers(response):
+        filename = (request.view_args or {}).get('filename', '')
+        versioned = request.args.get('v') or (filename.startswith(f'{DIST_DIR}/') and not filename.endswith(MANIFEST_FILE))
+        if request.endpoint == 'static' and response.status_code == 200 and versioned:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        return response
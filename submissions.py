@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Parsing and idempotent storage of data entry submissions
+
+The data entry form posts one or more model entries (fields branch_N,
+shop_code_N, category_N, model_N, display_type_N, pop_materials_N and
+images_N for every entry N) to /submit_data. The page keeps every
+submission in an offline outbox until the server confirmed it, so a form
+may arrive more than once: requests carry an Idempotency-Key header and
+the first one that commits records the key with the ids of the entries it
+created (submissions table, migration 6). A repeated key returns that
+result instead of inserting the entries again.
+
+Photos are uploaded before the database transaction so no connection is
+held during slow uploads. If two copies of a submission race, the loser's
+uploads are left unreferenced and removed later by image_gc.py.
+"""
+
+import os
+import re
+import uuid
+import sqlite3
+from datetime import datetime, timedelta
+
+from werkzeug.utils import secure_filename
+
+from cloudinary_config import upload_image_to_cloudinary, is_cloudinary_configured
+from metrics import counter
+
+try:
+    import psycopg2
+    INTEGRITY_ERRORS = (sqlite3.IntegrityError, psycopg2.IntegrityError)
+except ImportError:
+    INTEGRITY_ERRORS = (sqlite3.IntegrityError,)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+_IDEMPOTENCY_KEY = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+_ENTRY_FIELD = re.compile(r'^branch_(\d+)$')
+
+MAX_ENTRIES = 20
+MAX_IMAGES_PER_ENTRY = 10
+
+# Offline submissions keep the time of the visit, within reason
+CAPTURED_AT_MAX_AGE = timedelta(days=30)
+CAPTURED_AT_MAX_SKEW = timedelta(hours=24)
+
+SUBMISSIONS = counter('submissions_total', 'Data entry submissions by outcome', ('outcome',))
+SUBMITTED_ENTRIES = counter('submitted_entries_total', 'Model entries saved by /submit_data')
+
+class SubmissionError(Exception):
+    """Invalid submission, reported to the client with an HTTP status"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def get_idempotency_key(request):
+    """The submission's idempotency key (header or form field), or None"""
+    key = request.headers.get(IDEMPOTENCY_HEADER) or request.form.get('idempotency_key')
+    if key is None:
+        return None
+    key = key.strip()
+    if not _IDEMPOTENCY_KEY.match(key):
+        raise SubmissionError('Invalid idempotency key')
+    return key
+
+def parse_captured_at(value, now=None):
+    """
+    Time of the visit sent by the client (ISO 8601), e.g. for a submission
+    that waited in the offline outbox; the server time when missing or
+    implausible
+    """
+    now = now or datetime.now()
+    if value:
+        try:
+            captured = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if captured.tzinfo is not None:
+                # Stored timestamps are server local time without zone
+                captured = captured.astimezone().replace(tzinfo=None)
+            if now - CAPTURED_AT_MAX_AGE <= captured <= now + CAPTURED_AT_MAX_SKEW:
+                return captured.strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+    return now.strftime('%Y-%m-%d %H:%M:%S')
+
+def parse_entries(form, files):
+    """
+    Model entries of a submitted data entry form
+
+    Returns:
+        list: dicts with branch_name, shop_code, category, model,
+              display_type, selected_materials (list), images (list of
+              FileStorage) and uploads (ids of chunked uploads)
+    """
+    indexes = sorted(int(match.group(1)) for match in map(_ENTRY_FIELD.match, form.keys()) if match)
+    if not indexes:
+        raise SubmissionError('At least one model entry is required')
+    if len(indexes) > MAX_ENTRIES:
+        raise SubmissionError(f'At most {MAX_ENTRIES} model entries per submission')
+
+    entries = []
+    for number, index in enumerate(indexes, 1):
+        entry = {
+            'branch_name': form.get(f'branch_{index}', '').strip(),
+            'shop_code': form.get(f'shop_code_{index}', '').strip(),
+            'category': form.get(f'category_{index}', '').strip(),
+            'model': form.get(f'model_{index}', '').strip(),
+            'display_type': form.get(f'display_type_{index}', '').strip(),
+            'selected_materials': [material.strip() for material in form.getlist(f'pop_materials_{index}') if material.strip()],
+            'images': [image for image in files.getlist(f'images_{index}') if image and image.filename],
+            # Photos sent beforehand through the resumable upload endpoints
+            'uploads': [upload_id.strip() for upload_id in form.getlist(f'uploads_{index}') if upload_id.strip()]
+        }
+
+        missing = [label for field, label in (('branch_name', 'branch'), ('shop_code', 'shop code'),
+                                              ('category', 'category'), ('model', 'model'),
+                                              ('display_type', 'display type')) if not entry[field]]
+        if missing:
+            raise SubmissionError(f"Model entry {number}: {', '.join(missing)} required")
+        if len(entry['images']) + len(entry['uploads']) > MAX_IMAGES_PER_ENTRY:
+            raise SubmissionError(f'Model entry {number}: at most {MAX_IMAGES_PER_ENTRY} images')
+
+        entries.append(entry)
+    return entries
+
+def store_images(images, upload_folder):
+    """
+    Upload the photos of one entry
+
+    Returns:
+        list: Cloudinary URLs, or file names in upload_folder when Cloudinary
+              is not configured
+    """
+    references = []
+    use_cloudinary = is_cloudinary_configured()
+    for image in images:
+        if use_cloudinary:
+            result = upload_image_to_cloudinary(image)
+            if not result or not result.get('success'):
+                raise SubmissionError(f"Image upload failed: {(result or {}).get('error', 'unknown error')}", 502)
+            references.append(result['url'])
+        else:
+            filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}_{secure_filename(image.filename)}"
+            image.save(os.path.join(upload_folder, filename))
+            references.append(filename)
+    return references
+
+def find_submission(cursor, db_type, key):
+    """
+    Returns:
+        tuple: (user_id, entry_ids) of a recorded submission, entry_ids is
+               None while it is still being saved; None for an unknown key
+    """
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    cursor.execute(f'SELECT user_id, entry_ids FROM submissions WHERE idempotency_key = {placeholder}', (key,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    entry_ids = [int(entry_id) for entry_id in row[1].split(',') if entry_id] if row[1] is not None else None
+    return row[0], entry_ids
+
+def claim_submission(cursor, db_type, key, user_id, created_at):
+    """Record the key; raises one of INTEGRITY_ERRORS when it is already taken"""
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    cursor.execute(f'INSERT INTO submissions (idempotency_key, user_id, created_at) VALUES ({placeholder}, {placeholder}, {placeholder})',
+                   (key, user_id, created_at))
+
+def complete_submission(cursor, db_type, key, entry_ids):
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    cursor.execute(f'UPDATE submissions SET entry_ids = {placeholder} WHERE idempotency_key = {placeholder}',
+                   (','.join(str(entry_id) for entry_id in entry_ids), key))
+
+def save_branch(cursor, db_type, user_id, branch_name, shop_code, created_at):
+    """
+    Make sure the branch exists and is assigned to the user
+
+    Returns:
+        tuple: (branch_created, assignment_created)
+    """
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    if db_type == 'postgresql':
+        cursor.execute(f'INSERT INTO branches (name, code, created_at) VALUES ({placeholder}, {placeholder}, {placeholder}) ON CONFLICT (code) DO NOTHING',
+                       (branch_name, shop_code, created_at))
+        branch_created = cursor.rowcount > 0
+        cursor.execute(f'INSERT INTO user_branches (user_id, branch_name) VALUES ({placeholder}, {placeholder}) ON CONFLICT (user_id, branch_name) DO NOTHING',
+                       (user_id, branch_name))
+    else:
+        cursor.execute(f'INSERT OR IGNORE INTO branches (name, code, created_at) VALUES ({placeholder}, {placeholder}, {placeholder})',
+                       (branch_name, shop_code, created_at))
+        branch_created = cursor.rowcount > 0
+        cursor.execute(f'INSERT OR IGNORE INTO user_branches (user_id, branch_name) VALUES ({placeholder}, {placeholder})',
+                       (user_id, branch_name))
+    return branch_created, cursor.rowcount > 0
+
+def insert_entry(cursor, db_type, row):
+    """Insert one data_entries row (dict of column -> value) and return its id"""
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    columns = ', '.join(row)
+    values = ', '.join([placeholder] * len(row))
+    if db_type == 'postgresql':
+        cursor.execute(f'INSERT INTO data_entries ({columns}) VALUES ({values}) RETURNING id', tuple(row.values()))
+        return cursor.fetchone()[0]
+
+    cursor.execute(f'INSERT INTO data_entries ({columns}) VALUES ({values})', tuple(row.values()))
+    return cursor.lastrowid
@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Bulk import and export of the taxonomy
+
+Categories, models, display types and POP materials are exchanged as one
+spreadsheet (.xlsx or .csv) with a row per item:
+
+    Type           Category   Model   Name
+    category                          TV
+    model          TV                 QN90F
+    display_type   TV                 Wall
+    pop_material   TV         QN90F   AI topper
+
+Parents are implied: a pop_material row also creates its category and
+model when they are missing, so a plain list of materials per model is a
+valid import. /export_taxonomy writes the same layout, so an export can be
+edited and imported again.
+
+An import is validated as a whole (nothing is written when a row is
+invalid), compared with the current taxonomy and then applied in one
+transaction with multi-row INSERTs that skip existing items through the
+unique indexes of migration 3. Items missing from the file are reported
+but never deleted. This replaces one-off scripts such as
+populate_missing_pop_materials.py.
+"""
+
+import io
+import csv
+import os
+
+from metrics import counter
+from rename_propagation import record_renames
+
+COLUMNS = ('Type', 'Category', 'Model', 'Name')
+
+# Spelling of the Type column -> taxonomy list
+TYPES = {
+    'category': 'categories', 'categories': 'categories',
+    'model': 'models', 'models': 'models',
+    'display_type': 'display_types', 'display_types': 'display_types',
+    'pop_material': 'pop_materials', 'pop_materials': 'pop_materials', 'pop': 'pop_materials'
+}
+EXPORT_TYPES = {'categories': 'category', 'models': 'model', 'display_types': 'display_type', 'pop_materials': 'pop_material'}
+LISTS = ('categories', 'models', 'display_types', 'pop_materials')
+
+# Column sizes of the PostgreSQL schema (migration 1)
+NAME_LIMITS = {'categories': 100, 'models': 100, 'display_types': 100, 'pop_materials': 200}
+
+MAX_ROWS = 20000
+MAX_ERRORS = 50
+PREVIEW_ITEMS = 20
+
+# Rows per INSERT statement: 3 values each stays below SQLite's 999 parameters
+INSERT_BATCH = 300
+
+IMPORTED_ITEMS = counter('taxonomy_import_items_total', 'Taxonomy items added by bulk imports', ('type',))
+IMPORTS = counter('taxonomy_imports_total', 'Bulk taxonomy imports by outcome', ('outcome',))
+
+class TaxonomyImportError(Exception):
+    """Unreadable or invalid import file; errors lists the rejected rows"""
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+def read_rows(file):
+    """
+    Rows of an uploaded .xlsx / .csv file as lists of cell strings
+
+    Args:
+        file: werkzeug FileStorage
+    """
+    extension = os.path.splitext(file.filename or '')[1].lower()
+    if extension == '.csv':
+        text = file.read().decode('utf-8-sig', errors='replace')
+        return list(csv.reader(io.StringIO(text)))
+
+    if extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(io.BytesIO(file.read()), read_only=True, data_only=True)
+        except Exception as e:
+            raise TaxonomyImportError(f'Could not read the workbook: {e}')
+        try:
+            return [['' if value is None else str(value) for value in row]
+                    for row in workbook.active.iter_rows(values_only=True)]
+        finally:
+            workbook.close()
+
+    raise TaxonomyImportError('Upload an .xlsx or .csv file')
+
+def parse_taxonomy(rows):
+    """
+    Validate the rows of an import file
+
+    Returns:
+        dict: list name -> set of keys: names for categories,
+              (category, name) for models and display types,
+              (category, model, name) for POP materials
+    """
+    rows = [row for row in rows if any(cell.strip() for cell in row)]
+    if not rows:
+        raise TaxonomyImportError('The file is empty')
+    if len(rows) - 1 > MAX_ROWS:
+        raise TaxonomyImportError(f'Too many rows (at most {MAX_ROWS})')
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    missing = [column for column in ('type', 'name') if column not in header]
+    if missing:
+        raise TaxonomyImportError(f"Missing columns: {', '.join(missing)} (expected {', '.join(COLUMNS)})")
+    index = {column.lower(): header.index(column.lower()) for column in COLUMNS if column.lower() in header}
+
+    def cell(row, column):
+        position = index.get(column)
+        return row[position].strip() if position is not None and position < len(row) else ''
+
+    wanted = {name: set() for name in LISTS}
+    errors = []
+    for number, row in enumerate(rows[1:], start=2):
+        kind = TYPES.get(cell(row, 'type').lower().replace(' ', '_').replace('-', '_'))
+        category, model, name = cell(row, 'category'), cell(row, 'model'), cell(row, 'name')
+
+        if kind is None:
+            problem = f"unknown type '{cell(row, 'type')}'"
+        elif not name:
+            problem = 'name is missing'
+        elif len(name) > NAME_LIMITS[kind]:
+            problem = f'name is longer than {NAME_LIMITS[kind]} characters'
+        elif kind != 'categories' and not category:
+            problem = 'category is missing'
+        elif kind == 'pop_materials' and not model:
+            problem = 'model is missing'
+        elif len(category) > NAME_LIMITS['categories'] or len(model) > NAME_LIMITS['models']:
+            problem = 'category or model name is too long'
+        else:
+            problem = None
+
+        if problem:
+            errors.append({'row': number, 'message': problem})
+            if len(errors) >= MAX_ERRORS:
+                break
+            continue
+
+        if kind == 'categories':
+            wanted['categories'].add(name)
+        else:
+            wanted['categories'].add(category)
+            if kind == 'pop_materials':
+                wanted['models'].add((category, model))
+                wanted['pop_materials'].add((category, model, name))
+            else:
+                wanted[kind].add((category, name))
+
+    if errors:
+        raise TaxonomyImportError(f'{len(errors)} invalid rows, nothing was imported', errors)
+    return wanted
+
+def load_taxonomy(cursor):
+    """The current taxonomy as sets of keys like parse_taxonomy()"""
+    current = {}
+    cursor.execute('SELECT name FROM categories')
+    current['categories'] = {row[0] for row in cursor.fetchall()}
+    cursor.execute('SELECT c.name, m.name FROM models m JOIN categories c ON m.category_id = c.id')
+    current['models'] = {tuple(row) for row in cursor.fetchall()}
+    cursor.execute('SELECT c.name, dt.name FROM display_types dt JOIN categories c ON dt.category_id = c.id')
+    current['display_types'] = {tuple(row) for row in cursor.fetchall()}
+    cursor.execute('''SELECT c.name, m.name, pm.name FROM pop_materials pm
+                      JOIN models m ON pm.model_id = m.id JOIN categories c ON m.category_id = c.id''')
+    current['pop_materials'] = {tuple(row) for row in cursor.fetchall()}
+    return current
+
+def diff_taxonomy(wanted, current):
+    """
+    Returns:
+        dict: list name -> {'new': sorted keys to add, 'existing': count,
+              'not_in_file': count of current items the file leaves out}
+    """
+    return {
+        name: {
+            'new': sorted(wanted[name] - current[name]),
+            'existing': len(wanted[name] & current[name]),
+            'not_in_file': len(current[name] - wanted[name])
+        }
+        for name in LISTS
+    }
+
+def summarize(changes):
+    """JSON-friendly diff: counts plus the first few new items per list"""
+    return {
+        name: {
+            'new': len(change['new']),
+            'existing': change['existing'],
+            'not_in_file': change['not_in_file'],
+            'preview': [key if isinstance(key, str) else ' / '.join(key) for key in change['new'][:PREVIEW_ITEMS]]
+        }
+        for name, change in changes.items()
+    }
+
+def insert_rows(cursor, db_type, table, columns, rows, conflict_columns):
+    """Multi-row INSERT that skips rows violating the unique index; returns the rows added"""
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    row_values = f"({', '.join([placeholder] * len(columns))})"
+    added = 0
+    for start in range(0, len(rows), INSERT_BATCH):
+        batch = rows[start:start + INSERT_BATCH]
+        values = ', '.join([row_values] * len(batch))
+        params = [value for row in batch for value in row]
+        if db_type == 'postgresql':
+            cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} "
+                           f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING", params)
+        else:
+            cursor.execute(f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES {values}", params)
+        added += max(cursor.rowcount, 0)
+    return added
+
+def _category_ids(cursor):
+    cursor.execute('SELECT name, id FROM categories')
+    return dict(cursor.fetchall())
+
+def _model_ids(cursor):
+    cursor.execute('SELECT category_id, name, id FROM models WHERE category_id IS NOT NULL')
+    return {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+
+def apply_changes(cursor, db_type, changes, created_at):
+    """
+    Insert the new items of diff_taxonomy(), parents first; the caller
+    commits
+
+    Returns:
+        dict: list name -> number of rows added
+    """
+    added = {}
+    added['categories'] = insert_rows(cursor, db_type, 'categories', ('name', 'created_at'),
+                                      [(name, created_at) for name in changes['categories']['new']], ('name',))
+
+    category_ids = _category_ids(cursor)
+    for name in ('models', 'display_types'):
+        rows = [(item, category_ids[category], created_at) for category, item in changes[name]['new']]
+        added[name] = insert_rows(cursor, db_type, name, ('name', 'category_id', 'created_at'), rows,
+                                  ('category_id', 'name'))
+
+    model_ids = _model_ids(cursor)
+    rows = [(item, model_ids[(category_ids[category], model)], created_at)
+            for category, model, item in changes['pop_materials']['new']]
+    added['pop_materials'] = insert_rows(cursor, db_type, 'pop_materials', ('name', 'model_id', 'created_at'), rows,
+                                         ('model_id', 'name'))
+
+    for name, count in added.items():
+        if count:
+            IMPORTED_ITEMS.inc(count, type=name)
+    return added
+
+def export_rows(cursor):
+    """Rows of the export in COLUMNS order, parents before children"""
+    current = load_taxonomy(cursor)
+    rows = [(EXPORT_TYPES['categories'], '', '', name) for name in sorted(current['categories'])]
+    rows += [(EXPORT_TYPES['models'], category, '', name) for category, name in sorted(current['models'])]
+    rows += [(EXPORT_TYPES['display_types'], category, '', name) for category, name in sorted(current['display_types'])]
+    rows += [(EXPORT_TYPES['pop_materials'], category, model, name)
+             for category, model, name in sorted(current['pop_materials'])]
+    return rows
+
+def write_csv(rows):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(COLUMNS)
+    writer.writerows(rows)
+    return io.BytesIO(output.getvalue().encode('utf-8-sig'))
+
+def write_xlsx(rows):
+    from openpyxl import Workbook
+
+    # Write-only mode streams rows instead of building cell objects
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Taxonomy')
+    sheet.append(COLUMNS)
+    for row in rows:
+        sheet.append(row)
+    output = io.BytesIO()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+# Batched manage_data operations
+
+MAX_OPERATIONS = 500
+
+# Parent key column of each list and the list it points to
+PARENTS = {
+    'models': ('category_id', 'categories'),
+    'display_types': ('category_id', 'categories'),
+    'pop_materials': ('model_id', 'models')
+}
+# Children that prevent deleting an item (same rules as a single delete)
+DEPENDENTS = {'categories': ('models', 'category_id'), 'models': ('pop_materials', 'model_id')}
+DELETE_BLOCKED = {
+    'categories': 'Cannot delete category with existing models',
+    'models': 'Cannot delete model with existing POP materials'
+}
+LABELS = {'categories': 'Category', 'models': 'Model', 'display_types': 'Display type', 'pop_materials': 'POP material'}
+ACTIONS = {'add': 'added', 'edit': 'updated', 'delete': 'deleted'}
+
+OPERATIONS = counter('taxonomy_operations_total', 'Batched manage_data operations by action and outcome',
+                     ('action', 'outcome'))
+
+class OperationError(Exception):
+    """An operation of a batch that cannot be applied"""
+
+def _optional_id(value, field):
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise OperationError(f'{field} must be a number')
+
+def parse_operation(operation):
+    """Normalized {action, type, id, name, parent_id} of one batch item"""
+    if not isinstance(operation, dict):
+        raise OperationError('Operation must be an object')
+    action, data_type = operation.get('action'), operation.get('type')
+    if action not in ACTIONS:
+        raise OperationError('Invalid action')
+    if data_type not in LABELS:
+        raise OperationError('Invalid data type')
+
+    parent_field = PARENTS[data_type][0] if data_type in PARENTS else None
+    parsed = {
+        'action': action,
+        'type': data_type,
+        'id': _optional_id(operation.get('id'), 'id'),
+        'name': str(operation.get('name') or '').strip(),
+        'parent_id': _optional_id(operation.get(parent_field), parent_field) if parent_field else None
+    }
+    if action != 'add' and parsed['id'] is None:
+        raise OperationError('Item ID is required')
+    if action != 'delete' and not parsed['name']:
+        raise OperationError(f'{LABELS[data_type]} name is required')
+    if action != 'delete' and len(parsed['name']) > NAME_LIMITS[data_type]:
+        raise OperationError(f'Name is longer than {NAME_LIMITS[data_type]} characters')
+    if action == 'add' and parent_field and parsed['parent_id'] is None:
+        raise OperationError(f"{LABELS[PARENTS[data_type][1]]} is required")
+    return parsed
+
+def _select_in(cursor, db_type, query, values):
+    """Run query with an IN ({values}) list"""
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    cursor.execute(query.format(values=', '.join([placeholder] * len(values))), list(values))
+    return cursor.fetchall()
+
+def _validate(cursor, db_type, data_type, ops, parsed):
+    """
+    Check the operations of one list against the database with one query
+    per kind of check; returns index -> error message of the invalid ones
+    """
+    parent_column, parent_table = PARENTS.get(data_type, (None, None))
+    parent_select = parent_column or 'NULL'
+    errors = {}
+
+    ids = sorted({op['id'] for op in ops.values() if op['id'] is not None})
+    current = {}
+    if ids:
+        rows = _select_in(cursor, db_type, f'SELECT id, {parent_select} FROM {data_type} WHERE id IN ({{values}})', ids)
+        current = dict(rows)
+
+    names = sorted({op['name'] for op in ops.values() if op['name']})
+    taken = {}
+    if names:
+        rows = _select_in(cursor, db_type, f'SELECT {parent_select}, name, id FROM {data_type} WHERE name IN ({{values}})', names)
+        taken = {(row[0], row[1]): row[2] for row in rows}
+
+    parents = set()
+    parent_ids = sorted({op['parent_id'] for op in ops.values() if op['parent_id'] is not None})
+    if parent_ids:
+        parents = {row[0] for row in _select_in(cursor, db_type, f'SELECT id FROM {parent_table} WHERE id IN ({{values}})', parent_ids)}
+
+    # Items still referenced after the batch cannot be deleted: children in
+    # the database that the batch does not delete, or children the batch
+    # adds or moves under them
+    blocked, targeted = set(), set()
+    delete_ids = sorted(op['id'] for op in ops.values() if op['action'] == 'delete')
+    if delete_ids:
+        for child_type, (column, table) in PARENTS.items():
+            if table == data_type:
+                targeted |= {op['parent_id'] for op in parsed.values()
+                             if op['type'] == child_type and op['action'] != 'delete' and op['parent_id'] is not None}
+        if data_type in DEPENDENTS:
+            child_type, column = DEPENDENTS[data_type]
+            deleted_children = {op['id'] for op in parsed.values() if op['type'] == child_type and op['action'] == 'delete'}
+            rows = _select_in(cursor, db_type, f'SELECT {column}, id FROM {child_type} WHERE {column} IN ({{values}})', delete_ids)
+            blocked |= {row[0] for row in rows if row[1] not in deleted_children}
+
+    claimed = set()
+    for index, op in sorted(ops.items()):
+        if op['action'] != 'add' and op['id'] not in current:
+            errors[index] = f"{LABELS[data_type]} {op['id']} not found"
+            continue
+        if op['action'] == 'delete':
+            if op['id'] in blocked:
+                errors[index] = DELETE_BLOCKED[data_type]
+            elif op['id'] in targeted:
+                errors[index] = f'{LABELS[data_type]} is used by another operation of this batch'
+            continue
+
+        if op['parent_id'] is not None and op['parent_id'] not in parents:
+            errors[index] = f"{LABELS[parent_table]} {op['parent_id']} not found"
+            continue
+        parent = op['parent_id'] if op['parent_id'] is not None else current.get(op['id']) if parent_column else None
+        key = (parent, op['name'])
+        if taken.get(key, op['id']) != op['id'] or key in claimed:
+            errors[index] = f'{LABELS[data_type]} already exists' + (' in this category' if data_type == 'models' else '')
+            continue
+        claimed.add(key)
+    return errors
+
+def apply_operations(cursor, db_type, operations, created_at, atomic=False):
+    """
+    Run a batch of manage_data operations ({action, type, id, name,
+    category_id / model_id} each) in the caller's transaction
+
+    All operations are validated first with set-based queries; the valid
+    ones are then executed grouped by list: adds as multi-row INSERTs
+    (parents first), edits with executemany, deletes as one DELETE per list
+    (children first). With atomic=True nothing is executed when any
+    operation is invalid. Renames are recorded as propagation jobs (see
+    rename_propagation); the caller commits and starts the propagation.
+
+    Returns:
+        list: {'index', 'success', 'message'} per operation, in order
+    """
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    errors, parsed = {}, {}
+    for index, operation in enumerate(operations):
+        try:
+            parsed[index] = parse_operation(operation)
+        except OperationError as e:
+            errors[index] = str(e)
+
+    # Every item is changed at most once per batch
+    seen = set()
+    for index, op in sorted(parsed.items()):
+        if op['id'] is not None:
+            if (op['type'], op['id']) in seen:
+                errors[index] = 'Item is already changed by an earlier operation of this batch'
+            seen.add((op['type'], op['id']))
+    parsed = {index: op for index, op in parsed.items() if index not in errors}
+
+    # Children first, so a parent delete sees which child operations survive
+    for data_type in reversed(LISTS):
+        ops = {index: op for index, op in parsed.items() if op['type'] == data_type}
+        if ops:
+            errors.update(_validate(cursor, db_type, data_type, ops, parsed))
+            parsed = {index: op for index, op in parsed.items() if index not in errors}
+
+    if atomic and errors:
+        parsed = {}
+
+    for data_type in LISTS:
+        ops = [op for index, op in sorted(parsed.items()) if op['type'] == data_type]
+        parent_column = PARENTS[data_type][0] if data_type in PARENTS else None
+
+        adds = [op for op in ops if op['action'] == 'add']
+        if adds:
+            if parent_column:
+                insert_rows(cursor, db_type, data_type, ('name', parent_column, 'created_at'),
+                            [(op['name'], op['parent_id'], created_at) for op in adds], (parent_column, 'name'))
+            else:
+                insert_rows(cursor, db_type, data_type, ('name', 'created_at'),
+                            [(op['name'], created_at) for op in adds], ('name',))
+
+        edits = [op for op in ops if op['action'] == 'edit']
+        if edits:
+            # Entries that carry the old names are rewritten afterwards
+            record_renames(cursor, db_type, data_type, [(op['id'], op['name']) for op in edits], created_at)
+            if parent_column:
+                cursor.executemany(f'UPDATE {data_type} SET name = {placeholder}, '
+                                   f'{parent_column} = COALESCE({placeholder}, {parent_column}) WHERE id = {placeholder}',
+                                   [(op['name'], op['parent_id'], op['id']) for op in edits])
+            else:
+                cursor.executemany(f'UPDATE {data_type} SET name = {placeholder} WHERE id = {placeholder}',
+                                   [(op['name'], op['id']) for op in edits])
+
+    for data_type in reversed(LISTS):
+        delete_ids = [op['id'] for op in parsed.values() if op['type'] == data_type and op['action'] == 'delete']
+        if delete_ids:
+            cursor.execute(f"DELETE FROM {data_type} WHERE id IN ({', '.join([placeholder] * len(delete_ids))})",
+                           delete_ids)
+
+    results = []
+    for index in range(len(operations)):
+        if index in parsed:
+            op = parsed[index]
+            results.append({'index': index, 'success': True, 'message': f"{LABELS[op['type']]} {ACTIONS[op['action']]}"})
+            OPERATIONS.inc(action=op['action'], outcome='applied')
+        else:
+            message = errors.get(index, 'Not applied: other operations of the batch are invalid')
+            results.append({'index': index, 'success': False, 'message': message})
+            action = operations[index].get('action') if isinstance(operations[index], dict) else None
+            OPERATIONS.inc(action=action if action in ACTIONS else 'invalid', outcome='rejected')
+    return results
+
+# Copying POP material lists between models
+
+MAX_CLONE_TARGETS = 200
+
+def clone_pop_materials(cursor, db_type, source_model_id, target_model_ids, created_at):
+    """
+    Copy the POP materials of one model to other models with a single
+    INSERT ... SELECT; materials a target already has are skipped through
+    the (model_id, name) unique index. The caller commits.
+
+    Returns:
+        dict: source_materials (materials of the source model) and added
+              (rows inserted over all targets)
+
+    Raises:
+        OperationError: unknown source or target models
+    """
+    placeholder = '%s' if db_type == 'postgresql' else '?'
+    targets = sorted(set(target_model_ids) - {source_model_id})
+    if not targets:
+        raise OperationError('Select at least one target model other than the source')
+
+    found = {row[0] for row in _select_in(cursor, db_type, 'SELECT id FROM models WHERE id IN ({values})',
+                                          [source_model_id] + targets)}
+    if source_model_id not in found:
+        raise OperationError(f'Model {source_model_id} not found')
+    missing = [model_id for model_id in targets if model_id not in found]
+    if missing:
+        raise OperationError(f"Models not found: {', '.join(str(model_id) for model_id in missing)}")
+
+    cursor.execute(f'SELECT COUNT(*) FROM pop_materials WHERE model_id = {placeholder}', (source_model_id,))
+    source_materials = cursor.fetchone()[0]
+
+    in_targets = ', '.join([placeholder] * len(targets))
+    select = (f'SELECT pm.name, t.id, {placeholder} FROM pop_materials pm '
+              f'JOIN models t ON t.id IN ({in_targets}) WHERE pm.model_id = {placeholder}')
+    params = [created_at] + targets + [source_model_id]
+    if db_type == 'postgresql':
+        cursor.execute(f'INSERT INTO pop_materials (name, model_id, created_at) {select} '
+                       f'ON CONFLICT (model_id, name) DO NOTHING', params)
+    else:
+        cursor.execute(f'INSERT OR IGNORE INTO pop_materials (name, model_id, created_at) {select}', params)
+
+    added = max(cursor.rowcount, 0)
+    if added:
+        IMPORTED_ITEMS.inc(added, type='pop_materials')
+    return {'source_materials': source_materials, 'added': added}
@@ -0,0 +1,49 @@
+"""
+Shared fixtures: a migrated SQLite database per test, and the Flask app
+running on one (the app opens database.db in the working directory)
+"""
+
+import sqlite3
+
+import pytest
+
+from migrations import run_migrations
+
+ADMIN_CREDENTIALS = {'name': 'admin', 'company_code': 'ADMIN001', 'password': 'admin123'}
+
+@pytest.fixture
+def connect(tmp_path):
+    """Connection factory of a migrated database, as get_db_connection()"""
+    path = str(tmp_path / 'test.db')
+    conn = sqlite3.connect(path)
+    run_migrations(conn, 'sqlite')
+    conn.close()
+    return lambda: (sqlite3.connect(path), 'sqlite')
+
+@pytest.fixture
+def conn(connect):
+    conn, _ = connect()
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import app as app_module
+    import app_cache
+    from branch_index import reset_index
+
+    app_module.app.config['TESTING'] = True
+    # Nothing cached by an earlier test's database
+    app_cache.set_backend(app_cache.LocalBackend())
+    app_cache.use_shared_versions(app_module.get_db_connection)
+    reset_index()
+    with app_module.app.app_context():
+        app_module.init_db()
+    return app_module
+
+@pytest.fixture
+def admin_client(app_module):
+    client = app_module.app.test_client()
+    client.post('/login', data=ADMIN_CREDENTIALS)
+    return client
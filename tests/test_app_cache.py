@@ -0,0 +1,35 @@
+from app_cache import AppCache, LocalBackend, DatabaseVersions
+
+def counting(connect):
+    """connect() that counts the connections it opens"""
+    calls = []
+
+    def wrapped():
+        calls.append(1)
+        return connect()
+    return wrapped, calls
+
+def test_hits_do_not_query_the_database(connect):
+    connect, calls = counting(connect)
+    cache = AppCache(LocalBackend(), versions=DatabaseVersions(connect, refresh=60))
+
+    for _ in range(100):
+        assert cache.get_or_load('taxonomy', 'categories', lambda: ['TV']) == ['TV']
+
+    assert len(calls) == 1
+
+def test_invalidation_reaches_other_workers_after_the_refresh(connect):
+    worker_a = AppCache(LocalBackend(), versions=DatabaseVersions(connect, refresh=60))
+    versions_b = DatabaseVersions(connect, refresh=60)
+    worker_b = AppCache(LocalBackend(), versions=versions_b)
+    worker_a.get_or_load('taxonomy', 'categories', lambda: ['TV'])
+    worker_b.get_or_load('taxonomy', 'categories', lambda: ['TV'])
+
+    worker_a.invalidate('taxonomy')
+
+    # The invalidating worker at once, the others at their next refresh
+    assert worker_a.get_or_load('taxonomy', 'categories', lambda: ['TV', 'Audio']) == ['TV', 'Audio']
+    assert worker_b.get_or_load('taxonomy', 'categories', lambda: ['TV', 'Audio']) == ['TV']
+    versions_b.refresh = 0
+    assert worker_b.get_or_load('taxonomy', 'categories', lambda: ['TV', 'Audio']) == ['TV', 'Audio']
+    assert worker_b.version('taxonomy') == worker_a.version('taxonomy') == 1
@@ -0,0 +1,43 @@
+from branch_index import BranchIndex, normalize
+
+BRANCHES = [
+    (1, 'Cairo Festival City Mall Extension', 'BR001'),
+    (2, 'Alexandria San Stefano', 'BR002'),
+    (3, 'Giza Mall', 'BR003'),
+    (4, 'Festival Plaza', 'BR004'),
+    (5, 'Café Zamalek', 'BR010'),
+]
+
+def codes(results):
+    return [branch['code'] for branch in results]
+
+def test_exact_code_ranks_first():
+    assert codes(BranchIndex(BRANCHES).search('br001'))[0] == 'BR001'
+
+def test_every_query_word_must_prefix_a_word():
+    index = BranchIndex(BRANCHES)
+    assert codes(index.search('cai fes')) == ['BR001']
+    assert codes(index.search('fest')) == ['BR004', 'BR001']
+
+def test_accents_and_case_are_ignored():
+    assert normalize('  CAFÉ   Zamalek ') == 'cafe zamalek'
+    assert codes(BranchIndex(BRANCHES).search('cafe')) == ['BR010']
+
+def test_typo_in_one_word_of_a_long_name_matches():
+    index = BranchIndex(BRANCHES)
+    assert 'BR001' in codes(index.search('festivl'))
+    assert codes(index.search('cairo festivl')) == ['BR001']
+    assert codes(index.search('stefno')) == ['BR002']
+
+def test_substring_matches_rank_above_typos():
+    assert codes(BranchIndex(BRANCHES).search('ival cit'))[0] == 'BR001'
+
+def test_unrelated_query_finds_nothing():
+    assert BranchIndex(BRANCHES).search('xyz') == []
+    assert BranchIndex(BRANCHES).search('') == []
+
+def test_limit_and_lookup_by_code():
+    index = BranchIndex(BRANCHES)
+    assert len(index.search('br', limit=2)) == 2
+    assert index.get_by_code('br003') == {'name': 'Giza Mall', 'code': 'BR003'}
+    assert index.get_by_code('BR999') is None
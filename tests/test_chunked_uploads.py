@@ -0,0 +1,137 @@
+import io
+import os
+import time
+import hashlib
+
+import pytest
+
+import chunked_uploads
+from chunked_uploads import (UploadError, create_session, write_chunk, finalize, get_status, open_upload,
+                             discard_upload)
+
+DATA = bytes(range(256)) * 4 + b'tail'   # 1028 bytes: chunks of 256, last one 4 bytes
+USER = 7
+UPLOAD_ID = 'upload-0001'
+
+@pytest.fixture(autouse=True)
+def staging(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunked_uploads, 'STAGING_DIR', str(tmp_path / 'staging'))
+    monkeypatch.setattr(chunked_uploads, 'CHUNK_SIZE', 256)
+
+def chunk(index):
+    return DATA[index * 256:(index + 1) * 256]
+
+def start():
+    return create_session(USER, UPLOAD_ID, 'shelf photo.jpg', len(DATA), 'image/jpeg')
+
+def test_chunks_in_any_order_assemble_the_file():
+    state = start()
+    assert state['total_chunks'] == 5 and state['received'] == []
+
+    for index in (4, 0, 2, 1, 3):
+        write_chunk(USER, UPLOAD_ID, index, io.BytesIO(chunk(index)))
+    state = finalize(USER, UPLOAD_ID)
+
+    assert state['complete']
+    upload = open_upload(USER, UPLOAD_ID)
+    try:
+        assert upload.read() == DATA
+        assert upload.filename == 'shelf_photo.jpg'
+    finally:
+        upload.close()
+
+def test_resume_reports_received_chunks():
+    start()
+    write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)))
+    write_chunk(USER, UPLOAD_ID, 3, io.BytesIO(chunk(3)))
+
+    assert start()['received'] == [0, 3]
+    assert get_status(USER, UPLOAD_ID)['received'] == [0, 3]
+
+def test_finalize_with_missing_chunks_conflicts():
+    start()
+    write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)))
+
+    with pytest.raises(UploadError) as error:
+        finalize(USER, UPLOAD_ID)
+    assert error.value.status == 409
+    assert '1, 2, 3, 4' in str(error.value)
+
+def test_finalize_twice_returns_the_same_state():
+    start()
+    for index in range(5):
+        write_chunk(USER, UPLOAD_ID, index, io.BytesIO(chunk(index)))
+
+    assert finalize(USER, UPLOAD_ID) == finalize(USER, UPLOAD_ID)
+    # Late duplicates of a chunk are ignored
+    assert write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)))['complete']
+
+def test_wrong_size_or_checksum_is_rejected_and_not_stored():
+    start()
+    with pytest.raises(UploadError):
+        write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)[:-1]))
+    with pytest.raises(UploadError):
+        write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0) + b'x'))
+    with pytest.raises(UploadError):
+        write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)), checksum='0' * 64)
+    with pytest.raises(UploadError):
+        write_chunk(USER, UPLOAD_ID, 5, io.BytesIO(b'tail'))
+
+    assert get_status(USER, UPLOAD_ID)['received'] == []
+    write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)), checksum=hashlib.sha256(chunk(0)).hexdigest())
+    assert get_status(USER, UPLOAD_ID)['received'] == [0]
+
+def test_sessions_of_other_users_are_not_found():
+    start()
+    with pytest.raises(UploadError) as error:
+        get_status(USER + 1, UPLOAD_ID)
+    assert error.value.status == 404
+
+def test_invalid_sessions_are_rejected():
+    with pytest.raises(UploadError):
+        create_session(USER, '../etc', 'a.jpg', 10, 'image/jpeg')
+    with pytest.raises(UploadError):
+        create_session(USER, UPLOAD_ID, 'a.exe', 10, 'application/octet-stream')
+    with pytest.raises(UploadError) as error:
+        create_session(USER, UPLOAD_ID, 'a.jpg', chunked_uploads.MAX_UPLOAD_BYTES + 1, 'image/jpeg')
+    assert error.value.status == 413
+
+def test_reusing_an_id_for_another_file_conflicts():
+    start()
+    with pytest.raises(UploadError) as error:
+        create_session(USER, UPLOAD_ID, 'other.jpg', len(DATA) + 1, 'image/jpeg')
+    assert error.value.status == 409
+
+def age_session(seconds):
+    """Move every mtime of the session back by `seconds`"""
+    then = time.time() - seconds
+    for root, dirs, files in os.walk(os.path.join(chunked_uploads.STAGING_DIR, UPLOAD_ID)):
+        for name in dirs + files:
+            os.utime(os.path.join(root, name), (then, then))
+    os.utime(os.path.join(chunked_uploads.STAGING_DIR, UPLOAD_ID), (then, then))
+
+def test_cleanup_removes_expired_sessions():
+    start()
+    age_session(120)
+    path = os.path.join(chunked_uploads.STAGING_DIR, UPLOAD_ID)
+
+    assert chunked_uploads.cleanup_expired(max_age=60) == 1
+    assert not os.path.exists(path)
+
+def test_cleanup_keeps_uploads_receiving_chunks():
+    start()
+    age_session(120)
+    write_chunk(USER, UPLOAD_ID, 0, io.BytesIO(chunk(0)))
+
+    assert chunked_uploads.cleanup_expired(max_age=60) == 0
+    assert get_status(USER, UPLOAD_ID)['received'] == [0]
+
+def test_discard_removes_the_session_of_its_owner_only():
+    start()
+    discard_upload(USER + 1, UPLOAD_ID)
+    assert get_status(USER, UPLOAD_ID)['total_chunks'] == 5
+
+    discard_upload(USER, UPLOAD_ID)
+    assert not os.path.exists(os.path.join(chunked_uploads.STAGING_DIR, UPLOAD_ID))
+    # Discarding twice is harmless
+    discard_upload(USER, UPLOAD_ID)
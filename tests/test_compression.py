@@ -0,0 +1,31 @@
+import gzip
+
+import pytest
+
+from compression import negotiate, compress
+
+BOTH = ('br', 'gzip')
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip;q=1.0, br;q=0.5', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('br;q=0, gzip;q=0', None),
+    ('*', 'br'),
+    ('*;q=0.5, br;q=0', 'gzip'),
+    ('GZIP', 'gzip'),
+    ('identity', None),
+    ('gzip;q=oops, br;q=0.1', 'br'),
+    ('', None),
+    (None, None),
+])
+def test_negotiate(header, expected):
+    assert negotiate(header, BOTH) == expected
+
+def test_ties_follow_available_order():
+    assert negotiate('gzip, br', BOTH) == 'br'
+    assert negotiate('gzip, br', ('gzip', 'br')) == 'gzip'
+
+def test_gzip_round_trip():
+    data = b'display tracker ' * 100
+    assert gzip.decompress(compress(data, 'gzip')) == data
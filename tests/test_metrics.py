@@ -0,0 +1,54 @@
+import json
+import os
+
+from metrics import MetricsRegistry, Counter, Gauge, Histogram, aggregate, mark_process_dead, render_dump
+
+def worker_snapshot(requests, seconds, in_use):
+    """Registry dump of one worker"""
+    registry = MetricsRegistry()
+    registry.register(Counter, 'requests_total', 'Requests', ('status',)).inc(requests, status='200')
+    latency = registry.register(Histogram, 'latency_seconds', 'Latency', buckets=(0.1, 1))
+    for value in seconds:
+        latency.observe(value)
+    registry.register(Gauge, 'in_use', 'Connections in use').set(in_use)
+    return registry.dump()
+
+def write_worker(directory, pid, snapshot):
+    with open(os.path.join(directory, f'worker_{pid}.json'), 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+
+def test_scrape_sums_all_workers(tmp_path):
+    write_worker(tmp_path, 101, worker_snapshot(3, [0.05, 0.5], in_use=1))
+    write_worker(tmp_path, 102, worker_snapshot(4, [2.0], in_use=2))
+
+    text = render_dump(aggregate(str(tmp_path)))
+
+    assert 'requests_total{status="200"} 7' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'latency_seconds_count 3' in text
+    assert 'in_use{pid="101"} 1' in text and 'in_use{pid="102"} 2' in text
+
+def test_exited_workers_keep_their_counts(tmp_path):
+    write_worker(tmp_path, 101, worker_snapshot(3, [0.05], in_use=1))
+    write_worker(tmp_path, 102, worker_snapshot(4, [0.05], in_use=2))
+    before = aggregate(str(tmp_path))
+
+    mark_process_dead(101, str(tmp_path))
+    mark_process_dead(101, str(tmp_path))
+    after = aggregate(str(tmp_path))
+
+    assert not os.path.exists(tmp_path / 'worker_101.json')
+    assert after['requests_total']['values'] == before['requests_total']['values'] == {('200',): 7}
+    assert after['latency_seconds']['values'][()]['count'] == 2
+    # Gauges only describe live workers
+    assert list(after['in_use']['values']) == [('102',)]
+
+def test_worker_folded_while_reading_is_counted_once(tmp_path):
+    write_worker(tmp_path, 101, worker_snapshot(3, [], in_use=0))
+    mark_process_dead(101, str(tmp_path))
+    # A snapshot still listed by a scrape that raced with the fold
+    write_worker(tmp_path, 101, worker_snapshot(3, [], in_use=0))
+
+    assert aggregate(str(tmp_path))['requests_total']['values'] == {('200',): 3}
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+import migrations
+from migrations import discover_migrations, migration_status, run_migrations, table_exists
+
+def test_discovers_migrations_in_version_order():
+    versions = [version for version, _, _ in discover_migrations()]
+    assert versions == sorted(versions)
+    assert versions[0] == 1
+
+def test_applies_every_migration_once(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'db.sqlite'))
+    expected = [version for version, _, _ in discover_migrations()]
+
+    assert run_migrations(conn, 'sqlite') == expected
+    assert run_migrations(conn, 'sqlite') == []
+    assert all(applied for _, _, applied in migration_status(conn, 'sqlite'))
+
+    cursor = conn.cursor()
+    for table in ('users', 'categories', 'data_entries', 'branches', 'submissions', 'taxonomy_renames'):
+        assert table_exists(cursor, 'sqlite', table)
+
+def test_dry_run_lists_pending_without_applying(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'db.sqlite'))
+
+    pending = run_migrations(conn, 'sqlite', dry_run=True)
+
+    assert pending == [version for version, _, _ in discover_migrations()]
+    assert not table_exists(conn.cursor(), 'sqlite', 'users')
+
+def test_failed_migration_is_rolled_back(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / 'db.sqlite'))
+    run_migrations(conn, 'sqlite')
+
+    def broken(cursor, db_type):
+        cursor.execute('CREATE TABLE half_done (id INTEGER)')
+        raise RuntimeError('boom')
+
+    real = discover_migrations()
+    monkeypatch.setattr(migrations, 'discover_migrations', lambda: real + [(9999, 'Broken', broken)])
+
+    with pytest.raises(RuntimeError):
+        run_migrations(conn, 'sqlite')
+
+    cursor = conn.cursor()
+    assert not table_exists(cursor, 'sqlite', 'half_done')
+    assert 9999 not in migrations.get_applied_versions(cursor)
+
+def test_unique_taxonomy_migration_merges_duplicates(capsys):
+    from migrations import m0003_unique_taxonomy
+
+    conn = sqlite3.connect(':memory:')
+    conn.executescript('''
+        CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE models (id INTEGER PRIMARY KEY, name TEXT, category_id INTEGER);
+        CREATE TABLE display_types (id INTEGER PRIMARY KEY, name TEXT, category_id INTEGER);
+        CREATE TABLE pop_materials (id INTEGER PRIMARY KEY, name TEXT, model_id INTEGER);
+        INSERT INTO categories VALUES (1, 'OLED'), (2, 'OLED');
+        INSERT INTO models VALUES (1, 'M1', 1), (2, 'M1', 2);
+        INSERT INTO pop_materials VALUES (1, 'Header', 1), (2, 'Header', 2), (3, 'Stand', 2);
+    ''')
+
+    m0003_unique_taxonomy.upgrade(conn.cursor(), 'sqlite')
+
+    assert conn.execute('SELECT id, name FROM categories').fetchall() == [(1, 'OLED')]
+    assert conn.execute('SELECT id, category_id FROM models').fetchall() == [(1, 1)]
+    assert conn.execute('SELECT name, model_id FROM pop_materials ORDER BY id').fetchall() == [('Header', 1), ('Stand', 1)]
+    assert "categories (2, 'OLED')" in capsys.readouterr().out
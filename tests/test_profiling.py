@@ -0,0 +1,45 @@
+from profiling import ProfileStore
+
+def profile(profile_id, size=10):
+    return {'id': profile_id, 'mode': 'sample', 'path': '/get_branches', 'size': size,
+            'data': b'a;b 1\n', 'summary': 'summary'}
+
+def test_profiles_are_shared_through_the_directory(tmp_path):
+    worker_a = ProfileStore(str(tmp_path), 10, 1000)
+    worker_b = ProfileStore(str(tmp_path), 10, 1000)
+
+    worker_a.add(profile('aaaaaaaaaaa1'))
+
+    stored = worker_b.get('aaaaaaaaaaa1')
+    assert stored['data'] == b'a;b 1\n' and stored['summary'] == 'summary'
+    assert [listed['id'] for listed in worker_b.list()] == ['aaaaaaaaaaa1']
+    assert 'summary' not in worker_b.list()[0]
+
+def test_oldest_profiles_are_dropped_first(tmp_path):
+    store = ProfileStore(str(tmp_path), 3, 45)
+
+    for number in range(1, 5):
+        store.add(profile(f'aaaaaaaaaaa{number}'))
+    assert [listed['id'] for listed in store.list()] == ['aaaaaaaaaaa4', 'aaaaaaaaaaa3', 'aaaaaaaaaaa2']
+
+    store.add(profile('aaaaaaaaaaa5', size=30))
+    assert [listed['id'] for listed in store.list()] == ['aaaaaaaaaaa5', 'aaaaaaaaaaa4']
+    assert store.get('aaaaaaaaaaa1') is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'aaaaaaaaaaa4.data', 'aaaaaaaaaaa4.json', 'aaaaaaaaaaa5.data', 'aaaaaaaaaaa5.json']
+
+def test_unknown_or_malformed_ids_are_not_found(tmp_path):
+    store = ProfileStore(str(tmp_path / 'missing'), 3, 100)
+
+    assert store.get('../../etc/passwd') is None
+    assert store.get('aaaaaaaaaaa1') is None
+    assert store.list() == []
+    store.clear()
+
+def test_profiled_request_can_be_downloaded(admin_client):
+    response = admin_client.get('/get_dynamic_data/categories?_profile=sample')
+    profile_id = response.headers['X-Profile-Id']
+
+    download = admin_client.get(f'/admin/profiles/{profile_id}/download')
+    assert download.status_code == 200
+    assert admin_client.get(f'/admin/profiles/{profile_id}').status_code == 200
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import rename_propagation
+from rename_propagation import job_statement, record_renames, claim_next, run_pending
+
+CREATED_AT = '2026-01-01 00:00:00'
+
+def add_entry(cursor, category='TV', model='QN90F', display_type='Wall', selected='', missing=''):
+    cursor.execute('''INSERT INTO data_entries (employee_name, employee_code, branch_name, category, model,
+                      display_type, selected_materials, missing_materials) VALUES ('Ann', 'E1', 'Main', ?, ?, ?, ?, ?)''',
+                   (category, model, display_type, selected, missing))
+
+def rewrite(cursor, job):
+    set_sql, set_params, where_sql, where_params = job_statement(job, '?')
+    cursor.execute(f'UPDATE data_entries SET {set_sql} WHERE {where_sql}', set_params + where_params)
+    return cursor.rowcount
+
+def column(cursor, name):
+    cursor.execute(f'SELECT {name} FROM data_entries ORDER BY id')
+    return [row[0] for row in cursor.fetchall()]
+
+def job(data_type, old_name, new_name, category=None, model=None):
+    return {'data_type': data_type, 'old_name': old_name, 'new_name': new_name, 'category': category, 'model': model}
+
+def test_category_statement():
+    assert job_statement(job('categories', 'TV', 'Televisions'), '%s') == (
+        'category = %s', ['Televisions'], 'category = %s', ['TV'])
+
+def test_model_rename_is_scoped_by_category(conn):
+    cursor = conn.cursor()
+    add_entry(cursor, category='TV', model='Q1')
+    add_entry(cursor, category='Audio', model='Q1')
+
+    assert rewrite(cursor, job('models', 'Q1', 'Q2', category='TV')) == 1
+    assert column(cursor, 'model') == ['Q2', 'Q1']
+
+def test_material_rename_rewrites_list_items(conn):
+    cursor = conn.cursor()
+    add_entry(cursor, selected='A_1,B', missing='C')
+    add_entry(cursor, selected='B,A_1,C', missing='A_1')
+    add_entry(cursor, selected='A_1')
+    # Neither a longer name nor a LIKE wildcard match is rewritten
+    add_entry(cursor, selected='AX1,A_10,B')
+    add_entry(cursor, model='S90F', selected='A_1')
+
+    assert rewrite(cursor, job('pop_materials', 'A_1', 'A%2', category='TV', model='QN90F')) == 3
+    assert column(cursor, 'selected_materials') == ['A%2,B', 'B,A%2,C', 'A%2', 'AX1,A_10,B', 'A_1']
+    assert column(cursor, 'missing_materials') == ['C', 'A%2', '', '', '']
+    # Rewritten rows no longer match, so a job can be resumed
+    assert rewrite(cursor, job('pop_materials', 'A_1', 'A%2', category='TV', model='QN90F')) == 0
+
+def test_record_renames_skips_unchanged_names_and_commas(conn):
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO categories (id, name) VALUES (1, 'TV')")
+    cursor.execute("INSERT INTO models (id, name, category_id) VALUES (10, 'QN90F', 1)")
+    cursor.execute("INSERT INTO pop_materials (id, name, model_id) VALUES (30, 'Stand', 10), (31, 'Topper', 10)")
+
+    assert record_renames(cursor, 'sqlite', 'pop_materials', [(30, 'Stand'), (31, 'Top, large')], CREATED_AT) == 0
+    assert record_renames(cursor, 'sqlite', 'pop_materials', [(30, 'Floor stand'), (31, 'Topper')], CREATED_AT) == 1
+
+    cursor.execute('SELECT data_type, item_id, category, model, old_name, new_name FROM taxonomy_renames')
+    assert cursor.fetchall() == [('pop_materials', 30, 'TV', 'QN90F', 'Stand', 'Floor stand')]
+
+def test_run_pending_applies_jobs_in_batches(connect):
+    conn, _ = connect()
+    cursor = conn.cursor()
+    for _ in range(5):
+        add_entry(cursor, category='TV')
+    add_entry(cursor, category='Audio')
+    cursor.execute("INSERT INTO categories (id, name) VALUES (1, 'TV')")
+    record_renames(cursor, 'sqlite', 'categories', [(1, 'Televisions')], CREATED_AT)
+    conn.commit()
+
+    finished = run_pending(connect, batch_size=2, worker='test')
+
+    assert [(job['status'], job['rows']) for job in finished] == [('done', 5)]
+    assert column(cursor, 'category') == ['Televisions'] * 5 + ['Audio']
+    cursor.execute('SELECT status, rows_updated, total_rows, finished_at IS NOT NULL FROM taxonomy_renames')
+    assert cursor.fetchone() == ('done', 5, 5, 1)
+    assert run_pending(connect) == []
+    conn.close()
+
+def insert_running_job(conn, updated_at):
+    conn.execute('''INSERT INTO taxonomy_renames (data_type, item_id, old_name, new_name, status, worker, updated_at)
+                    VALUES ('categories', 1, 'TV', 'Televisions', 'running', 'gone', ?)''', (updated_at,))
+    conn.commit()
+
+@pytest.mark.parametrize('age, claimed', [(10, False), (rename_propagation.STALE_AFTER + 60, True)])
+def test_only_stale_claims_are_taken_over(conn, age, claimed):
+    insert_running_job(conn, (datetime.now() - timedelta(seconds=age)).strftime('%Y-%m-%d %H:%M:%S'))
+
+    job = claim_next(conn, 'sqlite', 'new-worker')
+
+    assert (job is not None) == claimed
+    worker = conn.execute('SELECT worker FROM taxonomy_renames').fetchone()[0]
+    assert worker == ('new-worker' if claimed else 'gone')
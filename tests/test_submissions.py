@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+FORM = {
+    'branch_1': 'Nasr City', 'shop_code_1': 'SC100', 'category_1': 'OLED',
+    'model_1': 'M1', 'display_type_1': 'Wall', 'pop_materials_1': ['Header', 'Stand'],
+}
+
+def entry_count(app_module):
+    conn, _ = app_module.get_db_connection()
+    try:
+        return conn.execute('SELECT COUNT(*) FROM data_entries').fetchone()[0]
+    finally:
+        conn.close()
+
+def submit(client, key=None, form=FORM):
+    headers = {'Idempotency-Key': key} if key else {}
+    return client.post('/submit_data', data=form, headers=headers)
+
+def test_repeated_key_is_saved_once(app_module, admin_client):
+    first = submit(admin_client, 'key-0001-abcd')
+    second = submit(admin_client, 'key-0001-abcd')
+
+    assert first.status_code == 200 and first.json['replayed'] is False
+    assert second.status_code == 200 and second.json['replayed'] is True
+    assert second.json['entry_ids'] == first.json['entry_ids']
+    assert entry_count(app_module) == 1
+
+def test_different_keys_and_no_key_insert_again(app_module, admin_client):
+    submit(admin_client, 'key-0001-abcd')
+    submit(admin_client, 'key-0002-abcd')
+    submit(admin_client)
+    submit(admin_client)
+
+    assert entry_count(app_module) == 4
+
+def test_key_of_another_user_conflicts(app_module, admin_client):
+    submit(admin_client, 'key-0001-abcd')
+    conn, _ = app_module.get_db_connection()
+    conn.execute('UPDATE submissions SET user_id = user_id + 1')
+    conn.commit()
+    conn.close()
+
+    response = submit(admin_client, 'key-0001-abcd')
+
+    assert response.status_code == 409
+    assert entry_count(app_module) == 1
+
+def test_submission_still_being_saved_conflicts(app_module, admin_client):
+    conn, _ = app_module.get_db_connection()
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone()[0]
+    conn.execute("INSERT INTO submissions (idempotency_key, user_id) VALUES ('key-0003-abcd', ?)", (user_id,))
+    conn.commit()
+    conn.close()
+
+    response = submit(admin_client, 'key-0003-abcd')
+
+    assert response.status_code == 409
+    assert entry_count(app_module) == 0
+
+@pytest.mark.parametrize('key', ['short', 'has spaces in it', 'x' * 65])
+def test_malformed_key_is_rejected(app_module, admin_client, key):
+    assert submit(admin_client, key).status_code == 400
+    assert entry_count(app_module) == 0
+
+def test_chunked_upload_is_deleted_once_stored(app_module, admin_client, tmp_path, monkeypatch):
+    import chunked_uploads
+
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    photo = b'\xff\xd8 not really a jpeg'
+    admin_client.post('/uploads', json={'upload_id': 'photo-0001', 'filename': 'shelf.jpg', 'size': len(photo),
+                                        'content_type': 'image/jpeg'})
+    admin_client.put('/uploads/photo-0001/chunks/0', data=photo)
+    assert admin_client.post('/uploads/photo-0001/finalize').json['complete']
+
+    response = submit(admin_client, form={**FORM, 'uploads_1': 'photo-0001'})
+
+    assert response.status_code == 200
+    assert not os.path.exists(os.path.join(chunked_uploads.STAGING_DIR, 'photo-0001'))
+    stored = [name for name in os.listdir(tmp_path) if name.endswith('shelf.jpg')]
+    assert len(stored) == 1
+    with open(os.path.join(tmp_path, stored[0]), 'rb') as f:
+        assert f.read() == photo
+
+def test_outbox_record_of_another_user_is_held(app_module, admin_client):
+    conn, _ = app_module.get_db_connection()
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'admin'").fetchone()[0]
+    conn.close()
+
+    held = admin_client.post('/submit_data', data=FORM, headers={'X-Outbox-User': str(user_id + 1)})
+    own = admin_client.post('/submit_data', data=FORM, headers={'X-Outbox-User': str(user_id)})
+
+    assert held.status_code == 403 and held.json['held'] is True
+    assert own.status_code == 200
+    assert entry_count(app_module) == 1
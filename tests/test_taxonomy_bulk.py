@@ -0,0 +1,216 @@
+import pytest
+
+from taxonomy_bulk import (TaxonomyImportError, parse_taxonomy, load_taxonomy, diff_taxonomy, summarize,
+                           apply_changes, export_rows, apply_operations, clone_pop_materials,
+                           OperationError)
+
+CREATED_AT = '2026-01-01 00:00:00'
+
+ROWS = [
+    ['Type', 'Category', 'Model', 'Name'],
+    ['category', '', '', 'TV'],
+    ['model', 'TV', '', 'QN90F'],
+    ['Display Type', 'TV', '', 'Wall'],
+    ['pop', 'Audio', 'Soundbar', 'Stand'],
+    ['', '', '', ''],
+]
+
+def test_parse_implies_parents():
+    wanted = parse_taxonomy(ROWS)
+
+    assert wanted['categories'] == {'TV', 'Audio'}
+    assert wanted['models'] == {('TV', 'QN90F'), ('Audio', 'Soundbar')}
+    assert wanted['display_types'] == {('TV', 'Wall')}
+    assert wanted['pop_materials'] == {('Audio', 'Soundbar', 'Stand')}
+
+def test_parse_reports_every_invalid_row():
+    rows = [['Name', 'Type', 'Category'], ['X', 'gadget', ''], ['', 'category', ''], ['Stand', 'pop', 'TV'],
+            ['QN90F', 'model', '']]
+
+    with pytest.raises(TaxonomyImportError) as error:
+        parse_taxonomy(rows)
+    assert [(e['row'], e['message']) for e in error.value.errors] == [
+        (2, "unknown type 'gadget'"), (3, 'name is missing'), (4, 'model is missing'), (5, 'category is missing')]
+
+@pytest.mark.parametrize('rows', [[], [['', '']], [['Category', 'Name'], ['', 'TV']]])
+def test_parse_rejects_empty_files_and_missing_columns(rows):
+    with pytest.raises(TaxonomyImportError):
+        parse_taxonomy(rows)
+
+def test_diff_and_summary():
+    wanted = parse_taxonomy(ROWS)
+    current = {'categories': {'TV', 'Phones'}, 'models': {('TV', 'QN90F')}, 'display_types': set(),
+               'pop_materials': set()}
+
+    changes = diff_taxonomy(wanted, current)
+
+    assert changes['categories'] == {'new': ['Audio'], 'existing': 1, 'not_in_file': 1}
+    assert changes['models']['new'] == [('Audio', 'Soundbar')]
+    assert summarize(changes)['pop_materials'] == {'new': 1, 'existing': 0, 'not_in_file': 0,
+                                                   'preview': ['Audio / Soundbar / Stand']}
+
+def test_apply_adds_new_items_once(conn):
+    cursor = conn.cursor()
+    wanted = parse_taxonomy(ROWS)
+
+    added = apply_changes(cursor, 'sqlite', diff_taxonomy(wanted, load_taxonomy(cursor)), CREATED_AT)
+    assert added == {'categories': 2, 'models': 2, 'display_types': 1, 'pop_materials': 1}
+    assert load_taxonomy(cursor) == wanted
+
+    changes = diff_taxonomy(wanted, load_taxonomy(cursor))
+    assert all(not change['new'] for change in changes.values())
+    assert apply_changes(cursor, 'sqlite', changes, CREATED_AT) == dict.fromkeys(added, 0)
+
+def test_export_reimports_to_the_same_taxonomy(conn):
+    cursor = conn.cursor()
+    wanted = parse_taxonomy(ROWS)
+    apply_changes(cursor, 'sqlite', diff_taxonomy(wanted, load_taxonomy(cursor)), CREATED_AT)
+
+    exported = [['Type', 'Category', 'Model', 'Name']] + [list(row) for row in export_rows(cursor)]
+    assert parse_taxonomy(exported) == wanted
+
+# Batched manage_data operations
+
+def seed(cursor):
+    """TV with model QN90F (one POP material) and display type Wall; Audio empty"""
+    cursor.execute("INSERT INTO categories (id, name) VALUES (1, 'TV'), (2, 'Audio')")
+    cursor.execute("INSERT INTO models (id, name, category_id) VALUES (10, 'QN90F', 1)")
+    cursor.execute("INSERT INTO display_types (id, name, category_id) VALUES (20, 'Wall', 1)")
+    cursor.execute("INSERT INTO pop_materials (id, name, model_id) VALUES (30, 'AI topper', 10)")
+
+def names(cursor, table):
+    cursor.execute(f'SELECT name FROM {table} ORDER BY name')
+    return [row[0] for row in cursor.fetchall()]
+
+def messages(results):
+    return [(result['success'], result['message']) for result in results]
+
+def test_operations_add_edit_and_delete(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    results = apply_operations(cursor, 'sqlite', [
+        {'action': 'add', 'type': 'categories', 'name': 'Phones'},
+        {'action': 'add', 'type': 'models', 'name': 'QN95F', 'category_id': '1'},
+        {'action': 'edit', 'type': 'display_types', 'id': 20, 'name': 'Wall mount'},
+        {'action': 'delete', 'type': 'categories', 'id': 2},
+    ], CREATED_AT)
+
+    assert messages(results) == [(True, 'Category added'), (True, 'Model added'),
+                                 (True, 'Display type updated'), (True, 'Category deleted')]
+    assert names(cursor, 'categories') == ['Phones', 'TV']
+    assert names(cursor, 'models') == ['QN90F', 'QN95F']
+    assert names(cursor, 'display_types') == ['Wall mount']
+
+def test_invalid_operations_are_rejected_alone(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    results = apply_operations(cursor, 'sqlite', [
+        {'action': 'add', 'type': 'models', 'name': 'QN90F', 'category_id': 1},
+        {'action': 'add', 'type': 'models', 'name': 'QN90F', 'category_id': 2},
+        {'action': 'delete', 'type': 'categories', 'id': 1},
+        {'action': 'edit', 'type': 'pop_materials', 'id': 99, 'name': 'Stand'},
+        {'action': 'add', 'type': 'display_types', 'name': 'Floor', 'category_id': 7},
+        {'action': 'rename', 'type': 'models', 'id': 10},
+        {'action': 'add', 'type': 'categories', 'name': ' '},
+    ], CREATED_AT)
+
+    assert messages(results) == [
+        (False, 'Model already exists in this category'),
+        (True, 'Model added'),
+        (False, 'Cannot delete category with existing models'),
+        (False, 'POP material 99 not found'),
+        (False, 'Category 7 not found'),
+        (False, 'Invalid action'),
+        (False, 'Category name is required'),
+    ]
+    cursor.execute('SELECT category_id FROM models WHERE name = ? ORDER BY category_id', ('QN90F',))
+    assert [row[0] for row in cursor.fetchall()] == [1, 2]
+
+def test_conflicts_within_a_batch(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    results = apply_operations(cursor, 'sqlite', [
+        {'action': 'add', 'type': 'categories', 'name': 'Phones'},
+        {'action': 'add', 'type': 'categories', 'name': 'Phones'},
+        {'action': 'edit', 'type': 'display_types', 'id': 20, 'name': 'Floor'},
+        {'action': 'delete', 'type': 'display_types', 'id': 20},
+        {'action': 'add', 'type': 'models', 'name': 'HW-Q990F', 'category_id': 2},
+        {'action': 'delete', 'type': 'categories', 'id': 2},
+    ], CREATED_AT)
+
+    assert messages(results) == [
+        (True, 'Category added'),
+        (False, 'Category already exists'),
+        (True, 'Display type updated'),
+        (False, 'Item is already changed by an earlier operation of this batch'),
+        (True, 'Model added'),
+        (False, 'Category is used by another operation of this batch'),
+    ]
+
+def test_deleting_children_unblocks_the_parent(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    results = apply_operations(cursor, 'sqlite', [
+        {'action': 'delete', 'type': 'models', 'id': 10},
+        {'action': 'delete', 'type': 'pop_materials', 'id': 30},
+    ], CREATED_AT)
+
+    assert all(result['success'] for result in results)
+    assert names(cursor, 'models') == [] and names(cursor, 'pop_materials') == []
+
+def test_atomic_batch_applies_nothing_when_one_fails(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    results = apply_operations(cursor, 'sqlite', [
+        {'action': 'add', 'type': 'categories', 'name': 'Phones'},
+        {'action': 'add', 'type': 'categories', 'name': 'TV'},
+    ], CREATED_AT, atomic=True)
+
+    assert messages(results) == [(False, 'Not applied: other operations of the batch are invalid'),
+                                 (False, 'Category already exists')]
+    assert names(cursor, 'categories') == ['Audio', 'TV']
+
+def test_edits_record_rename_jobs(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    apply_operations(cursor, 'sqlite', [
+        {'action': 'edit', 'type': 'models', 'id': 10, 'name': 'QN90G'},
+        {'action': 'edit', 'type': 'pop_materials', 'id': 30, 'name': 'AI topper'},
+    ], CREATED_AT)
+
+    cursor.execute('SELECT data_type, item_id, category, old_name, new_name, status FROM taxonomy_renames')
+    assert cursor.fetchall() == [('models', 10, 'TV', 'QN90F', 'QN90G', 'pending')]
+
+# Copying POP material lists between models
+
+def test_clone_copies_missing_materials_only(conn):
+    cursor = conn.cursor()
+    seed(cursor)
+    cursor.execute("INSERT INTO models (id, name, category_id) VALUES (11, 'QN95F', 1), (12, 'S90F', 1)")
+    cursor.execute("INSERT INTO pop_materials (name, model_id) VALUES ('Price card', 10), ('AI topper', 12)")
+
+    assert clone_pop_materials(cursor, 'sqlite', 10, [11, 12, 10], CREATED_AT) == {'source_materials': 2, 'added': 3}
+    cursor.execute('SELECT model_id, name FROM pop_materials ORDER BY model_id, name')
+    assert cursor.fetchall() == [(10, 'AI topper'), (10, 'Price card'), (11, 'AI topper'), (11, 'Price card'),
+                                 (12, 'AI topper'), (12, 'Price card')]
+
+    assert clone_pop_materials(cursor, 'sqlite', 10, [11, 12], CREATED_AT)['added'] == 0
+
+@pytest.mark.parametrize('source, targets, message', [
+    (10, [10], 'Select at least one target model other than the source'),
+    (99, [10], 'Model 99 not found'),
+    (10, [98, 99], 'Models not found: 98, 99'),
+])
+def test_clone_rejects_unknown_models(conn, source, targets, message):
+    cursor = conn.cursor()
+    seed(cursor)
+
+    with pytest.raises(OperationError) as error:
+        clone_pop_materials(cursor, 'sqlite', source, targets, CREATED_AT)
+    assert str(error.value) == message